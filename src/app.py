@@ -1,73 +1,59 @@
+from core import import_profiler
+import_profiler.install_from_env()  # must run before the application imports below
+
+import importlib.util
 from flask import Flask, render_template, session, redirect, url_for, jsonify, request
-from controllers.auth_controller import auth_bp
-from controllers.user_controller import user_bp
-from controllers.student_controller import student_bp
-from controllers.course_controller import course_bp
-from controllers.task_controller import task_bp
-from controllers.message_controller import message_bp
-from controllers.enrollment_controller import enrollment_bp
-from controllers.schedule_controller import schedule_bp
-from controllers.calendar_controller import calendar_bp
-from controllers.course_registration_controller import course_reg_bp
-from controllers.transcript_controller import transcript_bp
-from controllers.overview_controller import overview_bp
 from repositories.repository_factory import RepositoryFactory
 from core.user_helper import get_user_data
 from core.role_auth import requires_student, requires_role
+from core import (unit_of_work, tenant_context, sqlite_tuning, query_instrumentation, invalidation_bus,
+                  request_profiler, metrics)
+
+# Blueprints in registration order: (module, blueprint attribute, optional, required packages).
+# Controllers defer their services and heavy dependencies until first use, so
+# importing them here is cheap; optional ones are skipped when their packages
+# are missing, without importing those packages.
+BLUEPRINTS = [
+    ('controllers.auth_controller', 'auth_bp', False, ()),
+    ('controllers.user_controller', 'user_bp', False, ()),
+    ('controllers.student_controller', 'student_bp', False, ()),
+    ('controllers.course_controller', 'course_bp', False, ()),
+    ('controllers.message_controller', 'message_bp', False, ()),
+    ('controllers.enrollment_controller', 'enrollment_bp', False, ()),
+    ('controllers.schedule_controller', 'schedule_bp', False, ()),
+    ('controllers.calendar_controller', 'calendar_bp', False, ()),
+    ('controllers.course_registration_controller', 'course_reg_bp', False, ()),
+    ('controllers.transcript_controller', 'transcript_bp', False, ()),
+    ('controllers.overview_controller', 'overview_bp', False, ()),
+    ('controllers.AI_Note_controller', 'ai_note_bp', True, ('transformers', 'docx', 'PyPDF2')),
+    ('controllers.ai_assistant_controller', 'ai_assistant_bp', True, ()),
+    ('controllers.advisor_chatbot_controller', 'advisor_chatbot_bp', True, ()),
+    ('controllers.notification_controller', 'notification_bp', True, ()),
+    ('controllers.appointment_controller', 'appointment_bp', True, ()),
+    ('controllers.assignment_controller', 'assignment_bp', True, ()),
+    # Registered after the app routes so they take precedence
+    ('controllers.task_controller', 'task_bp', False, ()),
+]
+
+
+def load_blueprint(module_name, attr, optional=False, requires=()):
+    """
+    Import a controller and return its blueprint.
+    Optional blueprints return None (with a warning) when unavailable.
+    """
+    missing = [package for package in requires if importlib.util.find_spec(package) is None]
+    try:
+        if missing:
+            raise ImportError(f"No module named {missing[0]!r}")
+        # __import__ (not importlib.import_module) so the import profiler sees it
+        return getattr(__import__(module_name, fromlist=[attr]), attr)
+    except ImportError as e:
+        if not optional:
+            raise
+        print(f"Warning: {module_name.rsplit('.', 1)[-1]} not available: {e}")
+        return None
+
 
-# Conditionally import AI Note controller (requires additional dependencies)
-try:
-    from controllers.AI_Note_controller import ai_note_bp
-    ai_note_available = True
-except ImportError as e:
-    print(f"Warning: AI Note controller not available: {e}")
-    ai_note_bp = None
-    ai_note_available = False
-
-# Import AI Assistant controller
-try:
-    from controllers.ai_assistant_controller import ai_assistant_bp
-    ai_assistant_available = True
-except ImportError as e:
-    print(f"Warning: AI Assistant controller not available: {e}")
-    ai_assistant_bp = None
-    ai_assistant_available = False
-
-# Import Advisor Chatbot controller
-try:
-    from controllers.advisor_chatbot_controller import advisor_chatbot_bp
-    advisor_chatbot_available = True
-except ImportError as e:
-    print(f"Warning: Advisor Chatbot controller not available: {e}")
-    advisor_chatbot_bp = None
-    advisor_chatbot_available = False
-
-# Import Notification controller
-try:
-    from controllers.notification_controller import notification_bp
-    notification_available = True
-except ImportError as e:
-    print(f"Warning: Notification controller not available: {e}")
-    notification_bp = None
-    notification_available = False
-
-# Import Appointment controller
-try:
-    from controllers.appointment_controller import appointment_bp
-    appointment_available = True
-except ImportError as e:
-    print(f"Warning: Appointment controller not available: {e}")
-    appointment_bp = None
-    appointment_available = False
-
-# Import Assignment controller
-try:
-    from controllers.assignment_controller import assignment_bp
-    assignment_available = True
-except ImportError as e:
-    print(f"Warning: Assignment controller not available: {e}")
-    assignment_bp = None
-    assignment_available = False
 import os
 import sys
 
@@ -94,36 +80,48 @@ def create_app(config=None):
     # Configuration
     app.secret_key = os.environ.get('SECRET_KEY', 'unify-secret-key-change-in-production')
     
+    # Request-scoped unit of work: one shared connection/transaction per request
+    app.config['DB_UNIT_OF_WORK'] = os.environ.get('DB_UNIT_OF_WORK', 'false').lower() == 'true'
+    
     # Apply custom config if provided
     if config:
         app.config.update(config)
     
+    # Multi-tenant routing is bound per request from the session
+    if os.environ.get('MULTI_TENANT_MODE', 'false').lower() == 'true':
+        tenant_context.init_app(app)
+    
+    if app.config['DB_UNIT_OF_WORK']:
+        unit_of_work.init_app(app)
+    
+    # Server-Timing headers and on-demand cProfile captures (also turns on
+    # query instrumentation for the DB timings)
+    if request_profiler.get_request_profiler().enabled:
+        request_profiler.init_app(app)
+    
+    # Prometheus /metrics endpoint and the request latency histograms behind it
+    if metrics.get_metrics_registry().enabled:
+        metrics.init_app(app)
+    
+    # Per-request query counts, slow-query log and N+1 warnings
+    if query_instrumentation.get_query_instrumentation().enabled:
+        query_instrumentation.init_app(app)
+    
+    # Apply cache invalidations published by other workers
+    if invalidation_bus.get_invalidation_bus().enabled:
+        invalidation_bus.init_app(app)
+    
+    # Periodic WAL checkpoints for SQLite databases (connections run PRAGMA optimize themselves)
+    sqlite_tuning.get_maintenance().start()
+    
     # --- Register Blueprints ---
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(user_bp)
-    app.register_blueprint(student_bp)
-    app.register_blueprint(course_bp)
-    # Note: task_bp registered after routes to avoid conflicts
-    app.register_blueprint(message_bp)
-    app.register_blueprint(enrollment_bp)
-    app.register_blueprint(schedule_bp)
-    app.register_blueprint(calendar_bp)
-    app.register_blueprint(course_reg_bp)
-    app.register_blueprint(transcript_bp)
-    app.register_blueprint(overview_bp)
-    if ai_note_available and ai_note_bp:
-        app.register_blueprint(ai_note_bp)
-    if ai_assistant_available and ai_assistant_bp:
-        app.register_blueprint(ai_assistant_bp)
-    if advisor_chatbot_available and advisor_chatbot_bp:
-        app.register_blueprint(advisor_chatbot_bp)
-    if notification_available and notification_bp:
-        app.register_blueprint(notification_bp)
-    if appointment_available and appointment_bp:
-        app.register_blueprint(appointment_bp)
-    if assignment_available and assignment_bp:
-        app.register_blueprint(assignment_bp)
-    app.register_blueprint(task_bp)  # Register after routes to ensure app routes take precedence
+    for module_name, attr, optional, requires in BLUEPRINTS:
+        blueprint = load_blueprint(module_name, attr, optional, requires)
+        if blueprint is not None:
+            app.register_blueprint(blueprint)
+    
+    # Startup import report (UNIFY_PROFILE_IMPORTS=true)
+    import_profiler.report_startup()
     
     return app
 
@@ -136,10 +134,8 @@ try:
     user_repo = RepositoryFactory.get_repository('user')
     student_repo = RepositoryFactory.get_repository('student')
     course_repo = RepositoryFactory.get_repository('course')
-    task_repo = RepositoryFactory.get_repository('task')
-    enrollment_repo = RepositoryFactory.get_repository('enrollment')
     message_repo = RepositoryFactory.get_repository('message')
-    schedule_repo = RepositoryFactory.get_repository('schedule')
+    stats_repo = RepositoryFactory.get_repository('stats')
     db_available = True
 except Exception as e:
     print(f"Warning: Database not available: {e}")
@@ -147,10 +143,8 @@ except Exception as e:
     user_repo = None
     student_repo = None
     course_repo = None
-    task_repo = None
-    enrollment_repo = None
     message_repo = None
-    schedule_repo = None
+    stats_repo = None
 
 DEFAULT_USER_ID = 1  # Fallback user ID for testing
 
@@ -187,39 +181,27 @@ def get_default_stats():
 
 
 def get_user_stats(user_id):
+    """
+    Dashboard counters for a student, from StatsRepository.get_overview_stats:
+      total_courses          enrollments with Status 'enrolled'
+      active_tasks           tasks with Status 'pending'
+      completed_assignments  tasks with Status 'completed'
+      upcoming_events        Calendar entries dated today or later
+    """
     stats = get_default_stats()
-    if not (db_available and user_repo and student_repo):
+    if not (db_available and stats_repo):
         return stats
     try:
-        student = student_repo.get_by_user_id(user_id)
-        if not student:
+        # One aggregate query instead of loading every enrollment and task
+        overview_stats = stats_repo.get_overview_stats(user_id)
+        if overview_stats['student_id'] is None:
             return stats
-        if hasattr(student, 'GPA') and student.GPA:
-            stats['gpa'] = float(student.GPA)
-        # enrollments
-        if enrollment_repo and hasattr(enrollment_repo, 'get_by_student_id'):
-            try:
-                enrollments = enrollment_repo.get_by_student_id(getattr(student, 'Student_ID', None))
-                stats['total_courses'] = len(enrollments) if enrollments else 0
-            except Exception:
-                pass
-        # tasks
-        if task_repo and hasattr(task_repo, 'get_by_user_id'):
-            try:
-                tasks = task_repo.get_by_user_id(user_id)
-                if tasks:
-                    stats['active_tasks'] = len([t for t in tasks if not getattr(t, 'Completed', False)])
-                    stats['completed_assignments'] = len([t for t in tasks if getattr(t, 'Completed', False)])
-            except Exception:
-                pass
-        # schedules/events
-        if schedule_repo and hasattr(schedule_repo, 'get_by_user_id'):
-            try:
-                schedules = schedule_repo.get_by_user_id(user_id)
-                if schedules:
-                    stats['upcoming_events'] = len(schedules)
-            except Exception:
-                pass
+        if overview_stats['gpa']:
+            stats['gpa'] = overview_stats['gpa']
+        stats['total_courses'] = overview_stats['total_courses']
+        stats['active_tasks'] = overview_stats['active_tasks']
+        stats['completed_assignments'] = overview_stats['completed_tasks']
+        stats['upcoming_events'] = overview_stats['upcoming_events']
         stats['credits_completed'] = stats['total_courses'] * 3
         stats['credits_total'] = 120
         stats['credits_percentage'] = int((stats['credits_completed'] / stats['credits_total']) * 100) if stats['credits_total'] > 0 else 0
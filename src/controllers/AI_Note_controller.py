@@ -1,11 +1,10 @@
 from flask import Blueprint, request, jsonify, render_template, session
 from werkzeug.utils import secure_filename
 import os
-from docx import Document
-import PyPDF2
-from transformers import pipeline, AutoTokenizer
 
 from repositories.repository_factory import RepositoryFactory
+from core.metrics import time_inference, track_summarization
+from core.request_profiler import timed
 
 ai_note_bp = Blueprint('ai_note_bp', __name__)
 
@@ -15,7 +14,9 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 ALLOWED = {"txt", "pdf", "docx"}
 
-# Model configuration - loaded lazily on first use
+# Model configuration - loaded lazily on first use.
+# transformers, docx and PyPDF2 are imported where they are used: importing
+# transformers (and torch) alone takes seconds, on every startup and worker fork.
 model_name = "sshleifer/distilbart-cnn-12-6"
 summarizer = None
 tokenizer = None
@@ -25,6 +26,8 @@ def _load_model():
     global summarizer, tokenizer
     if summarizer is None or tokenizer is None:
         try:
+            from transformers import pipeline, AutoTokenizer
+
             # Load the summarization pipeline with a specific model
             # Using "sshleifer/distilbart-cnn-12-6" as it was the default, but specifying it explicitly.
             # This model has a max input size of 1024 tokens.
@@ -55,6 +58,8 @@ def extract_text(path):
             return f.read()
 
     if ext == "pdf":
+        import PyPDF2
+
         text = ""
         with open(path, "rb") as f:
             reader = PyPDF2.PdfReader(f)
@@ -65,6 +70,8 @@ def extract_text(path):
         return text
 
     if ext == "docx":
+        from docx import Document
+
         doc = Document(path)
         return "\n".join([p.text for p in doc.paragraphs])
 
@@ -117,7 +124,8 @@ def summarize_text(text):
             chunk_min_length = max(1, chunk_min_length)
             chunk_max_length = max(chunk_min_length + 1, chunk_max_length)
             
-            summary = summarizer(chunk, max_length=chunk_max_length, min_length=chunk_min_length, do_sample=False)[0]['summary_text']
+            with timed('model'), time_inference(model_name):
+                summary = summarizer(chunk, max_length=chunk_max_length, min_length=chunk_min_length, do_sample=False)[0]['summary_text']
             summaries.append(summary)
         except Exception as e:
             # Catch any exceptions during summarization and print an error
@@ -172,7 +180,8 @@ def summarize_api():
 
     # Summarize using chunking for long texts
     try:
-        summary = summarize_text(text)
+        with track_summarization():
+            summary = summarize_text(text)
     except Exception as e:
         error_msg = str(e)
         print(f"Summarization error: {error_msg}")
@@ -11,27 +11,33 @@ from models.advisor_appointment import AdvisorAppointment
 from datetime import datetime
 from core.user_helper import get_user_data
 from core.role_auth import requires_student
+from core.lazy import lazy
 
 advisor_chatbot_bp = Blueprint('advisor_chatbot', __name__, url_prefix='/api/advisor')
 
-# Initialize repositories
-try:
-    conv_repo = RepositoryFactory.get_repository('advisor_conversation')
-    msg_repo = RepositoryFactory.get_repository('advisor_message')
-    appointment_repo = RepositoryFactory.get_repository('advisor_appointment')
-    
-    # Initialize tables
-    conv_repo.create_table()
-    msg_repo.create_table()
-    appointment_repo.create_table()
-except Exception as e:
-    print(f"Warning: Advisor Chatbot repositories not available: {e}")
-    conv_repo = None
-    msg_repo = None
-    appointment_repo = None
+def _init_repositories():
+    try:
+        repos = (
+            RepositoryFactory.get_repository('advisor_conversation'),
+            RepositoryFactory.get_repository('advisor_message'),
+            RepositoryFactory.get_repository('advisor_appointment'),
+        )
+        
+        # Initialize tables
+        for repo in repos:
+            repo.create_table()
+        return repos
+    except Exception as e:
+        print(f"Warning: Advisor Chatbot repositories not available: {e}")
+        return None, None, None
+
 
-# Initialize service
-advisor_service = get_advisor_chatbot_service()
+# Tables and the chatbot service (which probes for an LLM) are set up on first use
+_repositories = lazy(_init_repositories, 'advisor_chatbot.repositories')
+conv_repo = lazy(lambda: _repositories.resolve()[0], 'advisor_conversation_repository')
+msg_repo = lazy(lambda: _repositories.resolve()[1], 'advisor_message_repository')
+appointment_repo = lazy(lambda: _repositories.resolve()[2], 'advisor_appointment_repository')
+advisor_service = lazy(get_advisor_chatbot_service, 'advisor_chatbot_service')
 
 
 @advisor_chatbot_bp.route('/chat/conversations/student/<int:student_id>', methods=['GET'])
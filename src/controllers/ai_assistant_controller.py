@@ -6,38 +6,49 @@ from flask import Blueprint, render_template, request, jsonify, session, redirec
 from repositories.repository_factory import RepositoryFactory
 from models.knowledge_base import KnowledgeBase
 from models.chat_history import ChatHistory
+from core.pagination import parse_page_args, InvalidCursorError
 from services.ai_assistant_service import get_rag_engine
+from core.lazy import lazy
 import json
 
 ai_assistant_bp = Blueprint('ai_assistant', __name__, url_prefix='/ai-assistant')
 
-# Initialize repositories
-try:
-    kb_repo = RepositoryFactory.get_repository('knowledge_base')
-    chat_repo = RepositoryFactory.get_repository('chat_history')
-    
-    # Initialize tables
-    kb_repo.create_table()
-    chat_repo.create_table()
-except Exception as e:
-    print(f"Warning: AI Assistant repositories not available: {e}")
-    kb_repo = None
-    chat_repo = None
-
-# Initialize LLM service
-try:
-    from services.llm_service import get_llm_service
-    llm_service = get_llm_service()
-    if llm_service:
-        print(f"[AI Assistant] LLM service initialized: {llm_service.provider}")
-    else:
-        print("[AI Assistant] No LLM available, using template-based responses")
-except Exception as e:
-    print(f"[AI Assistant] Error initializing LLM service: {e}")
-    llm_service = None
-
-# Initialize RAG Engine service
-rag_engine = get_rag_engine()
+
+def _init_repositories():
+    try:
+        kb = RepositoryFactory.get_repository('knowledge_base')
+        chat = RepositoryFactory.get_repository('chat_history')
+        
+        # Initialize tables
+        kb.create_table()
+        chat.create_table()
+        return kb, chat
+    except Exception as e:
+        print(f"Warning: AI Assistant repositories not available: {e}")
+        return None, None
+
+
+def _init_llm_service():
+    try:
+        from services.llm_service import get_llm_service
+        service = get_llm_service()
+        if service:
+            print(f"[AI Assistant] LLM service initialized: {service.provider}")
+        else:
+            print("[AI Assistant] No LLM available, using template-based responses")
+        return service
+    except Exception as e:
+        print(f"[AI Assistant] Error initializing LLM service: {e}")
+        return None
+
+
+# Created on first use: table setup and the LLM availability probes (HTTP calls
+# with timeouts) would otherwise run at import, on every startup and worker fork
+_repositories = lazy(_init_repositories, 'ai_assistant.repositories')
+kb_repo = lazy(lambda: _repositories.resolve()[0], 'knowledge_base_repository')
+chat_repo = lazy(lambda: _repositories.resolve()[1], 'chat_history_repository')
+llm_service = lazy(_init_llm_service, 'llm_service')
+rag_engine = lazy(get_rag_engine, 'rag_engine')
 
 
 @ai_assistant_bp.route('/')
@@ -143,16 +154,23 @@ def get_history():
     
     try:
         user_id = session.get('user_id')
-        limit = request.args.get('limit', 50, type=int)
+        limit, cursor = parse_page_args(request.args)
         
         if not chat_repo:
             return jsonify({'history': []})
         
-        history = chat_repo.get_by_user_id(user_id, limit=limit)
-        history_list = [chat.to_dict() for chat in history]
+        page = chat_repo.get_page_by_user(user_id, cursor=cursor, limit=limit)
+        history_list = [chat.to_dict() for chat in page]
         
-        return jsonify({'success': True, 'history': history_list})
+        return jsonify({
+            'success': True,
+            'history': history_list,
+            'next_cursor': page.next_cursor,
+            'has_more': page.has_more
+        })
     
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"Error getting history: {e}")
         return jsonify({'error': str(e)}), 500
@@ -4,7 +4,7 @@ Allows instructors to view appointments with students
 """
 from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
 from repositories.repository_factory import RepositoryFactory
-from core.user_helper import get_user_data
+from core.user_helper import get_user_data, get_student_users
 from core.role_auth import requires_role
 
 appointment_bp = Blueprint('appointment', __name__, url_prefix='/appointments')
@@ -40,15 +40,11 @@ def instructor_appointments():
             appointments = appointment_repo.get_by_advisor(instructor_id)
         
         # Enrich with student information
-        student_repo = RepositoryFactory.get_repository('student')
-        user_repo = RepositoryFactory.get_repository('user')
+        student_users = get_student_users([apt.Student_ID for apt in appointments])
         
         enriched_appointments = []
         for apt in appointments:
-            student = student_repo.get_by_id(apt.Student_ID) if student_repo else None
-            student_user = None
-            if student and user_repo:
-                student_user = user_repo.get_by_id(student.User_ID)
+            student_user = student_users.get(apt.Student_ID)
             
             enriched_appointments.append({
                 'appointment_id': apt.Appointment_ID,
@@ -84,15 +80,11 @@ def get_appointments_by_instructor(instructor_id):
         appointments = appointment_repo.get_by_advisor(instructor_id)
         
         # Enrich with student information
-        student_repo = RepositoryFactory.get_repository('student')
-        user_repo = RepositoryFactory.get_repository('user')
+        student_users = get_student_users([apt.Student_ID for apt in appointments])
         
         result = []
         for apt in appointments:
-            student = student_repo.get_by_id(apt.Student_ID) if student_repo else None
-            student_user = None
-            if student and user_repo:
-                student_user = user_repo.get_by_id(student.User_ID)
+            student_user = student_users.get(apt.Student_ID)
             
             result.append({
                 'appointment_id': apt.Appointment_ID,
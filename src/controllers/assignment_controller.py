@@ -5,26 +5,32 @@ Handles assignment management for instructors/TAs and submission for students
 from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
 from repositories.repository_factory import RepositoryFactory
 from services.assignment_service import get_assignment_service
-from core.user_helper import get_user_data
+from core.user_helper import get_user_data, get_student_users
 from core.role_auth import requires_role
+from core.lazy import lazy
 from datetime import datetime
 import os
 
 assignment_bp = Blueprint('assignment', __name__, url_prefix='/assignments')
 
-# Initialize service
-assignment_service = get_assignment_service()
-assignment_repo = RepositoryFactory.get_repository('assignment')
-assignment_service.assignment_repo.create_table()
-assignment_service.submission_repo.create_table()
+def _init_assignment_service():
+    service = get_assignment_service()
+    service.assignment_repo.create_table()
+    service.submission_repo.create_table()
+    
+    # Initialize grading suggestion table if available
+    try:
+        grading_repo = RepositoryFactory.get_repository('grading_suggestion')
+        if grading_repo:
+            grading_repo.create_table()
+    except Exception as e:
+        print(f"Note: Grading suggestion repository not available: {e}")
+    return service
 
-# Initialize grading suggestion table if available
-try:
-    grading_repo = RepositoryFactory.get_repository('grading_suggestion')
-    if grading_repo:
-        grading_repo.create_table()
-except Exception as e:
-    print(f"Note: Grading suggestion repository not available: {e}")
+
+# Service and tables are set up on first use rather than at import
+assignment_service = lazy(_init_assignment_service, 'assignment_service')
+assignment_repo = RepositoryFactory.get_repository('assignment')
 
 
 @assignment_bp.route('/', methods=['GET'])
@@ -403,15 +409,11 @@ def view_submissions(assignment_id):
         submissions = assignment_service.get_submissions_by_assignment(assignment_id)
         
         # Enrich with student info
-        student_repo = RepositoryFactory.get_repository('student')
-        user_repo = RepositoryFactory.get_repository('user')
+        student_users = get_student_users([submission.Student_ID for submission in submissions])
         
         submissions_list = []
         for submission in submissions:
-            student = student_repo.get_by_id(submission.Student_ID) if student_repo else None
-            student_user = None
-            if student and user_repo:
-                student_user = user_repo.get_by_id(student.User_ID)
+            student_user = student_users.get(submission.Student_ID)
             
             submission_dict = submission.to_dict()
             submission_dict['student_name'] = student_user.Username if student_user else f'Student {submission.Student_ID}'
@@ -536,15 +538,11 @@ def get_submissions(assignment_id):
         submissions = assignment_service.get_submissions_by_assignment(assignment_id)
         
         # Enrich with student info
-        student_repo = RepositoryFactory.get_repository('student')
-        user_repo = RepositoryFactory.get_repository('user')
+        student_users = get_student_users([submission.Student_ID for submission in submissions])
         
         result = []
         for submission in submissions:
-            student = student_repo.get_by_id(submission.Student_ID) if student_repo else None
-            student_user = None
-            if student and user_repo:
-                student_user = user_repo.get_by_id(student.User_ID)
+            student_user = student_users.get(submission.Student_ID)
             
             submission_dict = submission.to_dict()
             submission_dict['student_name'] = student_user.Username if student_user else f'Student {submission.Student_ID}'
@@ -1,15 +1,20 @@
 from flask import Blueprint, request, jsonify
 from repositories.repository_factory import RepositoryFactory
+from core.pagination import parse_page_args, InvalidCursorError
 
 calendar_bp = Blueprint("calendar", __name__, url_prefix="/calendar")
 
 
 @calendar_bp.route("/api", methods=["GET"])
 def api_list_events():
-    """API endpoint to get all calendar events"""
+    """API endpoint to list calendar events one keyset page at a time (?limit=&cursor=)"""
+    try:
+        limit, cursor = parse_page_args(request.args)
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     repo = RepositoryFactory.get_repository("calendar")
-    events = repo.get_all()
-    return jsonify([event.to_dict() for event in events])
+    page = repo.get_page(cursor=cursor, limit=limit)
+    return jsonify(page.to_dict())
 
 
 @calendar_bp.route("/api/<int:event_id>", methods=["GET"])
@@ -3,14 +3,22 @@ Course Registration Controller
 Handles course registration page and optimization API
 """
 from datetime import time
-from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
+import json
+import os
+import threading
+from flask import Blueprint, Response, render_template, request, jsonify, session, redirect, url_for, stream_with_context
 from repositories.repository_factory import RepositoryFactory
+from services.course_catalog_service import get_course_catalog_service
 from services.course_optimization_service import get_course_optimization_service
+from services.schedule_solver import SchedulePreferences
 from core.user_helper import get_user_data
-from core.role_auth import requires_student
+from core.role_auth import requires_instructor_or_ta, requires_student
+from core.unit_of_work import unit_of_work
+from core.lazy import lazy
 
 course_reg_bp = Blueprint("course_registration", __name__, url_prefix="/course-registration")
-optimization_service = get_course_optimization_service()
+optimization_service = lazy(get_course_optimization_service, 'course_optimization_service')
+catalog_service = lazy(get_course_catalog_service, 'course_catalog_service')
 
 
 @course_reg_bp.route("/")
@@ -26,8 +34,9 @@ def course_registration_page():
 def api_courses():
     """
     Return all courses (or filtered by ?q=) for the search panel.
-    Returns courses with their schedule slot counts.
-    Fetches courses directly from Course_Schedule_Slot table.
+    Returns courses with their lecture and lab section slot counts, from a
+    cached per-term catalog; codes starting with q come before other matches.
+    Responses carry an ETag, so repeated searches are answered with 304.
     """
     if 'user_id' not in session:
         return jsonify({"error": "Not authenticated"}), 401
@@ -36,73 +45,16 @@ def api_courses():
     academic_year = request.args.get("academic_year", 2025, type=int)
     term = request.args.get("term", "SPRING", type=str)
     
-    # Get schedule slot repository using factory pattern
-    slot_repo = RepositoryFactory.get_repository('course_schedule_slot')
-    
-    # Get all unique courses from schedule slots
-    from core.db_singleton import DatabaseConnection
-    db_connection = DatabaseConnection.get_instance()
-    conn = db_connection.get_connection()
-    try:
-        cursor = conn.cursor()
-        query = """
-            SELECT DISTINCT Course_Code, Course_ID
-            FROM Course_Schedule_Slot
-            WHERE Academic_Year = ? AND Term = ?
-        """
-        cursor.execute(query, (academic_year, term))
-        rows = cursor.fetchall()
-        
-        # Build a map of course codes
-        course_codes_map = {}
-        for row in rows:
-            course_code = row[0]
-            course_id = row[1]
-            if course_code not in course_codes_map:
-                course_codes_map[course_code] = course_id
-    finally:
-        conn.close()
-    
-    results = []
-    for course_code, course_id in course_codes_map.items():
-        # Filter by search query
-        if q and q not in course_code.upper():
-            continue
-        
-        # Get slots for this course
-        slots = slot_repo.get_by_course_code(course_code, academic_year=academic_year, term=term)
-        
-        if not slots:
-            continue
-        
-        # Count lectures and labs
-        lectures = [s for s in slots if s.get('Slot_Type', '').lower() == 'lecture' or s.get('Sub_Type', '') == 'LCTR']
-        labs = [s for s in slots if s.get('Slot_Type', '').lower() in ['lab', 'tutorial'] or s.get('Sub_Type', '') in ['LAB', 'TUTR']]
-        
-        # Group by section
-        lecture_sections = {}
-        lab_sections = {}
-        for slot in lectures:
-            section = slot.get('Section', 1)
-            if section not in lecture_sections:
-                lecture_sections[section] = []
-            lecture_sections[section].append(slot)
-        
-        for slot in labs:
-            section = slot.get('Section', 1)
-            if section not in lab_sections:
-                lab_sections[section] = []
-            lab_sections[section].append(slot)
-        
-        results.append({
-            "id": course_code,
-            "code": course_code,
-            "name": course_code,  # Using course code as name since we don't have separate name field
-            "lecture_slots": [{"section": sec, "count": len(slots)} for sec, slots in lecture_sections.items()],
-            "lab_slots": [{"section": sec, "count": len(slots)} for sec, slots in lab_sections.items()],
-        })
-    
-    return jsonify(results)
+    catalog = catalog_service.get_term_catalog(academic_year, term)
+    etag = catalog.etag(q)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(catalog.search(q))
+    response.set_etag(etag)
+    # Per-user (authenticated) data: browsers may keep it but must revalidate
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @course_reg_bp.route("/api/optimize", methods=["POST"])
@@ -114,7 +66,14 @@ def api_optimize():
     {
         "course_ids": ["AIE 501", "BGEN 201", ...],
         "academic_year": 2025,
-        "term": "SPRING"
+        "term": "SPRING",
+        "k": 5,                                    # optional: ranked mode
+        "preferences": {                           # optional: ranked mode
+            "no_classes_before": "10:00",
+            "preferred_sections": {"AIE 501": [2]},
+            "avoided_sections": {"BGEN 201": [1]},
+            "weights": {"early": 1, "days": 1, "gaps": 1, "preferred": 1, "avoided": 2}
+        }
     }
     
     Response JSON:
@@ -123,6 +82,9 @@ def api_optimize():
         "schedule": [...],
         "message": "..."
     }
+    Ranked mode adds "schedules" (best first, each with rank, score,
+    penalties and schedule) and "complete" (false if the search hit its
+    time limit and returned the best schedules found so far).
     """
     if 'user_id' not in session:
         return jsonify({"error": "Not authenticated"}), 401
@@ -135,7 +97,20 @@ def api_optimize():
     if not course_ids:
         return jsonify({"status": "error", "message": "No course_ids provided.", "schedule": None}), 400
     
-    result = optimization_service.optimize_schedule(course_ids, academic_year, term)
+    k = data.get("k")
+    preferences = data.get("preferences")
+    if k is not None or preferences is not None:
+        try:
+            k = int(k) if k is not None else None
+            if k is not None and k < 1:
+                raise ValueError("k must be at least 1")
+            preferences = SchedulePreferences.from_dict(preferences)
+        except (TypeError, ValueError) as e:
+            return jsonify({"status": "error", "message": str(e), "schedule": None}), 400
+        result = optimization_service.optimize_schedule(course_ids, academic_year, term,
+                                                        preferences=preferences, k=k)
+    else:
+        result = optimization_service.optimize_schedule(course_ids, academic_year, term)
     
     if result["status"] == "error":
         return jsonify(result), 404
@@ -145,6 +120,62 @@ def api_optimize():
     return jsonify(result)
 
 
+# One batch optimization at a time per web worker; each run starts its own process pool
+_batch_lock = threading.Lock()
+
+
+@course_reg_bp.route("/api/optimize/batch", methods=["POST"])
+@requires_instructor_or_ta
+def api_optimize_batch():
+    """
+    Pre-compute schedules for a whole cohort - INSTRUCTOR/TA ONLY.
+    
+    Request JSON:
+    {
+        "requests": [{"student_id": 1, "course_codes": ["AIE 501", ...]}, ...],
+        "academic_year": 2025,
+        "term": "SPRING"
+    }
+    
+    Response: newline-delimited JSON streamed as schedules finish, one
+    /api/optimize-style result per student, then {"summary": {...}} with
+    throughput (schedules_per_second) and the infeasible cases.
+
+    Runs on COHORT_OPTIMIZER_WEB_WORKERS processes (default 2) and only one
+    batch at a time per web worker; a second request gets 429. Use
+    `python -m unify optimize-cohort` to use every core.
+    """
+    from services.cohort_optimizer import CohortOptimizer
+
+    data = request.get_json(silent=True) or {}
+    cohort = data.get("requests")
+    if not isinstance(cohort, list) or not cohort or not all(isinstance(item, dict) for item in cohort):
+        return jsonify({"status": "error", "message": "requests must be a non-empty list of objects."}), 400
+    max_requests = int(os.environ.get('COHORT_OPTIMIZER_MAX_REQUESTS', '5000'))
+    if len(cohort) > max_requests:
+        return jsonify({"status": "error", "message": f"At most {max_requests} requests per batch."}), 400
+
+    if not _batch_lock.acquire(blocking=False):
+        return jsonify({"status": "error",
+                        "message": "Another batch optimization is running; try again shortly."}), 429
+    try:
+        optimizer = CohortOptimizer(data.get("academic_year", 2025), data.get("term", "SPRING"),
+                                    workers=int(os.environ.get('COHORT_OPTIMIZER_WEB_WORKERS', '2')))
+
+        def generate():
+            for result in optimizer.run(cohort):
+                yield json.dumps(result, default=str) + "\n"
+            yield json.dumps({"summary": optimizer.report.to_dict()}, default=str) + "\n"
+
+        response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+    except Exception:
+        _batch_lock.release()
+        raise
+    # Released when the stream finishes or the client goes away
+    response.call_on_close(_batch_lock.release)
+    return response
+
+
 @course_reg_bp.route("/api/enroll", methods=["POST"])
 def api_enroll():
     """
@@ -193,122 +224,124 @@ def api_enroll():
     enrollments = []
     errors = []
     
-    # Get database connection
-    from core.db_singleton import DatabaseConnection
-    import json
-    db_connection = DatabaseConnection()
-    conn = db_connection.get_connection()
+    # All enrollment and schedule writes commit (or roll back) together
+    with unit_of_work():
+        # Get database connection
+        from core.db_singleton import DatabaseConnection
+        import json
+        db_connection = DatabaseConnection()
+        conn = db_connection.get_connection()
     
-    try:
-        cursor = conn.cursor()
+        try:
+            cursor = conn.cursor()
         
-        for course_code, sections in course_sections_map.items():
-            # Get Course_ID from Course_Schedule_Slot table
-            cursor.execute("""
-                SELECT DISTINCT Course_ID 
-                FROM Course_Schedule_Slot 
-                WHERE Course_Code = ?
-            """, (course_code,))
-            row = cursor.fetchone()
+            for course_code, sections in course_sections_map.items():
+                # Get Course_ID from Course_Schedule_Slot table
+                cursor.execute("""
+                    SELECT DISTINCT Course_ID 
+                    FROM Course_Schedule_Slot 
+                    WHERE Course_Code = ?
+                """, (course_code,))
+                row = cursor.fetchone()
             
-            if not row:
-                errors.append(f"Course {course_code} not found in schedule")
-                continue
+                if not row:
+                    errors.append(f"Course {course_code} not found in schedule")
+                    continue
             
-            course_id = row[0]
+                course_id = row[0]
             
-            # Check if already enrolled
-            existing = enrollment_repo.get_by_student(student_id)
-            already_enrolled = any(e.Course_ID == course_id and e.Status == "enrolled" for e in existing)
+                # Check if already enrolled
+                existing = enrollment_repo.get_by_student(student_id)
+                already_enrolled = any(e.Course_ID == course_id and e.Status == "enrolled" for e in existing)
             
-            if already_enrolled:
-                errors.append(f"Course {course_code} is already enrolled")
-                continue
+                if already_enrolled:
+                    errors.append(f"Course {course_code} is already enrolled")
+                    continue
             
-            # Create enrollment
-            from models.enrollment import Enrollment
-            enrollment = Enrollment(
-                Student_ID=student_id,
-                Course_ID=course_id,
-                Status="enrolled"
-            )
-            created = enrollment_repo.create(enrollment)
-            enrollments.append(created.to_dict())
+                # Create enrollment
+                from models.enrollment import Enrollment
+                enrollment = Enrollment(
+                    Student_ID=student_id,
+                    Course_ID=course_id,
+                    Status="enrolled"
+                )
+                created = enrollment_repo.create(enrollment)
+                enrollments.append(created.to_dict())
         
-        # Save the optimized schedule with specific sections to Schedule table
-        # IMPORTANT: Build complete schedule from ALL enrolled courses, not just new ones
-        import json
+            # Save the optimized schedule with specific sections to Schedule table
+            # IMPORTANT: Build complete schedule from ALL enrolled courses, not just new ones
+            import json
         
-        # Get ALL enrolled courses for this student
-        all_enrollments = enrollment_repo.get_by_student(student_id)
-        enrolled_course_ids = [e.Course_ID for e in all_enrollments if e.Status == "enrolled"]
+            # Get ALL enrolled courses for this student
+            all_enrollments = enrollment_repo.get_by_student(student_id)
+            enrolled_course_ids = [e.Course_ID for e in all_enrollments if e.Status == "enrolled"]
         
-        # Check if student already has a schedule
-        existing_schedule = schedule_repo.get_by_student(student_id)
-        existing_schedule_dict = {}
-        enrolled_course_codes = set()
+            # Check if student already has a schedule
+            existing_schedule = schedule_repo.get_by_student(student_id)
+            existing_schedule_dict = {}
+            enrolled_course_codes = set()
         
-        # Build a map of course_code -> course_id for enrolled courses
-        cursor2 = conn.cursor()
-        for course_id in enrolled_course_ids:
-            cursor2.execute("""
-                SELECT DISTINCT Course_Code FROM Course_Schedule_Slot 
-                WHERE Course_ID = ?
-            """, (course_id,))
-            row = cursor2.fetchone()
-            if row:
-                enrolled_course_codes.add(row[0])
-        cursor2.close()
+            # Build a map of course_code -> course_id for enrolled courses
+            cursor2 = conn.cursor()
+            for course_id in enrolled_course_ids:
+                cursor2.execute("""
+                    SELECT DISTINCT Course_Code FROM Course_Schedule_Slot 
+                    WHERE Course_ID = ?
+                """, (course_id,))
+                row = cursor2.fetchone()
+                if row:
+                    enrolled_course_codes.add(row[0])
+            cursor2.close()
         
-        if existing_schedule and existing_schedule.Course_List:
-            try:
-                existing_schedule_list = json.loads(existing_schedule.Course_List)
-                # Create a map of existing courses by course_code for quick lookup
-                for slot in existing_schedule_list:
-                    course_code = slot.get("course_code")
-                    if course_code:
-                        # Use (course_code, section) as key to preserve all sections
-                        key = (course_code, slot.get("section", ""))
-                        existing_schedule_dict[key] = slot
-            except (json.JSONDecodeError, AttributeError) as e:
-                print(f"Error parsing existing schedule: {e}")
-                existing_schedule_dict = {}
+            if existing_schedule and existing_schedule.Course_List:
+                try:
+                    existing_schedule_list = json.loads(existing_schedule.Course_List)
+                    # Create a map of existing courses by course_code for quick lookup
+                    for slot in existing_schedule_list:
+                        course_code = slot.get("course_code")
+                        if course_code:
+                            # Use (course_code, section) as key to preserve all sections
+                            key = (course_code, slot.get("section", ""))
+                            existing_schedule_dict[key] = slot
+                except (json.JSONDecodeError, AttributeError) as e:
+                    print(f"Error parsing existing schedule: {e}")
+                    existing_schedule_dict = {}
         
-        # Build merged schedule: keep existing courses, add/update new ones
-        merged_schedule = []
+            # Build merged schedule: keep existing courses, add/update new ones
+            merged_schedule = []
         
-        # First, add all slots from the new optimized schedule (these are the newly enrolled courses)
-        for slot in schedule:
-            course_code = slot.get("course_code")
-            section = slot.get("section", "")
-            if course_code:
-                key = (course_code, section)
-                existing_schedule_dict[key] = slot  # Update or add
+            # First, add all slots from the new optimized schedule (these are the newly enrolled courses)
+            for slot in schedule:
+                course_code = slot.get("course_code")
+                section = slot.get("section", "")
+                if course_code:
+                    key = (course_code, section)
+                    existing_schedule_dict[key] = slot  # Update or add
         
-        # Then, add all existing courses that are still enrolled
-        for key, slot in existing_schedule_dict.items():
-            course_code = slot.get("course_code")
-            # Only include if this course is still enrolled
-            if course_code and course_code in enrolled_course_codes:
-                merged_schedule.append(slot)
+            # Then, add all existing courses that are still enrolled
+            for key, slot in existing_schedule_dict.items():
+                course_code = slot.get("course_code")
+                # Only include if this course is still enrolled
+                if course_code and course_code in enrolled_course_codes:
+                    merged_schedule.append(slot)
         
-        # Update schedule with merged list (contains all enrolled courses)
-        if existing_schedule:
-            existing_schedule.Course_List = json.dumps(merged_schedule)
-            existing_schedule.Optimized = True
-            schedule_repo.update(existing_schedule)
-        else:
-            # Create new schedule
-            from models.schedule import Schedule
-            new_schedule = Schedule(
-                Student_ID=student_id,
-                Course_List=json.dumps(merged_schedule),
-                Optimized=True
-            )
-            schedule_repo.create(new_schedule)
+            # Update schedule with merged list (contains all enrolled courses)
+            if existing_schedule:
+                existing_schedule.Course_List = json.dumps(merged_schedule)
+                existing_schedule.Optimized = True
+                schedule_repo.update(existing_schedule)
+            else:
+                # Create new schedule
+                from models.schedule import Schedule
+                new_schedule = Schedule(
+                    Student_ID=student_id,
+                    Course_List=json.dumps(merged_schedule),
+                    Optimized=True
+                )
+                schedule_repo.create(new_schedule)
             
-    finally:
-        conn.close()
+        finally:
+            conn.close()
     
     if errors:
         return jsonify({
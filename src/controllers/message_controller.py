@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, request, jsonify, session
 from repositories.repository_factory import RepositoryFactory
+from core.pagination import parse_page_args, InvalidCursorError
 from models.message import Message
 from datetime import datetime
 
@@ -188,10 +189,14 @@ def list_messages():
 @message_bp.route("/api", methods=["GET"])
 @require_login
 def api_list_messages():
-    """API endpoint to get all messages (legacy endpoint)"""
+    """API endpoint to list messages one keyset page at a time (legacy endpoint, ?limit=&cursor=)"""
+    try:
+        limit, cursor = parse_page_args(request.args)
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     repo = RepositoryFactory.get_repository("message")
-    messages = repo.get_all()
-    return jsonify([message.to_dict() for message in messages])
+    page = repo.get_page(cursor=cursor, limit=limit)
+    return jsonify(page.to_dict())
 
 
 @message_bp.route("/api/<int:message_id>", methods=["GET"])
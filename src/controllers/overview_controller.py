@@ -7,7 +7,7 @@ from repositories.repository_factory import RepositoryFactory
 from core.user_helper import get_user_data
 from services.notification_service import get_notification_service
 from services.academic_dashboard_service import get_academic_dashboard_service
-from datetime import datetime, date, timedelta
+from datetime import datetime
 
 overview_bp = Blueprint("overview", __name__, url_prefix="/overview")
 
@@ -21,60 +21,37 @@ def overview_page():
     user_id = session.get('user_id')
     user_data = get_user_data(user_id)
     
-    # Initialize default values
+    # All dashboard counters in one aggregate query (optionally cached)
     stats = {
         'total_courses': 0,
         'active_tasks': 0,
+        'due_soon_tasks': 0,
         'upcoming_events': 0,
-        'completed_assignments': 0
+        'completed_assignments': 0,
+        'unread_notifications': 0
     }
     today_schedule = []
     notifications = []
     
-    # Get student data
-    student_repo = RepositoryFactory.get_repository("student")
-    student = student_repo.get_by_user_id(user_id)
+    student_id = None
+    try:
+        stats_repo = RepositoryFactory.get_repository("stats")
+        overview_stats = stats_repo.get_overview_stats(user_id)
+        student_id = overview_stats['student_id']
+        stats['total_courses'] = overview_stats['total_courses']
+        stats['active_tasks'] = overview_stats['active_tasks']
+        stats['due_soon_tasks'] = overview_stats['due_soon_tasks']
+        stats['upcoming_events'] = overview_stats['upcoming_events']
+        stats['completed_assignments'] = overview_stats['completed_this_month']
+        stats['unread_notifications'] = overview_stats['unread_notifications']
+    except Exception as e:
+        print(f"Error fetching overview stats: {e}")
     
-    if student:
-        # ===== GET ENROLLED COURSES COUNT =====
-        try:
-            enrollment_repo = RepositoryFactory.get_repository("enrollment")
-            enrollments = enrollment_repo.get_by_student(student.Student_ID)
-            stats['total_courses'] = len([e for e in enrollments if e.Status == 'enrolled'])
-        except Exception as e:
-            print(f"Error fetching enrollments: {e}")
-        
-        # ===== GET ACTIVE TASKS COUNT =====
-        try:
-            task_repo = RepositoryFactory.get_repository("task")
-            tasks = task_repo.get_by_student(student.Student_ID)
-            stats['active_tasks'] = len([t for t in tasks if t.Status == 'pending'])
-            
-            # Count completed tasks this month for assignments stat
-            today = date.today()
-            first_day_of_month = today.replace(day=1)
-            completed_this_month = len([
-                t for t in tasks 
-                if t.Status == 'completed' and t.Due_Date and t.Due_Date.date() >= first_day_of_month
-            ]) if any(hasattr(t, 'Due_Date') and t.Due_Date for t in tasks) else 0
-            stats['completed_assignments'] = completed_this_month
-        except Exception as e:
-            print(f"Error fetching tasks: {e}")
-        
-        # ===== GET UPCOMING CALENDAR EVENTS COUNT =====
-        try:
-            calendar_repo = RepositoryFactory.get_repository("calendar")
-            events = calendar_repo.get_by_student(student.Student_ID)
-            today = date.today()
-            upcoming = [e for e in events if e.Date and e.Date >= today]
-            stats['upcoming_events'] = len(upcoming)
-        except Exception as e:
-            print(f"Error fetching calendar events: {e}")
-        
+    if student_id is not None:
         # ===== GET TODAY'S SCHEDULE =====
         try:
             schedule_repo = RepositoryFactory.get_repository("schedule")
-            schedules = schedule_repo.get_by_student(student.Student_ID)
+            schedules = schedule_repo.get_by_student(student_id)
             
             # Get today's day name (e.g., "MON", "TUE", etc.)
             today_day = datetime.now().strftime('%A').upper()[:3]
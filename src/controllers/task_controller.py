@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, request, jsonify, session
 from repositories.repository_factory import RepositoryFactory
+from core.pagination import parse_page_args, InvalidCursorError
 from models.focus_session import FocusSession
 from datetime import datetime
 
@@ -8,10 +9,14 @@ task_bp = Blueprint("task", __name__, url_prefix="/tasks")
 
 @task_bp.route("/api", methods=["GET"])
 def api_list_tasks():
-    """API endpoint to get all tasks"""
+    """API endpoint to list tasks one keyset page at a time (?limit=&cursor=)"""
+    try:
+        limit, cursor = parse_page_args(request.args)
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     repo = RepositoryFactory.get_repository("task")
-    tasks = repo.get_all()
-    return jsonify([task.to_dict() for task in tasks])
+    page = repo.get_page(cursor=cursor, limit=limit)
+    return jsonify(page.to_dict())
 
 
 @task_bp.route("/api/<int:task_id>", methods=["GET"])
@@ -346,6 +351,7 @@ def api_generate_study_plan():
                     days_diff = (end_date - start_date).days
                     tasks_per_day = max(1, len(tasks) // max(1, days_diff // 7))  # Spread over weeks
                     
+                    study_tasks = []
                     for idx, task_data in enumerate(tasks):
                         task_name = task_data.get("name", f"Task {idx + 1}")
                         task_priority = task_data.get("priority", "medium")
@@ -362,7 +368,10 @@ def api_generate_study_plan():
                             Due_Date=datetime.combine(task_due_date, datetime.min.time()),
                             Estimated_Hours=2.0 if task_priority == 'high' else 1.5 if task_priority == 'medium' else 1.0
                         )
-                        study_task_repo.create(study_task)
+                        study_tasks.append(study_task)
+                    
+                    # Insert every task in one round trip instead of one per task
+                    study_task_repo.create_many(study_tasks)
             except Exception as task_error:
                 print(f"Error creating study tasks: {task_error}")
                 # Don't fail the whole request if tasks fail
@@ -51,12 +51,14 @@ def api_get_transcript_data():
     total_credits = 0
     total_grade_points = 0
     
+    courses = course_repo.get_many_by_ids([e.Course_ID for e in enrollments])
+    
     for enrollment in enrollments:
         # Only include completed courses with grades
         if enrollment.Status != 'completed' or not enrollment.Grade or not enrollment.Semester:
             continue
         
-        course = course_repo.get_by_id(enrollment.Course_ID)
+        course = courses.get(enrollment.Course_ID)
         if not course:
             continue
         
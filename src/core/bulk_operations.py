@@ -0,0 +1,125 @@
+"""
+Bulk Operation Helpers
+executemany / multi-row INSERT support shared by DatabaseConnection and
+MultiTenantDatabaseManager, plus chunked IN (...) lookups for repositories.
+These functions never commit; callers own the transaction.
+"""
+import sqlite3
+from core.sql_dialect import dialect_for, unwrap_connection
+
+DEFAULT_CHUNK_SIZE = 1000
+# Parameters per IN (...) list; stays under SQL Server's 2100 and old SQLite's 999 limits
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def is_sqlite_connection(conn):
+    return isinstance(unwrap_connection(conn), sqlite3.Connection)
+
+
+def chunked(rows, size):
+    """Yield successive lists of at most `size` rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def unique_ids(ids):
+    """Distinct, non-null ids in first-seen order"""
+    seen = set()
+    result = []
+    for value in ids:
+        if value is not None and value not in seen:
+            seen.add(value)
+            result.append(value)
+    return result
+
+
+def fetch_by_ids(cursor, query, ids, chunk_size=IN_CLAUSE_CHUNK_SIZE):
+    """
+    Run `query` once per chunk of distinct ids and return all rows.
+    `query` contains one `{ids}` placeholder for the IN list, e.g.
+    "SELECT ... FROM Course WHERE Course_ID IN ({ids})".
+    """
+    rows = []
+    for chunk in chunked(unique_ids(ids), chunk_size):
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(query.format(ids=placeholders), chunk)
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def execute_many(conn, query, params_seq, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Execute one statement for many parameter tuples.
+    Uses pyodbc fast_executemany (array binding) when available.
+    Returns the number of parameter sets executed.
+    """
+    cursor = conn.cursor()
+    try:
+        if hasattr(cursor, 'fast_executemany'):
+            cursor.fast_executemany = True
+        total = 0
+        for chunk in chunked(params_seq, chunk_size):
+            cursor.executemany(query, chunk)
+            total += len(chunk)
+        return total
+    finally:
+        cursor.close()
+
+
+def bulk_insert(conn, table, columns, rows, id_column=None, chunk_size=None):
+    """
+    Insert many rows into `table`.
+
+    Args:
+        conn: Open connection (not committed here)
+        table: Table name as written in SQL, e.g. "[Task]"
+        columns: Column names matching each row tuple
+        rows: Iterable of tuples
+        id_column: Identity column to return; when None, rows are sent with
+            executemany and an empty list is returned
+        chunk_size: Rows per statement (capped by driver parameter limits)
+
+    Returns:
+        List of generated ids in row order (only when id_column is given)
+    """
+    columns = list(columns)
+    column_sql = ", ".join(columns)
+    row_placeholder = "(" + ", ".join("?" for _ in columns) + ")"
+
+    if id_column is None:
+        query = f"INSERT INTO {table} ({column_sql}) VALUES {row_placeholder}"
+        execute_many(conn, query, rows, chunk_size or DEFAULT_CHUNK_SIZE)
+        return []
+
+    dialect = dialect_for(conn)
+    rows_per_statement = dialect.rows_per_insert(len(columns))
+    if chunk_size:
+        rows_per_statement = min(chunk_size, rows_per_statement)
+
+    ids = []
+    cursor = conn.cursor()
+    try:
+        if dialect.name == 'sqlite':
+            # RETURNING rows come back in no guaranteed order and cannot carry an
+            # ordinal; SQLite runs in-process, so one statement per row is cheap
+            query = f"INSERT INTO {table} ({column_sql}) VALUES {row_placeholder}"
+            for row in rows:
+                cursor.execute(query, row)
+                ids.append(cursor.lastrowid)
+            return ids
+
+        for chunk in chunked(rows, rows_per_statement):
+            params = [value for row in chunk for value in row]
+            query = dialect.insert_returning(table, columns, id_column, rows=len(chunk))
+            cursor.execute(query, params)
+            by_ordinal = dict(cursor.fetchall())
+            ids.extend(by_ordinal[ordinal] for ordinal in range(len(chunk)))
+        return ids
+    finally:
+        cursor.close()
@@ -0,0 +1,156 @@
+"""
+Tenant Config Cache
+Bounded LRU + TTL cache for per-user database configurations, with
+invalidation hooks shared by every database manager
+"""
+import os
+import time
+import threading
+import weakref
+from collections import OrderedDict
+
+from core.invalidation_bus import decode_key, publish, subscribe
+from core.unit_of_work import on_commit
+
+
+# Weak so that discarded caches (and manager instances) are not kept alive
+_all_caches = weakref.WeakSet()
+_tenant_config_caches = weakref.WeakSet()
+_registry_lock = threading.Lock()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds.
+    Once `max_size` entries are stored the least recently used one is dropped.
+    """
+
+    def __init__(self, max_size=10000, ttl=300, name="cache"):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl
+        self.name = name
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        with _registry_lock:
+            _all_caches.add(self)
+
+    def get(self, key, default=None):
+        """Return the cached value, or `default` if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl and self.ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop one entry; returns True if it was cached"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+                return True
+            return False
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+def create_tenant_config_cache(name):
+    """
+    Create a tenant config cache sized from the environment and register it
+    for invalidation.
+
+    Configuration (environment):
+        TENANT_CONFIG_CACHE_SIZE  max cached tenants per manager (default 10000)
+        TENANT_CONFIG_CACHE_TTL   seconds before a config is re-read (default 300)
+    """
+    cache = TTLCache(
+        max_size=int(os.environ.get('TENANT_CONFIG_CACHE_SIZE', '10000')),
+        ttl=float(os.environ.get('TENANT_CONFIG_CACHE_TTL', '300')),
+        name=name,
+    )
+    with _registry_lock:
+        _tenant_config_caches.add(cache)
+    return cache
+
+
+def invalidate_tenant_config(user_id=None):
+    """
+    Drop a user's cached database config from every manager, in every worker.
+    Call after the User_Database_Config row changes; user_id=None clears all.
+    """
+    topic = f"tenant_config:{'*' if user_id is None else user_id}"
+    on_commit(lambda: publish(topic))
+
+
+def _drop_tenant_config(key):
+    # Invalidation bus handler for "tenant_config:<user_id>" / "tenant_config:*"
+    with _registry_lock:
+        caches = list(_tenant_config_caches)
+    user_id = None if key in (None, '*') else decode_key(key)
+    for cache in caches:
+        if user_id is None:
+            cache.clear()
+        else:
+            cache.invalidate(user_id)
+
+
+subscribe('tenant_config', _drop_tenant_config)
+
+
+def get_tenant_config_cache_stats():
+    """Hit/miss counters of every registered tenant config cache"""
+    with _registry_lock:
+        caches = list(_tenant_config_caches)
+    return [cache.get_stats() for cache in caches]
+
+
+def get_all_cache_stats():
+    """Hit/miss counters of every live TTLCache (for metrics)"""
+    with _registry_lock:
+        caches = list(_all_caches)
+    return [cache.get_stats() for cache in caches]
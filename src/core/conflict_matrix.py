@@ -0,0 +1,360 @@
+"""
+Section Conflict Matrix
+Per-term compiled artifact: every section of an (Academic_Year, Term) with its
+slots plus a pairwise section-conflict matrix as packed bitsets, persisted to a
+file that every worker memory-maps (one copy in the page cache for all of them)
+
+File layout (little-endian):
+    header   magic 'UNIFYCM1', section count N, words per row W, index length,
+             and the course_schedule_slot Cache_Version the sections were loaded at
+    matrix   N rows x W 64-bit words; bit j of row i is set when sections i and j
+             (of different courses) meet at the same time
+    index    UTF-8 JSON: academic year, term and [course, section, slots] per row
+"""
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from datetime import time
+
+from core.db_singleton import DatabaseConnection
+from core.invalidation_bus import subscribe
+from core.reference_cache import get_region_version
+from core.tenant_context import get_current_tenant
+
+MAGIC = b'UNIFYCM1'
+HEADER = struct.Struct('<8sIIQQ')
+FILE_SUFFIX = '.ucm'
+
+
+def _time_text(value):
+    """Time column value to 'HH:MM'"""
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+    text = str(value)
+    if len(text) >= 5 and text[2] == ":":
+        return text[:5]
+    return text
+
+
+def _minutes(text):
+    h, m = text.split(":")[:2]
+    return int(h) * 60 + int(m)
+
+
+def _course_key(course_code):
+    return str(course_code).strip().upper()
+
+
+def load_term_sections(academic_year, term):
+    """[(course_code, section, [slot dicts])] for a term, in course/section order"""
+    conn = DatabaseConnection().get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT Course_Code, Section, Day, Start_Time, End_Time, Slot_Type, Sub_Type
+            FROM Course_Schedule_Slot
+            WHERE Academic_Year = ? AND Term = ?
+            ORDER BY Course_Code, Section, Day, Start_Time
+        """, (academic_year, term))
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    sections = []
+    positions = {}
+    for course_code, section, day, start, end, slot_type, sub_type in rows:
+        key = (course_code, section)
+        if key not in positions:
+            positions[key] = len(sections)
+            sections.append((course_code, section, []))
+        sections[positions[key]][2].append({
+            "course_code": course_code,
+            "course_name": course_code,
+            "type": slot_type,
+            "sub_type": sub_type,
+            "section": int(section),
+            "day": day,
+            "start": _time_text(start),
+            "end": _time_text(end),
+        })
+    return sections
+
+
+def compute_conflict_rows(sections):
+    """
+    Row bitsets for `sections` ([(course, section, slots)]): bit j of rows[i] is
+    set when i and j belong to different courses and have overlapping slots.
+    Sweeps each day's intervals in start order, so the cost grows with the
+    number of overlaps rather than with every pair of sections.
+    """
+    per_day = {}
+    for index, (course, _, slots) in enumerate(sections):
+        for slot in slots:
+            start, end = _minutes(slot["start"]), _minutes(slot["end"])
+            if end > start:
+                per_day.setdefault(str(slot["day"]).upper(), []).append((start, end, index))
+
+    rows = [0] * len(sections)
+    for intervals in per_day.values():
+        intervals.sort()
+        active = []  # (end, index) of intervals that may still overlap
+        for start, end, index in intervals:
+            active = [item for item in active if item[0] > start]
+            course = _course_key(sections[index][0])
+            for _, other in active:
+                if other != index and _course_key(sections[other][0]) != course:
+                    rows[index] |= 1 << other
+                    rows[other] |= 1 << index
+            active.append((end, index))
+    return rows
+
+
+def write_conflict_matrix(path, academic_year, term, sections, version=0):
+    """
+    Compile `sections` to `path`; the file is replaced atomically.
+    `version` is the slot version read before the sections were loaded.
+    """
+    rows = compute_conflict_rows(sections)
+    words = (len(sections) + 63) // 64
+    index = json.dumps({
+        "academic_year": academic_year,
+        "term": term,
+        "sections": [[course, section, slots] for course, section, slots in sections],
+    }, separators=(',', ':')).encode('utf-8')
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.build-', suffix=FILE_SUFFIX, dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(sections), words, len(index), version))
+            for row in rows:
+                f.write(row.to_bytes(words * 8, 'little'))
+            f.write(index)
+        os.chmod(temp_path, 0o644)  # mkstemp creates owner-only files
+        # Readers that mapped the previous file keep their (still valid) mapping
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ConflictMatrix:
+    """A compiled term mapped read-only into this process"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, words, index_length, version = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"Not a conflict matrix file: {path}")
+        self.section_count = count
+        self.version = version
+        self.row_bytes = words * 8
+        index_start = HEADER.size + count * self.row_bytes
+        index = json.loads(self._map[index_start:index_start + index_length].decode('utf-8'))
+        self.academic_year = index["academic_year"]
+        self.term = index["term"]
+        self.sections = [tuple(entry) for entry in index["sections"]]
+        self._positions = {(_course_key(course), section): position
+                           for position, (course, section, _) in enumerate(self.sections)}
+        self._by_course = {}
+        for position, (course, _, _) in enumerate(self.sections):
+            self._by_course.setdefault(_course_key(course), []).append(position)
+
+    def row(self, index):
+        """Conflict bitset of section `index` as an int"""
+        offset = HEADER.size + index * self.row_bytes
+        return int.from_bytes(self._map[offset:offset + self.row_bytes], 'little')
+
+    def conflicts(self, first, second):
+        """Whether sections `first` and `second` (row indexes) overlap"""
+        return bool(self._map[HEADER.size + first * self.row_bytes + second // 8] >> (second % 8) & 1)
+
+    def index_of(self, course_code, section):
+        return self._positions.get((_course_key(course_code), section))
+
+    def section_map(self, course_codes):
+        """{course_code: {section: [slot dicts]}} for the requested courses"""
+        section_map = {}
+        for code in course_codes:
+            for position in self._by_course.get(_course_key(code), ()):
+                course, section, slots = self.sections[position]
+                section_map.setdefault(course, {})[section] = [dict(slot) for slot in slots]
+        return section_map
+
+    def conflict_rows(self, section_map):
+        """{(course_code, section): (row index, conflict bitset)} for a section map"""
+        rows = {}
+        for course, sections in section_map.items():
+            for section in sections:
+                position = self.index_of(course, section)
+                if position is not None:
+                    rows[(course, section)] = (position, self.row(position))
+        return rows
+
+    def close(self):
+        try:
+            self._map.close()
+        except (BufferError, ValueError):
+            pass  # still referenced; released with the last reference
+
+
+def _tenant_key():
+    if DatabaseConnection().multi_tenant_enabled:
+        return get_current_tenant()
+    return None
+
+
+def _safe_name(value):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(value))
+
+
+class ConflictMatrixStore:
+    """
+    Finds, builds and maps compiled terms.
+
+    A loaded matrix is reused while its file is unchanged (one stat() per
+    lookup). Slot changes delete the files, so the next lookup in any worker
+    rebuilds the term once and the other workers pick up the new file.
+    Each file is stamped with the slot version read before its sections were
+    loaded; a build that raced a slot write (and replaced the file after the
+    write deleted it) carries an older stamp and is rebuilt on next use.
+
+    Configuration (environment):
+        CONFLICT_MATRIX_ENABLED  use compiled terms in the optimizer (default false)
+        CONFLICT_MATRIX_DIR      where compiled terms live (default data/conflict_matrix)
+    """
+
+    def __init__(self, directory=None, enabled=None, version=None):
+        env = os.environ
+        self.enabled = (enabled if enabled is not None
+                        else env.get('CONFLICT_MATRIX_ENABLED', 'false').lower() == 'true')
+        self.directory = directory or env.get('CONFLICT_MATRIX_DIR', os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), 'data', 'conflict_matrix'))
+        # Current slot version; None (unavailable) accepts any file
+        self.version = version or (lambda: get_region_version('course_schedule_slot'))
+        self._loaded = {}  # path -> ((inode, mtime, size), ConflictMatrix)
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def path(self, academic_year, term, tenant=None):
+        prefix = f"{_safe_name(tenant)}-" if tenant is not None else ''
+        return os.path.join(self.directory, f"{prefix}{_safe_name(academic_year)}-{_safe_name(term).upper()}{FILE_SUFFIX}")
+
+    def get(self, academic_year, term, loader=None):
+        """
+        The compiled term, building it first if there is no file yet.
+        `loader()` returns the term's sections (default: load_term_sections).
+        """
+        path = self.path(academic_year, term, _tenant_key())
+        version = self.version()
+        matrix = self._current(path, version)
+        if matrix is not None:
+            return matrix
+        with self._lock:
+            # Another thread may have built it while we waited
+            matrix = self._current(path, version)
+            if matrix is None:
+                self._build(path, academic_year, term, loader, version)
+                matrix = self._map(path)
+        return matrix
+
+    def build(self, academic_year, term, loader=None):
+        """Compile a term now (e.g. right after a schedule import)"""
+        path = self.path(academic_year, term, _tenant_key())
+        version = self.version()
+        with self._lock:
+            self._build(path, academic_year, term, loader, version)
+            return self._map(path)
+
+    def _build(self, path, academic_year, term, loader, version):
+        # `version` was read before loading, so a slot write committed meanwhile leaves the stamp behind
+        sections = loader() if loader is not None else load_term_sections(academic_year, term)
+        write_conflict_matrix(path, academic_year, term, sections, version or 0)
+        self.builds += 1
+
+    def _current(self, path, version):
+        """The mapped file at `path` unless it was built from slots older than `version`"""
+        matrix = self._mapped(path)
+        if matrix is not None and version is not None and matrix.version < version:
+            return None
+        return matrix
+
+    def _mapped(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        loaded = self._loaded.get(path)
+        if loaded is not None and loaded[0] == (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+            return loaded[1]
+        return self._map(path)
+
+    def _map(self, path):
+        stat = os.stat(path)
+        matrix = ConflictMatrix(path)
+        # A replaced matrix is unmapped once requests still using it let go of it
+        self._loaded[path] = ((stat.st_ino, stat.st_mtime_ns, stat.st_size), matrix)
+        return matrix
+
+    def invalidate(self):
+        """Delete every compiled term (they are rebuilt on next use)"""
+        with self._lock:
+            self._loaded.clear()
+            if not os.path.isdir(self.directory):
+                return
+            for name in os.listdir(self.directory):
+                if name.endswith(FILE_SUFFIX):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError as e:
+                        # e.g. Windows refuses to delete a file another process has mapped
+                        print(f"Warning: could not remove conflict matrix {name}: {e}")
+
+    def _reset_after_fork(self):
+        # Mappings are inherited and stay valid; only the lock may be held by a dead thread
+        self._lock = threading.Lock()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_conflict_matrix_store():
+    """Get the process-wide conflict matrix store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ConflictMatrixStore()
+    return _store
+
+
+def invalidate_conflict_matrices():
+    """Drop compiled terms after Course_Schedule_Slot changes"""
+    get_conflict_matrix_store().invalidate()
+
+
+def _reset_after_fork():
+    global _store_lock
+    _store_lock = threading.Lock()
+    if _store is not None:
+        _store._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):  # POSIX only
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+# Slot writes publish "course_schedule_slot:*" (see core.reference_cache); workers
+# on other hosts with their own directory drop their copies when it arrives
+subscribe('course_schedule_slot', lambda key: invalidate_conflict_matrices())
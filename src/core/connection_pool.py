@@ -0,0 +1,442 @@
+"""
+Database Connection Pool
+Reuses open DB-API connections instead of reconnecting on every repository call
+"""
+import os
+import time
+from collections import OrderedDict
+from threading import Condition, Lock
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+    pass
+
+
+class PooledConnection:
+    """
+    Thin proxy around a raw DB-API connection.
+    Behaves like the wrapped connection, except that close() hands the
+    connection back to its pool instead of closing the socket/file.
+    """
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._raw = raw_conn
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Same semantics as the drivers: commit/rollback, but stay open
+        if exc_type is None:
+            self._raw.commit()
+        else:
+            self._raw.rollback()
+        return False
+
+    @property
+    def raw_connection(self):
+        """Underlying driver connection"""
+        return self._raw
+
+    def cursor(self, *args, **kwargs):
+        if self._closed:
+            raise RuntimeError("Cannot use a connection that was returned to the pool")
+        return self._raw.cursor(*args, **kwargs)
+
+    def close(self):
+        """Return the connection to the pool (safe to call more than once)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.release(self._raw)
+
+    def invalidate(self):
+        """Discard the connection instead of returning it to the pool"""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.discard(self._raw)
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe connection pool.
+
+    Args:
+        connect: Zero-argument callable that opens a new raw connection
+        min_size: Connections kept open even when idle
+        max_size: Hard cap on open connections (idle + checked out)
+        idle_timeout: Seconds an idle connection above min_size may live
+        checkout_timeout: Seconds acquire() waits when the pool is exhausted
+        health_check_interval: Connections idle longer than this are pinged
+            on checkout (0 pings on every checkout)
+        health_check_query: Statement used to ping a connection
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, idle_timeout=300,
+                 checkout_timeout=30, health_check_interval=30,
+                 health_check_query="SELECT 1", name="default"):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.name = name
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_query = health_check_query
+
+        self._cond = Condition()
+        self._idle = []  # list of (raw_conn, returned_at); most recent last
+        self._in_use = 0
+        self._closed = False
+
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'returns': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'health_check_failures': 0,
+            'evicted_idle': 0,
+            'discarded': 0,
+        }
+
+        self._fill_to_min()
+
+    # ----- public API -----
+
+    def acquire(self, timeout=None):
+        """Check out a connection wrapped in a PooledConnection"""
+        if timeout is None:
+            timeout = self.checkout_timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            candidate = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError(f"Connection pool '{self.name}' is closed")
+
+                    self._evict_idle_locked()
+
+                    if self._idle:
+                        candidate = self._idle.pop()
+                        self._in_use += 1
+                        break
+
+                    if self._in_use < self.max_size:
+                        # Reserve the slot before connecting outside the lock
+                        self._in_use += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout}s waiting for a connection "
+                            f"from pool '{self.name}' (max_size={self.max_size})"
+                        )
+                    self._stats['waits'] += 1
+                    self._cond.wait(remaining)
+
+            if candidate is None:
+                break
+
+            raw, returned_at = candidate
+            if self._is_healthy(raw, returned_at):
+                with self._cond:
+                    self._stats['checkouts'] += 1
+                return PooledConnection(self, raw)
+
+            with self._cond:
+                self._in_use -= 1
+                self._stats['health_check_failures'] += 1
+                self._close_raw(raw)
+                self._cond.notify()
+
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._stats['created'] += 1
+            self._stats['checkouts'] += 1
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        """Return a raw connection to the idle list"""
+        try:
+            # Never hand out a connection with a half-finished transaction
+            raw.rollback()
+        except Exception:
+            self.discard(raw)
+            return
+        optimize_if_due = getattr(raw, 'optimize_if_due', None)  # sqlite_tuning.TunedConnection
+        if optimize_if_due is not None:
+            optimize_if_due()
+
+        with self._cond:
+            self._in_use -= 1
+            self._stats['returns'] += 1
+            if self._closed:
+                self._close_raw(raw)
+            else:
+                self._idle.append((raw, time.monotonic()))
+                self._evict_idle_locked()
+            self._cond.notify()
+
+    def discard(self, raw):
+        """Drop a checked-out connection that is known to be broken"""
+        with self._cond:
+            self._in_use -= 1
+            self._stats['discarded'] += 1
+            self._close_raw(raw)
+            self._cond.notify()
+
+    def evict_idle(self):
+        """Close idle connections that exceeded idle_timeout"""
+        with self._cond:
+            return self._evict_idle_locked()
+
+    def close_idle(self):
+        """Close every idle connection but keep the pool usable"""
+        with self._cond:
+            closed = 0
+            while self._idle:
+                raw, _ = self._idle.pop()
+                self._close_raw(raw)
+                closed += 1
+            return closed
+
+    @property
+    def size(self):
+        """Open connections (idle + checked out)"""
+        with self._cond:
+            return self._in_use + len(self._idle)
+
+    def close_all(self):
+        """Close every idle connection and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                raw, _ = self._idle.pop()
+                self._close_raw(raw)
+            self._cond.notify_all()
+
+    def get_stats(self):
+        """Snapshot of pool counters"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'name': self.name,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'size': self._in_use + len(self._idle),
+            })
+            return stats
+
+    # ----- internals -----
+
+    def _fill_to_min(self):
+        """Pre-open min_size connections; failures are left for acquire() to surface"""
+        while True:
+            with self._cond:
+                if self._in_use + len(self._idle) >= self.min_size:
+                    return
+            try:
+                raw = self._connect()
+            except Exception as e:
+                print(f"Warning: could not pre-open pooled connection for '{self.name}': {e}")
+                return
+            with self._cond:
+                self._stats['created'] += 1
+                self._idle.append((raw, time.monotonic()))
+
+    def _evict_idle_locked(self):
+        if not self.idle_timeout:
+            return 0
+        now = time.monotonic()
+        evicted = 0
+        # Oldest connections sit at the front of the list
+        while self._idle and self._in_use + len(self._idle) > self.min_size:
+            raw, returned_at = self._idle[0]
+            if now - returned_at < self.idle_timeout:
+                break
+            self._idle.pop(0)
+            self._close_raw(raw)
+            evicted += 1
+        self._stats['evicted_idle'] += evicted
+        return evicted
+
+    def _is_healthy(self, raw, returned_at):
+        if self.health_check_interval and time.monotonic() - returned_at < self.health_check_interval:
+            return True
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute(self.health_check_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _close_raw(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+        self._stats['closed'] += 1
+
+
+class PoolRegistry:
+    """
+    LRU registry of connection pools keyed by database target (one pool per
+    tenant database). Keeps the total number of open handles across all
+    pools under max_open_connections by closing the least recently used
+    pools first.
+    """
+
+    def __init__(self, max_open_connections=256, pool_max_size=4, idle_timeout=300,
+                 checkout_timeout=30, health_check_interval=30):
+        self.max_open_connections = max_open_connections
+        self.pool_settings = {
+            'min_size': 0,
+            'max_size': pool_max_size,
+            'idle_timeout': idle_timeout,
+            'checkout_timeout': checkout_timeout,
+            'health_check_interval': health_check_interval,
+        }
+        self._pools = OrderedDict()
+        self._lock = Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evicted_pools': 0}
+
+    def acquire(self, key, connect, name=None):
+        """Check out a connection from the pool for `key`, creating the pool if needed"""
+        pool = self.get_pool(key, connect, name)
+        conn = pool.acquire()
+        self._enforce_limit(keep=key)
+        return conn
+
+    def get_pool(self, key, connect, name=None):
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._pools.move_to_end(key)
+                self._stats['hits'] += 1
+                return pool
+            self._stats['misses'] += 1
+            pool = ConnectionPool(connect, name=name or str(key), **self.pool_settings)
+            self._pools[key] = pool
+            return pool
+
+    def remove(self, key):
+        """Close and forget the pool for `key` (e.g. after its config changed)"""
+        with self._lock:
+            pool = self._pools.pop(key, None)
+        if pool is not None:
+            pool.close_all()
+
+    def close_all(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = OrderedDict()
+        for pool in pools:
+            pool.close_all()
+
+    def open_connections(self):
+        with self._lock:
+            pools = list(self._pools.values())
+        return sum(pool.size for pool in pools)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            pools = list(self._pools.values())
+        stats.update({
+            'pools': len(pools),
+            'open_connections': sum(pool.size for pool in pools),
+            'max_open_connections': self.max_open_connections,
+        })
+        return stats
+
+    def _enforce_limit(self, keep=None):
+        """Close least recently used pools until the handle cap is respected"""
+        victims = []
+        with self._lock:
+            open_count = sum(pool.size for pool in self._pools.values())
+            if open_count <= self.max_open_connections:
+                return
+            for key in list(self._pools.keys()):
+                if open_count <= self.max_open_connections:
+                    break
+                if key == keep:
+                    continue
+                pool = self._pools.pop(key)
+                open_count -= pool.size
+                victims.append(pool)
+                self._stats['evicted_pools'] += 1
+        # Checked-out connections of evicted pools are closed when released
+        for pool in victims:
+            pool.close_all()
+
+
+_tenant_pool_registry = None
+_tenant_pool_registry_lock = Lock()
+
+
+def get_tenant_pool_registry():
+    """Get the process-wide registry of per-tenant connection pools"""
+    global _tenant_pool_registry
+    if _tenant_pool_registry is None:
+        with _tenant_pool_registry_lock:
+            if _tenant_pool_registry is None:
+                _tenant_pool_registry = PoolRegistry(
+                    max_open_connections=int(os.environ.get('TENANT_MAX_OPEN_CONNECTIONS', '256')),
+                    pool_max_size=int(os.environ.get('TENANT_POOL_MAX_SIZE', '4')),
+                    idle_timeout=float(os.environ.get('DB_POOL_IDLE_TIMEOUT', '300')),
+                )
+    return _tenant_pool_registry
+
+
+# Connections inherited through fork() share their sockets/files with the parent.
+# A forked worker starts with empty pools and keeps the inherited connections
+# referenced without closing them: closing (or garbage-collecting) them would end
+# the parent's sessions and, for SQLite, drop the parent's file locks.
+_inherited_after_fork = []
+
+
+def forget_after_fork(pools):
+    """Keep `pools` (and their connections) alive but unused in a forked child"""
+    _inherited_after_fork.append(pools)
+
+
+def _reset_after_fork():
+    global _tenant_pool_registry, _tenant_pool_registry_lock
+    forget_after_fork(_tenant_pool_registry)
+    _tenant_pool_registry = None
+    _tenant_pool_registry_lock = Lock()
+
+
+if hasattr(os, 'register_at_fork'):  # POSIX only
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,6 +1,18 @@
-import pyodbc
-import sqlite3
+try:
+    import pyodbc
+except ImportError:  # Only required for the SQL Server backend
+    pyodbc = None
 import os
+from threading import Lock
+from core import sqlite_tuning, bulk_operations
+from core.connection_pool import ConnectionPool, get_tenant_pool_registry, forget_after_fork
+from core.tenant_context import get_current_tenant, set_current_tenant, clear_current_tenant
+from core.unit_of_work import get_current_unit_of_work
+from core.query_instrumentation import get_query_instrumentation
+from core.metrics import count_db_connection
+from core.config_cache import create_tenant_config_cache, invalidate_tenant_config
+from core.sql_dialect import (DialectConnection, get_dialect, dialect_for, init_sqlite_schema,
+                              SQLITE, SQLITE_DETECT_TYPES)
 
 class DatabaseConnection:
     """
@@ -10,6 +22,10 @@ class DatabaseConnection:
     Usage:
     1. For main/admin database: db = DatabaseConnection.get_instance()
     2. For user-specific database: db.set_user_context(user_id)
+    3. For pooled connections: set DB_POOL_ENABLED=true (or call enable_pooling());
+       conn.close() then returns the connection to the pool
+    4. For a local SQLite database instead of SQL Server: set DB_BACKEND=sqlite
+       (DB_SQLITE_PATH defaults to data/unify_dev.db)
     """
     _instance = None
 
@@ -27,12 +43,35 @@ class DatabaseConnection:
                 "SERVER=DESKTOP-V6DPJFP\\SQLEXPRESS;"
                 "DATABASE=unify;"
                 "Trusted_Connection=yes;"
+                "MARS_Connection=yes;"  # several open cursors on one shared connection
             )
             
+            # Main database backend: 'sqlserver' (default) or 'sqlite'
+            self.backend = os.environ.get('DB_BACKEND', 'sqlserver').lower()
+            self.dialect = get_dialect(self.backend)
+            self.sqlite_path = os.environ.get(
+                'DB_SQLITE_PATH',
+                os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'unify_dev.db')
+            )
+            self._schema_ready = set()
+            self._schema_lock = Lock()
+            
             # Multi-tenant support
             self.multi_tenant_enabled = os.environ.get('MULTI_TENANT_MODE', 'false').lower() == 'true'
-            self.current_user_id = None
-            self.user_db_configs = {}
+            # Bounded LRU/TTL cache of per-user database configs
+            self.user_db_configs = create_tenant_config_cache('database_connection')
+            
+            # Connection pooling (one pool per connection string)
+            self.pool_enabled = os.environ.get('DB_POOL_ENABLED', 'false').lower() == 'true'
+            self.pool_settings = {
+                'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '1')),
+                'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+                'idle_timeout': float(os.environ.get('DB_POOL_IDLE_TIMEOUT', '300')),
+                'checkout_timeout': float(os.environ.get('DB_POOL_CHECKOUT_TIMEOUT', '30')),
+                'health_check_interval': float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', '30')),
+            }
+            self._pools = {}
+            self._pools_lock = Lock()
             
             self.initialized = True
 
@@ -45,34 +84,141 @@ class DatabaseConnection:
         """Enable or disable multi-tenant mode"""
         self.multi_tenant_enabled = enabled
     
+    @property
+    def current_user_id(self):
+        """Tenant of the current request/thread (see core.tenant_context)"""
+        return get_current_tenant()
+    
+    @current_user_id.setter
+    def current_user_id(self, user_id):
+        set_current_tenant(user_id)
+    
     def set_user_context(self, user_id):
         """Set the current user context for multi-tenant mode"""
-        self.current_user_id = user_id
+        set_current_tenant(user_id)
     
     def clear_user_context(self):
         """Clear the current user context"""
-        self.current_user_id = None
+        clear_current_tenant()
+    
+    def enable_pooling(self, enabled=True, **settings):
+        """
+        Enable or disable connection pooling.
+        Optional settings: min_size, max_size, idle_timeout, checkout_timeout,
+        health_check_interval. Existing pools are closed so new settings apply.
+        """
+        self.pool_settings.update(settings)
+        self.close_pools()
+        self.pool_enabled = enabled
+    
+    def get_pool_stats(self):
+        """Return statistics for every open pool, keyed by pool name"""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        stats = {pool.name: pool.get_stats() for pool in pools}
+        stats['tenants'] = get_tenant_pool_registry().get_stats()
+        return stats
+    
+    def get_config_cache_stats(self):
+        """Hit/miss counters of the user database config cache"""
+        return self.user_db_configs.get_stats()
+    
+    def invalidate_user_db_config(self, user_id=None):
+        """Forget a user's cached database config (all users if None)"""
+        invalidate_tenant_config(user_id)
+    
+    def close_pools(self):
+        """Close all pools and their idle connections"""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            pool.close_all()
+    
+    def _reset_after_fork(self):
+        """Start a forked worker with its own pools and locks"""
+        forget_after_fork(self._pools)
+        self._pools = {}
+        self._pools_lock = Lock()
+        self._schema_lock = Lock()
+    
+    def _get_pool(self, key, name, connect):
+        """Get (or lazily create) the pool for a connection string"""
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = ConnectionPool(connect, name=name, **self.pool_settings)
+                    self._pools[key] = pool
+        return pool
 
     def get_connection(self):
         """
         Returns a NEW connection to the database.
         In multi-tenant mode, returns user-specific connection.
         Always close this connection after use.
+        
+        Inside a unit of work (see core.unit_of_work) every call returns the
+        same shared connection; commit/close are deferred to the unit of work.
         """
-        if self.multi_tenant_enabled and self.current_user_id:
-            return self._get_user_connection(self.current_user_id)
+        uow = get_current_unit_of_work()
+        user_id = self.current_user_id
+        if uow is not None:
+            if self.multi_tenant_enabled and user_id:
+                conn = uow.get_connection(('user', user_id), lambda: self._get_user_connection(user_id))
+            else:
+                conn = uow.get_connection(('main',), self._get_main_connection)
+        elif self.multi_tenant_enabled and user_id:
+            conn = self._get_user_connection(user_id)
         else:
-            return self._get_main_connection()
+            conn = self._get_main_connection()
+        count_db_connection(self.backend)
+        # Times each statement when DB_QUERY_INSTRUMENTATION is enabled
+        return get_query_instrumentation().wrap(conn)
     
     def _get_main_connection(self):
         """Get connection to main/admin database"""
+        if self.backend == 'sqlite':
+            return self._get_sqlite_main_connection()
+        if pyodbc is None:
+            raise RuntimeError("pyodbc is not installed; install it or set DB_BACKEND=sqlite")
         try:
+            if self.pool_enabled:
+                connection_string = self.connection_string
+                pool = self._get_pool(connection_string, 'main', lambda: pyodbc.connect(connection_string))
+                return pool.acquire()
             conn = pyodbc.connect(self.connection_string)
             return conn
         except Exception as e:
             print(f"ERROR connecting to SQL Server: {e}")
             raise
     
+    def _get_sqlite_main_connection(self):
+        """Get connection to the local SQLite main database"""
+        try:
+            db_path = self.sqlite_path
+            if self.pool_enabled:
+                pool = self._get_pool(('sqlite', db_path), 'main', lambda: self._open_sqlite(db_path))
+                return DialectConnection(pool.acquire(), SQLITE)
+            return DialectConnection(self._open_sqlite(db_path), SQLITE)
+        except Exception as e:
+            print(f"ERROR connecting to SQLite database: {e}")
+            raise
+    
+    def _open_sqlite(self, db_path):
+        """Open a tuned SQLite connection with the core schema in place"""
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite_tuning.connect(db_path, check_same_thread=False, detect_types=SQLITE_DETECT_TYPES)
+        if db_path not in self._schema_ready:
+            with self._schema_lock:
+                if db_path not in self._schema_ready:
+                    init_sqlite_schema(conn)
+                    self._schema_ready.add(db_path)
+        return conn
+    
     def _get_user_connection(self, user_id):
         """Get connection to user-specific database"""
         # Load user database configuration
@@ -89,8 +235,9 @@ class DatabaseConnection:
     def _load_user_db_config(self, user_id):
         """Load database configuration for a user"""
         # Check cache
-        if user_id in self.user_db_configs:
-            return self.user_db_configs[user_id]
+        config = self.user_db_configs.get(user_id)
+        if config is not None:
+            return config
         
         # Load from main database
         try:
@@ -123,7 +270,7 @@ class DatabaseConnection:
             conn.close()
             
             # Cache it
-            self.user_db_configs[user_id] = config
+            self.user_db_configs.set(user_id, config)
             return config
             
         except Exception as e:
@@ -149,10 +296,17 @@ class DatabaseConnection:
         """Get SQLite connection"""
         try:
             db_path = config['db_path']
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(db_path), exist_ok=True)
-            conn = sqlite3.connect(db_path)
-            return conn
+            if self.pool_enabled:
+                # Pooled handles may be checked out by different threads over time
+                conn = get_tenant_pool_registry().acquire(
+                    ('sqlite', db_path),
+                    lambda: self._open_sqlite(db_path),
+                    name=f"sqlite:{os.path.basename(db_path)}"
+                )
+            else:
+                conn = self._open_sqlite(db_path)
+            # Repositories write T-SQL; the dialect layer rewrites it for SQLite
+            return DialectConnection(conn, SQLITE)
         except Exception as e:
             print(f"ERROR connecting to SQLite database: {e}")
             raise
@@ -171,6 +325,14 @@ class DatabaseConnection:
             else:
                 connection_string += "Trusted_Connection=yes;"
             
+            if pyodbc is None:
+                raise RuntimeError("pyodbc is not installed; cannot open a SQL Server tenant database")
+            if self.pool_enabled:
+                return get_tenant_pool_registry().acquire(
+                    ('sqlserver', connection_string),
+                    lambda: pyodbc.connect(connection_string),
+                    name=f"sqlserver:{config['db_host']}/{config['db_name']}"
+                )
             conn = pyodbc.connect(connection_string)
             return conn
         except Exception as e:
@@ -178,6 +340,23 @@ class DatabaseConnection:
             raise
     
     # Helper methods for database operations
+    def create_table(self, table, columns_sql):
+        """
+        Create a table if it doesn't exist.
+        columns_sql uses SQL Server column syntax; it is translated for SQLite.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            dialect_for(conn).create_table(cursor, table, columns_sql)
+            conn.commit()
+            cursor.close()
+            conn.close()
+        except Exception as e:
+            print(f"Error creating table {table}: {e}")
+            conn.close()
+            raise
+    
     def execute_update(self, query, params=None):
         """Execute INSERT/UPDATE/DELETE query"""
         conn = self.get_connection()
@@ -241,6 +420,50 @@ class DatabaseConnection:
             conn.close()
             raise
 
+    
+    def execute_many(self, query, params_seq, chunk_size=bulk_operations.DEFAULT_CHUNK_SIZE):
+        """
+        Execute INSERT/UPDATE/DELETE for many parameter tuples in one
+        transaction (fast_executemany on SQL Server). Returns rows processed.
+        """
+        conn = self.get_connection()
+        try:
+            count = bulk_operations.execute_many(conn, query, params_seq, chunk_size)
+            conn.commit()
+            conn.close()
+            return count
+        except Exception as e:
+            print(f"Error executing bulk update: {e}")
+            conn.rollback()
+            conn.close()
+            raise
+    
+    def bulk_insert(self, table, columns, rows, id_column=None, chunk_size=None):
+        """
+        Insert many rows in one transaction.
+        Returns the generated ids in row order when id_column is given.
+        """
+        conn = self.get_connection()
+        try:
+            ids = bulk_operations.bulk_insert(conn, table, columns, rows, id_column, chunk_size)
+            conn.commit()
+            conn.close()
+            return ids
+        except Exception as e:
+            print(f"Error executing bulk insert: {e}")
+            conn.rollback()
+            conn.close()
+            raise
+
+
+def _reset_after_fork():
+    if DatabaseConnection._instance is not None and hasattr(DatabaseConnection._instance, 'initialized'):
+        DatabaseConnection._instance._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):  # POSIX only
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 # Test function - run this file directly to test the connection
 if __name__ == "__main__":
@@ -271,4 +494,4 @@ if __name__ == "__main__":
         print("  4. ODBC Driver 17 for SQL Server is installed")
         print("\nTo check SQL Server services:")
         print("  - Open Services (services.msc)")
-        print("  - Find 'SQL Server (SQLEXPRESS)' and start it")
\ No newline at end of file
+        print("  - Find 'SQL Server (SQLEXPRESS)' and start it")
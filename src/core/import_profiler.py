@@ -0,0 +1,155 @@
+"""
+Import Profiler
+Per-module import times for application startup, enabled with
+UNIFY_PROFILE_IMPORTS=true, so slow or newly-heavy imports show up in a report
+"""
+import builtins
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+
+
+class ImportProfiler:
+    """
+    Wraps builtins.__import__ and records, for each module imported for the
+    first time, its cumulative time (including the imports it triggered) and
+    its self time (excluding them).
+    """
+
+    def __init__(self):
+        self.modules = {}  # module -> [cumulative seconds, self seconds]
+        self.deferred = {}  # lazily created object -> seconds
+        self.started_at = None
+        self._original_import = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self._original_import is not None
+
+    def install(self):
+        if self.active:
+            return
+        self._original_import = builtins.__import__
+        self.started_at = time.perf_counter()
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        if not self.active:
+            return
+        if builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._original_import
+        self._original_import = None
+
+    @staticmethod
+    def _module_name(name, globals, level):
+        if level == 0:
+            return name
+        try:
+            return importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+        except (ImportError, ValueError):
+            return name
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        module = self._module_name(name, globals, level)
+        if module in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        children = [0.0]
+        stack.append(children)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            with self._lock:
+                entry = self.modules.setdefault(module, [0.0, 0.0])
+                entry[0] += elapsed
+                entry[1] += max(elapsed - children[0], 0.0)
+
+    def record_deferred(self, name, seconds):
+        with self._lock:
+            self.deferred[name] = self.deferred.get(name, 0.0) + seconds
+
+    def get_report(self, top=None):
+        """Modules sorted by cumulative import time, slowest first"""
+        with self._lock:
+            rows = [
+                {'module': module, 'cumulative_ms': round(times[0] * 1000, 2), 'self_ms': round(times[1] * 1000, 2)}
+                for module, times in self.modules.items()
+            ]
+            deferred = {name: round(seconds * 1000, 2) for name, seconds in self.deferred.items()}
+        rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+        return {
+            'since_start_ms': round((time.perf_counter() - self.started_at) * 1000, 2) if self.started_at else None,
+            'modules': rows[:top] if top else rows,
+            'module_count': len(rows),
+            'deferred_ms': deferred,
+        }
+
+    def print_report(self, top=25):
+        report = self.get_report(top)
+        print(f"[IMPORTS] {report['module_count']} modules imported, "
+              f"{report['since_start_ms']} ms since profiling started")
+        print(f"[IMPORTS] {'cumulative':>12} {'self':>10}  module")
+        for row in report['modules']:
+            print(f"[IMPORTS] {row['cumulative_ms']:>9.1f} ms {row['self_ms']:>7.1f} ms  {row['module']}")
+        return report
+
+
+_profiler = ImportProfiler()
+_reported = False
+
+
+def get_import_profiler():
+    """Get the process-wide import profiler"""
+    return _profiler
+
+
+def profiling_enabled():
+    return os.environ.get('UNIFY_PROFILE_IMPORTS', 'false').lower() == 'true'
+
+
+def install_from_env():
+    """Start timing imports if UNIFY_PROFILE_IMPORTS=true (call before other imports)"""
+    if profiling_enabled():
+        _profiler.install()
+    return _profiler.active
+
+
+def record_deferred(name, seconds):
+    """Time spent creating a lazily initialized object (see core.lazy)"""
+    if _profiler.active:
+        _profiler.record_deferred(name, seconds)
+
+
+def report_startup():
+    """
+    Print the startup report once and, if UNIFY_PROFILE_IMPORTS_FILE is set,
+    write it there as JSON for comparison between builds.
+    Timing stays installed so lazily loaded modules are still recorded.
+    """
+    global _reported
+    if not _profiler.active or _reported:
+        return None
+    _reported = True
+    report = _profiler.print_report(top=int(os.environ.get('UNIFY_PROFILE_IMPORTS_TOP', '25')))
+    path = os.environ.get('UNIFY_PROFILE_IMPORTS_FILE')
+    if path:
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(_profiler.get_report(), f, indent=2)
+        except OSError as e:
+            print(f"Warning: could not write import profile to {path}: {e}")
+    return report
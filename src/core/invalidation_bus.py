@@ -0,0 +1,324 @@
+"""
+Cache Invalidation Bus
+Topic-based invalidations ("user:123", "course:*", "kb") delivered to the
+in-process caches of every worker through a polled change-log transport
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from core import sqlite_tuning
+
+# Change-log rows older than this are pruned; a worker that has not polled for
+# longer than the retention period may miss invalidations (caches still expire by TTL)
+RETENTION_SECONDS = 3600
+
+
+def split_topic(topic):
+    """'user:123' -> ('user', '123'); 'kb' -> ('kb', None)"""
+    namespace, _, key = topic.partition(':')
+    return namespace, (key or None)
+
+
+def _parse_id(text):
+    if text == '':
+        return None
+    return int(text) if text.lstrip('-').isdigit() else text
+
+
+def encode_key(cache_key):
+    """Topic key for a cache key: 123, or (tenant, 123) in multi-tenant mode -> '123@tenant'"""
+    if isinstance(cache_key, tuple):
+        tenant, key = cache_key
+        return f"{key}@{'' if tenant is None else tenant}"
+    return str(cache_key)
+
+
+def decode_key(text):
+    """Inverse of encode_key()"""
+    key, scoped, tenant = text.partition('@')
+    if scoped:
+        return (_parse_id(tenant), _parse_id(key))
+    return _parse_id(key)
+
+
+class MemoryTransport:
+    """
+    In-process change log (tests, single-process runs). Several buses can share
+    one instance to simulate workers, which makes it a stand-in for Redis.
+    """
+
+    def __init__(self):
+        self._events = []  # (seq, origin, topic)
+        self._lock = threading.Lock()
+
+    def publish(self, origin, topics):
+        with self._lock:
+            for topic in topics:
+                self._events.append((len(self._events) + 1, origin, topic))
+
+    def latest(self):
+        with self._lock:
+            return len(self._events)
+
+    def read_after(self, seq):
+        with self._lock:
+            return self._events[seq:]
+
+
+class SQLiteTransport:
+    """
+    Change-log table in a SQLite file shared by the workers of one host.
+    Sequence numbers come from an AUTOINCREMENT primary key, so polling is an
+    index range scan over the rows added since the last poll.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._last_prune = 0.0
+
+    def _connect(self):
+        # sqlite3 connections may not cross threads; the pid check covers fork()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite_tuning.connect(self.path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS Cache_Invalidation ("
+                "Seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "Origin TEXT NOT NULL, Topic TEXT NOT NULL, Created_At REAL NOT NULL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def publish(self, origin, topics):
+        conn = self._connect()
+        now = time.time()
+        conn.executemany(
+            "INSERT INTO Cache_Invalidation (Origin, Topic, Created_At) VALUES (?, ?, ?)",
+            [(origin, topic, now) for topic in topics])
+        if now - self._last_prune > 60:
+            self._last_prune = now
+            conn.execute("DELETE FROM Cache_Invalidation WHERE Created_At < ?", (now - RETENTION_SECONDS,))
+        conn.commit()
+
+    def latest(self):
+        row = self._connect().execute("SELECT MAX(Seq) FROM Cache_Invalidation").fetchone()
+        return row[0] or 0
+
+    def read_after(self, seq):
+        return self._connect().execute(
+            "SELECT Seq, Origin, Topic FROM Cache_Invalidation WHERE Seq > ? ORDER BY Seq", (seq,)
+        ).fetchall()
+
+
+class RedisTransport:
+    """
+    Change log kept in a Redis stream. Takes any client with the redis-py
+    stream API, so a local stand-in (e.g. fakeredis) can be passed instead.
+    """
+
+    def __init__(self, client=None, url=None, stream='unify:invalidations', max_len=100000):
+        if client is None:
+            import redis  # optional dependency, only needed for this transport
+            client = redis.Redis.from_url(url or 'redis://localhost:6379/0')
+        self.client = client
+        self.stream = stream
+        self.max_len = max_len
+
+    @staticmethod
+    def _seq(entry_id):
+        # Stream ids are "<ms>-<n>"; keep them as (ms, n) tuples so they order correctly
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode('ascii')
+        ms, _, n = entry_id.partition('-')
+        return (int(ms), int(n or 0))
+
+    @staticmethod
+    def _text(value):
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def publish(self, origin, topics):
+        for topic in topics:
+            self.client.xadd(self.stream, {'origin': origin, 'topic': topic},
+                             maxlen=self.max_len, approximate=True)
+
+    def latest(self):
+        entries = self.client.xrevrange(self.stream, count=1)
+        return self._seq(entries[0][0]) if entries else (0, 0)
+
+    def read_after(self, seq):
+        start = f"({seq[0]}-{seq[1]}"
+        return [
+            (self._seq(entry_id), self._text(fields.get(b'origin', fields.get('origin'))),
+             self._text(fields.get(b'topic', fields.get('topic'))))
+            for entry_id, fields in self.client.xrange(self.stream, min=start)
+        ]
+
+
+class InvalidationBus:
+    """
+    Dispatches topics to local handlers and, when enabled, to other workers.
+
+    publish() runs the matching handlers in this process right away and appends
+    the topics to the transport; poll() applies topics published by other
+    processes since the last poll (at most once per `poll_interval`).
+    """
+
+    def __init__(self, transport=None, enabled=False, poll_interval=1.0):
+        self.transport = transport
+        self.enabled = enabled and transport is not None
+        self.poll_interval = poll_interval
+        self._handlers = {}  # namespace -> [handler(key)]
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._pid = None
+        self._origin = None
+        self._last_seq = None
+        self._last_poll = 0.0
+        self.published = 0
+        self.received = 0
+
+    def subscribe(self, namespace, handler):
+        """Call handler(key) for every topic in `namespace` (key is None or '*' for all)"""
+        with self._lock:
+            self._handlers.setdefault(namespace, []).append(handler)
+
+    def _dispatch(self, topic):
+        namespace, key = split_topic(topic)
+        for handler in self._handlers.get(namespace, ()):
+            try:
+                handler(key)
+            except Exception as e:
+                print(f"Error handling invalidation {topic}: {e}")
+
+    def _ensure_started(self):
+        # A forked worker gets its own origin and starts from the current end of the log
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        self._pid = pid
+        self._origin = f"{pid}-{uuid.uuid4().hex[:8]}"
+        self._last_seq = self.transport.latest()
+        self._last_poll = time.monotonic()
+
+    def publish(self, *topics):
+        """Invalidate `topics` here and in every other worker"""
+        for topic in topics:
+            self._dispatch(topic)
+        if not self.enabled or not topics:
+            return
+        try:
+            self._ensure_started()
+            self.transport.publish(self._origin, topics)
+            self.published += len(topics)
+        except Exception as e:
+            print(f"Warning: could not publish invalidation {topics}: {e}")
+
+    def poll(self, force=False):
+        """Apply invalidations from other workers; returns how many were applied"""
+        if not self.enabled:
+            return 0
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_interval:
+            return 0
+        if not self._poll_lock.acquire(blocking=False):
+            return 0  # another thread is already polling
+        try:
+            self._ensure_started()
+            self._last_poll = now
+            applied = 0
+            for seq, origin, topic in self.transport.read_after(self._last_seq):
+                self._last_seq = seq
+                if origin != self._origin:
+                    self._dispatch(topic)
+                    applied += 1
+            self.received += applied
+            return applied
+        except Exception as e:
+            print(f"Warning: could not poll invalidations: {e}")
+            return 0
+        finally:
+            self._poll_lock.release()
+
+    def get_stats(self):
+        return {
+            'enabled': self.enabled,
+            'transport': type(self.transport).__name__ if self.transport else None,
+            'published': self.published,
+            'received': self.received,
+        }
+
+
+def create_transport(name=None):
+    """
+    Transport from the environment:
+        INVALIDATION_BUS_TRANSPORT  sqlite (default), redis or memory
+        INVALIDATION_BUS_PATH       change-log file for sqlite (default data/invalidation_bus.db)
+        INVALIDATION_BUS_REDIS_URL  server for redis
+    """
+    name = (name or os.environ.get('INVALIDATION_BUS_TRANSPORT', 'sqlite')).lower()
+    if name == 'memory':
+        return MemoryTransport()
+    if name == 'redis':
+        return RedisTransport(url=os.environ.get('INVALIDATION_BUS_REDIS_URL'))
+    if name == 'sqlite':
+        return SQLiteTransport(os.environ.get(
+            'INVALIDATION_BUS_PATH',
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'invalidation_bus.db')
+        ))
+    raise ValueError(f"Unknown invalidation bus transport: {name}")
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_invalidation_bus():
+    """
+    Get the process-wide invalidation bus.
+    Cross-worker delivery is off unless INVALIDATION_BUS_ENABLED=true; local
+    handlers always run.
+    """
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                enabled = os.environ.get('INVALIDATION_BUS_ENABLED', 'false').lower() == 'true'
+                transport = None
+                if enabled:
+                    try:
+                        transport = create_transport()
+                    except (ImportError, ValueError, OSError, sqlite3.Error) as e:
+                        print(f"Warning: invalidation bus disabled: {e}")
+                _bus = InvalidationBus(
+                    transport,
+                    enabled=enabled,
+                    poll_interval=float(os.environ.get('INVALIDATION_BUS_POLL_INTERVAL', '1')),
+                )
+    return _bus
+
+
+def publish(*topics):
+    """Shortcut for get_invalidation_bus().publish(...)"""
+    get_invalidation_bus().publish(*topics)
+
+
+def subscribe(namespace, handler):
+    """Shortcut for get_invalidation_bus().subscribe(...)"""
+    get_invalidation_bus().subscribe(namespace, handler)
+
+
+def init_app(app):
+    """Apply other workers' invalidations before each request"""
+
+    @app.before_request
+    def _poll_invalidations():
+        get_invalidation_bus().poll()
@@ -0,0 +1,68 @@
+"""
+Lazy Initialization
+Module-level singletons whose construction (HTTP probes, model loads, table
+creation) is deferred until first use instead of happening at import time
+"""
+import threading
+import time
+
+from core import import_profiler
+
+
+class LazyObject:
+    """
+    Stand-in for the value returned by `factory()`, built on first attribute
+    access or truth test and shared by every thread after that.
+
+    A factory may return None (e.g. no LLM provider available); the proxy is
+    then falsy, so existing `if service:` checks keep working.
+    """
+
+    __slots__ = ('_factory', '_name', '_value', '_loaded', '_lock')
+
+    def __init__(self, factory, name=None):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_name', name or getattr(factory, '__name__', 'lazy'))
+        object.__setattr__(self, '_value', None)
+        object.__setattr__(self, '_loaded', False)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def resolve(self):
+        """The underlying value, creating it if needed"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    start = time.perf_counter()
+                    object.__setattr__(self, '_value', self._factory())
+                    object.__setattr__(self, '_loaded', True)
+                    import_profiler.record_deferred(self._name, time.perf_counter() - start)
+        return self._value
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def reset(self):
+        """Forget the value so the next use calls the factory again"""
+        with self._lock:
+            object.__setattr__(self, '_value', None)
+            object.__setattr__(self, '_loaded', False)
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.resolve(), name, value)
+
+    def __bool__(self):
+        return bool(self.resolve())
+
+    def __repr__(self):
+        if not self._loaded:
+            return f"<LazyObject {self._name} (not loaded)>"
+        return f"<LazyObject {self._name}: {self._value!r}>"
+
+
+def lazy(factory, name=None):
+    """Shortcut for LazyObject(factory, name)"""
+    return LazyObject(factory, name)
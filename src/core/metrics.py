@@ -0,0 +1,534 @@
+"""
+Application Metrics
+In-process counters, gauges and histograms exposed at /metrics in the
+Prometheus text format, merged across gunicorn workers through a shared directory
+"""
+import hmac
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process server, nothing to merge
+    fcntl = None
+
+# Seconds; request, LLM and model latencies span milliseconds to minutes
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+# Summed counters and histograms of workers that have exited
+RETIRED_FILE = 'metrics-retired.json'
+
+
+class Metric:
+    """A named family of samples keyed by label values"""
+
+    type = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # label values tuple -> value
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(value) for value in labels)
+
+    def samples(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def snapshot(self):
+        return {'name': self.name, 'type': self.type, 'help': self.help,
+                'labelnames': list(self.labelnames), 'samples': self.samples()}
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, *labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    """Per-bucket (non-cumulative) counts plus sum and count for each label set"""
+
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            return [[list(key), [list(entry[0]), entry[1], entry[2]]] for key, entry in self._values.items()]
+
+    def snapshot(self):
+        data = super().snapshot()
+        data['buckets'] = list(self.buckets)
+        return data
+
+
+class MetricsRegistry:
+    """
+    Metrics of this process plus collectors evaluated at scrape time.
+
+    With UNIFY_METRICS_DIR set, every worker writes a snapshot file there
+    (at most every `flush_interval` seconds, and on each scrape) and /metrics
+    merges all of them: counters and histograms are summed, including those of
+    recycled workers; gauges are reported per live worker with a `pid` label.
+    A scrape folds the files of workers that have exited into one retired
+    snapshot, so the directory does not grow with every recycled worker.
+    """
+
+    def __init__(self, enabled=False, directory=None, flush_interval=5.0):
+        self.enabled = enabled
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()):
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector):
+        """collector() returns metrics built at scrape time (pool sizes, cache counters)"""
+        self._collectors.append(collector)
+
+    def snapshot(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshots = [metric.snapshot() for metric in metrics]
+        for collector in self._collectors:
+            try:
+                snapshots.extend(metric.snapshot() for metric in collector())
+            except Exception as e:
+                print(f"Warning: metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return snapshots
+
+    def _reset_after_fork(self):
+        # A forked worker starts from zero: the parent's counts are not its own and
+        # would otherwise be summed once per worker
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric._lock = threading.Lock()
+            metric._values = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    # ----- multi-process -----
+
+    def _snapshot_path(self, pid):
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def flush(self, force=False):
+        """Write this process's snapshot for the other workers' scrapes"""
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        pid = os.getpid()
+        path = self._snapshot_path(pid)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'pid': pid, 'metrics': self.snapshot()}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: could not write metrics snapshot: {e}")
+
+    @contextmanager
+    def _directory_lock(self, exclusive):
+        # Scrapes read under a shared lock; folding dead workers takes it exclusively
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, 'metrics.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _dead_worker_files(self):
+        dead = []
+        for name in os.listdir(self.directory):
+            pid = name[len('metrics-'):-len('.json')]
+            if name.startswith('metrics-') and name.endswith('.json') and pid.isdigit():
+                if int(pid) != os.getpid() and not _pid_alive(int(pid)):
+                    dead.append(os.path.join(self.directory, name))
+        return dead
+
+    def _retire_dead_workers(self):
+        """Fold exited workers' counters and histograms into RETIRED_FILE and delete their files"""
+        if fcntl is None or not self._dead_worker_files():
+            return
+        with self._directory_lock(exclusive=True):
+            dead = self._dead_worker_files()  # another worker may have folded them meanwhile
+            retired_path = os.path.join(self.directory, RETIRED_FILE)
+            families = {}
+            for path in [retired_path] + dead:
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        snapshots = json.load(f).get('metrics', [])
+                except (OSError, ValueError):
+                    continue
+                for metric in snapshots:
+                    if metric['type'] == 'gauge':
+                        continue  # only meaningful while the worker runs
+                    family = families.setdefault(metric['name'], dict(metric, samples={}))
+                    _merge_samples(family, metric, None, False, False)
+            retired = [dict(family, samples=[[list(labels), value] for labels, value in family['samples'].items()])
+                       for family in families.values()]
+            try:
+                temp_path = f"{retired_path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'pid': None, 'metrics': retired}, f)
+                os.replace(temp_path, retired_path)
+                for path in dead:
+                    os.remove(path)
+            except OSError as e:
+                print(f"Warning: could not fold exited workers' metrics: {e}")
+
+    def _load_snapshots(self):
+        own_pid = os.getpid()
+        loaded = [(own_pid, True, self.snapshot())]
+        if not self.directory or not os.path.isdir(self.directory):
+            return loaded
+        self._retire_dead_workers()
+        with self._directory_lock(exclusive=False):
+            for name in os.listdir(self.directory):
+                if not (name.startswith('metrics-') and name.endswith('.json')):
+                    continue
+                try:
+                    with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue  # being replaced by its worker
+                if data.get('pid') == own_pid:
+                    continue
+                loaded.append((data.get('pid'), _pid_alive(data.get('pid')), data.get('metrics', [])))
+        return loaded
+
+    def render(self):
+        """Prometheus text exposition of every worker's metrics"""
+        self.flush(force=True)
+        per_process = self._load_snapshots()
+        multi = len(per_process) > 1
+        families = {}
+        for pid, alive, snapshots in per_process:
+            for metric in snapshots:
+                family = families.get(metric['name'])
+                if family is None:
+                    family = families[metric['name']] = dict(metric, samples={})
+                    if multi and metric['type'] == 'gauge':
+                        family['labelnames'] = list(metric['labelnames']) + ['pid']
+                _merge_samples(family, metric, pid, alive, multi)
+        return ''.join(_render_family(family) for family in families.values())
+
+
+def _pid_alive(pid):
+    if not isinstance(pid, int):
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists but owned by someone else
+    return True
+
+
+def _merge_samples(family, metric, pid, alive, multi):
+    samples = family['samples']
+    kind = metric['type']
+    if kind == 'gauge':
+        if not alive:
+            return
+        for labels, value in metric['samples']:
+            samples[tuple(labels) + ((str(pid),) if multi else ())] = value
+        return
+    for labels, value in metric['samples']:
+        key = tuple(labels)
+        current = samples.get(key)
+        if kind == 'histogram':
+            if current is None or len(current[0]) != len(value[0]):
+                samples[key] = [list(value[0]), value[1], value[2]]
+            else:
+                current[0] = [a + b for a, b in zip(current[0], value[0])]
+                current[1] += value[1]
+                current[2] += value[2]
+        else:
+            samples[key] = (current or 0) + value
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_family(family):
+    name, names = family['name'], family['labelnames']
+    lines = [f"# HELP {name} {family['help']}", f"# TYPE {name} {family['type']}"]
+    for labels, value in sorted(family['samples'].items()):
+        if family['type'] == 'histogram':
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(list(family['buckets']) + [math.inf], counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{name}_bucket{_labels(names, labels, (le,))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(names, labels)} {count}")
+        else:
+            lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry(
+    enabled=os.environ.get('METRICS_ENABLED', 'false').lower() == 'true',
+    directory=os.environ.get('UNIFY_METRICS_DIR') or None,
+    flush_interval=float(os.environ.get('UNIFY_METRICS_FLUSH_INTERVAL', '5')),
+)
+
+
+if hasattr(os, 'register_at_fork'):  # POSIX only
+    os.register_at_fork(after_in_child=_registry._reset_after_fork)
+
+
+def get_metrics_registry():
+    """Get the process-wide metrics registry"""
+    return _registry
+
+
+REQUEST_LATENCY = _registry.histogram(
+    'unify_http_request_duration_seconds', 'HTTP request latency', ('blueprint', 'endpoint'))
+REQUESTS = _registry.counter(
+    'unify_http_requests_total', 'HTTP requests by response status', ('blueprint', 'endpoint', 'status'))
+DB_CONNECTIONS = _registry.counter(
+    'unify_db_connections_total', 'Connections handed out by DatabaseConnection.get_connection', ('backend',))
+DB_CONNECTIONS_PER_REQUEST = _registry.histogram(
+    'unify_db_connections_per_request', 'DatabaseConnection.get_connection calls per request',
+    buckets=COUNT_BUCKETS)
+DB_QUERIES_PER_REQUEST = _registry.histogram(
+    'unify_db_queries_per_request', 'SQL statements per request (needs DB_QUERY_INSTRUMENTATION)',
+    buckets=COUNT_BUCKETS)
+LLM_LATENCY = _registry.histogram(
+    'unify_llm_request_duration_seconds', 'LLM generation latency', ('provider',))
+LLM_ERRORS = _registry.counter(
+    'unify_llm_errors_total', 'Failed LLM generations', ('provider',))
+SUMMARIZATION_QUEUE = _registry.gauge(
+    'unify_summarization_queue_depth', 'Note summarizations waiting for or running model inference')
+MODEL_INFERENCE = _registry.histogram(
+    'unify_model_inference_seconds', 'Summarization model inference time per chunk', ('model',))
+
+
+def _request_counters():
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return None
+    return g if has_request_context() else None
+
+
+def count_db_connection(backend):
+    """Called by DatabaseConnection.get_connection"""
+    if not _registry.enabled:
+        return
+    DB_CONNECTIONS.inc(backend)
+    request_g = _request_counters()
+    if request_g is not None:
+        request_g.metrics_db_connections = request_g.get('metrics_db_connections', 0) + 1
+
+
+def record_llm_call(provider, seconds, failed=False):
+    if not _registry.enabled:
+        return
+    LLM_LATENCY.observe(seconds, provider)
+    if failed:
+        LLM_ERRORS.inc(provider)
+
+
+@contextmanager
+def track_summarization():
+    """Counts a summarization in the queue depth gauge while it runs"""
+    if not _registry.enabled:
+        yield
+        return
+    SUMMARIZATION_QUEUE.inc()
+    try:
+        yield
+    finally:
+        SUMMARIZATION_QUEUE.dec()
+
+
+@contextmanager
+def time_inference(model):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _registry.enabled:
+            MODEL_INFERENCE.observe(time.perf_counter() - start, model)
+
+
+def _collect_db_pools():
+    from core.db_singleton import DatabaseConnection
+
+    connections = Gauge('unify_db_pool_connections', 'Pooled connections by state', ('pool', 'state'))
+    max_size = Gauge('unify_db_pool_max_size', 'Pool size limit', ('pool',))
+    waits = Counter('unify_db_pool_waits_total', 'Checkouts that had to wait for a connection', ('pool',))
+    timeouts = Counter('unify_db_pool_timeouts_total', 'Checkouts that timed out', ('pool',))
+    stats = DatabaseConnection().get_pool_stats()
+    tenants = stats.pop('tenants', {})
+    for name, pool in stats.items():
+        connections.set(pool['in_use'], name, 'in_use')
+        connections.set(pool['idle'], name, 'idle')
+        max_size.set(pool['max_size'], name)
+        waits.inc(name, amount=pool['waits'])
+        timeouts.inc(name, amount=pool['timeouts'])
+    connections.set(tenants.get('open_connections', 0), 'tenants', 'open')
+    max_size.set(tenants.get('max_open_connections', 0), 'tenants')
+    return [connections, max_size, waits, timeouts]
+
+
+def _collect_caches():
+    from core.config_cache import get_all_cache_stats
+
+    hits = Counter('unify_cache_hits_total', 'Cache hits', ('cache',))
+    misses = Counter('unify_cache_misses_total', 'Cache misses', ('cache',))
+    size = Gauge('unify_cache_entries', 'Cached entries', ('cache',))
+    for stats in get_all_cache_stats():
+        hits.inc(stats['name'], amount=stats['hits'])
+        misses.inc(stats['name'], amount=stats['misses'])
+        size.inc(stats['name'], amount=stats['size'])
+    return [hits, misses, size]
+
+
+def _collect_queries():
+    from core.query_instrumentation import get_query_instrumentation
+
+    stats = get_query_instrumentation().get_stats()
+    queries = Counter('unify_db_queries_total', 'SQL statements executed (needs DB_QUERY_INSTRUMENTATION)')
+    slow = Counter('unify_db_slow_queries_total', 'Statements over SLOW_QUERY_THRESHOLD_MS')
+    seconds = Counter('unify_db_query_seconds_total', 'Time spent executing SQL statements')
+    queries.inc(amount=stats['total_queries'])
+    slow.inc(amount=stats['slow_queries'])
+    seconds.inc(amount=stats['total_time_ms'] / 1000.0)
+    return [queries, slow, seconds]
+
+
+for _collector in (_collect_db_pools, _collect_caches, _collect_queries):
+    _registry.add_collector(_collector)
+
+
+def init_app(app):
+    """
+    Time every request and serve /metrics.
+    Set METRICS_TOKEN to require "Authorization: Bearer <token>" on scrapes.
+    """
+    from flask import Response, g, request
+    from core.query_instrumentation import get_query_instrumentation, get_request_query_stats
+
+    registry = get_metrics_registry()
+    registry.enabled = True
+    token = os.environ.get('METRICS_TOKEN') or None
+
+    @app.before_request
+    def _start_request_metrics():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+        # Unmatched URLs share one label value so scanners cannot blow up cardinality
+        endpoint = request.endpoint if request.url_rule is not None else '<unmatched>'
+        blueprint = request.blueprint or ''
+        REQUEST_LATENCY.observe(time.perf_counter() - started, blueprint, endpoint)
+        REQUESTS.inc(blueprint, endpoint, response.status_code)
+        DB_CONNECTIONS_PER_REQUEST.observe(g.get('metrics_db_connections', 0))
+        if get_query_instrumentation().enabled:
+            query_stats = get_request_query_stats()
+            if query_stats is not None:
+                DB_QUERIES_PER_REQUEST.observe(query_stats['count'])
+        registry.flush()
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        if token is not None and not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
@@ -2,10 +2,19 @@
 Multi-Tenant Database Connection Manager
 Manages separate database connections for each user/tenant
 """
-import pyodbc
+try:
+    import pyodbc
+except ImportError:  # Only required for SQL Server databases
+    pyodbc = None
 import sqlite3
 import os
 from threading import Lock
+from core import sqlite_tuning, bulk_operations
+from core.connection_pool import get_tenant_pool_registry
+from core.query_instrumentation import get_query_instrumentation
+from core.config_cache import create_tenant_config_cache, invalidate_tenant_config
+from core.tenant_context import get_current_tenant, set_current_tenant
+from core.sql_dialect import DialectConnection, SQLITE, SQLITE_DETECT_TYPES
 
 class MultiTenantDatabaseManager:
     """
@@ -33,25 +42,54 @@ class MultiTenantDatabaseManager:
             )
             
             # Cache for user database connections (user_id -> connection_config)
-            self.user_db_configs = {}
+            # Bounded LRU/TTL cache of per-user database configs
+            self.user_db_configs = create_tenant_config_cache('multi_tenant')
             
-            # Current user context (thread-local would be better for production)
-            self.current_user_id = None
+            # Reuse open tenant connections through an LRU of per-tenant pools
+            # capped by TENANT_MAX_OPEN_CONNECTIONS (see core.connection_pool)
+            self.pool_enabled = os.environ.get('DB_POOL_ENABLED', 'false').lower() == 'true'
             
             self.initialized = True
     
+    @property
+    def current_user_id(self):
+        """Tenant of the current request/thread (see core.tenant_context)"""
+        return get_current_tenant()
+    
+    @current_user_id.setter
+    def current_user_id(self, user_id):
+        set_current_tenant(user_id)
+    
+    def enable_pooling(self, enabled=True):
+        """Enable or disable per-tenant connection pooling"""
+        self.pool_enabled = enabled
+    
+    def get_pool_stats(self):
+        """Statistics of the per-tenant pool registry"""
+        return get_tenant_pool_registry().get_stats()
+    
+    def get_config_cache_stats(self):
+        """Hit/miss counters of the user database config cache"""
+        return self.user_db_configs.get_stats()
+    
+    def invalidate_user_db_config(self, user_id=None):
+        """Forget a user's cached database config (all users if None)"""
+        invalidate_tenant_config(user_id)
+    
     def get_main_connection(self):
         """Get connection to main/admin database"""
+        if pyodbc is None:
+            raise RuntimeError("pyodbc is not installed; cannot connect to the main SQL Server database")
         try:
             conn = pyodbc.connect(self.main_connection_string)
-            return conn
+            return get_query_instrumentation().wrap(conn)
         except Exception as e:
             print(f"ERROR connecting to main database: {e}")
             raise
     
     def set_current_user(self, user_id):
-        """Set the current user context"""
-        self.current_user_id = user_id
+        """Set the current user context (scoped to the current request/thread)"""
+        set_current_tenant(user_id)
     
     def get_current_user(self):
         """Get the current user context"""
@@ -59,8 +97,9 @@ class MultiTenantDatabaseManager:
     
     def load_user_db_config(self, user_id):
         """Load database configuration for a specific user"""
-        if user_id in self.user_db_configs:
-            return self.user_db_configs[user_id]
+        config = self.user_db_configs.get(user_id)
+        if config is not None:
+            return config
         
         # Load from main database
         try:
@@ -89,7 +128,7 @@ class MultiTenantDatabaseManager:
                     'db_path': row[8],
                     'is_active': row[9]
                 }
-                self.user_db_configs[user_id] = config
+                self.user_db_configs.set(user_id, config)
                 cursor.close()
                 conn.close()
                 return config
@@ -124,7 +163,7 @@ class MultiTenantDatabaseManager:
             'is_active': True
         }
         
-        self.user_db_configs[user_id] = config
+        self.user_db_configs.set(user_id, config)
         return config
     
     def get_user_connection(self, user_id=None):
@@ -139,29 +178,46 @@ class MultiTenantDatabaseManager:
         config = self.load_user_db_config(user_id)
         
         if config['db_type'] == 'sqlite':
-            return self._get_sqlite_connection(config)
+            conn = self._get_sqlite_connection(config)
         elif config['db_type'] == 'sqlserver':
-            return self._get_sqlserver_connection(config)
+            conn = self._get_sqlserver_connection(config)
         elif config['db_type'] == 'mysql':
-            return self._get_mysql_connection(config)
+            conn = self._get_mysql_connection(config)
         elif config['db_type'] == 'postgresql':
-            return self._get_postgresql_connection(config)
+            conn = self._get_postgresql_connection(config)
         else:
             raise ValueError(f"Unsupported database type: {config['db_type']}")
+        return get_query_instrumentation().wrap(conn)
     
     def _get_sqlite_connection(self, config):
         """Get SQLite connection"""
         try:
             db_path = config['db_path']
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-            return conn
+            if self.pool_enabled:
+                conn = get_tenant_pool_registry().acquire(
+                    ('sqlite', db_path, 'row'),
+                    lambda: self._open_sqlite_connection(db_path, check_same_thread=False),
+                    name=f"sqlite:{os.path.basename(db_path)}"
+                )
+            else:
+                conn = self._open_sqlite_connection(db_path)
+            # Repositories write T-SQL; the dialect layer rewrites it for SQLite
+            return DialectConnection(conn, SQLITE)
         except Exception as e:
             print(f"ERROR connecting to SQLite database: {e}")
             raise
     
+    def _open_sqlite_connection(self, db_path, check_same_thread=True):
+        """Open a new SQLite connection"""
+        conn = sqlite_tuning.connect(db_path, check_same_thread=check_same_thread,
+                                     detect_types=SQLITE_DETECT_TYPES)
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        return conn
+    
     def _get_sqlserver_connection(self, config):
         """Get SQL Server connection"""
+        if pyodbc is None:
+            raise RuntimeError("pyodbc is not installed; cannot open a SQL Server tenant database")
         try:
             connection_string = (
                 f"DRIVER={{ODBC Driver 17 for SQL Server}};"
@@ -174,6 +230,12 @@ class MultiTenantDatabaseManager:
             else:
                 connection_string += "Trusted_Connection=yes;"
             
+            if self.pool_enabled:
+                return get_tenant_pool_registry().acquire(
+                    ('sqlserver', connection_string),
+                    lambda: pyodbc.connect(connection_string),
+                    name=f"sqlserver:{config['db_host']}/{config['db_name']}"
+                )
             conn = pyodbc.connect(connection_string)
             return conn
         except Exception as e:
@@ -305,6 +367,40 @@ class MultiTenantDatabaseManager:
             conn.close()
             raise
     
+    def execute_many(self, query, params_seq, chunk_size=bulk_operations.DEFAULT_CHUNK_SIZE, user_id=None):
+        """
+        Execute INSERT/UPDATE/DELETE for many parameter tuples on user's database in one
+        transaction (fast_executemany on SQL Server). Returns rows processed.
+        """
+        conn = self.get_user_connection(user_id)
+        try:
+            count = bulk_operations.execute_many(conn, query, params_seq, chunk_size)
+            conn.commit()
+            conn.close()
+            return count
+        except Exception as e:
+            print(f"Error executing bulk update: {e}")
+            conn.rollback()
+            conn.close()
+            raise
+    
+    def bulk_insert(self, table, columns, rows, id_column=None, chunk_size=None, user_id=None):
+        """
+        Insert many rows on user's database in one transaction.
+        Returns the generated ids in row order when id_column is given.
+        """
+        conn = self.get_user_connection(user_id)
+        try:
+            ids = bulk_operations.bulk_insert(conn, table, columns, rows, id_column, chunk_size)
+            conn.commit()
+            conn.close()
+            return ids
+        except Exception as e:
+            print(f"Error executing bulk insert: {e}")
+            conn.rollback()
+            conn.close()
+            raise
+    
     def initialize_user_database(self, user_id, db_type='sqlite', **kwargs):
         """Initialize a new database for a user"""
         if db_type == 'sqlite':
@@ -335,7 +431,7 @@ class MultiTenantDatabaseManager:
                 'is_active': True
             }
             
-            self.user_db_configs[user_id] = config
+            self.user_db_configs.set(user_id, config)
             
             # Save configuration
             self._save_user_db_config(config)
@@ -445,6 +541,9 @@ class MultiTenantDatabaseManager:
             cursor.close()
             conn.close()
             
+            # Every manager re-reads the saved row on next use
+            invalidate_tenant_config(config['user_id'])
+            
         except Exception as e:
             print(f"Error saving user database config: {e}")
 
@@ -0,0 +1,152 @@
+"""
+Keyset Pagination
+Opaque page cursors, seek-method page queries and fetchmany() streaming
+shared by repositories and list endpoints
+"""
+import base64
+import binascii
+import json
+from core.sql_dialect import dialect_for
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that was not issued by encode_cursor()"""
+
+
+class Page:
+    """One page of results plus the cursor for the next page (None on the last page)"""
+
+    def __init__(self, items, next_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_more(self):
+        return self.next_cursor is not None
+
+    def to_dict(self, serialize=None):
+        serialize = serialize or (lambda item: item.to_dict())
+        return {
+            'items': [serialize(item) for item in self.items],
+            'next_cursor': self.next_cursor,
+            'has_more': self.has_more,
+        }
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(key):
+    """Opaque, URL-safe token for the last key of a page"""
+    raw = json.dumps({'k': key}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Key encoded in `token`; None for the first page"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))['k']
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+    if not isinstance(key, int) or isinstance(key, bool):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return key
+
+
+def clamp_page_size(limit):
+    """Page size bounded to 1..MAX_PAGE_SIZE (DEFAULT_PAGE_SIZE when not given)"""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def parse_page_args(args):
+    """
+    Read ?limit=&cursor= from request.args.
+    Raises InvalidCursorError for a malformed cursor.
+    """
+    limit = clamp_page_size(args.get('limit', type=int))
+    cursor = args.get('cursor') or None
+    decode_cursor(cursor)
+    return limit, cursor
+
+
+def fetch_page(conn, select_sql, key_column, row_mapper, cursor=None, limit=None,
+               descending=False, where=None, params=(), key_index=0):
+    """
+    Seek-method page: rows after the cursor's key, ordered by `key_column`.
+
+    `select_sql` is a SELECT without WHERE/ORDER BY; `where` adds a filter with
+    `params`. One extra row is fetched to tell whether another page exists,
+    so cost stays flat however deep the client pages.
+    """
+    limit = clamp_page_size(limit)
+    after = decode_cursor(cursor)
+
+    conditions = [where] if where else []
+    query_params = list(params)
+    if after is not None:
+        conditions.append(f"{key_column} {'<' if descending else '>'} ?")
+        query_params.append(after)
+    query = select_sql
+    if conditions:
+        query += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+    query += f" ORDER BY {key_column} {'DESC' if descending else 'ASC'}"
+    query = dialect_for(conn).limit(query, limit + 1)
+
+    db_cursor = conn.cursor()
+    try:
+        if query_params:
+            db_cursor.execute(query, tuple(query_params))
+        else:
+            db_cursor.execute(query)
+        rows = db_cursor.fetchall()
+    finally:
+        db_cursor.close()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][key_index])
+    return Page([row_mapper(row) for row in rows], next_cursor)
+
+
+def iter_rows(cursor, batch_size=STREAM_BATCH_SIZE):
+    """Yield rows from an executed cursor `batch_size` at a time via fetchmany()"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        for row in rows:
+            yield row
+
+
+def stream_query(db_connection, query, row_mapper, params=(), batch_size=STREAM_BATCH_SIZE):
+    """
+    Generator over a whole result set that holds at most `batch_size` rows in memory.
+    The connection stays checked out until the generator is exhausted or closed.
+    """
+    conn = db_connection.get_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            for row in iter_rows(cursor, batch_size):
+                yield row_mapper(row)
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
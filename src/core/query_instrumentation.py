@@ -0,0 +1,301 @@
+"""
+SQL Query Instrumentation
+Times every statement run through DatabaseConnection / MultiTenantDatabaseManager,
+counts queries per request, logs slow statements and flags N+1 patterns
+"""
+import os
+import sys
+import time
+import threading
+from datetime import datetime
+
+
+class QueryInstrumentation:
+    """
+    Process-wide instrumentation settings and slow-query log.
+
+    Configuration (environment):
+        DB_QUERY_INSTRUMENTATION  enable cursor wrapping (default false)
+        SLOW_QUERY_THRESHOLD_MS   statements slower than this are logged (default 200)
+        SLOW_QUERY_LOG            slow-query log file (default logs/slow_queries.log)
+        N_PLUS_ONE_THRESHOLD      warn when one request repeats a statement more
+                                  than this many times (default 10)
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get('DB_QUERY_INSTRUMENTATION', 'false').lower() == 'true'
+        self.slow_query_threshold_ms = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '200'))
+        self.slow_query_log = os.environ.get('SLOW_QUERY_LOG', os.path.join('logs', 'slow_queries.log'))
+        self.n_plus_one_threshold = int(os.environ.get('N_PLUS_ONE_THRESHOLD', '10'))
+        self._log_lock = threading.Lock()
+        self._totals_lock = threading.Lock()
+        self.total_queries = 0
+        self.total_time_ms = 0.0
+        self.slow_queries = 0
+
+    def configure(self, enabled=None, slow_query_threshold_ms=None, slow_query_log=None,
+                  n_plus_one_threshold=None):
+        """Override settings at runtime (e.g. from tests or app config)"""
+        if enabled is not None:
+            self.enabled = enabled
+        if slow_query_threshold_ms is not None:
+            self.slow_query_threshold_ms = slow_query_threshold_ms
+        if slow_query_log is not None:
+            self.slow_query_log = slow_query_log
+        if n_plus_one_threshold is not None:
+            self.n_plus_one_threshold = n_plus_one_threshold
+
+    def wrap(self, conn):
+        """Wrap a connection so its cursors are timed (no-op when disabled)"""
+        if not self.enabled or conn is None or isinstance(conn, InstrumentedConnection):
+            return conn
+        return InstrumentedConnection(conn, self)
+
+    def record(self, statement, params, elapsed_ms, rows, source):
+        """Record one executed statement"""
+        with self._totals_lock:
+            self.total_queries += 1
+            self.total_time_ms += elapsed_ms
+
+        stats = _get_request_stats()
+        if stats is not None:
+            stats['count'] += 1
+            stats['time_ms'] += elapsed_ms
+            key = _normalize(statement)
+            repeats = stats['statements'].get(key, 0) + 1
+            stats['statements'][key] = repeats
+            if repeats == self.n_plus_one_threshold + 1:
+                stats['n_plus_one'].append({'statement': key, 'source': source})
+                print(f"Warning: possible N+1 query - statement repeated more than "
+                      f"{self.n_plus_one_threshold} times in one request (from {source}): {key[:200]}")
+
+        if elapsed_ms >= self.slow_query_threshold_ms:
+            with self._totals_lock:
+                self.slow_queries += 1
+            self._log_slow_query(statement, params, elapsed_ms, rows, source)
+
+    def _log_slow_query(self, statement, params, elapsed_ms, rows, source):
+        line = (f"{datetime.now().isoformat(timespec='seconds')}\t{elapsed_ms:.1f}ms\t"
+                f"rows={rows}\t{source}\t{_normalize(statement)}\tparams={_format_params(params)}\n")
+        try:
+            with self._log_lock:
+                log_dir = os.path.dirname(self.slow_query_log)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                with open(self.slow_query_log, 'a', encoding='utf-8') as f:
+                    f.write(line)
+        except OSError as e:
+            print(f"Warning: could not write slow query log: {e}")
+
+    def get_stats(self):
+        """Process-wide totals since startup"""
+        with self._totals_lock:
+            return {
+                'enabled': self.enabled,
+                'total_queries': self.total_queries,
+                'total_time_ms': round(self.total_time_ms, 3),
+                'slow_queries': self.slow_queries,
+            }
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors report timings to QueryInstrumentation"""
+
+    def __init__(self, conn, instrumentation):
+        self._raw = conn
+        self._instrumentation = instrumentation
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs), self._instrumentation)
+
+    def execute(self, statement, *args):
+        # sqlite3 shortcut: conn.execute() creates its own cursor
+        cursor = self.cursor()
+        return cursor.execute(statement, *args)
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class InstrumentedCursor:
+    """
+    Cursor proxy that times execute()/executemany().
+    The statement is recorded when the cursor is closed or re-used so that
+    rows fetched by SELECTs are included in the row count.
+    """
+
+    def __init__(self, cursor, instrumentation):
+        self._cursor = cursor
+        self._instrumentation = instrumentation
+        self._pending = None
+        self._fetched = 0
+
+    def execute(self, statement, *args):
+        return self._timed(self._cursor.execute, statement, args[0] if args else None, args)
+
+    def executemany(self, statement, params_seq):
+        params_seq = list(params_seq)
+        return self._timed(self._cursor.executemany, statement, params_seq, (params_seq,))
+
+    def _timed(self, method, statement, params, args):
+        self._flush()
+        source = _find_caller()
+        start = time.perf_counter()
+        try:
+            result = method(statement, *args)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._pending = (statement, params, elapsed_ms, source)
+            self._fetched = 0
+        # sqlite3 returns the cursor itself; keep returning the proxy
+        return self if result is self._cursor else result
+
+    def _flush(self):
+        if self._pending is None:
+            return
+        statement, params, elapsed_ms, source = self._pending
+        self._pending = None
+        rowcount = getattr(self._cursor, 'rowcount', -1)
+        rows = rowcount if isinstance(rowcount, int) and rowcount >= 0 else self._fetched
+        self._instrumentation.record(statement, params, elapsed_ms, rows, source)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._fetched += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._fetched += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._fetched += len(rows)
+        return rows
+
+    def close(self):
+        self._flush()
+        self._cursor.close()
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._fetched += 1
+            yield row
+
+    def __del__(self):
+        try:
+            self._flush()
+        except Exception:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # e.g. cursor.fast_executemany = True must reach the driver cursor
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+
+_instrumentation = None
+_instrumentation_lock = threading.Lock()
+
+
+def get_query_instrumentation():
+    """Get the process-wide query instrumentation"""
+    global _instrumentation
+    if _instrumentation is None:
+        with _instrumentation_lock:
+            if _instrumentation is None:
+                _instrumentation = QueryInstrumentation()
+    return _instrumentation
+
+
+def _get_request_stats():
+    """Per-request counters stored on flask.g (None outside a request)"""
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return None
+    if not has_request_context():
+        return None
+    stats = g.get('db_query_stats')
+    if stats is None:
+        stats = {'count': 0, 'time_ms': 0.0, 'statements': {}, 'n_plus_one': []}
+        g.db_query_stats = stats
+    return stats
+
+
+def get_request_query_stats():
+    """Return the current request's query count, time and N+1 findings"""
+    stats = _get_request_stats()
+    if stats is None:
+        return None
+    return {
+        'count': stats['count'],
+        'time_ms': round(stats['time_ms'], 3),
+        'n_plus_one': list(stats['n_plus_one']),
+    }
+
+
+_INTERNAL_FILES = {
+    'query_instrumentation.py', 'db_singleton.py', 'multi_tenant_db.py',
+    'bulk_operations.py', 'unit_of_work.py', 'connection_pool.py', 'sql_dialect.py',
+}
+
+
+def _find_caller():
+    """Name the repository/service method that issued the statement"""
+    frame = sys._getframe(1)
+    fallback = None
+    depth = 0
+    while frame is not None and depth < 25:
+        name = os.path.basename(frame.f_code.co_filename)
+        if name not in _INTERNAL_FILES:
+            if name.endswith('.repository.py'):
+                return f"{name[:-len('.repository.py')]}.{frame.f_code.co_name}"
+            if fallback is None:
+                fallback = f"{os.path.splitext(name)[0]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+        depth += 1
+    return fallback or 'unknown'
+
+
+def _normalize(statement):
+    return " ".join(str(statement).split())
+
+
+def _format_params(params):
+    text = repr(params)
+    return text if len(text) <= 200 else text[:197] + '...'
+
+
+def init_app(app):
+    """
+    Reset the per-request counters and expose them as response headers.
+    X-DB-Query-Count / X-DB-Query-Time-Ms are only added when instrumentation is on.
+    """
+    from flask import g
+
+    @app.before_request
+    def _reset_query_stats():
+        g.db_query_stats = {'count': 0, 'time_ms': 0.0, 'statements': {}, 'n_plus_one': []}
+
+    @app.after_request
+    def _report_query_stats(response):
+        stats = g.get('db_query_stats')
+        if stats is not None and get_query_instrumentation().enabled:
+            response.headers['X-DB-Query-Count'] = str(stats['count'])
+            response.headers['X-DB-Query-Time-Ms'] = f"{stats['time_ms']:.1f}"
+        return response
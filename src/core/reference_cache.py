@@ -0,0 +1,251 @@
+"""
+Reference Data Cache
+Read-through second-level cache for rarely-changing tables (courses,
+instructors, schedule slots), kept coherent across worker processes by
+per-region version counters stored in the database
+"""
+import os
+import threading
+import time
+import weakref
+
+from core.config_cache import TTLCache
+from core.db_singleton import DatabaseConnection
+from core.invalidation_bus import publish, subscribe
+from core.tenant_context import get_current_tenant
+from core.unit_of_work import get_current_unit_of_work, on_commit
+
+VERSION_TABLE = "Cache_Version"
+
+# Deleting an instructor cascades to their courses, and a course to its slots,
+# so a write to a region also invalidates the regions that depend on it.
+_DEPENDENTS = {
+    'instructor': ('course', 'course_schedule_slot'),
+    'course': ('course_schedule_slot',),
+}
+
+_MISSING = object()
+
+# Regions each open unit of work has written to; until it commits, its own reads
+# of them bypass the cache and are not stored (they may still be rolled back)
+_stale_regions = weakref.WeakKeyDictionary()
+
+
+def _tenant_key():
+    if DatabaseConnection().multi_tenant_enabled:
+        return get_current_tenant()
+    return None
+
+
+def _written_in_unit_of_work(region):
+    uow = get_current_unit_of_work()
+    return uow is not None and not uow.completed and region in _stale_regions.get(uow, ())
+
+
+class _VersionTracker:
+    """
+    Last seen Cache_Version rows per database (tenant).
+    The table is re-read at most every `check_interval` seconds; a region whose
+    counter moved since the last read is cleared in this process.
+    """
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self._seen = {}  # tenant -> (checked_at, {region: version})
+        self._ready = set()  # tenants whose version table exists
+        self._lock = threading.Lock()
+
+    def _ensure_table(self, db, tenant):
+        if tenant in self._ready:
+            return
+        db.create_table(VERSION_TABLE, """
+            Region NVARCHAR(50) PRIMARY KEY,
+            Version INT NOT NULL DEFAULT 0
+        """)
+        for region in _caches:
+            try:
+                db.execute_update(
+                    f"INSERT INTO {VERSION_TABLE} (Region, Version) SELECT ?, 0 "
+                    f"WHERE NOT EXISTS (SELECT 1 FROM {VERSION_TABLE} WHERE Region = ?)",
+                    (region, region))
+            except Exception:
+                # Another process seeded the row first
+                pass
+        self._ready.add(tenant)
+
+    def sync(self):
+        """
+        Re-read the version counters if the check interval has passed.
+        Returns False when the counters cannot be read (callers then bypass the cache).
+        """
+        tenant = _tenant_key()
+        now = time.monotonic()
+        seen = self._seen.get(tenant)
+        if seen is not None and now - seen[0] < self.check_interval:
+            return True
+        try:
+            db = DatabaseConnection()
+            self._ensure_table(db, tenant)
+            rows = db.fetch_all(f"SELECT Region, Version FROM {VERSION_TABLE}")
+        except Exception as e:
+            print(f"Warning: reference cache versions unavailable: {e}")
+            return False
+        versions = {row[0]: row[1] for row in rows}
+        with self._lock:
+            previous = self._seen.get(tenant)
+            self._seen[tenant] = (now, versions)
+        if previous is not None:
+            for region, version in versions.items():
+                if previous[1].get(region) != version and region in _caches:
+                    _caches[region].clear_local()
+        return True
+
+    def bump(self, regions):
+        """Increment the counters of `regions` so other processes drop them"""
+        tenant = _tenant_key()
+        db = DatabaseConnection()
+        bumped = []
+        try:
+            self._ensure_table(db, tenant)
+            for region in regions:
+                db.execute_update(
+                    f"UPDATE {VERSION_TABLE} SET Version = Version + 1 WHERE Region = ?", (region,))
+                bumped.append(region)
+        except Exception as e:
+            print(f"Warning: could not bump reference cache version: {e}")
+        with self._lock:
+            # Account for our own bump (this process is already cleared); if another
+            # process bumped concurrently the counters still differ on the next read
+            seen = self._seen.get(tenant)
+            if seen is not None:
+                versions = dict(seen[1])
+                for region in bumped:
+                    versions[region] = versions.get(region, 0) + 1
+                self._seen[tenant] = (seen[0], versions)
+
+    def version(self, region):
+        """Last read counter of `region` (re-read per the check interval), or None if unavailable"""
+        if not self.sync():
+            return None
+        seen = self._seen.get(_tenant_key())
+        return seen[1].get(region, 0) if seen is not None else None
+
+    def reset(self):
+        with self._lock:
+            self._seen.clear()
+            self._ready.clear()
+
+
+class ReferenceCache:
+    """Per-region read-through cache; values are whatever the loader returns"""
+
+    def __init__(self, region):
+        self.region = region
+        self._entries = TTLCache(
+            max_size=int(os.environ.get('REFERENCE_CACHE_SIZE', '10000')),
+            ttl=float(os.environ.get('REFERENCE_CACHE_TTL', '3600')),
+            name=f"reference:{region}",
+        )
+        # Bumped on every clear so a load that raced with a write is not stored
+        self._generation = 0
+
+    def get(self, key, loader):
+        """Cached value for `key`, calling `loader()` on a miss"""
+        if _written_in_unit_of_work(self.region) or not _tracker.sync():
+            return loader()
+        cache_key = (_tenant_key(), key)
+        value = self._entries.get(cache_key, _MISSING)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        value = loader()
+        if generation == self._generation and not _written_in_unit_of_work(self.region):
+            self._entries.set(cache_key, value)
+        return value
+
+    def get_many(self, keys, loader):
+        """
+        {key: value} for every key; `loader(missing_keys)` returns a dict for the
+        keys not cached, and keys it leaves out are cached as None
+        """
+        keys = list(keys)
+        if _written_in_unit_of_work(self.region) or not _tracker.sync():
+            loaded = loader(keys)
+            return {key: loaded.get(key) for key in keys}
+        tenant = _tenant_key()
+        found = {}
+        missing = []
+        for key in keys:
+            value = self._entries.get((tenant, key), _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            generation = self._generation
+            loaded = loader(missing)
+            store = generation == self._generation and not _written_in_unit_of_work(self.region)
+            for key in missing:
+                found[key] = loaded.get(key)
+                if store:
+                    self._entries.set((tenant, key), found[key])
+        return found
+
+    def clear_local(self):
+        self._generation += 1
+        self._entries.clear()
+
+    def invalidate(self):
+        """Drop this region (and its dependents) here and in every other process, once the write commits"""
+        regions = (self.region,) + _DEPENDENTS.get(self.region, ())
+        uow = get_current_unit_of_work()
+        if uow is not None and not uow.completed:
+            _stale_regions.setdefault(uow, set()).update(regions)
+        on_commit(lambda: self._invalidate_now(regions))
+
+    def _invalidate_now(self, regions):
+        # The bus clears other workers on their next poll; the version bump
+        # covers workers that run without the bus
+        publish(*(f"{region}:*" for region in regions))
+        _tracker.bump(regions)
+
+    def get_stats(self):
+        return self._entries.get_stats()
+
+
+_tracker = _VersionTracker(float(os.environ.get('REFERENCE_CACHE_VERSION_CHECK_INTERVAL', '5')))
+_caches = {region: ReferenceCache(region) for region in ('instructor', 'course', 'course_schedule_slot')}
+
+
+def _clear_region_handler(cache):
+    # Any "<region>:..." topic clears the whole region; entries are not keyed by row
+    return lambda key: cache.clear_local()
+
+
+for _region in _caches:
+    subscribe(_region, _clear_region_handler(_caches[_region]))
+
+
+def get_reference_cache(region):
+    """Cache for 'course', 'instructor' or 'course_schedule_slot'"""
+    return _caches[region]
+
+
+def get_region_version(region):
+    """
+    Cache_Version counter of a region as this process last saw it (includes its
+    own bumps; other processes' bumps show up within the check interval)
+    """
+    return _tracker.version(region)
+
+
+def clear_reference_caches():
+    """Drop every cached entry in this process and forget the seen versions"""
+    for cache in _caches.values():
+        cache.clear_local()
+    _tracker.reset()
+
+
+def get_reference_cache_stats():
+    """Hit/miss counters of every reference data region"""
+    return [cache.get_stats() for cache in _caches.values()]
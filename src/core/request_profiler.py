@@ -0,0 +1,262 @@
+"""
+Request Profiler
+Per-request Server-Timing headers (wall, DB, LLM, model time and query count)
+plus on-demand cProfile / collapsed-stack captures of individual requests
+"""
+import cProfile
+import fnmatch
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_HEADER = 'X-Unify-Profile'
+PROFILE_FORMAT_HEADER = 'X-Unify-Profile-Format'
+FORMATS = ('pstats', 'collapsed')
+
+
+def _parse_sample_rules(text):
+    """'/api/stats=1,/course-registration/*=0.05' -> [(pattern, rate)]"""
+    rules = []
+    for item in (text or '').split(','):
+        pattern, _, rate = item.strip().partition('=')
+        if pattern:
+            rules.append((pattern, float(rate) if rate else 1.0))
+    return rules
+
+
+class RequestProfiler:
+    """
+    Process-wide request profiling settings.
+
+    Configuration (environment):
+        REQUEST_PROFILING_ENABLED  Server-Timing headers and captures (default false)
+        REQUEST_PROFILE_SECRET     a request whose X-Unify-Profile header equals
+                                   this value is captured (unset: header ignored)
+        REQUEST_PROFILE_SAMPLE     path patterns and capture rates, e.g.
+                                   "/api/stats=1,/course-registration/api/*=0.05"
+        REQUEST_PROFILE_FORMAT     pstats (cProfile dump, default) or collapsed
+                                   (folded stacks for flamegraph.pl / speedscope)
+        REQUEST_PROFILE_DIR        where captures are written (default logs/profiles)
+        REQUEST_PROFILE_INTERVAL_MS  stack sampling interval for collapsed captures (default 1)
+    """
+
+    def __init__(self):
+        env = os.environ
+        self.enabled = env.get('REQUEST_PROFILING_ENABLED', 'false').lower() == 'true'
+        self.secret = env.get('REQUEST_PROFILE_SECRET') or None
+        self.sample_rules = _parse_sample_rules(env.get('REQUEST_PROFILE_SAMPLE'))
+        self.default_format = env.get('REQUEST_PROFILE_FORMAT', 'pstats').lower()
+        self.output_dir = env.get('REQUEST_PROFILE_DIR', os.path.join('logs', 'profiles'))
+        self.sample_interval = float(env.get('REQUEST_PROFILE_INTERVAL_MS', '1')) / 1000.0
+        self.captures = 0
+
+    def configure(self, enabled=None, secret=None, sample=None, default_format=None, output_dir=None):
+        """Override settings at runtime (e.g. from tests or app config)"""
+        if enabled is not None:
+            self.enabled = enabled
+        if secret is not None:
+            self.secret = secret or None
+        if sample is not None:
+            self.sample_rules = _parse_sample_rules(sample) if isinstance(sample, str) else list(sample)
+        if default_format is not None:
+            self.default_format = default_format
+        if output_dir is not None:
+            self.output_dir = output_dir
+
+    def capture_format(self, path, headers):
+        """The capture format for this request, or None to not capture it"""
+        token = headers.get(PROFILE_HEADER)
+        requested = token is not None and self.secret is not None and hmac.compare_digest(token, self.secret)
+        if not requested:
+            requested = any(fnmatch.fnmatchcase(path, pattern) and random.random() < rate
+                            for pattern, rate in self.sample_rules)
+        if not requested:
+            return None
+        fmt = (headers.get(PROFILE_FORMAT_HEADER) or self.default_format).lower()
+        return fmt if fmt in FORMATS else 'pstats'
+
+    def start_capture(self, fmt):
+        if fmt == 'collapsed':
+            capture = StackSampler(threading.get_ident(), self.sample_interval)
+        else:
+            capture = cProfile.Profile()
+        capture.enable()
+        return capture
+
+    def finish_capture(self, capture, fmt, endpoint):
+        """Stop `capture` and write it to the output directory; returns the file name"""
+        capture.disable()
+        label = re.sub(r'[^A-Za-z0-9_.-]+', '_', endpoint or 'unknown')
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        name = f"{stamp}-{label}-{os.getpid()}.{'prof' if fmt == 'pstats' else 'collapsed'}"
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, name)
+            if fmt == 'pstats':
+                capture.dump_stats(path)
+            else:
+                capture.write(path)
+        except OSError as e:
+            print(f"Warning: could not write request profile: {e}")
+            return None
+        self.captures += 1
+        return name
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a helper
+    thread and counts identical stacks (the "collapsed" flamegraph format).
+    Costs nothing for requests that are not captured.
+    """
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def enable(self):
+        self._thread = threading.Thread(target=self._run, name='request-stack-sampler', daemon=True)
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_request_profiler():
+    """Get the process-wide request profiler"""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = RequestProfiler()
+    return _profiler
+
+
+def _request_timings():
+    """{metric: [total ms, calls]} for the current request (None outside a request)"""
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return None
+    if not has_request_context():
+        return None
+    timings = g.get('request_timings')
+    if timings is None:
+        timings = {}
+        g.request_timings = timings
+    return timings
+
+
+def record_timing(metric, elapsed_ms):
+    """Add time spent in a subsystem ('llm', 'model', ...) to the current request"""
+    timings = _request_timings()
+    if timings is not None:
+        entry = timings.setdefault(metric, [0.0, 0])
+        entry[0] += elapsed_ms
+        entry[1] += 1
+
+
+@contextmanager
+def timed(metric):
+    """Time the enclosed block as `metric` in the current request's Server-Timing"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(metric, (time.perf_counter() - start) * 1000)
+
+
+def server_timing(total_ms, query_stats, timings):
+    """Server-Timing header value; 'app' is the wall time not spent in DB/LLM/model calls"""
+    parts = []
+    accounted = 0.0
+    if query_stats is not None:
+        accounted += query_stats['time_ms']
+        parts.append(f'db;dur={query_stats["time_ms"]:.1f};desc="{query_stats["count"]} queries"')
+    for metric, (elapsed_ms, calls) in sorted(timings.items()):
+        accounted += elapsed_ms
+        parts.append(f'{metric};dur={elapsed_ms:.1f};desc="{calls} calls"')
+    parts.append(f'app;dur={max(total_ms - accounted, 0.0):.1f}')
+    parts.insert(0, f'total;dur={total_ms:.1f}')
+    return ', '.join(parts)
+
+
+def init_app(app):
+    """
+    Add Server-Timing headers to every response and capture requests that ask
+    for it. DB time comes from core.query_instrumentation, which is switched on
+    with the profiler.
+    """
+    from flask import g, request
+    from core.query_instrumentation import get_query_instrumentation, get_request_query_stats
+
+    profiler = get_request_profiler()
+    get_query_instrumentation().configure(enabled=True)
+
+    @app.before_request
+    def _start_request_profile():
+        g.request_started = time.perf_counter()
+        g.request_timings = {}
+        fmt = profiler.capture_format(request.path, request.headers)
+        if fmt is not None:
+            try:
+                g.request_capture = (profiler.start_capture(fmt), fmt)
+            except ValueError as e:
+                # e.g. Python 3.12+ allows a single active cProfile per process
+                print(f"Warning: request not profiled: {e}")
+
+    @app.after_request
+    def _finish_request_profile(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        total_ms = (time.perf_counter() - started) * 1000
+        capture = g.pop('request_capture', None)
+        if capture is not None:
+            name = profiler.finish_capture(capture[0], capture[1], request.endpoint)
+            if name:
+                response.headers['X-Unify-Profile-File'] = name
+        response.headers['Server-Timing'] = server_timing(
+            total_ms, get_request_query_stats(), g.get('request_timings') or {})
+        return response
+
+    @app.teardown_request
+    def _abort_request_profile(exc):
+        # Unhandled errors skip after_request; never leave a profiler running
+        capture = g.pop('request_capture', None)
+        if capture is not None:
+            capture[0].disable()
@@ -4,7 +4,7 @@ Restricts access to routes based on user roles (Instructor, TA, Student)
 """
 from functools import wraps
 from flask import session, redirect, url_for, jsonify, request
-from repositories.repository_factory import RepositoryFactory
+from core.user_profile import get_user_profile
 
 
 def get_user_role(user_id):
@@ -17,28 +17,8 @@ def get_user_role(user_id):
     Returns:
         str: 'Instructor', 'TA', 'Student', or None
     """
-    if not user_id:
-        return None
-    
-    # Check if user is an instructor
-    instructor_repo = RepositoryFactory.get_repository("instructor")
-    instructor = instructor_repo.get_by_user_id(user_id)
-    if instructor:
-        return 'Instructor'
-    
-    # Check if user is a TA
-    ta_repo = RepositoryFactory.get_repository("teaching_assistant")
-    ta = ta_repo.get_by_user_id(user_id)
-    if ta:
-        return 'TA'
-    
-    # Check if user is a student
-    student_repo = RepositoryFactory.get_repository("student")
-    student = student_repo.get_by_user_id(user_id)
-    if student:
-        return 'Student'
-    
-    return None
+    profile = get_user_profile(user_id)
+    return profile.role if profile else None
 
 
 def requires_role(*allowed_roles):
@@ -0,0 +1,85 @@
+"""
+Row Decoder
+Shared, cached conversion of driver values (strings from SQLite, ints for BIT
+columns, ...) into Python types, built once per column layout
+"""
+from datetime import date, datetime, time
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def _parse_datetime(text):
+    # Many rows share timestamps (due dates, seeds); parse each distinct string once
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            return datetime.strptime(text, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return None
+
+
+def to_datetime(value):
+    """datetime from a driver value; unparseable strings become None"""
+    if value.__class__ is str:
+        return _parse_datetime(value) if value else None
+    return value
+
+
+def to_date(value):
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def to_time(value):
+    if isinstance(value, str):
+        try:
+            return time.fromisoformat(value)
+        except ValueError:
+            return None
+    return value
+
+
+def to_bool(value):
+    """BIT column as bool (None -> False)"""
+    return bool(value) if value is not None else False
+
+
+CONVERTERS = {
+    'datetime': to_datetime,
+    'date': to_date,
+    'time': to_time,
+    'bool': to_bool,
+}
+
+
+@lru_cache(maxsize=256)
+def row_decoder(*kinds, factory=None):
+    """
+    Return a function that decodes a row according to `kinds`, one entry per
+    column: a CONVERTERS key, or None to pass the value through.
+
+    The function is built once per column layout (and cached): it closes over
+    the (index, converter) pairs of the columns that need converting, so
+    pass-through columns cost nothing per row. With `factory`, the decoded
+    values are passed positionally to it (e.g. a model class) instead of being
+    returned as a tuple.
+    """
+    if factory is None and not any(kinds):
+        return tuple
+    width = len(kinds)
+    converters = tuple((index, CONVERTERS[kind]) for index, kind in enumerate(kinds) if kind)
+
+    def decode(row):
+        values = list(row)
+        del values[width:]
+        for index, convert in converters:
+            values[index] = convert(values[index])
+        return factory(*values) if factory is not None else tuple(values)
+    return decode
@@ -0,0 +1,160 @@
+"""
+Production Server
+Multi-worker WSGI server (gunicorn) with optional app/model preloading,
+worker recycling and graceful reload; started with `python -m unify serve`
+
+Signals sent to the master process:
+    HUP     graceful reload: start new workers, then stop the old ones once
+            their requests finish (re-imports the code unless preloaded)
+    TERM    graceful shutdown (workers get `graceful_timeout` seconds)
+    TTIN/TTOU  add/remove one worker
+
+With preloading the app (and optionally the summarization model) is loaded
+once in the master and shared with the workers copy-on-write; code changes
+then need a full restart (or USR2 followed by QUIT to the old master).
+"""
+import gc
+import os
+import tempfile
+
+
+def _env_bool(name, default='false'):
+    return os.environ.get(name, default).lower() == 'true'
+
+
+class ServerConfig:
+    """Server settings; defaults come from UNIFY_* environment variables"""
+
+    def __init__(self, bind=None, workers=None, threads=None, preload=None, preload_model=None,
+                 max_requests=None, max_requests_jitter=None, timeout=None, graceful_timeout=None):
+        env = os.environ
+        self.bind = bind or env.get('UNIFY_BIND', '0.0.0.0:5000')
+        self.workers = workers if workers is not None else int(env.get('UNIFY_WORKERS', '2'))
+        self.threads = threads if threads is not None else int(env.get('UNIFY_THREADS', '4'))
+        self.preload_model = preload_model if preload_model is not None else _env_bool('UNIFY_PRELOAD_MODEL')
+        # Sharing the model requires loading it before the fork, i.e. preloading the app
+        self.preload = (preload if preload is not None else _env_bool('UNIFY_PRELOAD')) or self.preload_model
+        # Recycle a worker after this many requests (0 = never) to bound memory growth;
+        # the jitter keeps workers from restarting at the same time
+        self.max_requests = max_requests if max_requests is not None else int(env.get('UNIFY_MAX_REQUESTS', '1000'))
+        self.max_requests_jitter = (max_requests_jitter if max_requests_jitter is not None
+                                    else int(env.get('UNIFY_MAX_REQUESTS_JITTER', '100')))
+        # LLM and summarization requests can legitimately take a while
+        self.timeout = timeout if timeout is not None else int(env.get('UNIFY_TIMEOUT', '120'))
+        self.graceful_timeout = (graceful_timeout if graceful_timeout is not None
+                                 else int(env.get('UNIFY_GRACEFUL_TIMEOUT', '30')))
+
+    def gunicorn_options(self):
+        return {
+            'bind': self.bind,
+            'workers': self.workers,
+            'threads': self.threads,
+            'worker_class': 'gthread' if self.threads > 1 else 'sync',
+            'preload_app': self.preload,
+            'max_requests': self.max_requests,
+            'max_requests_jitter': self.max_requests_jitter,
+            'timeout': self.timeout,
+            'graceful_timeout': self.graceful_timeout,
+            'when_ready': _when_ready,
+            'post_fork': _post_fork,
+        }
+
+
+def load_app(preload_model=False):
+    """Import the Flask app (and optionally the summarization model)"""
+    from app import app
+
+    if preload_model:
+        preload_summarization_model()
+    return app
+
+
+def preload_summarization_model():
+    """Load the AI Notes model now so forked workers share its memory pages"""
+    try:
+        from controllers import AI_Note_controller
+        AI_Note_controller._load_model()
+        print("[SERVER] Summarization model preloaded")
+    except Exception as e:
+        print(f"Warning: summarization model not preloaded: {e}")
+
+
+def _when_ready(server):
+    # Master process, after the preloaded app (if any) is imported and before forking
+    if not server.cfg.preload_app:
+        return
+    from core import sqlite_tuning
+    from core.connection_pool import get_tenant_pool_registry
+    from core.db_singleton import DatabaseConnection
+
+    # The master serves no requests: release startup connections and stop the
+    # maintenance thread so no lock is held mid-operation when workers fork
+    DatabaseConnection().close_pools()
+    get_tenant_pool_registry().close_all()
+    sqlite_tuning.get_maintenance().stop()
+    # Move everything loaded so far out of the collector's reach; otherwise the
+    # first GC in each worker writes to (and so copies) every shared page
+    gc.freeze()
+
+
+def _post_fork(server, worker):
+    # Worker process; background threads do not survive fork()
+    from core import sqlite_tuning
+    sqlite_tuning.get_maintenance().start()
+
+
+def _clear_metrics_dir(directory):
+    # Snapshots of a previous run would be summed into this run's counters
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name.startswith('metrics-'):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def _enable_invalidation_bus(workers):
+    # Profile, tenant config, stats and reference caches live in each worker;
+    # without the bus a write in one worker leaves the others serving stale entries
+    if workers <= 1 or _env_bool('INVALIDATION_BUS_ENABLED'):
+        return
+    os.environ['INVALIDATION_BUS_ENABLED'] = 'true'
+    os.environ.setdefault('INVALIDATION_BUS_TRANSPORT', 'sqlite')
+    print(f"[SERVER] Invalidation bus enabled ({os.environ['INVALIDATION_BUS_TRANSPORT']} transport) "
+          f"so cache invalidations reach all {workers} workers")
+
+
+def serve(config=None):
+    """Run the app under gunicorn, or the threaded Werkzeug server if unavailable"""
+    config = config or ServerConfig()
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        # gunicorn is POSIX-only; Windows development machines end up here
+        print("Warning: gunicorn not installed, using a single-process threaded server")
+        host, _, port = config.bind.rpartition(':')
+        load_app(config.preload_model).run(host=host or '0.0.0.0', port=int(port), threaded=True)
+        return
+
+    class UnifyApplication(BaseApplication):
+        def load_config(self):
+            for key, value in config.gunicorn_options().items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app(config.preload_model)
+
+    # Workers keep their own metrics; /metrics merges them through a shared directory
+    metrics_dir = os.environ.get('UNIFY_METRICS_DIR')
+    if not metrics_dir and config.workers > 1:
+        metrics_dir = os.environ['UNIFY_METRICS_DIR'] = os.path.join(
+            tempfile.gettempdir(), f"unify-metrics-{os.getpid()}")
+    if metrics_dir:
+        _clear_metrics_dir(metrics_dir)
+    _enable_invalidation_bus(config.workers)
+
+    print(f"[SERVER] {config.workers} workers x {config.threads} threads on {config.bind} "
+          f"(preload={config.preload}, max_requests={config.max_requests})")
+    UnifyApplication().run()
@@ -0,0 +1,376 @@
+"""
+SQL Dialects
+Portable SQL for the SQL Server and SQLite backends: row limits, returning
+inserted ids and idempotent table creation
+"""
+import os
+import re
+import sqlite3
+from datetime import date, datetime, time
+from functools import lru_cache
+
+
+class SQLDialect:
+    """
+    Base dialect. Repositories write T-SQL (the house dialect); helpers here
+    produce the backend-specific form and translate() rewrites statements for
+    backends that do not speak T-SQL.
+    """
+    name = 'base'
+    max_params = 2000
+    max_insert_rows = 1000
+
+    def rows_per_insert(self, column_count):
+        """Largest number of rows one multi-row INSERT may carry"""
+        rows = max(1, self.max_params // max(1, column_count))
+        return min(rows, self.max_insert_rows) if self.max_insert_rows else rows
+
+    def translate(self, query, params=None):
+        """Rewrite a T-SQL statement (and reorder its parameters) for this backend"""
+        return query, params
+
+    def limit(self, query, limit):
+        raise NotImplementedError
+
+    def insert_returning(self, table, columns, id_column, rows=1):
+        """
+        Multi-row INSERT whose result rows are (ordinal, id): ordinal is the
+        0-based position of the row within the statement's parameters
+        """
+        raise NotImplementedError
+
+    def create_table(self, cursor, table, columns_sql):
+        raise NotImplementedError
+
+    def add_column(self, cursor, table, column, definition):
+        raise NotImplementedError
+
+
+class SQLServerDialect(SQLDialect):
+    """Microsoft SQL Server (pyodbc)"""
+    name = 'sqlserver'
+    # 2100 parameters per statement, 1000 rows per VALUES list
+    max_params = 2000
+    max_insert_rows = 1000
+
+    def limit(self, query, limit):
+        return re.sub(r'^\s*SELECT(\s+DISTINCT)?', lambda m: f"{m.group(0)} TOP {int(limit)}",
+                      query, count=1, flags=re.IGNORECASE)
+
+    def insert_returning(self, table, columns, id_column, rows=1):
+        # Neither identity assignment nor OUTPUT row order follows VALUES order,
+        # so MERGE carries each row's ordinal through to OUTPUT
+        placeholders = ", ".join("?" for _ in columns)
+        values = ", ".join(f"({placeholders}, {ordinal})" for ordinal in range(rows))
+        inserted = ", ".join(f"source.{col}" for col in columns)
+        return (f"MERGE INTO {table} AS target "
+                f"USING (VALUES {values}) AS source ({', '.join(columns)}, Row_Ordinal) ON 1 = 0 "
+                f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) VALUES ({inserted}) "
+                f"OUTPUT source.Row_Ordinal, INSERTED.{id_column};")
+
+    def create_table(self, cursor, table, columns_sql):
+        cursor.execute(f"""
+            IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[{table}]') AND type in (N'U'))
+            BEGIN
+                CREATE TABLE [{table}] ({columns_sql})
+            END
+        """)
+
+    def add_column(self, cursor, table, column, definition):
+        cursor.execute(f"""
+            IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[{table}]') AND name = '{column}')
+            BEGIN
+                ALTER TABLE [{table}] ADD {column} {definition}
+            END
+        """)
+
+
+class SQLiteDialect(SQLDialect):
+    """SQLite 3.35+ (RETURNING)"""
+    name = 'sqlite'
+    # Works on builds compiled with the old default of 999 host parameters
+    max_params = 999
+    max_insert_rows = None
+
+    def translate(self, query, params=None):
+        sql, order = _translate_tsql(query)
+        if order is not None and params is not None and not isinstance(params, dict):
+            params = [params[i] for i in order]
+        return sql, params
+
+    def limit(self, query, limit):
+        return f"{_strip_statement(query)} LIMIT {int(limit)}"
+
+    def create_table(self, cursor, table, columns_sql):
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS [{table}] ({translate_ddl(columns_sql)})")
+
+    def add_column(self, cursor, table, column, definition):
+        cursor.execute(f"PRAGMA table_info([{table}])")
+        if not any(row[1].lower() == column.lower() for row in cursor.fetchall()):
+            cursor.execute(f"ALTER TABLE [{table}] ADD COLUMN {column} {translate_ddl(definition)}")
+
+
+SQLSERVER = SQLServerDialect()
+SQLITE = SQLiteDialect()
+
+_DIALECTS = {
+    'sqlserver': SQLSERVER,
+    'mssql': SQLSERVER,
+    'sqlite': SQLITE,
+}
+
+
+def get_dialect(name):
+    """Look up a dialect by backend name ('sqlserver' or 'sqlite')"""
+    try:
+        return _DIALECTS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported SQL dialect: {name}")
+
+
+def unwrap_connection(conn):
+    """Return the driver connection behind pool/unit-of-work/dialect proxies"""
+    for _ in range(10):
+        raw = getattr(conn, '__dict__', {}).get('_raw')
+        if raw is None:
+            break
+        conn = raw
+    return conn
+
+
+def dialect_for(conn):
+    """Return the dialect of an open connection"""
+    for _ in range(10):
+        attrs = getattr(conn, '__dict__', {})
+        if isinstance(attrs.get('dialect'), SQLDialect):
+            return attrs['dialect']
+        if attrs.get('_raw') is None:
+            break
+        conn = attrs['_raw']
+    return SQLITE if isinstance(conn, sqlite3.Connection) else SQLSERVER
+
+
+class DialectConnection:
+    """
+    Connection proxy that rewrites each statement for its dialect before it
+    reaches the driver, so T-SQL repositories run unchanged on SQLite.
+    """
+
+    def __init__(self, conn, dialect):
+        self._raw = conn
+        self.dialect = dialect
+
+    def cursor(self, *args, **kwargs):
+        return DialectCursor(self._raw.cursor(*args, **kwargs), self.dialect)
+
+    def execute(self, query, params=None):
+        return self.cursor().execute(query, params)
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class DialectCursor:
+    """Cursor proxy used by DialectConnection"""
+
+    def __init__(self, cursor, dialect):
+        self._cursor = cursor
+        self._dialect = dialect
+
+    def execute(self, query, params=None):
+        query, params = self._dialect.translate(query, params)
+        if params is None:
+            self._cursor.execute(query)
+        else:
+            self._cursor.execute(query, params)
+        return self
+
+    def executemany(self, query, params_seq):
+        sql, order = _translate_tsql(query) if self._dialect is SQLITE else (query, None)
+        if order is not None:
+            params_seq = ([params[i] for i in order] for params in params_seq)
+        self._cursor.executemany(sql, params_seq)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+
+# ---------------------------------------------------------------------------
+# T-SQL -> SQLite translation
+# ---------------------------------------------------------------------------
+
+_MARKER = re.compile(r'\x00(\d+)\x00')
+_TOP = re.compile(r'\bSELECT(\s+DISTINCT)?\s+TOP\s*(?:\(\s*([^)]+?)\s*\)|(\d+))', re.IGNORECASE)
+_OUTPUT = re.compile(
+    r'\s+OUTPUT\s+((?:INSERTED|DELETED)\.\[?\w+\]?(?:\s*,\s*(?:INSERTED|DELETED)\.\[?\w+\]?)*)',
+    re.IGNORECASE)
+_OFFSET_FETCH = re.compile(r'\bOFFSET\s+(\S+)\s+ROWS?\s+FETCH\s+(?:NEXT|FIRST)\s+(\S+)\s+ROWS?\s+ONLY',
+                           re.IGNORECASE)
+_SIMPLE_REWRITES = [
+    (re.compile(r'\b(?:GETDATE|SYSDATETIME)\s*\(\s*\)', re.IGNORECASE), "datetime('now', 'localtime')"),
+    (re.compile(r'\bGETUTCDATE\s*\(\s*\)', re.IGNORECASE), "datetime('now')"),
+    (re.compile(r'\bISNULL\s*\(', re.IGNORECASE), "IFNULL("),
+    (re.compile(r'\bLEN\s*\(', re.IGNORECASE), "LENGTH("),
+    (re.compile(r"\bN'"), "'"),
+    (re.compile(r'\[dbo\]\.', re.IGNORECASE), ""),
+    (re.compile(r'\s+WITH\s*\(\s*NOLOCK\s*\)', re.IGNORECASE), ""),
+]
+_DDL_REWRITES = [
+    (re.compile(r'\bINT\s+IDENTITY\s*\(\s*1\s*,\s*1\s*\)\s+PRIMARY\s+KEY\b', re.IGNORECASE),
+     "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r'\bINT\s+PRIMARY\s+KEY\s+IDENTITY\s*\(\s*1\s*,\s*1\s*\)', re.IGNORECASE),
+     "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r'\bN?VARCHAR\s*\(\s*MAX\s*\)', re.IGNORECASE), "TEXT"),
+    (re.compile(r'\bDEFAULT\s+\(?\s*GETDATE\s*\(\s*\)\s*\)?', re.IGNORECASE),
+     "DEFAULT (datetime('now', 'localtime'))"),
+]
+
+
+def translate_ddl(ddl):
+    """Rewrite SQL Server column definitions for SQLite"""
+    for pattern, replacement in _DDL_REWRITES:
+        ddl = pattern.sub(replacement, ddl)
+    return _translate_tsql(ddl)[0]
+
+
+@lru_cache(maxsize=2048)
+def _translate_tsql(query):
+    """
+    Translate one T-SQL statement to SQLite.
+    Returns (sql, order) where `order` lists original parameter indexes in
+    their new positions, or None when parameters keep their order.
+    """
+    text, count = _mark_params(query)
+
+    for pattern, replacement in _SIMPLE_REWRITES:
+        text = pattern.sub(replacement, text)
+
+    match = _OUTPUT.search(text)
+    if match:
+        columns = re.sub(r'(?:INSERTED|DELETED)\.', '', match.group(1), flags=re.IGNORECASE)
+        text = _strip_statement(text[:match.start()] + text[match.end():]) + f" RETURNING {columns}"
+
+    text = _OFFSET_FETCH.sub(r'LIMIT \2 OFFSET \1', text)
+
+    match = _TOP.search(text)
+    while match:
+        limit = match.group(2) or match.group(3)
+        head = text[:match.start()] + "SELECT" + (match.group(1) or "")
+        rest = text[match.end():]
+        end = _scope_end(rest)
+        body = rest[:end]
+        stripped = _strip_statement(body)
+        text = head + stripped + f" LIMIT {limit}" + body[len(stripped):] + rest[end:]
+        match = _TOP.search(text)
+
+    order = [int(i) for i in _MARKER.findall(text)]
+    sql = _MARKER.sub('?', text)
+    if order == list(range(count)):
+        return sql, None
+    return sql, tuple(order)
+
+
+def _mark_params(query):
+    """Replace each ? placeholder outside string literals with a numbered marker"""
+    out = []
+    count = 0
+    in_string = False
+    for ch in query:
+        if ch == "'":
+            in_string = not in_string
+            out.append(ch)
+        elif ch == '?' and not in_string:
+            out.append(f"\x00{count}\x00")
+            count += 1
+        else:
+            out.append(ch)
+    return "".join(out), count
+
+
+def _scope_end(text):
+    """Index where the current (sub)query ends: its closing paren or end of text"""
+    depth = 0
+    in_string = False
+    for i, ch in enumerate(text):
+        if ch == "'":
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            if depth == 0:
+                return i
+            depth -= 1
+    return len(text)
+
+
+def _strip_statement(query):
+    return query.rstrip().rstrip(';').rstrip()
+
+
+# ---------------------------------------------------------------------------
+# SQLite type handling (parity with pyodbc result types)
+# ---------------------------------------------------------------------------
+
+def _convert_datetime(value):
+    text = value.decode()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def _convert_date(value):
+    text = value.decode()
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        return text
+
+
+def _convert_time(value):
+    text = value.decode()
+    try:
+        return time.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(time, lambda value: value.isoformat())
+sqlite3.register_converter("DATETIME", _convert_datetime)
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("TIME", _convert_time)
+sqlite3.register_converter("BIT", lambda value: value not in (b"0", b""))
+
+# Column types are only converted on connections opened with this flag
+SQLITE_DETECT_TYPES = sqlite3.PARSE_DECLTYPES
+
+SQLITE_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'database', 'schema_sqlite.sql')
+
+
+def init_sqlite_schema(conn, schema_path=None):
+    """Create the core tables (User, Student, Course, ...) in a SQLite database"""
+    with open(schema_path or SQLITE_SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        script = f.read()
+    unwrap_connection(conn).executescript(script)
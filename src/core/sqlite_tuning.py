@@ -0,0 +1,207 @@
+"""
+SQLite Performance Profile
+Pragmas applied to every SQLite connection plus maintenance for per-user and
+dev databases: PRAGMA optimize from the connections themselves (on close and
+periodically while pooled) and background WAL checkpoints
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def load_profile():
+    """Build the tuning profile from environment variables"""
+    return {
+        # WAL lets readers and a writer work on the same file concurrently
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        # NORMAL is durable across application crashes in WAL mode
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+        # Negative values are KiB: -65536 = 64 MiB page cache per connection
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', '-65536')),
+        'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        # Seconds between PRAGMA optimize runs on a long-lived (pooled) connection
+        'optimize_interval': float(os.environ.get('SQLITE_OPTIMIZE_INTERVAL', '3600')),
+    }
+
+
+_profile = load_profile()
+
+
+def get_profile():
+    """Return the active tuning profile"""
+    return dict(_profile)
+
+
+def set_profile(**overrides):
+    """Override profile entries (e.g. set_profile(synchronous='FULL'))"""
+    _profile.update(overrides)
+
+
+def apply_profile(conn, profile=None):
+    """Apply the tuning pragmas to an open SQLite connection"""
+    profile = profile or _profile
+    cursor = conn.cursor()
+    try:
+        # busy_timeout first so the journal_mode switch can wait for locks
+        cursor.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+        if profile.get('journal_mode'):
+            cursor.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+        if profile.get('synchronous'):
+            cursor.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+        cursor.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+        cursor.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+        if profile.get('temp_store'):
+            cursor.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+    finally:
+        cursor.close()
+    return conn
+
+
+class TunedConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that runs PRAGMA optimize before it closes. The pragma
+    decides what to analyze from the queries this connection ran, so it has
+    to come from the connection that did the work, not from a fresh one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._optimized_at = time.monotonic()
+
+    def optimize(self):
+        self._optimized_at = time.monotonic()
+        try:
+            self.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass  # closed, locked or read-only: statistics just stay as they are
+
+    def optimize_if_due(self):
+        """Called by the connection pool on release; pooled connections can live for hours"""
+        interval = _profile['optimize_interval']
+        if interval > 0 and time.monotonic() - self._optimized_at >= interval:
+            self.optimize()
+
+    def close(self):
+        self.optimize()
+        super().close()
+
+
+def connect(db_path, profile=None, **kwargs):
+    """
+    Open a tuned SQLite connection.
+    Extra keyword arguments are passed to sqlite3.connect().
+    """
+    profile = profile or _profile
+    kwargs.setdefault('timeout', profile['busy_timeout'] / 1000.0)
+    kwargs.setdefault('factory', TunedConnection)
+    conn = sqlite3.connect(db_path, **kwargs)
+    try:
+        apply_profile(conn, profile)
+    except sqlite3.Error as e:
+        # A locked or read-only file still works with default settings
+        print(f"Warning: could not apply SQLite profile to {db_path}: {e}")
+    if db_path != ':memory:':
+        get_maintenance().register(db_path)
+    return conn
+
+
+class SQLiteMaintenance:
+    """
+    Background task that periodically runs a passive WAL checkpoint on the
+    SQLite files most recently opened through connect() (at most `max_paths`,
+    so tenants that stopped connecting are forgotten).
+    """
+
+    def __init__(self, interval=None, max_paths=None):
+        self.interval = interval if interval is not None else float(
+            os.environ.get('SQLITE_MAINTENANCE_INTERVAL', '600'))
+        self.max_paths = max_paths if max_paths is not None else int(
+            os.environ.get('SQLITE_MAINTENANCE_MAX_PATHS', '256'))
+        self._paths = OrderedDict()  # least recently opened first
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.runs = 0
+
+    def register(self, db_path):
+        with self._lock:
+            self._paths[db_path] = None
+            self._paths.move_to_end(db_path)
+            while len(self._paths) > self.max_paths:
+                self._paths.popitem(last=False)
+
+    def start(self):
+        """Start the maintenance thread (no-op if the interval is 0)"""
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='sqlite-maintenance', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def run_once(self):
+        """Checkpoint every registered database file"""
+        with self._lock:
+            paths = list(self._paths)
+        for db_path in paths:
+            if not os.path.exists(db_path):
+                with self._lock:
+                    self._paths.pop(db_path, None)
+                continue
+            try:
+                conn = sqlite3.connect(db_path, timeout=_profile['busy_timeout'] / 1000.0)
+                try:
+                    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                print(f"Warning: SQLite maintenance failed for {db_path}: {e}")
+        self.runs += 1
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def _reset_after_fork(self):
+        # Only the forking thread survives fork(); locks it did not hold may be
+        # stuck, so a child gets fresh ones and restarts the thread if it ran
+        was_running = self._thread is not None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if was_running:
+            self.start()
+
+
+_maintenance = None
+_maintenance_lock = threading.Lock()
+
+
+def get_maintenance():
+    """Get the process-wide SQLite maintenance task"""
+    global _maintenance
+    if _maintenance is None:
+        with _maintenance_lock:
+            if _maintenance is None:
+                _maintenance = SQLiteMaintenance()
+    return _maintenance
+
+
+def _reset_after_fork():
+    global _maintenance_lock
+    _maintenance_lock = threading.Lock()
+    if _maintenance is not None:
+        _maintenance._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):  # POSIX only
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,91 @@
+"""
+Overview Stats Cache
+Optional per-user cache of dashboard counters, invalidated by writes to the
+Enrollment, Task, Calendar, Notification and Student tables
+"""
+import os
+import threading
+
+from core.config_cache import TTLCache
+from core.db_singleton import DatabaseConnection
+from core.invalidation_bus import decode_key, encode_key, publish, subscribe
+from core.tenant_context import get_current_tenant
+from core.unit_of_work import on_commit
+
+# Counters are time-relative (due soon, upcoming), so entries stay short-lived
+# even without writes.
+_stats = TTLCache(
+    max_size=int(os.environ.get('OVERVIEW_STATS_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('OVERVIEW_STATS_CACHE_TTL', '60')),
+    name="overview_stats",
+)
+# Student_ID (scoped like a cache key) -> cache key, so writes that only know the student can invalidate
+_student_keys = {}
+_student_keys_lock = threading.Lock()
+
+
+def stats_cache_enabled():
+    return os.environ.get('OVERVIEW_STATS_CACHE_ENABLED', 'false').lower() == 'true'
+
+
+def _cache_key(user_id):
+    if DatabaseConnection().multi_tenant_enabled:
+        return (get_current_tenant(), user_id)
+    return user_id
+
+
+def get_cached_stats(user_id):
+    """A copy of the cached counters for `user_id`, or None"""
+    if not stats_cache_enabled():
+        return None
+    stats = _stats.get(_cache_key(user_id))
+    return dict(stats) if stats is not None else None
+
+
+def cache_stats(user_id, stats):
+    """Store counters for `user_id` (no-op unless OVERVIEW_STATS_CACHE_ENABLED=true)"""
+    if not stats_cache_enabled():
+        return
+    key = _cache_key(user_id)
+    _stats.set(key, dict(stats))
+    if stats.get('student_id') is not None:
+        with _student_keys_lock:
+            _student_keys[_cache_key(stats['student_id'])] = key
+
+
+def invalidate_overview_stats(user_id=None, student_id=None):
+    """
+    Drop cached counters for a user, identified by User_ID or Student_ID,
+    in every worker. With neither (e.g. a delete by row id), everything is cleared.
+    """
+    if user_id is not None:
+        topic = f"stats:user:{encode_key(_cache_key(user_id))}"
+    elif student_id is not None:
+        topic = f"stats:student:{encode_key(_cache_key(student_id))}"
+    else:
+        topic = "stats:*"
+    on_commit(lambda: publish(topic))
+
+
+def _drop_stats(key):
+    # Invalidation bus handler for "stats:user:<id>", "stats:student:<id>" and "stats:*"
+    kind, _, id_key = (key or '*').partition(':')
+    if kind == 'user':
+        _stats.invalidate(decode_key(id_key))
+    elif kind == 'student':
+        with _student_keys_lock:
+            cache_key = _student_keys.pop(decode_key(id_key), None)
+        if cache_key is not None:
+            _stats.invalidate(cache_key)
+    else:
+        _stats.clear()
+        with _student_keys_lock:
+            _student_keys.clear()
+
+
+subscribe('stats', _drop_stats)
+
+
+def get_stats_cache_stats():
+    """Hit/miss counters of the overview stats cache"""
+    return _stats.get_stats()
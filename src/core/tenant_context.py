@@ -0,0 +1,61 @@
+"""
+Tenant Context
+Per-request (per-thread / per-task) tenant routing for multi-tenant mode
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_tenant = ContextVar('unify_tenant_user_id', default=None)
+
+
+def get_current_tenant():
+    """Return the user ID whose database the current request should use"""
+    return _current_tenant.get()
+
+
+def set_current_tenant(user_id):
+    """Route the current context to `user_id`'s database; returns a reset token"""
+    return _current_tenant.set(user_id)
+
+
+def clear_current_tenant():
+    """Route the current context back to the main database"""
+    _current_tenant.set(None)
+
+
+@contextmanager
+def tenant_context(user_id):
+    """
+    Temporarily route database calls to a tenant.
+
+    Usage:
+        with tenant_context(user_id):
+            tasks = task_repo.get_by_user_id(user_id)
+    """
+    token = _current_tenant.set(user_id)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def init_app(app):
+    """
+    Set the tenant from the session at the start of every request.
+    Only registered in multi-tenant mode; concurrent requests each get
+    their own tenant because the value lives in a context variable.
+    """
+    from flask import g, session
+
+    @app.before_request
+    def _bind_tenant():
+        g.tenant_token = _current_tenant.set(session.get('user_id'))
+
+    @app.teardown_request
+    def _unbind_tenant(exc):
+        token = g.pop('tenant_token', None)
+        if token is not None:
+            try:
+                _current_tenant.reset(token)
+            except ValueError:
+                _current_tenant.set(None)
@@ -0,0 +1,201 @@
+"""
+Unit of Work
+Shares one connection/transaction between every repository call in a request
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_uow = ContextVar('unify_unit_of_work', default=None)
+
+
+class UnitOfWorkConnection:
+    """
+    Proxy handed to repositories while a unit of work is active.
+    commit() and close() are deferred to the unit of work; rollback()
+    marks the whole unit of work as failed.
+    """
+
+    def __init__(self, uow, raw_conn):
+        self._uow = uow
+        self._raw = raw_conn
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        return self._raw.cursor(*args, **kwargs)
+
+    def commit(self):
+        """Deferred until the unit of work completes"""
+        self._uow.pending_commits += 1
+
+    def rollback(self):
+        """Roll back now and make the unit of work roll back at the end"""
+        self._uow.rollback_only = True
+        self._raw.rollback()
+
+    def close(self):
+        """Connection stays open until the unit of work completes"""
+        pass
+
+
+class UnitOfWork:
+    """
+    Holds one lazily-opened connection per database target (main database,
+    or a tenant database in multi-tenant mode) and commits or rolls back
+    all of them exactly once.
+    """
+
+    def __init__(self):
+        self._connections = {}
+        self.rollback_only = False
+        self.pending_commits = 0
+        self.completed = False
+        self._after_commit = []
+
+    def get_connection(self, key, opener):
+        """Return the shared connection for `key`, opening it on first use"""
+        if self.completed:
+            raise RuntimeError("Unit of work already completed")
+        proxy = self._connections.get(key)
+        if proxy is None:
+            proxy = UnitOfWorkConnection(self, opener())
+            self._connections[key] = proxy
+        return proxy
+
+    @property
+    def connection_count(self):
+        return len(self._connections)
+
+    def add_after_commit(self, callback):
+        """Run `callback` once the unit of work has committed (dropped on rollback)"""
+        self._after_commit.append(callback)
+
+    def mark_rollback(self):
+        """Force the unit of work to roll back instead of committing"""
+        self.rollback_only = True
+
+    def complete(self, success=True):
+        """Commit (or roll back) and close every connection exactly once"""
+        if self.completed:
+            return
+        self.completed = True
+        commit = success and not self.rollback_only
+        error = None
+        for proxy in self._connections.values():
+            raw = proxy._raw
+            try:
+                if commit:
+                    raw.commit()
+                else:
+                    raw.rollback()
+            except Exception as e:
+                print(f"Error completing unit of work: {e}")
+                error = error or e
+                try:
+                    raw.rollback()
+                except Exception:
+                    pass
+            finally:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+        self._connections = {}
+        callbacks, self._after_commit = self._after_commit, []
+        if error is not None:
+            raise error
+        if commit:
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Error in after-commit callback: {e}")
+
+
+def get_current_unit_of_work():
+    """Return the active unit of work, or None"""
+    return _current_uow.get()
+
+
+def on_commit(callback):
+    """
+    Run `callback` after the active unit of work commits, or right away when
+    none is active. Cache invalidations go through here so other threads and
+    workers cannot reload the old rows between the invalidation and the commit.
+    """
+    uow = _current_uow.get()
+    if uow is None or uow.completed:
+        callback()
+    else:
+        uow.add_after_commit(callback)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Run a block inside a unit of work.
+
+    Usage:
+        with unit_of_work():
+            enrollment_repo.create(...)
+            schedule_repo.update(...)
+
+    If a unit of work is already active (e.g. the request-scoped one), the
+    block joins it; an exception in the block then marks it for rollback.
+    """
+    outer = _current_uow.get()
+    if outer is not None:
+        try:
+            yield outer
+        except BaseException:
+            outer.mark_rollback()
+            raise
+        return
+
+    uow = UnitOfWork()
+    token = _current_uow.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        _current_uow.reset(token)
+        uow.complete(success=False)
+        raise
+    _current_uow.reset(token)
+    uow.complete(success=True)
+
+
+def init_app(app):
+    """
+    Register request hooks that open a unit of work per request and
+    commit/roll back once at teardown. Responses with a 5xx status roll back.
+    """
+    from flask import g
+
+    @app.before_request
+    def _begin_unit_of_work():
+        uow = UnitOfWork()
+        g.unit_of_work = uow
+        g.unit_of_work_token = _current_uow.set(uow)
+
+    @app.after_request
+    def _flag_failed_response(response):
+        uow = g.get('unit_of_work')
+        if uow is not None and response.status_code >= 500:
+            uow.mark_rollback()
+        return response
+
+    @app.teardown_request
+    def _end_unit_of_work(exc):
+        uow = g.pop('unit_of_work', None)
+        token = g.pop('unit_of_work_token', None)
+        if token is not None:
+            try:
+                _current_uow.reset(token)
+            except ValueError:
+                _current_uow.set(None)
+        if uow is not None:
+            try:
+                uow.complete(success=exc is None)
+            except Exception:
+                pass
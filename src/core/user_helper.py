@@ -1,12 +1,13 @@
 """
 Helper function to get user data for templates
 """
+from core.user_profile import get_user_profile
 from repositories.repository_factory import RepositoryFactory
 
 
 def get_user_data(user_id):
     """
-    Get user data for display in templates
+    Get user data for display in templates (one cached profile lookup)
     
     Args:
         user_id: The user ID from session
@@ -23,10 +24,9 @@ def get_user_data(user_id):
             'avatar_letter': 'U'
         }
     
-    user_repo = RepositoryFactory.get_repository("user")
-    user = user_repo.get_by_id(user_id)
+    profile = get_user_profile(user_id)
     
-    if not user:
+    if not profile.exists:
         return {
             'name': 'User',
             'email': '',
@@ -35,30 +35,18 @@ def get_user_data(user_id):
             'avatar_letter': 'U'
         }
     
-    # Get student data if user is a student
-    student_repo = RepositoryFactory.get_repository("student")
-    student = student_repo.get_by_user_id(user_id)
-    
-    # Get instructor data if user is an instructor
-    instructor_repo = RepositoryFactory.get_repository("instructor")
-    instructor = instructor_repo.get_by_user_id(user_id)
-    
-    # Get TA data if user is a TA
-    ta_repo = RepositoryFactory.get_repository("teaching_assistant")
-    ta = ta_repo.get_by_user_id(user_id) if ta_repo else None
-    
     # Determine role and get major/department
-    if student:
+    if profile.is_student:
         role = 'Student'
-        department = student.Department if student.Department else 'Zewail City'
-        major = student.Department if student.Department else 'Computer Science'  # Use Department as Major
+        department = profile.Student_Department if profile.Student_Department else 'Zewail City'
+        major = profile.Student_Department if profile.Student_Department else 'Computer Science'  # Use Department as Major
         avatar_letter = 'S'  # S for Student
-    elif instructor:
+    elif profile.is_instructor:
         role = 'Instructor'
-        department = instructor.Department if instructor.Department else 'Zewail City'
-        major = instructor.Department if instructor.Department else 'Computer Science'  # Use Department as Major
+        department = profile.Instructor_Department if profile.Instructor_Department else 'Zewail City'
+        major = profile.Instructor_Department if profile.Instructor_Department else 'Computer Science'  # Use Department as Major
         avatar_letter = 'I'  # I for Instructor
-    elif ta:
+    elif profile.is_ta:
         role = 'TA'
         department = 'Zewail City'
         major = 'Computer Science'
@@ -70,16 +58,36 @@ def get_user_data(user_id):
         avatar_letter = 'U'  # U for User
     
     return {
-        'name': user.Username if user.Username else 'User',
-        'email': user.Email if user.Email else '',
+        'name': profile.Username if profile.Username else 'User',
+        'email': profile.Email if profile.Email else '',
         'role': role,
         'department': department,
         'major': major,
         'avatar_letter': avatar_letter,
-        'is_student': student is not None,
-        'is_instructor': instructor is not None,
-        'is_ta': ta is not None,
-        'is_instructor_or_ta': (instructor is not None) or (ta is not None)
+        'is_student': profile.is_student,
+        'is_instructor': profile.is_instructor,
+        'is_ta': profile.is_ta,
+        'is_instructor_or_ta': profile.is_instructor or profile.is_ta
     }
 
 
+def get_student_users(student_ids):
+    """
+    Batch-load the User behind each student (two queries in total)
+    
+    Args:
+        student_ids: Iterable of Student_IDs (duplicates and None are ignored)
+        
+    Returns:
+        dict: {Student_ID: User} for every student that exists
+    """
+    student_repo = RepositoryFactory.get_repository("student")
+    user_repo = RepositoryFactory.get_repository("user")
+    
+    students = student_repo.get_many_by_ids(student_ids)
+    users = user_repo.get_many_by_ids([s.User_ID for s in students.values()])
+    return {
+        student_id: users[student.User_ID]
+        for student_id, student in students.items()
+        if student.User_ID in users
+    }
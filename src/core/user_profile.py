@@ -0,0 +1,187 @@
+"""
+User Profile Resolution
+One joined query for a user's account and role rows (Student, Instructor, TA),
+cached per user and shared by RBAC checks and template context
+"""
+import os
+
+from core.config_cache import TTLCache
+from core.db_singleton import DatabaseConnection
+from core.invalidation_bus import decode_key, encode_key, publish, subscribe
+from core.tenant_context import get_current_tenant
+from core.unit_of_work import on_commit
+
+# A user can hold several TA assignments (and, in bad data, duplicate role rows);
+# pick the lowest id of each so the query always returns a single row.
+_PROFILE_QUERY = (
+    "SELECT u.User_ID, u.Username, u.Email, "
+    "s.Student_ID, s.Department, i.Instructor_ID, i.Department, "
+    "(SELECT MIN(ta.TA_ID) FROM Teaching_Assistant ta WHERE ta.User_ID = u.User_ID) "
+    "FROM [User] u "
+    "LEFT JOIN Student s ON s.Student_ID = "
+    "(SELECT MIN(Student_ID) FROM Student WHERE User_ID = u.User_ID) "
+    "LEFT JOIN Instructor i ON i.Instructor_ID = "
+    "(SELECT MIN(Instructor_ID) FROM Instructor WHERE User_ID = u.User_ID) "
+    "WHERE u.User_ID = ?"
+)
+
+
+class UserProfile:
+    """A user's account fields plus which role tables reference them"""
+
+    __slots__ = ('User_ID', 'Username', 'Email', 'Student_ID', 'Student_Department',
+                 'Instructor_ID', 'Instructor_Department', 'TA_ID')
+
+    def __init__(self, User_ID=None, Username=None, Email=None, Student_ID=None,
+                 Student_Department=None, Instructor_ID=None, Instructor_Department=None,
+                 TA_ID=None):
+        self.User_ID = User_ID
+        self.Username = Username
+        self.Email = Email
+        self.Student_ID = Student_ID
+        self.Student_Department = Student_Department
+        self.Instructor_ID = Instructor_ID
+        self.Instructor_Department = Instructor_Department
+        self.TA_ID = TA_ID
+
+    @property
+    def exists(self):
+        return self.User_ID is not None
+
+    @property
+    def is_student(self):
+        return self.Student_ID is not None
+
+    @property
+    def is_instructor(self):
+        return self.Instructor_ID is not None
+
+    @property
+    def is_ta(self):
+        return self.TA_ID is not None
+
+    @property
+    def role(self):
+        """RBAC role: 'Instructor', 'TA', 'Student', or None"""
+        if self.is_instructor:
+            return 'Instructor'
+        if self.is_ta:
+            return 'TA'
+        if self.is_student:
+            return 'Student'
+        return None
+
+    def __repr__(self):
+        return f"<UserProfile(User_ID={self.User_ID}, role={self.role})>"
+
+
+# Missing users are cached too (as an empty profile) so that unknown ids in
+# stale sessions do not hit the database on every request.
+_profiles = TTLCache(
+    max_size=int(os.environ.get('USER_PROFILE_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('USER_PROFILE_CACHE_TTL', '300')),
+    name="user_profiles",
+)
+
+
+def _cache_key(user_id):
+    if DatabaseConnection().multi_tenant_enabled:
+        return (get_current_tenant(), user_id)
+    return user_id
+
+
+# Request-scoped marker for profiles this request changed but has not committed yet
+_STALE = object()
+_ALL = '*'
+
+
+def _request_profiles():
+    """Profiles already resolved in the current request (None outside a request)"""
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return None
+    if not has_request_context():
+        return None
+    profiles = g.get('user_profiles')
+    if profiles is None:
+        profiles = {}
+        g.user_profiles = profiles
+    return profiles
+
+
+def _load_profile(user_id):
+    row = DatabaseConnection().fetch_one(_PROFILE_QUERY, (user_id,))
+    if not row:
+        return UserProfile()
+    return UserProfile(*row)
+
+
+def get_user_profile(user_id):
+    """
+    Resolve a user's profile with at most one query.
+    Reused for the rest of the request, and across requests until it expires
+    or invalidate_user_profile() is called.
+
+    Args:
+        user_id: The user ID
+
+    Returns:
+        UserProfile, or None when user_id is empty
+    """
+    if not user_id:
+        return None
+
+    key = _cache_key(user_id)
+    request_profiles = _request_profiles()
+    cached = request_profiles.get(key) if request_profiles is not None else None
+    if cached is not None and cached is not _STALE:
+        return cached
+
+    # After this request's own role write the shared entry is stale until the commit;
+    # reload (seeing the uncommitted rows) without publishing them to other requests
+    stale = cached is _STALE or (request_profiles is not None and _ALL in request_profiles)
+    profile = None if stale else _profiles.get(key)
+    if profile is None:
+        profile = _load_profile(user_id)
+        if not stale:
+            _profiles.set(key, profile)
+    if request_profiles is not None:
+        request_profiles[key] = profile
+    return profile
+
+
+def invalidate_user_profile(user_id=None):
+    """
+    Drop a user's cached profile (all users with user_id=None) in every worker.
+    Call after [User], Student, Instructor or Teaching_Assistant rows change;
+    other requests see the change once the unit of work commits.
+    """
+    key = _ALL if user_id is None else _cache_key(user_id)
+    request_profiles = _request_profiles()
+    if request_profiles is not None:
+        request_profiles[key] = _STALE
+    topic = f"user:{'*' if user_id is None else encode_key(key)}"
+    on_commit(lambda: publish(topic))
+
+
+def _drop_profile(key):
+    # Invalidation bus handler for "user:<id>" / "user:*"
+    request_profiles = _request_profiles()
+    if key in (None, '*'):
+        _profiles.clear()
+        if request_profiles:
+            request_profiles.clear()
+        return
+    cache_key = decode_key(key)
+    _profiles.invalidate(cache_key)
+    if request_profiles:
+        request_profiles.pop(cache_key, None)
+
+
+subscribe('user', _drop_profile)
+
+
+def get_user_profile_cache_stats():
+    """Hit/miss counters of the profile cache"""
+    return _profiles.get_stats()
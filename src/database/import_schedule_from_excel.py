@@ -212,6 +212,14 @@ def import_schedule_data():
     print(f"\nImport complete!")
     print(f"Total slots imported: {slots_created}")
 
+    # Compile the term once so optimize requests do not each rebuild it
+    try:
+        from core.conflict_matrix import get_conflict_matrix_store
+        matrix = get_conflict_matrix_store().build(2025, 'SPRING')
+        print(f"Conflict matrix built: {matrix.section_count} sections -> {matrix.path}")
+    except Exception as e:
+        print(f"Warning: could not build conflict matrix: {e}")
+
 
 if __name__ == "__main__":
     print("=" * 50)
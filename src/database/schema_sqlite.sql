@@ -0,0 +1,190 @@
+-- Unify Database Schema (SQLite)
+-- Core tables for the SQLite backend (DB_BACKEND=sqlite, data/unify_dev.db).
+-- Feature tables (Notification, StudyPlan, Assignment, ...) are created on
+-- demand by each repository's create_table().
+-- Applied by core.sql_dialect.init_sqlite_schema(); every statement is idempotent.
+
+CREATE TABLE IF NOT EXISTS [User] (
+    User_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username VARCHAR(100) NOT NULL UNIQUE,
+    Email VARCHAR(255) NOT NULL UNIQUE,
+    Password_Hash VARCHAR(255) NOT NULL,
+    Created_At DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS Student (
+    Student_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    User_ID INT NOT NULL REFERENCES [User](User_ID) ON DELETE CASCADE,
+    Department VARCHAR(100),
+    Year_Level INT CHECK (Year_Level BETWEEN 1 AND 5),
+    GPA FLOAT CHECK (GPA BETWEEN 0.0 AND 4.0)
+);
+CREATE INDEX IF NOT EXISTS idx_student_user_id ON Student(User_ID);
+
+CREATE TABLE IF NOT EXISTS Instructor (
+    Instructor_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    User_ID INT NOT NULL REFERENCES [User](User_ID) ON DELETE CASCADE,
+    Department VARCHAR(100),
+    Office VARCHAR(100),
+    Email VARCHAR(255) UNIQUE
+);
+CREATE INDEX IF NOT EXISTS idx_instructor_user_id ON Instructor(User_ID);
+
+CREATE TABLE IF NOT EXISTS Course (
+    Course_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Course_Name VARCHAR(200) NOT NULL,
+    Credits INT NOT NULL,
+    Instructor_ID INT NOT NULL REFERENCES Instructor(Instructor_ID) ON DELETE CASCADE,
+    Schedule TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_course_instructor_id ON Course(Instructor_ID);
+
+CREATE TABLE IF NOT EXISTS Course_Schedule_Slot (
+    Slot_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Course_ID INT NOT NULL REFERENCES Course(Course_ID) ON DELETE CASCADE,
+    Course_Code VARCHAR(50) NOT NULL,
+    Section INT NOT NULL,
+    Day VARCHAR(10) NOT NULL,
+    Start_Time TIME NOT NULL,
+    End_Time TIME NOT NULL,
+    Slot_Type VARCHAR(20) NOT NULL,
+    Sub_Type VARCHAR(10),
+    Academic_Year INT,
+    Term VARCHAR(20)
+);
+CREATE INDEX IF NOT EXISTS idx_course_code ON Course_Schedule_Slot(Course_Code);
+CREATE INDEX IF NOT EXISTS idx_course_id ON Course_Schedule_Slot(Course_ID);
+CREATE INDEX IF NOT EXISTS idx_day_time ON Course_Schedule_Slot(Day, Start_Time);
+
+CREATE TABLE IF NOT EXISTS Enrollment (
+    Enrollment_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Student_ID INT NOT NULL REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    Course_ID INT NOT NULL REFERENCES Course(Course_ID) ON DELETE CASCADE,
+    Status VARCHAR(20) CHECK (Status IN ('enrolled', 'dropped', 'completed')),
+    Grade VARCHAR(5),
+    Semester VARCHAR(50),
+    UNIQUE (Student_ID, Course_ID)
+);
+CREATE INDEX IF NOT EXISTS idx_enrollment_course_id ON Enrollment(Course_ID);
+
+CREATE TABLE IF NOT EXISTS Task (
+    Task_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Student_ID INT NOT NULL REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    Task_Title VARCHAR(255) NOT NULL,
+    Due_Date DATETIME NOT NULL,
+    Priority VARCHAR(10) CHECK (Priority IN ('low', 'medium', 'high')),
+    Status VARCHAR(20) CHECK (Status IN ('pending', 'completed'))
+);
+CREATE INDEX IF NOT EXISTS idx_task_student_id ON Task(Student_ID);
+CREATE INDEX IF NOT EXISTS idx_task_due_date ON Task(Due_Date);
+
+CREATE TABLE IF NOT EXISTS Schedule (
+    Schedule_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Student_ID INT NOT NULL REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    Course_List TEXT,
+    Optimized BIT DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_schedule_student_id ON Schedule(Student_ID);
+
+CREATE TABLE IF NOT EXISTS Note (
+    Note_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Student_ID INT NOT NULL REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    Original_File VARCHAR(255) NOT NULL,
+    Summary_Text TEXT,
+    Upload_Date DATETIME NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_note_student_id ON Note(Student_ID);
+
+CREATE TABLE IF NOT EXISTS Message (
+    Message_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Sender_ID INT NOT NULL REFERENCES [User](User_ID) ON DELETE CASCADE,
+    Receiver_ID INT NOT NULL REFERENCES [User](User_ID) ON DELETE CASCADE,
+    Message_Text TEXT NOT NULL,
+    Timestamp DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    Is_Read BIT DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_message_sender_id ON Message(Sender_ID);
+CREATE INDEX IF NOT EXISTS idx_message_receiver_id ON Message(Receiver_ID);
+CREATE INDEX IF NOT EXISTS idx_message_timestamp ON Message(Timestamp);
+
+CREATE TABLE IF NOT EXISTS Transcript (
+    Transcript_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Student_ID INT NOT NULL REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    GPA FLOAT CHECK (GPA BETWEEN 0.0 AND 4.0),
+    PDF_Path VARCHAR(255) NOT NULL,
+    Issue_Date DATETIME NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transcript_student_id ON Transcript(Student_ID);
+
+CREATE TABLE IF NOT EXISTS Calendar (
+    Event_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Student_ID INT NOT NULL REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    Title VARCHAR(200) NOT NULL,
+    Date DATE NOT NULL,
+    Time TIME NOT NULL,
+    Source VARCHAR(50)
+);
+CREATE INDEX IF NOT EXISTS idx_calendar_student_id ON Calendar(Student_ID);
+CREATE INDEX IF NOT EXISTS idx_calendar_date ON Calendar(Date);
+
+CREATE TABLE IF NOT EXISTS Reminder (
+    Reminder_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Student_ID INT NOT NULL REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    Event_ID INT NOT NULL REFERENCES Calendar(Event_ID) ON DELETE CASCADE,
+    Reminder_Time DATETIME NOT NULL,
+    Status VARCHAR(10) CHECK (Status IN ('pending', 'done'))
+);
+CREATE INDEX IF NOT EXISTS idx_reminder_student_id ON Reminder(Student_ID);
+
+CREATE TABLE IF NOT EXISTS Focus_Session (
+    Session_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Student_ID INT NOT NULL REFERENCES Student(Student_ID) ON DELETE CASCADE,
+    Duration INT NOT NULL,
+    Start_Time DATETIME NOT NULL,
+    End_Time DATETIME,
+    Completed BIT DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_focus_student_id ON Focus_Session(Student_ID);
+
+CREATE TABLE IF NOT EXISTS Teaching_Assistant (
+    TA_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    User_ID INT NOT NULL REFERENCES [User](User_ID) ON DELETE CASCADE,
+    Assigned_Course_ID INT NOT NULL REFERENCES Course(Course_ID) ON DELETE CASCADE,
+    Role VARCHAR(100) DEFAULT 'Teaching Assistant',
+    Hours_Per_Week INT CHECK (Hours_Per_Week BETWEEN 1 AND 20)
+);
+CREATE INDEX IF NOT EXISTS idx_ta_user_id ON Teaching_Assistant(User_ID);
+
+CREATE TABLE IF NOT EXISTS User_Settings (
+    Setting_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    User_ID INT NOT NULL UNIQUE REFERENCES [User](User_ID) ON DELETE CASCADE,
+    email_notifications BIT DEFAULT 1,
+    push_notifications BIT DEFAULT 1,
+    calendar_reminders BIT DEFAULT 1,
+    assignment_deadlines BIT DEFAULT 1,
+    sync_google_calendar BIT DEFAULT 0,
+    calendar_default_view VARCHAR(20) DEFAULT 'week',
+    timezone VARCHAR(50) DEFAULT 'Africa/Cairo',
+    theme VARCHAR(10) DEFAULT 'dark',
+    language VARCHAR(5) DEFAULT 'en',
+    colorblind_mode BIT DEFAULT 0,
+    dyslexia_font BIT DEFAULT 0,
+    profile_visibility VARCHAR(20) DEFAULT 'public',
+    share_schedule BIT DEFAULT 0,
+    created_at DATETIME DEFAULT (datetime('now', 'localtime')),
+    updated_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS User_Database_Config (
+    Config_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    User_ID INTEGER NOT NULL UNIQUE,
+    DB_Type TEXT NOT NULL DEFAULT 'sqlite',
+    DB_Host TEXT,
+    DB_Port INTEGER,
+    DB_Name TEXT,
+    DB_User TEXT,
+    DB_Password TEXT,
+    DB_Path TEXT,
+    Is_Active INTEGER DEFAULT 1,
+    Created_Date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
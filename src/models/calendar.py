@@ -4,9 +4,12 @@ Represents a calendar event for a student
 """
 from datetime import date, time
 from typing import Optional
+from models.slotted import SlottedModel
 
 
-class Calendar:
+class Calendar(SlottedModel):
+    __slots__ = ('Event_ID', 'Student_ID', 'Title', 'Date', 'Time', 'Source')
+    
     def __init__(self, Event_ID: Optional[int] = None, Student_ID: int = 0,
                  Title: str = "", Date: Optional[date] = None,
                  Time: Optional[time] = None, Source: Optional[str] = None, **kwargs):
@@ -17,9 +20,8 @@ class Calendar:
         self.Time = Time
         self.Source = Source
         
-        # Handle any additional fields passed via kwargs
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        # Any additional fields passed via kwargs
+        self._set_extra(kwargs)
     
     def __repr__(self):
         return f"<Calendar(Event_ID={self.Event_ID}, Student_ID={self.Student_ID}, Title='{self.Title}')>"
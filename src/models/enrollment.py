@@ -3,9 +3,12 @@ Enrollment Model
 Represents a student's enrollment in a course
 """
 from typing import Optional
+from models.slotted import SlottedModel
 
 
-class Enrollment:
+class Enrollment(SlottedModel):
+    __slots__ = ('Enrollment_ID', 'Student_ID', 'Course_ID', 'Status', 'Grade', 'Semester')
+    
     def __init__(self, Enrollment_ID: Optional[int] = None, Student_ID: int = 0,
                  Course_ID: int = 0, Status: str = "enrolled", 
                  Grade: Optional[str] = None, Semester: Optional[str] = None, **kwargs):
@@ -16,9 +19,8 @@ class Enrollment:
         self.Grade = Grade  # Grade received (e.g., 'A', 'B+', 'C')
         self.Semester = Semester  # Semester name (e.g., 'Fall 2021', 'Spring 2022')
         
-        # Handle any additional fields passed via kwargs
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        # Any additional fields passed via kwargs
+        self._set_extra(kwargs)
     
     def __repr__(self):
         return f"<Enrollment(Enrollment_ID={self.Enrollment_ID}, Student_ID={self.Student_ID}, Course_ID={self.Course_ID}, Status='{self.Status}')>"
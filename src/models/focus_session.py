@@ -4,9 +4,12 @@ Represents a Pomodoro/focus session for a student
 """
 from datetime import datetime
 from typing import Optional
+from models.slotted import SlottedModel
 
 
-class FocusSession:
+class FocusSession(SlottedModel):
+    __slots__ = ('Session_ID', 'Student_ID', 'Duration', 'Start_Time', 'End_Time', 'Completed')
+    
     def __init__(self, Session_ID: Optional[int] = None, Student_ID: int = 0,
                  Duration: int = 0, Start_Time: Optional[datetime] = None,
                  End_Time: Optional[datetime] = None, Completed: bool = False, **kwargs):
@@ -17,9 +20,8 @@ class FocusSession:
         self.End_Time = End_Time
         self.Completed = bool(Completed) if Completed is not None else False
         
-        # Handle any additional fields passed via kwargs
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        # Any additional fields passed via kwargs
+        self._set_extra(kwargs)
     
     def __repr__(self):
         return f"<FocusSession(Session_ID={self.Session_ID}, Student_ID={self.Student_ID}, Duration={self.Duration}, Completed={self.Completed})>"
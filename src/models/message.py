@@ -4,12 +4,17 @@ Represents a message between users
 """
 from datetime import datetime
 from typing import Optional
+from models.slotted import SlottedModel
 
 
-class Message:
+class Message(SlottedModel):
+    __slots__ = ('Message_ID', 'Sender_ID', 'Receiver_ID', 'Message_Text', 'Timestamp', 'Is_Read',
+                 'Sender_Name', 'Receiver_Name')
+    
     def __init__(self, Message_ID: Optional[int] = None, Sender_ID: int = 0,
                  Receiver_ID: int = 0, Message_Text: str = "",
-                 Timestamp: Optional[datetime] = None, Is_Read: bool = False, **kwargs):
+                 Timestamp: Optional[datetime] = None, Is_Read: bool = False,
+                 Sender_Name: Optional[str] = None, Receiver_Name: Optional[str] = None, **kwargs):
         self.Message_ID = Message_ID
         self.Sender_ID = Sender_ID
         self.Receiver_ID = Receiver_ID
@@ -18,13 +23,11 @@ class Message:
         self.Is_Read = Is_Read
         
         # Additional fields for display purposes
-        self.Sender_Name = kwargs.get('Sender_Name', None)
-        self.Receiver_Name = kwargs.get('Receiver_Name', None)
+        self.Sender_Name = Sender_Name
+        self.Receiver_Name = Receiver_Name
         
-        # Handle any additional fields passed via kwargs
-        for key, value in kwargs.items():
-            if not hasattr(self, key):
-                setattr(self, key, value)
+        # Any additional fields passed via kwargs
+        self._set_extra(kwargs)
     
     def __repr__(self):
         return f"<Message(Message_ID={self.Message_ID}, Sender_ID={self.Sender_ID}, Receiver_ID={self.Receiver_ID})>"
@@ -4,10 +4,13 @@ Represents a notification for a user
 """
 from datetime import datetime
 from typing import Optional
+from models.slotted import SlottedModel
 
 
-class Notification:
+class Notification(SlottedModel):
     """Notification model"""
+    __slots__ = ('Notification_ID', 'User_ID', 'Title', 'Message', 'Type', 'Priority', 'Is_Read',
+                 'Action_URL', 'Created_At', 'Read_At')
     
     def __init__(self, 
                  Notification_ID: Optional[int] = None,
@@ -30,6 +33,7 @@ class Notification:
         self.Action_URL = Action_URL
         self.Created_At = Created_At or datetime.now()
         self.Read_At = Read_At
+        self._extra = None
     
     def to_dict(self):
         """Convert notification to dictionary"""
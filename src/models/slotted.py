@@ -0,0 +1,29 @@
+"""
+Slotted Model Base
+Compact base class for high-volume entities: declared fields live in
+__slots__ (no per-instance __dict__); rarely used extra fields passed as
+keyword arguments are kept in a side dict
+"""
+
+
+class SlottedModel:
+    __slots__ = ('_extra',)
+
+    def _set_extra(self, kwargs):
+        self._extra = kwargs or None
+
+    def __getattr__(self, name):
+        # Only reached when the normal slot lookup fails
+        if name != '_extra':
+            extra = getattr(self, '_extra', None)
+            if extra and name in extra:
+                return extra[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __getstate__(self):
+        return {name: getattr(self, name, None) for cls in type(self).__mro__
+                for name in getattr(cls, '__slots__', ())}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
@@ -4,9 +4,12 @@ Represents a task/assignment for a student
 """
 from datetime import datetime
 from typing import Optional
+from models.slotted import SlottedModel
 
 
-class Task:
+class Task(SlottedModel):
+    __slots__ = ('Task_ID', 'Student_ID', 'Task_Title', 'Due_Date', 'Priority', 'Status')
+    
     def __init__(self, Task_ID: Optional[int] = None, Student_ID: int = 0,
                  Task_Title: str = "", Due_Date: Optional[datetime] = None,
                  Priority: str = "medium", Status: str = "pending", **kwargs):
@@ -17,9 +20,8 @@ class Task:
         self.Priority = Priority  # 'low', 'medium', 'high'
         self.Status = Status  # 'pending', 'completed'
         
-        # Handle any additional fields passed via kwargs
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        # Any additional fields passed via kwargs
+        self._set_extra(kwargs)
     
     def __repr__(self):
         return f"<Task(Task_ID={self.Task_ID}, Student_ID={self.Student_ID}, Task_Title='{self.Task_Title}', Status='{self.Status}')>"
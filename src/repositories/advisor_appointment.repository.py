@@ -4,6 +4,7 @@ Handles database operations for advisor appointments
 """
 from models.advisor_appointment import AdvisorAppointment
 from core.db_singleton import DatabaseConnection
+from core.sql_dialect import dialect_for
 from datetime import datetime
 
 
@@ -16,10 +17,8 @@ class AdvisorAppointmentRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[AdvisorAppointment]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE AdvisorAppointment (
+            dialect = dialect_for(conn)
+            dialect.create_table(cursor, "AdvisorAppointment", """
                         Appointment_ID INT IDENTITY(1,1) PRIMARY KEY,
                         Student_ID INT NOT NULL,
                         Advisor_ID INT NOT NULL,
@@ -31,59 +30,55 @@ class AdvisorAppointmentRepository:
                         FOREIGN KEY (Student_ID) REFERENCES Student(Student_ID),
                         FOREIGN KEY (Advisor_ID) REFERENCES Instructor(Instructor_ID),
                         FOREIGN KEY (Created_From_Conversation_ID) REFERENCES AdvisorConversation(Conversation_ID)
-                    )
-                END
             """)
             
             # Add Instructor_Response column if it doesn't exist (for existing tables)
             try:
-                cursor.execute("""
-                    IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[AdvisorAppointment]') AND name = 'Instructor_Response')
-                    BEGIN
-                        ALTER TABLE AdvisorAppointment ADD Instructor_Response NVARCHAR(MAX)
-                    END
-                """)
+                dialect.add_column(cursor, "AdvisorAppointment", "Instructor_Response", "NVARCHAR(MAX)")
                 
-                # Update CHECK constraint for Status column to include 'pending' and 'rejected'
-                cursor.execute("""
-                    DECLARE @ConstraintName NVARCHAR(200)
-                    DECLARE @SQL NVARCHAR(MAX)
+                # Rebuilding CHECK constraints is only needed on SQL Server;
+                # SQLite tables are created with the current constraint
+                if dialect.name == 'sqlserver':
+                    # Update CHECK constraint for Status column to include 'pending' and 'rejected'
+                    cursor.execute("""
+                        DECLARE @ConstraintName NVARCHAR(200)
+                        DECLARE @SQL NVARCHAR(MAX)
                     
-                    -- Find and drop existing Status check constraints
-                    DECLARE constraint_cursor CURSOR FOR
-                    SELECT cc.name 
-                    FROM sys.check_constraints cc
-                    INNER JOIN sys.columns c ON c.object_id = cc.parent_object_id AND c.column_id = cc.parent_column_id
-                    WHERE cc.parent_object_id = OBJECT_ID(N'[dbo].[AdvisorAppointment]')
-                    AND c.name = 'Status'
+                        -- Find and drop existing Status check constraints
+                        DECLARE constraint_cursor CURSOR FOR
+                        SELECT cc.name 
+                        FROM sys.check_constraints cc
+                        INNER JOIN sys.columns c ON c.object_id = cc.parent_object_id AND c.column_id = cc.parent_column_id
+                        WHERE cc.parent_object_id = OBJECT_ID(N'[dbo].[AdvisorAppointment]')
+                        AND c.name = 'Status'
                     
-                    OPEN constraint_cursor
-                    FETCH NEXT FROM constraint_cursor INTO @ConstraintName
-                    
-                    WHILE @@FETCH_STATUS = 0
-                    BEGIN
-                        SET @SQL = 'ALTER TABLE [dbo].[AdvisorAppointment] DROP CONSTRAINT [' + @ConstraintName + ']'
-                        EXEC sp_executesql @SQL
+                        OPEN constraint_cursor
                         FETCH NEXT FROM constraint_cursor INTO @ConstraintName
-                    END
                     
-                    CLOSE constraint_cursor
-                    DEALLOCATE constraint_cursor
-                """)
+                        WHILE @@FETCH_STATUS = 0
+                        BEGIN
+                            SET @SQL = 'ALTER TABLE [dbo].[AdvisorAppointment] DROP CONSTRAINT [' + @ConstraintName + ']'
+                            EXEC sp_executesql @SQL
+                            FETCH NEXT FROM constraint_cursor INTO @ConstraintName
+                        END
+                    
+                        CLOSE constraint_cursor
+                        DEALLOCATE constraint_cursor
+                    """)
                 
-                # Add new constraint with all allowed values
-                cursor.execute("""
-                    IF NOT EXISTS (
-                        SELECT * FROM sys.check_constraints 
-                        WHERE name = 'CK_AdvisorAppointment_Status' 
-                        AND parent_object_id = OBJECT_ID(N'[dbo].[AdvisorAppointment]')
-                    )
-                    BEGIN
-                        ALTER TABLE AdvisorAppointment
-                        ADD CONSTRAINT CK_AdvisorAppointment_Status 
-                        CHECK (Status IN ('pending', 'scheduled', 'completed', 'cancelled', 'rejected'))
-                    END
-                """)
+                    # Add new constraint with all allowed values
+                    cursor.execute("""
+                        IF NOT EXISTS (
+                            SELECT * FROM sys.check_constraints 
+                            WHERE name = 'CK_AdvisorAppointment_Status' 
+                            AND parent_object_id = OBJECT_ID(N'[dbo].[AdvisorAppointment]')
+                        )
+                        BEGIN
+                            ALTER TABLE AdvisorAppointment
+                            ADD CONSTRAINT CK_AdvisorAppointment_Status 
+                            CHECK (Status IN ('pending', 'scheduled', 'completed', 'cancelled', 'rejected'))
+                        END
+                    """)
             except Exception as e:
                 print(f"Warning: Could not update Status constraint or add Instructor_Response column: {e}")
             
@@ -15,9 +15,7 @@ class AdvisorConversationRepository:
     def create_table(self):
         """Create advisor conversation table if it doesn't exist"""
         try:
-            query = """
-            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='AdvisorConversation' AND xtype='U')
-            CREATE TABLE AdvisorConversation (
+            self.db.create_table("AdvisorConversation", """
                 Conversation_ID INT IDENTITY(1,1) PRIMARY KEY,
                 Student_ID INT NOT NULL,
                 Conversation_Type NVARCHAR(50),
@@ -27,9 +25,7 @@ class AdvisorConversationRepository:
                 Escalated_To_Advisor_ID INT,
                 FOREIGN KEY (Student_ID) REFERENCES Student(Student_ID),
                 FOREIGN KEY (Escalated_To_Advisor_ID) REFERENCES Instructor(Instructor_ID)
-            )
-            """
-            self.db.execute_update(query)
+            """)
         except Exception as e:
             print(f"Error creating AdvisorConversation table: {e}")
             import traceback
@@ -15,9 +15,7 @@ class AdvisorMessageRepository:
     def create_table(self):
         """Create advisor message table if it doesn't exist"""
         try:
-            query = """
-            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='AdvisorMessage' AND xtype='U')
-            CREATE TABLE AdvisorMessage (
+            self.db.create_table("AdvisorMessage", """
                 Message_ID INT IDENTITY(1,1) PRIMARY KEY,
                 Conversation_ID INT NOT NULL,
                 Sender_Type NVARCHAR(20) CHECK (Sender_Type IN ('student', 'ai', 'advisor')),
@@ -26,9 +24,7 @@ class AdvisorMessageRepository:
                 Confidence_Score DECIMAL(3,2),
                 Sent_At DATETIME DEFAULT GETDATE(),
                 FOREIGN KEY (Conversation_ID) REFERENCES AdvisorConversation(Conversation_ID)
-            )
-            """
-            self.db.execute_update(query)
+            """)
         except Exception as e:
             print(f"Error creating AdvisorMessage table: {e}")
             import traceback
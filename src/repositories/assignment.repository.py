@@ -3,6 +3,8 @@ Assignment Repository
 Handles database operations for assignments
 """
 from core.db_singleton import DatabaseConnection
+from core.bulk_operations import fetch_by_ids
+from core.sql_dialect import dialect_for
 from models.assignment import Assignment
 from datetime import datetime
 
@@ -16,10 +18,7 @@ class AssignmentRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[Assignment]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE [Assignment] (
+            dialect_for(conn).create_table(cursor, "Assignment", """
                         Assignment_ID INT IDENTITY(1,1) PRIMARY KEY,
                         Course_ID INT NOT NULL,
                         Title NVARCHAR(255) NOT NULL,
@@ -38,8 +37,6 @@ class AssignmentRepository:
                         Is_Auto_Graded BIT DEFAULT 0,
                         FOREIGN KEY (Course_ID) REFERENCES Course(Course_ID),
                         FOREIGN KEY (Created_By) REFERENCES Instructor(Instructor_ID)
-                    )
-                END
             """)
             conn.commit()
         finally:
@@ -87,6 +84,23 @@ class AssignmentRepository:
             cursor.close()
             conn.close()
     
+    def get_many_by_ids(self, assignment_ids):
+        """Get assignments for many IDs in one IN (...) query per chunk; returns {Assignment_ID: Assignment}"""
+        conn = self.db_connection.get_connection()
+        try:
+            cursor = conn.cursor()
+            rows = fetch_by_ids(cursor, """
+                SELECT Assignment_ID, Course_ID, Title, Description, Instructions, Due_Date, 
+                       Max_Score, Assignment_Type, Allowed_File_Types, Max_File_Size_MB,
+                       Created_By, Created_At, Solution_Path, Solution_File_Name, Correct_Answer, Is_Auto_Graded
+                FROM [Assignment]
+                WHERE Assignment_ID IN ({ids})
+            """, assignment_ids)
+            return {row[0]: self._row_to_assignment(row) for row in rows}
+        finally:
+            cursor.close()
+            conn.close()
+    
     def get_by_course(self, course_id):
         """Get all assignments for a course"""
         conn = self.db_connection.get_connection()
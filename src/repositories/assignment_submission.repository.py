@@ -3,6 +3,7 @@ Assignment Submission Repository
 Handles database operations for assignment submissions
 """
 from core.db_singleton import DatabaseConnection
+from core.sql_dialect import dialect_for
 from models.assignment_submission import AssignmentSubmission
 from datetime import datetime
 
@@ -16,10 +17,8 @@ class AssignmentSubmissionRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[Assignment_Submission]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE [Assignment_Submission] (
+            dialect = dialect_for(conn)
+            dialect.create_table(cursor, "Assignment_Submission", """
                         Submission_ID INT IDENTITY(1,1) PRIMARY KEY,
                         Assignment_ID INT NOT NULL,
                         Student_ID INT NOT NULL,
@@ -38,73 +37,59 @@ class AssignmentSubmissionRepository:
                         FOREIGN KEY (Assignment_ID) REFERENCES Assignment(Assignment_ID),
                         FOREIGN KEY (Student_ID) REFERENCES Student(Student_ID),
                         FOREIGN KEY (Graded_By) REFERENCES Instructor(Instructor_ID) ON DELETE SET NULL
-                    )
-                END
             """)
             
             # Add new columns if they don't exist (for existing tables)
             try:
-                cursor.execute("""
-                    IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[Assignment_Submission]') AND name = 'Review_Requested')
-                    BEGIN
-                        ALTER TABLE [Assignment_Submission] ADD Review_Requested BIT DEFAULT 0
-                    END
-                """)
-                cursor.execute("""
-                    IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[Assignment_Submission]') AND name = 'Review_Comment')
-                    BEGIN
-                        ALTER TABLE [Assignment_Submission] ADD Review_Comment NVARCHAR(MAX)
-                    END
-                """)
-                cursor.execute("""
-                    IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[Assignment_Submission]') AND name = 'Is_AI_Graded')
-                    BEGIN
-                        ALTER TABLE [Assignment_Submission] ADD Is_AI_Graded BIT DEFAULT 0
-                    END
-                """)
+                dialect.add_column(cursor, "Assignment_Submission", "Review_Requested", "BIT DEFAULT 0")
+                dialect.add_column(cursor, "Assignment_Submission", "Review_Comment", "NVARCHAR(MAX)")
+                dialect.add_column(cursor, "Assignment_Submission", "Is_AI_Graded", "BIT DEFAULT 0")
                 
-                # Update CHECK constraint for Status column to include 'review_requested'
-                # Find and drop existing Status check constraints
-                cursor.execute("""
-                    DECLARE @ConstraintName NVARCHAR(200)
-                    DECLARE @SQL NVARCHAR(MAX)
-                    
-                    -- Find Status column constraints by checking definitions that include Status column values
-                    DECLARE constraint_cursor CURSOR FOR
-                    SELECT cc.name 
-                    FROM sys.check_constraints cc
-                    INNER JOIN sys.columns c ON c.object_id = cc.parent_object_id AND c.column_id = cc.parent_column_id
-                    WHERE cc.parent_object_id = OBJECT_ID(N'[dbo].[Assignment_Submission]')
-                    AND c.name = 'Status'
-                    AND (cc.definition LIKE '%submitted%' OR cc.definition LIKE '%graded%' OR cc.definition LIKE '%late%')
+                # Rebuilding CHECK constraints is only needed on SQL Server;
+                # SQLite tables are created with the current constraint
+                if dialect.name == 'sqlserver':
+                    # Update CHECK constraint for Status column to include 'review_requested'
+                    # Find and drop existing Status check constraints
+                    cursor.execute("""
+                        DECLARE @ConstraintName NVARCHAR(200)
+                        DECLARE @SQL NVARCHAR(MAX)
                     
-                    OPEN constraint_cursor
-                    FETCH NEXT FROM constraint_cursor INTO @ConstraintName
+                        -- Find Status column constraints by checking definitions that include Status column values
+                        DECLARE constraint_cursor CURSOR FOR
+                        SELECT cc.name 
+                        FROM sys.check_constraints cc
+                        INNER JOIN sys.columns c ON c.object_id = cc.parent_object_id AND c.column_id = cc.parent_column_id
+                        WHERE cc.parent_object_id = OBJECT_ID(N'[dbo].[Assignment_Submission]')
+                        AND c.name = 'Status'
+                        AND (cc.definition LIKE '%submitted%' OR cc.definition LIKE '%graded%' OR cc.definition LIKE '%late%')
                     
-                    WHILE @@FETCH_STATUS = 0
-                    BEGIN
-                        SET @SQL = 'ALTER TABLE [dbo].[Assignment_Submission] DROP CONSTRAINT [' + @ConstraintName + ']'
-                        EXEC sp_executesql @SQL
+                        OPEN constraint_cursor
                         FETCH NEXT FROM constraint_cursor INTO @ConstraintName
-                    END
                     
-                    CLOSE constraint_cursor
-                    DEALLOCATE constraint_cursor
-                """)
+                        WHILE @@FETCH_STATUS = 0
+                        BEGIN
+                            SET @SQL = 'ALTER TABLE [dbo].[Assignment_Submission] DROP CONSTRAINT [' + @ConstraintName + ']'
+                            EXEC sp_executesql @SQL
+                            FETCH NEXT FROM constraint_cursor INTO @ConstraintName
+                        END
+                    
+                        CLOSE constraint_cursor
+                        DEALLOCATE constraint_cursor
+                    """)
                 
-                # Add new constraint with all allowed values including 'review_requested'
-                cursor.execute("""
-                    IF NOT EXISTS (
-                        SELECT * FROM sys.check_constraints 
-                        WHERE name = 'CK_Assignment_Submission_Status' 
-                        AND parent_object_id = OBJECT_ID(N'[dbo].[Assignment_Submission]')
-                    )
-                    BEGIN
-                        ALTER TABLE [Assignment_Submission]
-                        ADD CONSTRAINT CK_Assignment_Submission_Status 
-                        CHECK (Status IN ('submitted', 'late', 'graded', 'review_requested'))
-                    END
-                """)
+                    # Add new constraint with all allowed values including 'review_requested'
+                    cursor.execute("""
+                        IF NOT EXISTS (
+                            SELECT * FROM sys.check_constraints 
+                            WHERE name = 'CK_Assignment_Submission_Status' 
+                            AND parent_object_id = OBJECT_ID(N'[dbo].[Assignment_Submission]')
+                        )
+                        BEGIN
+                            ALTER TABLE [Assignment_Submission]
+                            ADD CONSTRAINT CK_Assignment_Submission_Status 
+                            CHECK (Status IN ('submitted', 'late', 'graded', 'review_requested'))
+                        END
+                    """)
             except Exception as e:
                 # Log error but continue - constraint might already be updated
                 print(f"Warning: Could not update Status constraint: {e}")
@@ -1,29 +1,39 @@
 from core.db_singleton import DatabaseConnection
+from core.stats_cache import invalidate_overview_stats
+from core.pagination import fetch_page, stream_query, STREAM_BATCH_SIZE
 from models.calendar import Calendar
+from core.row_decoder import row_decoder
+
+# Event_ID, Student_ID, Title, Date, Time, Source
+_decode_event = row_decoder(None, None, None, None, None, None, factory=Calendar)
 
 
 class CalendarRepository:
     def __init__(self):
         self.db_connection = DatabaseConnection()
 
+    SELECT_COLUMNS = "SELECT Event_ID, Student_ID, Title, Date, Time, Source FROM Calendar"
+
+    def _row_to_event(self, row):
+        return _decode_event(row)
+
     def get_all(self):
         """Get all calendar events"""
+        return list(self.iter_all())
+
+    def iter_all(self, batch_size=STREAM_BATCH_SIZE):
+        """Stream all calendar events without loading the table into memory"""
+        return stream_query(self.db_connection, self.SELECT_COLUMNS + " ORDER BY Event_ID",
+                            self._row_to_event, batch_size=batch_size)
+
+    def get_page(self, cursor=None, limit=None, student_id=None):
+        """Get one keyset page of calendar events ordered by Event_ID"""
         conn = self.db_connection.get_connection()
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT Event_ID, Student_ID, Title, Date, Time, Source FROM Calendar")
-            rows = cursor.fetchall()
-            events = []
-            for row in rows:
-                events.append(Calendar(
-                    Event_ID=row[0],
-                    Student_ID=row[1],
-                    Title=row[2],
-                    Date=row[3],
-                    Time=row[4],
-                    Source=row[5]
-                ))
-            return events
+            return fetch_page(conn, self.SELECT_COLUMNS, "Event_ID", self._row_to_event,
+                              cursor=cursor, limit=limit,
+                              where="Student_ID = ?" if student_id is not None else None,
+                              params=(student_id,) if student_id is not None else ())
         finally:
             conn.close()
 
@@ -35,14 +45,7 @@ class CalendarRepository:
             cursor.execute("SELECT Event_ID, Student_ID, Title, Date, Time, Source FROM Calendar WHERE Event_ID = ?", (event_id,))
             row = cursor.fetchone()
             if row:
-                return Calendar(
-                    Event_ID=row[0],
-                    Student_ID=row[1],
-                    Title=row[2],
-                    Date=row[3],
-                    Time=row[4],
-                    Source=row[5]
-                )
+                return self._row_to_event(row)
             return None
         finally:
             conn.close()
@@ -56,14 +59,7 @@ class CalendarRepository:
             rows = cursor.fetchall()
             events = []
             for row in rows:
-                events.append(Calendar(
-                    Event_ID=row[0],
-                    Student_ID=row[1],
-                    Title=row[2],
-                    Date=row[3],
-                    Time=row[4],
-                    Source=row[5]
-                ))
+                events.append(self._row_to_event(row))
             return events
         finally:
             conn.close()
@@ -79,6 +75,7 @@ class CalendarRepository:
             )
             event_id = cursor.fetchone()[0]
             conn.commit()
+            invalidate_overview_stats(student_id=calendar.Student_ID)
             calendar.Event_ID = event_id
             return calendar
         finally:
@@ -94,6 +91,7 @@ class CalendarRepository:
                 (calendar.Title, calendar.Date, calendar.Time, calendar.Source, calendar.Event_ID)
             )
             conn.commit()
+            invalidate_overview_stats(student_id=calendar.Student_ID)
             return calendar
         finally:
             conn.close()
@@ -105,6 +103,7 @@ class CalendarRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM Calendar WHERE Event_ID = ?", (event_id,))
             conn.commit()
+            invalidate_overview_stats()
             return cursor.rowcount > 0
         finally:
             conn.close()
@@ -4,6 +4,7 @@ Handles database operations for chat history
 """
 from models.chat_history import ChatHistory
 from core.db_singleton import DatabaseConnection
+from core.pagination import fetch_page, stream_query, STREAM_BATCH_SIZE
 
 class ChatHistoryRepository:
     def __init__(self):
@@ -11,9 +12,7 @@ class ChatHistoryRepository:
     
     def create_table(self):
         """Create chat history table if it doesn't exist"""
-        query = """
-        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Chat_History' AND xtype='U')
-        CREATE TABLE Chat_History (
+        self.db.create_table("Chat_History", """
             Chat_ID INT IDENTITY(1,1) PRIMARY KEY,
             User_ID INT NOT NULL,
             Question NVARCHAR(MAX) NOT NULL,
@@ -21,9 +20,7 @@ class ChatHistoryRepository:
             Sources NVARCHAR(MAX),
             Created_Date DATETIME DEFAULT GETDATE(),
             FOREIGN KEY (User_ID) REFERENCES [User](User_ID)
-        )
-        """
-        self.db.execute_update(query)
+        """)
     
     def add(self, chat_history):
         """Add a new chat history entry"""
@@ -50,6 +47,21 @@ class ChatHistoryRepository:
         results = self.db.fetch_all(query, (user_id, limit))
         return [self._map_to_object(row) for row in results] if results else []
     
+    def get_page_by_user(self, user_id, cursor=None, limit=None):
+        """Get one keyset page of a user's chat history, newest first (ordered by Chat_ID)"""
+        conn = self.db.get_connection()
+        try:
+            return fetch_page(conn, "SELECT * FROM Chat_History", "Chat_ID", self._map_to_object,
+                              cursor=cursor, limit=limit, descending=True,
+                              where="User_ID = ?", params=(user_id,))
+        finally:
+            conn.close()
+    
+    def iter_by_user(self, user_id, batch_size=STREAM_BATCH_SIZE):
+        """Stream a user's whole chat history, newest first"""
+        return stream_query(self.db, "SELECT * FROM Chat_History WHERE User_ID = ? ORDER BY Chat_ID DESC",
+                            self._map_to_object, params=(user_id,), batch_size=batch_size)
+    
     def get_recent_chats(self, user_id, limit=10):
         """Get recent chat history for a user"""
         return self.get_by_user_id(user_id, limit)
@@ -1,69 +1,69 @@
 from core.db_singleton import DatabaseConnection
+from core.bulk_operations import fetch_by_ids, unique_ids
+from core.reference_cache import get_reference_cache
+from core.row_decoder import row_decoder
 from models.course import Course
 
+# Course_ID, Course_Name, Credits, Instructor_ID, Schedule
+_decode_course = row_decoder(None, None, None, None, None, factory=Course)
+
+# Courses rarely change during a term: cache the raw rows and build fresh
+# Course objects per call so callers can't mutate each other's results
+_cache = get_reference_cache('course')
+
 
 class CourseRepository:
     def __init__(self):
         self.db_connection = DatabaseConnection()
 
-    def get_all(self):
-        """Get all courses"""
+    SELECT_COLUMNS = "SELECT Course_ID, Course_Name, Credits, Instructor_ID, Schedule FROM Course"
+
+    def _fetch_rows(self, query, params=None):
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT Course_ID, Course_Name, Credits, Instructor_ID, Schedule FROM Course")
-            rows = cursor.fetchall()
-            courses = []
-            for row in rows:
-                courses.append(Course(
-                    Course_ID=row[0],
-                    Course_Name=row[1],
-                    Credits=row[2],
-                    Instructor_ID=row[3],
-                    Schedule=row[4]
-                ))
-            return courses
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            return [tuple(row) for row in cursor.fetchall()]
         finally:
             conn.close()
 
+    def get_all(self):
+        """Get all courses"""
+        rows = _cache.get('all', lambda: self._fetch_rows(self.SELECT_COLUMNS))
+        return [_decode_course(row) for row in rows]
+
     def get_by_id(self, course_id):
         """Get course by ID"""
+        row = _cache.get(('id', course_id), lambda: self._fetch_one_row(course_id))
+        return _decode_course(row) if row else None
+
+    def _fetch_one_row(self, course_id):
+        rows = self._fetch_rows(self.SELECT_COLUMNS + " WHERE Course_ID = ?", (course_id,))
+        return rows[0] if rows else None
+
+    def get_many_by_ids(self, course_ids):
+        """Get courses for many IDs in one IN (...) query per chunk; returns {Course_ID: Course}"""
+        rows = _cache.get_many([('id', course_id) for course_id in unique_ids(course_ids)],
+                               self._load_rows_by_keys)
+        return {key[1]: _decode_course(row) for key, row in rows.items() if row}
+
+    def _load_rows_by_keys(self, keys):
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT Course_ID, Course_Name, Credits, Instructor_ID, Schedule FROM Course WHERE Course_ID = ?", (course_id,))
-            row = cursor.fetchone()
-            if row:
-                return Course(
-                    Course_ID=row[0],
-                    Course_Name=row[1],
-                    Credits=row[2],
-                    Instructor_ID=row[3],
-                    Schedule=row[4]
-                )
-            return None
+            rows = fetch_by_ids(cursor, self.SELECT_COLUMNS + " WHERE Course_ID IN ({ids})", [key[1] for key in keys])
+            return {('id', row[0]): tuple(row) for row in rows}
         finally:
             conn.close()
 
     def get_by_instructor(self, instructor_id):
         """Get all courses by instructor"""
-        conn = self.db_connection.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT Course_ID, Course_Name, Credits, Instructor_ID, Schedule FROM Course WHERE Instructor_ID = ?", (instructor_id,))
-            rows = cursor.fetchall()
-            courses = []
-            for row in rows:
-                courses.append(Course(
-                    Course_ID=row[0],
-                    Course_Name=row[1],
-                    Credits=row[2],
-                    Instructor_ID=row[3],
-                    Schedule=row[4]
-                ))
-            return courses
-        finally:
-            conn.close()
+        rows = _cache.get(('instructor', instructor_id), lambda: self._fetch_rows(
+            self.SELECT_COLUMNS + " WHERE Instructor_ID = ?", (instructor_id,)))
+        return [_decode_course(row) for row in rows]
 
     def create(self, course):
         """Create a new course"""
@@ -76,6 +76,7 @@ class CourseRepository:
             )
             course_id = cursor.fetchone()[0]
             conn.commit()
+            _cache.invalidate()
             course.Course_ID = course_id
             return course
         finally:
@@ -91,6 +92,7 @@ class CourseRepository:
                 (course.Course_Name, course.Credits, course.Instructor_ID, course.Schedule, course.Course_ID)
             )
             conn.commit()
+            _cache.invalidate()
             return course
         finally:
             conn.close()
@@ -102,6 +104,7 @@ class CourseRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM Course WHERE Course_ID = ?", (course_id,))
             conn.commit()
+            _cache.invalidate()
             return cursor.rowcount > 0
         finally:
             conn.close()
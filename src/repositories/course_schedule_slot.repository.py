@@ -2,82 +2,80 @@
 Course Schedule Slot Repository
 Handles database operations for course schedule slots
 """
+from core.conflict_matrix import invalidate_conflict_matrices
 from core.db_singleton import DatabaseConnection
+from core.reference_cache import get_reference_cache
+from core.unit_of_work import on_commit
 from datetime import time
 from typing import Optional, List, Dict
 
 
+SLOT_COLUMNS = ('Slot_ID', 'Course_ID', 'Course_Code', 'Section', 'Day',
+                'Start_Time', 'End_Time', 'Slot_Type', 'Sub_Type', 'Academic_Year', 'Term')
+
+# Slots are fixed for a term: cache the raw rows, hand out fresh dicts per call
+_cache = get_reference_cache('course_schedule_slot')
+
+
+def _row_to_slot(row):
+    return dict(zip(SLOT_COLUMNS, row))
+
+
 class CourseScheduleSlotRepository:
     def __init__(self):
         self.db_connection = DatabaseConnection()
 
-    def get_all(self):
-        """Get all schedule slots"""
+    def _fetch_rows(self, query, params=None):
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            return [tuple(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_all(self):
+        """Get all schedule slots"""
+        rows = _cache.get('all', lambda: self._fetch_rows("""
                 SELECT Slot_ID, Course_ID, Course_Code, Section, Day, 
                        Start_Time, End_Time, Slot_Type, Sub_Type, Academic_Year, Term
                 FROM Course_Schedule_Slot
                 ORDER BY Course_Code, Section, Day, Start_Time
-            """)
-            rows = cursor.fetchall()
-            slots = []
-            for row in rows:
-                slots.append({
-                    'Slot_ID': row[0],
-                    'Course_ID': row[1],
-                    'Course_Code': row[2],
-                    'Section': row[3],
-                    'Day': row[4],
-                    'Start_Time': row[5],
-                    'End_Time': row[6],
-                    'Slot_Type': row[7],
-                    'Sub_Type': row[8],
-                    'Academic_Year': row[9],
-                    'Term': row[10]
-                })
-            return slots
-        finally:
-            conn.close()
+            """))
+        return [_row_to_slot(row) for row in rows]
 
     def get_by_course_code(self, course_code: str, academic_year: Optional[int] = None, term: Optional[str] = None):
         """Get slots by course code"""
-        conn = self.db_connection.get_connection()
-        try:
-            cursor = conn.cursor()
-            query = "SELECT Slot_ID, Course_ID, Course_Code, Section, Day, Start_Time, End_Time, Slot_Type, Sub_Type, Academic_Year, Term FROM Course_Schedule_Slot WHERE Course_Code = ?"
-            params = [course_code]
-            
-            if academic_year:
-                query += " AND Academic_Year = ?"
-                params.append(academic_year)
-            if term:
-                query += " AND Term = ?"
-                params.append(term)
-            
-            query += " ORDER BY Section, Day, Start_Time"
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            slots = []
-            for row in rows:
-                slots.append({
-                    'Slot_ID': row[0],
-                    'Course_ID': row[1],
-                    'Course_Code': row[2],
-                    'Section': row[3],
-                    'Day': row[4],
-                    'Start_Time': row[5],
-                    'End_Time': row[6],
-                    'Slot_Type': row[7],
-                    'Sub_Type': row[8],
-                    'Academic_Year': row[9],
-                    'Term': row[10]
-                })
-            return slots
-        finally:
-            conn.close()
+        query = "SELECT Slot_ID, Course_ID, Course_Code, Section, Day, Start_Time, End_Time, Slot_Type, Sub_Type, Academic_Year, Term FROM Course_Schedule_Slot WHERE Course_Code = ?"
+        params = [course_code]
+        
+        if academic_year:
+            query += " AND Academic_Year = ?"
+            params.append(academic_year)
+        if term:
+            query += " AND Term = ?"
+            params.append(term)
+        
+        query += " ORDER BY Section, Day, Start_Time"
+        rows = _cache.get(('code', course_code, academic_year or None, term or None),
+                          lambda: self._fetch_rows(query, params))
+        return [_row_to_slot(row) for row in rows]
+
+    def get_section_counts(self, academic_year: int, term: str):
+        """
+        Slot counts per (course, section, slot type, sub type) for a term, in one
+        grouped query: [(Course_Code, Section, Slot_Type, Sub_Type, Slot_Count)]
+        """
+        return self._fetch_rows("""
+                SELECT Course_Code, Section, Slot_Type, Sub_Type, COUNT(*) AS Slot_Count
+                FROM Course_Schedule_Slot
+                WHERE Academic_Year = ? AND Term = ?
+                GROUP BY Course_Code, Section, Slot_Type, Sub_Type
+                ORDER BY Course_Code, Section
+            """, (academic_year, term))
 
     def create(self, slot_data: Dict):
         """Create a new schedule slot"""
@@ -103,6 +101,8 @@ class CourseScheduleSlotRepository:
             ))
             slot_id = cursor.fetchone()[0]
             conn.commit()
+            _cache.invalidate()
+            on_commit(invalidate_conflict_matrices)
             return slot_id
         finally:
             conn.close()
@@ -133,6 +133,8 @@ class CourseScheduleSlotRepository:
                 ))
                 created_ids.append(cursor.fetchone()[0])
             conn.commit()
+            _cache.invalidate()
+            on_commit(invalidate_conflict_matrices)
             return created_ids
         finally:
             conn.close()
@@ -144,6 +146,8 @@ class CourseScheduleSlotRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM Course_Schedule_Slot WHERE Course_Code = ?", (course_code,))
             conn.commit()
+            _cache.invalidate()
+            on_commit(invalidate_conflict_matrices)
             return cursor.rowcount > 0
         finally:
             conn.close()
@@ -1,31 +1,39 @@
+from core.bulk_operations import fetch_by_ids
 from core.db_singleton import DatabaseConnection
+from core.stats_cache import invalidate_overview_stats
+from core.pagination import fetch_page, stream_query, STREAM_BATCH_SIZE
 from models.enrollment import Enrollment
+from core.row_decoder import row_decoder
+
+# Enrollment_ID, Student_ID, Course_ID, Status, Grade, Semester
+_decode_enrollment = row_decoder(None, None, None, None, None, None, factory=Enrollment)
 
 
 class EnrollmentRepository:
     def __init__(self):
         self.db_connection = DatabaseConnection()
 
+    SELECT_COLUMNS = "SELECT Enrollment_ID, Student_ID, Course_ID, Status, Grade, Semester FROM [Enrollment]"
+
+    def _row_to_enrollment(self, row):
+        return _decode_enrollment(row)
+
     def get_all(self):
         """Get all enrollments"""
+        return list(self.iter_all())
+
+    def iter_all(self, batch_size=STREAM_BATCH_SIZE):
+        """Stream all enrollments without loading the table into memory"""
+        return stream_query(self.db_connection, self.SELECT_COLUMNS + " ORDER BY Enrollment_ID",
+                            self._row_to_enrollment, batch_size=batch_size)
+
+    def get_page(self, cursor=None, limit=None):
+        """Get one keyset page of enrollments ordered by Enrollment_ID"""
         conn = self.db_connection.get_connection()
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT Enrollment_ID, Student_ID, Course_ID, Status, Grade, Semester FROM [Enrollment]")
-            rows = cursor.fetchall()
-            enrollments = []
-            for row in rows:
-                enrollments.append(Enrollment(
-                    Enrollment_ID=row[0],
-                    Student_ID=row[1],
-                    Course_ID=row[2],
-                    Status=row[3],
-                    Grade=row[4],
-                    Semester=row[5]
-                ))
-            return enrollments
+            return fetch_page(conn, self.SELECT_COLUMNS, "Enrollment_ID", self._row_to_enrollment,
+                              cursor=cursor, limit=limit)
         finally:
-            cursor.close()
             conn.close()
 
     def get_by_id(self, enrollment_id):
@@ -36,14 +44,7 @@ class EnrollmentRepository:
             cursor.execute("SELECT Enrollment_ID, Student_ID, Course_ID, Status, Grade, Semester FROM [Enrollment] WHERE Enrollment_ID = ?", (enrollment_id,))
             row = cursor.fetchone()
             if row:
-                return Enrollment(
-                    Enrollment_ID=row[0],
-                    Student_ID=row[1],
-                    Course_ID=row[2],
-                    Status=row[3],
-                    Grade=row[4],
-                    Semester=row[5]
-                )
+                return self._row_to_enrollment(row)
             return None
         finally:
             cursor.close()
@@ -58,19 +59,26 @@ class EnrollmentRepository:
             rows = cursor.fetchall()
             enrollments = []
             for row in rows:
-                enrollments.append(Enrollment(
-                    Enrollment_ID=row[0],
-                    Student_ID=row[1],
-                    Course_ID=row[2],
-                    Status=row[3],
-                    Grade=row[4],
-                    Semester=row[5]
-                ))
+                enrollments.append(self._row_to_enrollment(row))
             return enrollments
         finally:
             cursor.close()
             conn.close()
     
+    def get_by_students(self, student_ids):
+        """Get enrollments of many students in one IN (...) query per chunk; returns {Student_ID: [Enrollment]}"""
+        conn = self.db_connection.get_connection()
+        try:
+            cursor = conn.cursor()
+            rows = fetch_by_ids(cursor, "SELECT Enrollment_ID, Student_ID, Course_ID, Status, Grade, Semester FROM [Enrollment] WHERE Student_ID IN ({ids}) ORDER BY Enrollment_ID", student_ids)
+            enrollments = {student_id: [] for student_id in student_ids}
+            for row in rows:
+                enrollments.setdefault(row[1], []).append(self._row_to_enrollment(row))
+            return enrollments
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_by_student_id(self, student_id):
         """Get all enrollments for a student (alias for get_by_student)"""
         return self.get_by_student(student_id)
@@ -84,14 +92,7 @@ class EnrollmentRepository:
             rows = cursor.fetchall()
             enrollments = []
             for row in rows:
-                enrollments.append(Enrollment(
-                    Enrollment_ID=row[0],
-                    Student_ID=row[1],
-                    Course_ID=row[2],
-                    Status=row[3],
-                    Grade=row[4],
-                    Semester=row[5]
-                ))
+                enrollments.append(self._row_to_enrollment(row))
             return enrollments
         finally:
             cursor.close()
@@ -112,11 +113,26 @@ class EnrollmentRepository:
             if row:
                 enrollment.Enrollment_ID = row[0]
             conn.commit()
+            invalidate_overview_stats(student_id=enrollment.Student_ID)
             return enrollment
         finally:
             cursor.close()
             conn.close()
 
+    def create_many(self, enrollments):
+        """Create many enrollments with one INSERT per chunk; assigns generated IDs back to each object"""
+        enrollments = list(enrollments)
+        if not enrollments:
+            return []
+        columns = ['Student_ID', 'Course_ID', 'Status', 'Grade', 'Semester']
+        rows = [(enrollment.Student_ID, enrollment.Course_ID, enrollment.Status, enrollment.Grade, enrollment.Semester) for enrollment in enrollments]
+        ids = self.db_connection.bulk_insert("[Enrollment]", columns, rows, id_column="Enrollment_ID")
+        for enrollment, new_id in zip(enrollments, ids):
+            enrollment.Enrollment_ID = new_id
+        for student_id in {enrollment.Student_ID for enrollment in enrollments}:
+            invalidate_overview_stats(student_id=student_id)
+        return enrollments
+
     def update(self, enrollment):
         """Update an existing enrollment"""
         conn = self.db_connection.get_connection()
@@ -127,6 +143,7 @@ class EnrollmentRepository:
                 (enrollment.Status, enrollment.Grade, enrollment.Semester, enrollment.Enrollment_ID)
             )
             conn.commit()
+            invalidate_overview_stats(student_id=enrollment.Student_ID)
             return enrollment
         finally:
             cursor.close()
@@ -139,6 +156,7 @@ class EnrollmentRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM [Enrollment] WHERE Enrollment_ID = ?", (enrollment_id,))
             conn.commit()
+            invalidate_overview_stats()
             return cursor.rowcount > 0
         finally:
             cursor.close()
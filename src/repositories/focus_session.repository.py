@@ -1,5 +1,10 @@
 from core.db_singleton import DatabaseConnection
+from core.sql_dialect import dialect_for
 from models.focus_session import FocusSession
+from core.row_decoder import row_decoder
+
+# Session_ID, Student_ID, Duration, Start_Time, End_Time, Completed
+_decode_session = row_decoder(None, None, None, 'datetime', 'datetime', 'bool', factory=FocusSession)
 
 
 class FocusSessionRepository:
@@ -11,10 +16,7 @@ class FocusSessionRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[Focus_Session]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE Focus_Session (
+            dialect_for(conn).create_table(cursor, "Focus_Session", """
                         Session_ID INT IDENTITY(1,1) PRIMARY KEY,
                         Student_ID INT NOT NULL,
                         Duration INT NOT NULL,
@@ -22,14 +24,15 @@ class FocusSessionRepository:
                         End_Time DATETIME,
                         Completed BIT DEFAULT 0,
                         FOREIGN KEY (Student_ID) REFERENCES Student(Student_ID)
-                    )
-                END
             """)
             conn.commit()
         finally:
             cursor.close()
             conn.close()
 
+    def _row_to_session(self, row):
+        return _decode_session(row)
+
     def get_all(self):
         """Get all focus sessions"""
         conn = self.db_connection.get_connection()
@@ -39,14 +42,7 @@ class FocusSessionRepository:
             rows = cursor.fetchall()
             sessions = []
             for row in rows:
-                sessions.append(FocusSession(
-                    Session_ID=row[0],
-                    Student_ID=row[1],
-                    Duration=row[2],
-                    Start_Time=row[3],
-                    End_Time=row[4],
-                    Completed=bool(row[5])
-                ))
+                sessions.append(self._row_to_session(row))
             return sessions
         finally:
             conn.close()
@@ -59,14 +55,7 @@ class FocusSessionRepository:
             cursor.execute("SELECT Session_ID, Student_ID, Duration, Start_Time, End_Time, Completed FROM Focus_Session WHERE Session_ID = ?", (session_id,))
             row = cursor.fetchone()
             if row:
-                return FocusSession(
-                    Session_ID=row[0],
-                    Student_ID=row[1],
-                    Duration=row[2],
-                    Start_Time=row[3],
-                    End_Time=row[4],
-                    Completed=bool(row[5])
-                )
+                return self._row_to_session(row)
             return None
         finally:
             conn.close()
@@ -80,14 +69,7 @@ class FocusSessionRepository:
             rows = cursor.fetchall()
             sessions = []
             for row in rows:
-                sessions.append(FocusSession(
-                    Session_ID=row[0],
-                    Student_ID=row[1],
-                    Duration=row[2],
-                    Start_Time=row[3],
-                    End_Time=row[4],
-                    Completed=bool(row[5])
-                ))
+                sessions.append(self._row_to_session(row))
             return sessions
         finally:
             conn.close()
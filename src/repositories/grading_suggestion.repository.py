@@ -3,6 +3,7 @@ GradingSuggestion Repository
 Handles database operations for GradingSuggestion model
 """
 from core.db_singleton import DatabaseConnection
+from core.sql_dialect import dialect_for
 from models.grading_suggestion import GradingSuggestion
 from datetime import datetime
 from typing import List, Optional
@@ -18,10 +19,7 @@ class GradingSuggestionRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[GradingSuggestion]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE [GradingSuggestion] (
+            dialect_for(conn).create_table(cursor, "GradingSuggestion", """
                         Suggestion_ID INT IDENTITY(1,1) PRIMARY KEY,
                         Submission_ID INT NOT NULL,
                         Suggested_Grade DECIMAL(5,2),
@@ -33,8 +31,6 @@ class GradingSuggestionRepository:
                         Generated_At DATETIME DEFAULT GETDATE(),
                         Accepted BIT,
                         FOREIGN KEY (Submission_ID) REFERENCES Assignment_Submission(Submission_ID)
-                    )
-                END
             """)
             conn.commit()
         finally:
@@ -1,68 +1,68 @@
 from core.db_singleton import DatabaseConnection
+from core.user_profile import invalidate_user_profile
+from core.bulk_operations import fetch_by_ids, unique_ids
+from core.reference_cache import get_reference_cache
+from core.row_decoder import row_decoder
 from models.instructor import Instructor
 
+# Instructor_ID, User_ID, Department, Office, Email
+_decode_instructor = row_decoder(None, None, None, None, None, factory=Instructor)
+
+# Reference data: raw rows are cached, Instructor objects are built per call
+_cache = get_reference_cache('instructor')
+
 
 class InstructorRepository:
     def __init__(self):
         self.db_connection = DatabaseConnection()
 
-    def get_all(self):
-        """Get all instructors"""
+    SELECT_COLUMNS = "SELECT Instructor_ID, User_ID, Department, Office, Email FROM Instructor"
+
+    def _fetch_rows(self, query, params=None):
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT Instructor_ID, User_ID, Department, Office, Email FROM Instructor")
-            rows = cursor.fetchall()
-            instructors = []
-            for row in rows:
-                instructors.append(Instructor(
-                    Instructor_ID=row[0],
-                    User_ID=row[1],
-                    Department=row[2],
-                    Office=row[3],
-                    Email=row[4]
-                ))
-            return instructors
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            return [tuple(row) for row in cursor.fetchall()]
         finally:
             conn.close()
 
+    def _fetch_first_row(self, where, value):
+        rows = self._fetch_rows(f"{self.SELECT_COLUMNS} WHERE {where} = ?", (value,))
+        return rows[0] if rows else None
+
+    def get_all(self):
+        """Get all instructors"""
+        rows = _cache.get('all', lambda: self._fetch_rows(self.SELECT_COLUMNS))
+        return [_decode_instructor(row) for row in rows]
+
     def get_by_id(self, instructor_id):
         """Get instructor by ID"""
+        row = _cache.get(('id', instructor_id), lambda: self._fetch_first_row("Instructor_ID", instructor_id))
+        return _decode_instructor(row) if row else None
+
+    def get_many_by_ids(self, instructor_ids):
+        """Get instructors for many IDs in one IN (...) query per chunk; returns {Instructor_ID: Instructor}"""
+        rows = _cache.get_many([('id', instructor_id) for instructor_id in unique_ids(instructor_ids)],
+                               self._load_rows_by_keys)
+        return {key[1]: _decode_instructor(row) for key, row in rows.items() if row}
+
+    def _load_rows_by_keys(self, keys):
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT Instructor_ID, User_ID, Department, Office, Email FROM Instructor WHERE Instructor_ID = ?", (instructor_id,))
-            row = cursor.fetchone()
-            if row:
-                return Instructor(
-                    Instructor_ID=row[0],
-                    User_ID=row[1],
-                    Department=row[2],
-                    Office=row[3],
-                    Email=row[4]
-                )
-            return None
+            rows = fetch_by_ids(cursor, self.SELECT_COLUMNS + " WHERE Instructor_ID IN ({ids})", [key[1] for key in keys])
+            return {('id', row[0]): tuple(row) for row in rows}
         finally:
             conn.close()
 
     def get_by_user_id(self, user_id):
         """Get instructor by User_ID"""
-        conn = self.db_connection.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT Instructor_ID, User_ID, Department, Office, Email FROM Instructor WHERE User_ID = ?", (user_id,))
-            row = cursor.fetchone()
-            if row:
-                return Instructor(
-                    Instructor_ID=row[0],
-                    User_ID=row[1],
-                    Department=row[2],
-                    Office=row[3],
-                    Email=row[4]
-                )
-            return None
-        finally:
-            conn.close()
+        row = _cache.get(('user', user_id), lambda: self._fetch_first_row("User_ID", user_id))
+        return _decode_instructor(row) if row else None
 
     def create(self, instructor):
         """Create a new instructor"""
@@ -75,6 +75,8 @@ class InstructorRepository:
             )
             instructor_id = cursor.fetchone()[0]
             conn.commit()
+            invalidate_user_profile(instructor.User_ID)
+            _cache.invalidate()
             instructor.Instructor_ID = instructor_id
             return instructor
         finally:
@@ -90,6 +92,8 @@ class InstructorRepository:
                 (instructor.Department, instructor.Office, instructor.Email, instructor.Instructor_ID)
             )
             conn.commit()
+            invalidate_user_profile(instructor.User_ID)
+            _cache.invalidate()
             return instructor
         finally:
             conn.close()
@@ -101,6 +105,8 @@ class InstructorRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM Instructor WHERE Instructor_ID = ?", (instructor_id,))
             conn.commit()
+            invalidate_user_profile()
+            _cache.invalidate()
             return cursor.rowcount > 0
         finally:
             conn.close()
@@ -4,6 +4,8 @@ Handles database operations for knowledge base documents
 """
 from models.knowledge_base import KnowledgeBase
 from core.db_singleton import DatabaseConnection
+from core.invalidation_bus import publish
+from core.unit_of_work import on_commit
 from datetime import datetime
 
 class KnowledgeBaseRepository:
@@ -12,9 +14,7 @@ class KnowledgeBaseRepository:
     
     def create_table(self):
         """Create knowledge base table if it doesn't exist"""
-        query = """
-        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Knowledge_Base' AND xtype='U')
-        CREATE TABLE Knowledge_Base (
+        self.db.create_table("Knowledge_Base", """
             KB_ID INT IDENTITY(1,1) PRIMARY KEY,
             Title NVARCHAR(500) NOT NULL,
             Content NVARCHAR(MAX) NOT NULL,
@@ -23,9 +23,7 @@ class KnowledgeBaseRepository:
             Created_Date DATETIME DEFAULT GETDATE(),
             Updated_Date DATETIME DEFAULT GETDATE(),
             Source NVARCHAR(500)
-        )
-        """
-        self.db.execute_update(query)
+        """)
     
     def add(self, knowledge_base):
         """Add a new knowledge base document"""
@@ -40,7 +38,9 @@ class KnowledgeBaseRepository:
             knowledge_base.Keywords,
             knowledge_base.Source
         )
-        return self.db.execute_update(query, params)
+        result = self.db.execute_update(query, params)
+        on_commit(lambda: publish("kb"))
+        return result
     
     def get_by_id(self, kb_id):
         """Get a knowledge base document by ID"""
@@ -97,12 +97,16 @@ class KnowledgeBaseRepository:
             knowledge_base.Source,
             knowledge_base.KB_ID
         )
-        return self.db.execute_update(query, params)
+        result = self.db.execute_update(query, params)
+        on_commit(lambda: publish("kb"))
+        return result
     
     def delete(self, kb_id):
         """Delete a knowledge base document"""
         query = "DELETE FROM Knowledge_Base WHERE KB_ID = ?"
-        return self.db.execute_update(query, (kb_id,))
+        result = self.db.execute_update(query, (kb_id,))
+        on_commit(lambda: publish("kb"))
+        return result
     
     def get_categories(self):
         """Get all unique categories"""
@@ -1,39 +1,48 @@
 from core.db_singleton import DatabaseConnection
+from core.pagination import fetch_page, stream_query, STREAM_BATCH_SIZE
 from models.message import Message
+from core.row_decoder import row_decoder
+
+# Message_ID, Sender_ID, Receiver_ID, Message_Text, Timestamp, Is_Read, Sender_Name, Receiver_Name
+_decode_message = row_decoder(None, None, None, None, 'datetime', 'bool', None, None, factory=Message)
 
 
 class MessageRepository:
     def __init__(self):
         self.db_connection = DatabaseConnection()
 
+    SELECT_WITH_NAMES = """
+        SELECT m.Message_ID, m.Sender_ID, m.Receiver_ID, m.Message_Text, m.Timestamp, m.Is_Read,
+               u1.Username as Sender_Name, u2.Username as Receiver_Name
+        FROM [Message] m
+        LEFT JOIN [User] u1 ON m.Sender_ID = u1.User_ID
+        LEFT JOIN [User] u2 ON m.Receiver_ID = u2.User_ID
+    """
+
+    def _row_to_message(self, row):
+        return _decode_message(row)
+
     def get_all(self):
         """Get all messages"""
+        return list(self.iter_all())
+
+    def iter_all(self, batch_size=STREAM_BATCH_SIZE):
+        """Stream all messages without loading the table into memory"""
+        return stream_query(self.db_connection, self.SELECT_WITH_NAMES + " ORDER BY m.Message_ID",
+                            self._row_to_message, batch_size=batch_size)
+
+    def get_page(self, cursor=None, limit=None, user_id=None):
+        """
+        Get one keyset page of messages, newest first (ordered by Message_ID).
+        With user_id, only messages the user sent or received.
+        """
         conn = self.db_connection.get_connection()
         try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT m.Message_ID, m.Sender_ID, m.Receiver_ID, m.Message_Text, m.Timestamp, m.Is_Read,
-                       u1.Username as Sender_Name, u2.Username as Receiver_Name
-                FROM [Message] m
-                LEFT JOIN [User] u1 ON m.Sender_ID = u1.User_ID
-                LEFT JOIN [User] u2 ON m.Receiver_ID = u2.User_ID
-            """)
-            rows = cursor.fetchall()
-            messages = []
-            for row in rows:
-                messages.append(Message(
-                    Message_ID=row[0],
-                    Sender_ID=row[1],
-                    Receiver_ID=row[2],
-                    Message_Text=row[3],
-                    Timestamp=row[4],
-                    Is_Read=bool(row[5]) if row[5] is not None else False,
-                    Sender_Name=row[6],
-                    Receiver_Name=row[7]
-                ))
-            return messages
+            return fetch_page(conn, self.SELECT_WITH_NAMES, "m.Message_ID", self._row_to_message,
+                              cursor=cursor, limit=limit, descending=True,
+                              where="m.Sender_ID = ? OR m.Receiver_ID = ?" if user_id is not None else None,
+                              params=(user_id, user_id) if user_id is not None else ())
         finally:
-            cursor.close()
             conn.close()
 
     def get_by_id(self, message_id):
@@ -51,16 +60,7 @@ class MessageRepository:
             """, (message_id,))
             row = cursor.fetchone()
             if row:
-                return Message(
-                    Message_ID=row[0],
-                    Sender_ID=row[1],
-                    Receiver_ID=row[2],
-                    Message_Text=row[3],
-                    Timestamp=row[4],
-                    Is_Read=bool(row[5]) if row[5] is not None else False,
-                    Sender_Name=row[6],
-                    Receiver_Name=row[7]
-                )
+                return self._row_to_message(row)
             return None
         finally:
             cursor.close()
@@ -84,16 +84,7 @@ class MessageRepository:
             rows = cursor.fetchall()
             messages = []
             for row in rows:
-                messages.append(Message(
-                    Message_ID=row[0],
-                    Sender_ID=row[1],
-                    Receiver_ID=row[2],
-                    Message_Text=row[3],
-                    Timestamp=row[4],
-                    Is_Read=bool(row[5]) if row[5] is not None else False,
-                    Sender_Name=row[6],
-                    Receiver_Name=row[7]
-                ))
+                messages.append(self._row_to_message(row))
             return messages
         finally:
             cursor.close()
@@ -116,16 +107,7 @@ class MessageRepository:
             rows = cursor.fetchall()
             messages = []
             for row in rows:
-                messages.append(Message(
-                    Message_ID=row[0],
-                    Sender_ID=row[1],
-                    Receiver_ID=row[2],
-                    Message_Text=row[3],
-                    Timestamp=row[4],
-                    Is_Read=bool(row[5]) if row[5] is not None else False,
-                    Sender_Name=row[6],
-                    Receiver_Name=row[7]
-                ))
+                messages.append(self._row_to_message(row))
             return messages
         finally:
             cursor.close()
@@ -3,9 +3,16 @@ Notification Repository
 Handles database operations for notifications
 """
 from core.db_singleton import DatabaseConnection
+from core.stats_cache import invalidate_overview_stats
+from core.pagination import fetch_page, stream_query, STREAM_BATCH_SIZE
+from core.sql_dialect import dialect_for
 from models.notification import Notification
+from core.row_decoder import row_decoder
 from datetime import datetime
 
+# Notification_ID, User_ID, Title, Message, Type, Priority, Is_Read, Action_URL, Created_At, Read_At
+_decode_notification = row_decoder(None, None, None, None, None, None, 'bool', None, 'datetime', 'datetime', factory=Notification)
+
 
 class NotificationRepository:
     def __init__(self):
@@ -16,10 +23,7 @@ class NotificationRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[Notification]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE [Notification] (
+            dialect_for(conn).create_table(cursor, "Notification", """
                         Notification_ID INT IDENTITY(1,1) PRIMARY KEY,
                         User_ID INT NOT NULL,
                         Title NVARCHAR(255) NOT NULL,
@@ -31,42 +35,38 @@ class NotificationRepository:
                         Created_At DATETIME DEFAULT GETDATE(),
                         Read_At DATETIME,
                         FOREIGN KEY (User_ID) REFERENCES [User](User_ID)
-                    )
-                END
             """)
             conn.commit()
         finally:
             cursor.close()
             conn.close()
     
+    SELECT_COLUMNS = """
+        SELECT Notification_ID, User_ID, Title, Message, Type, Priority, Is_Read, Action_URL, Created_At, Read_At
+        FROM [Notification]
+    """
+
+    def _row_to_notification(self, row):
+        return _decode_notification(row)
+
     def get_all(self):
         """Get all notifications"""
+        return list(self.iter_all())
+    
+    def iter_all(self, batch_size=STREAM_BATCH_SIZE):
+        """Stream all notifications, newest first, without loading the table into memory"""
+        return stream_query(self.db_connection, self.SELECT_COLUMNS + " ORDER BY Created_At DESC",
+                            self._row_to_notification, batch_size=batch_size)
+    
+    def get_page(self, cursor=None, limit=None, user_id=None):
+        """Get one keyset page of notifications, newest first (ordered by Notification_ID)"""
         conn = self.db_connection.get_connection()
         try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT Notification_ID, User_ID, Title, Message, Type, Priority, Is_Read, Action_URL, Created_At, Read_At
-                FROM [Notification]
-                ORDER BY Created_At DESC
-            """)
-            rows = cursor.fetchall()
-            notifications = []
-            for row in rows:
-                notifications.append(Notification(
-                    Notification_ID=row[0],
-                    User_ID=row[1],
-                    Title=row[2],
-                    Message=row[3],
-                    Type=row[4],
-                    Priority=row[5],
-                    Is_Read=bool(row[6]) if row[6] is not None else False,
-                    Action_URL=row[7],
-                    Created_At=row[8],
-                    Read_At=row[9]
-                ))
-            return notifications
+            return fetch_page(conn, self.SELECT_COLUMNS, "Notification_ID", self._row_to_notification,
+                              cursor=cursor, limit=limit, descending=True,
+                              where="User_ID = ?" if user_id is not None else None,
+                              params=(user_id,) if user_id is not None else ())
         finally:
-            cursor.close()
             conn.close()
     
     def get_by_id(self, notification_id):
@@ -81,18 +81,7 @@ class NotificationRepository:
             """, (notification_id,))
             row = cursor.fetchone()
             if row:
-                return Notification(
-                    Notification_ID=row[0],
-                    User_ID=row[1],
-                    Title=row[2],
-                    Message=row[3],
-                    Type=row[4],
-                    Priority=row[5],
-                    Is_Read=bool(row[6]) if row[6] is not None else False,
-                    Action_URL=row[7],
-                    Created_At=row[8],
-                    Read_At=row[9]
-                )
+                return self._row_to_notification(row)
             return None
         finally:
             cursor.close()
@@ -116,24 +105,13 @@ class NotificationRepository:
             query += " ORDER BY Created_At DESC"
             
             if limit:
-                query = query.replace("SELECT", f"SELECT TOP {limit}")
+                query = dialect_for(conn).limit(query, limit)
             
             cursor.execute(query, tuple(params))
             rows = cursor.fetchall()
             notifications = []
             for row in rows:
-                notifications.append(Notification(
-                    Notification_ID=row[0],
-                    User_ID=row[1],
-                    Title=row[2],
-                    Message=row[3],
-                    Type=row[4],
-                    Priority=row[5],
-                    Is_Read=bool(row[6]) if row[6] is not None else False,
-                    Action_URL=row[7],
-                    Created_At=row[8],
-                    Read_At=row[9]
-                ))
+                notifications.append(self._row_to_notification(row))
             return notifications
         finally:
             cursor.close()
@@ -171,11 +149,28 @@ class NotificationRepository:
             if row:
                 notification.Notification_ID = row[0]
             conn.commit()
+            invalidate_overview_stats(user_id=notification.User_ID)
             return notification
         finally:
             cursor.close()
             conn.close()
     
+    def create_many(self, notifications):
+        """Create many notifications with one INSERT per chunk; assigns generated IDs back to each object"""
+        notifications = list(notifications)
+        if not notifications:
+            return []
+        columns = ['User_ID', 'Title', 'Message', 'Type', 'Priority', 'Is_Read', 'Action_URL', 'Created_At']
+        rows = [(notification.User_ID, notification.Title, notification.Message, notification.Type,
+                 notification.Priority, notification.Is_Read, notification.Action_URL, notification.Created_At)
+                for notification in notifications]
+        ids = self.db_connection.bulk_insert("[Notification]", columns, rows, id_column="Notification_ID")
+        for notification, new_id in zip(notifications, ids):
+            notification.Notification_ID = new_id
+        for user_id in {notification.User_ID for notification in notifications}:
+            invalidate_overview_stats(user_id=user_id)
+        return notifications
+    
     def mark_as_read(self, notification_id):
         """Mark a notification as read"""
         conn = self.db_connection.get_connection()
@@ -187,6 +182,7 @@ class NotificationRepository:
                 WHERE Notification_ID = ?
             """, (notification_id,))
             conn.commit()
+            invalidate_overview_stats()
             return cursor.rowcount > 0
         finally:
             cursor.close()
@@ -203,6 +199,7 @@ class NotificationRepository:
                 WHERE User_ID = ? AND Is_Read = 0
             """, (user_id,))
             conn.commit()
+            invalidate_overview_stats(user_id=user_id)
             return cursor.rowcount
         finally:
             cursor.close()
@@ -215,6 +212,7 @@ class NotificationRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM [Notification] WHERE Notification_ID = ?", (notification_id,))
             conn.commit()
+            invalidate_overview_stats()
             return cursor.rowcount > 0
         finally:
             cursor.close()
@@ -3,6 +3,7 @@ Notification Preference Repository
 Handles database operations for notification preferences
 """
 from core.db_singleton import DatabaseConnection
+from core.sql_dialect import dialect_for
 from models.notification_preference import NotificationPreference
 
 
@@ -15,10 +16,7 @@ class NotificationPreferenceRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[NotificationPreference]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE [NotificationPreference] (
+            dialect_for(conn).create_table(cursor, "NotificationPreference", """
                         Preference_ID INT IDENTITY(1,1) PRIMARY KEY,
                         User_ID INT NOT NULL,
                         Notification_Type NVARCHAR(50),
@@ -26,8 +24,6 @@ class NotificationPreferenceRepository:
                         In_App_Enabled BIT DEFAULT 1,
                         FOREIGN KEY (User_ID) REFERENCES [User](User_ID),
                         UNIQUE (User_ID, Notification_Type)
-                    )
-                END
             """)
             conn.commit()
         finally:
@@ -1,5 +1,10 @@
 import importlib.util
 import os
+from threading import Lock
+
+from core.config_cache import TTLCache
+from core.db_singleton import DatabaseConnection
+from core.tenant_context import get_current_tenant
 
 # Get the directory containing this file
 _repo_dir = os.path.dirname(os.path.abspath(__file__))
@@ -16,131 +21,144 @@ def _import_repository(filename, class_name):
     spec.loader.exec_module(module)
     return getattr(module, class_name)
 
-AINoteRepository = _import_repository('ai_note.repository', 'AINoteRepository')
-UserRepository = _import_repository('user.repository', 'UserRepository')
-StudentRepository = _import_repository('student.repository', 'StudentRepository')
-InstructorRepository = _import_repository('instructor.repository', 'InstructorRepository')
-CourseRepository = _import_repository('course.repository', 'CourseRepository')
-EnrollmentRepository = _import_repository('enrollment.repository', 'EnrollmentRepository')
-TaskRepository = _import_repository('task.repository', 'TaskRepository')
-ScheduleRepository = _import_repository('schedule.repository', 'ScheduleRepository')
-NoteRepository = _import_repository('note.repository', 'NoteRepository')
-MessageRepository = _import_repository('message.repository', 'MessageRepository')
-TranscriptRepository = _import_repository('transcript.repository', 'TranscriptRepository')
-CalendarRepository = _import_repository('calendar.repository', 'CalendarRepository')
-ReminderRepository = _import_repository('reminder.repository', 'ReminderRepository')
-FocusSessionRepository = _import_repository('focus_session.repository', 'FocusSessionRepository')
-TeachingAssistantRepository = _import_repository('teaching_assistant.repository', 'TeachingAssistantRepository')
-UserSettingsRepository = _import_repository('user_settings.repository', 'UserSettingsRepository')
-KnowledgeBaseRepository = _import_repository('knowledge_base.repository', 'KnowledgeBaseRepository')
-ChatHistoryRepository = _import_repository('chat_history.repository', 'ChatHistoryRepository')
-UserDatabaseConfigRepository = _import_repository('user_database_config.repository', 'UserDatabaseConfigRepository')
-AdvisorConversationRepository = _import_repository('advisor_conversation.repository', 'AdvisorConversationRepository')
-AdvisorMessageRepository = _import_repository('advisor_message.repository', 'AdvisorMessageRepository')
-AdvisorAppointmentRepository = _import_repository('advisor_appointment.repository', 'AdvisorAppointmentRepository')
-NotificationRepository = _import_repository('notification.repository', 'NotificationRepository')
-AssignmentRepository = _import_repository('assignment.repository', 'AssignmentRepository')
-AssignmentSubmissionRepository = _import_repository('assignment_submission.repository', 'AssignmentSubmissionRepository')
-try:
-    GradingSuggestionRepository = _import_repository('grading_suggestion.repository', 'GradingSuggestionRepository')
-except Exception:
-    GradingSuggestionRepository = None
-
-try:
-    StudyPlanRepository = _import_repository('study_plan.repository', 'StudyPlanRepository')
-except Exception:
-    StudyPlanRepository = None
-
-try:
-    StudyTaskRepository = _import_repository('study_task.repository', 'StudyTaskRepository')
-except Exception:
-    StudyTaskRepository = None
-
-try:
-    StudyRecommendationRepository = _import_repository('study_recommendation.repository', 'StudyRecommendationRepository')
-except Exception:
-    StudyRecommendationRepository = None
-
-# Import CourseScheduleSlotRepository
-CourseScheduleSlotRepository = _import_repository('course_schedule_slot.repository', 'CourseScheduleSlotRepository')
+
+# Repository type -> (module file, class name, optional).
+# Modules are only imported the first time their repository is requested;
+# optional repositories raise ValueError instead of ImportError when unavailable.
+_REGISTRY = {
+    "user": ('user.repository', 'UserRepository', False),
+    "ai_note": ('ai_note.repository', 'AINoteRepository', False),
+    "student": ('student.repository', 'StudentRepository', False),
+    "instructor": ('instructor.repository', 'InstructorRepository', False),
+    "course": ('course.repository', 'CourseRepository', False),
+    "enrollment": ('enrollment.repository', 'EnrollmentRepository', False),
+    "task": ('task.repository', 'TaskRepository', False),
+    "schedule": ('schedule.repository', 'ScheduleRepository', False),
+    "note": ('note.repository', 'NoteRepository', False),
+    "message": ('message.repository', 'MessageRepository', False),
+    "transcript": ('transcript.repository', 'TranscriptRepository', False),
+    "calendar": ('calendar.repository', 'CalendarRepository', False),
+    "reminder": ('reminder.repository', 'ReminderRepository', False),
+    "focus_session": ('focus_session.repository', 'FocusSessionRepository', False),
+    "teaching_assistant": ('teaching_assistant.repository', 'TeachingAssistantRepository', False),
+    "course_schedule_slot": ('course_schedule_slot.repository', 'CourseScheduleSlotRepository', False),
+    "user_settings": ('user_settings.repository', 'UserSettingsRepository', False),
+    "knowledge_base": ('knowledge_base.repository', 'KnowledgeBaseRepository', False),
+    "chat_history": ('chat_history.repository', 'ChatHistoryRepository', False),
+    "user_database_config": ('user_database_config.repository', 'UserDatabaseConfigRepository', False),
+    "advisor_conversation": ('advisor_conversation.repository', 'AdvisorConversationRepository', False),
+    "advisor_message": ('advisor_message.repository', 'AdvisorMessageRepository', False),
+    "advisor_appointment": ('advisor_appointment.repository', 'AdvisorAppointmentRepository', False),
+    "notification": ('notification.repository', 'NotificationRepository', False),
+    "assignment": ('assignment.repository', 'AssignmentRepository', False),
+    "assignment_submission": ('assignment_submission.repository', 'AssignmentSubmissionRepository', False),
+    "stats": ('stats.repository', 'StatsRepository', False),
+    "grading_suggestion": ('grading_suggestion.repository', 'GradingSuggestionRepository', True),
+    "study_plan": ('study_plan.repository', 'StudyPlanRepository', True),
+    "study_task": ('study_task.repository', 'StudyTaskRepository', True),
+    "study_recommendation": ('study_recommendation.repository', 'StudyRecommendationRepository', True),
+}
+
+_ALIASES = {
+    "ta": "teaching_assistant",
+    "schedule_slot": "course_schedule_slot",
+    "settings": "user_settings",
+    "kb": "knowledge_base",
+    "chat": "chat_history",
+    "user_db_config": "user_database_config",
+    "advisor_conv": "advisor_conversation",
+    "advisor_msg": "advisor_message",
+    "advisor_apt": "advisor_appointment",
+    "assignment_sub": "assignment_submission",
+    "grading": "grading_suggestion",
+    "studyplan": "study_plan",
+    "studytask": "study_task",
+    "studyrecommendation": "study_recommendation",
+}
+
+_CLASS_NAMES = {class_name: entity_type for entity_type, (_, class_name, _) in _REGISTRY.items()}
+
+_classes = {}
+_classes_lock = Lock()
+
+# One instance per repository type (and per tenant in multi-tenant mode).
+# Bounded so that many short-lived tenants cannot grow it without limit.
+_instances = TTLCache(
+    max_size=int(os.environ.get('REPOSITORY_CACHE_SIZE', '5000')),
+    ttl=0,
+    name="repositories",
+)
+_instances_lock = Lock()
+
+
+def _resolve(entity_type):
+    entity_type = entity_type.lower()
+    entity_type = _ALIASES.get(entity_type, entity_type)
+    if entity_type not in _REGISTRY:
+        raise ValueError(f"Unknown repository type: {entity_type}")
+    return entity_type
+
+
+def _get_repository_class(entity_type):
+    """Import (once) and return the repository class for a registered type"""
+    cls = _classes.get(entity_type)
+    if cls is not None:
+        return cls
+    filename, class_name, optional = _REGISTRY[entity_type]
+    with _classes_lock:
+        cls = _classes.get(entity_type)
+        if cls is None:
+            try:
+                cls = _import_repository(filename, class_name)
+            except Exception:
+                if optional:
+                    raise ValueError(f"{class_name} not available")
+                raise
+            _classes[entity_type] = cls
+    return cls
+
+
+def __getattr__(name):
+    # Keep `from repositories.repository_factory import UserRepository` working
+    entity_type = _CLASS_NAMES.get(name)
+    if entity_type is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        return _get_repository_class(entity_type)
+    except ValueError:
+        return None
 
 
 class RepositoryFactory:
     @staticmethod
     def get_repository(entity_type):
-        entity_type = entity_type.lower()
-        
-        if entity_type == "user":
-            return UserRepository()
-        elif entity_type == "ai_note":
-            return AINoteRepository()
-        elif entity_type == "student":
-            return StudentRepository()
-        elif entity_type == "instructor":
-            return InstructorRepository()
-        elif entity_type == "course":
-            return CourseRepository()
-        elif entity_type == "enrollment":
-            return EnrollmentRepository()
-        elif entity_type == "task":
-            return TaskRepository()
-        elif entity_type == "schedule":
-            return ScheduleRepository()
-        elif entity_type == "note":
-            return NoteRepository()
-        elif entity_type == "message":
-            return MessageRepository()
-        elif entity_type == "transcript":
-            return TranscriptRepository()
-        elif entity_type == "calendar":
-            return CalendarRepository()
-        elif entity_type == "reminder":
-            return ReminderRepository()
-        elif entity_type == "focus_session":
-            return FocusSessionRepository()
-        elif entity_type == "teaching_assistant" or entity_type == "ta":
-            return TeachingAssistantRepository()
-        elif entity_type == "course_schedule_slot" or entity_type == "schedule_slot":
-            return CourseScheduleSlotRepository()
-        elif entity_type == "user_settings" or entity_type == "settings":
-            return UserSettingsRepository()
-        elif entity_type == "knowledge_base" or entity_type == "kb":
-            return KnowledgeBaseRepository()
-        elif entity_type == "chat_history" or entity_type == "chat":
-            return ChatHistoryRepository()
-        elif entity_type == "user_database_config" or entity_type == "user_db_config":
-            return UserDatabaseConfigRepository()
-        elif entity_type == "advisor_conversation" or entity_type == "advisor_conv":
-            return AdvisorConversationRepository()
-        elif entity_type == "advisor_message" or entity_type == "advisor_msg":
-            return AdvisorMessageRepository()
-        elif entity_type == "advisor_appointment" or entity_type == "advisor_apt":
-            return AdvisorAppointmentRepository()
-        elif entity_type == "notification":
-            return NotificationRepository()
-        elif entity_type == "assignment":
-            return AssignmentRepository()
-        elif entity_type == "assignment_submission" or entity_type == "assignment_sub":
-            return AssignmentSubmissionRepository()
-        elif entity_type == "grading_suggestion" or entity_type == "grading":
-            if GradingSuggestionRepository:
-                return GradingSuggestionRepository()
-            else:
-                raise ValueError(f"GradingSuggestionRepository not available")
-        elif entity_type == "study_plan" or entity_type == "studyplan":
-            if StudyPlanRepository:
-                return StudyPlanRepository()
-            else:
-                raise ValueError(f"StudyPlanRepository not available")
-        elif entity_type == "study_task" or entity_type == "studytask":
-            if StudyTaskRepository:
-                return StudyTaskRepository()
-            else:
-                raise ValueError(f"StudyTaskRepository not available")
-        elif entity_type == "study_recommendation" or entity_type == "studyrecommendation":
-            if StudyRecommendationRepository:
-                return StudyRecommendationRepository()
-            else:
-                raise ValueError(f"StudyRecommendationRepository not available")
-        else:
-            raise ValueError(f"Unknown repository type: {entity_type}")
+        entity_type = _resolve(entity_type)
+
+        key = entity_type
+        if DatabaseConnection().multi_tenant_enabled:
+            key = (entity_type, get_current_tenant())
+
+        repo = _instances.get(key)
+        if repo is None:
+            cls = _get_repository_class(entity_type)
+            with _instances_lock:
+                repo = _instances.get(key)
+                if repo is None:
+                    repo = cls()
+                    _instances.set(key, repo)
+        return repo
+
+    @staticmethod
+    def create_repository(entity_type):
+        """Build a new, uncached repository instance"""
+        return _get_repository_class(_resolve(entity_type))()
+
+    @staticmethod
+    def clear_cache():
+        """Drop all cached repository instances"""
+        _instances.clear()
+
+    @staticmethod
+    def get_cache_stats():
+        """Hit/miss counters of the repository instance cache"""
+        return _instances.get_stats()
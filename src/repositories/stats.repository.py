@@ -0,0 +1,94 @@
+"""
+Stats Repository
+Aggregate dashboard counters computed in a single SQL statement
+"""
+from datetime import date, datetime, timedelta
+
+from core.db_singleton import DatabaseConnection
+from core.stats_cache import cache_stats, get_cached_stats
+
+# Pending tasks due within this window count as "due soon" (matches the
+# 24-hour task reminders sent by NotificationService)
+DUE_SOON_WINDOW = timedelta(hours=24)
+
+# One row per user; role tables are joined on their lowest id so the row
+# is unique, and every counter is a correlated COUNT(*) on an indexed column.
+_OVERVIEW_QUERY = """
+    SELECT
+        s.Student_ID,
+        s.GPA,
+        (SELECT COUNT(*) FROM [Enrollment] e
+         WHERE e.Student_ID = s.Student_ID AND e.Status = 'enrolled'),
+        (SELECT COUNT(*) FROM [Task] t
+         WHERE t.Student_ID = s.Student_ID AND t.Status = 'pending'),
+        (SELECT COUNT(*) FROM [Task] t
+         WHERE t.Student_ID = s.Student_ID AND t.Status = 'pending'
+           AND t.Due_Date >= ? AND t.Due_Date < ?),
+        (SELECT COUNT(*) FROM [Task] t
+         WHERE t.Student_ID = s.Student_ID AND t.Status = 'completed'),
+        (SELECT COUNT(*) FROM [Task] t
+         WHERE t.Student_ID = s.Student_ID AND t.Status = 'completed' AND t.Due_Date >= ?),
+        (SELECT COUNT(*) FROM Calendar c
+         WHERE c.Student_ID = s.Student_ID AND c.Date >= ?),
+        (SELECT COUNT(*) FROM [Notification] n
+         WHERE n.User_ID = u.User_ID AND n.Is_Read = 0)
+    FROM [User] u
+    LEFT JOIN [Student] s ON s.Student_ID =
+        (SELECT MIN(Student_ID) FROM [Student] WHERE User_ID = u.User_ID)
+    WHERE u.User_ID = ?
+"""
+
+_COUNTERS = ('total_courses', 'active_tasks', 'due_soon_tasks', 'completed_tasks',
+             'completed_this_month', 'upcoming_events', 'unread_notifications')
+
+
+def empty_overview_stats():
+    """Counters for a user with no student record (or no account)"""
+    stats = {'student_id': None, 'gpa': None}
+    stats.update((name, 0) for name in _COUNTERS)
+    return stats
+
+
+class StatsRepository:
+    def __init__(self):
+        self.db_connection = DatabaseConnection()
+        self._notification_table_ready = False
+
+    def _ensure_notification_table(self):
+        # Notification is created on demand; the aggregate needs it to exist
+        if self._notification_table_ready:
+            return
+        from repositories.repository_factory import RepositoryFactory
+        RepositoryFactory.create_repository("notification").create_table()
+        self._notification_table_ready = True
+
+    def get_overview_stats(self, user_id):
+        """
+        Dashboard counters for a user in one round trip.
+
+        Returns:
+            dict: student_id, gpa, total_courses (enrolled), active_tasks (pending),
+            due_soon_tasks, completed_tasks, completed_this_month, upcoming_events
+            (calendar events from today on) and unread_notifications
+        """
+        stats = get_cached_stats(user_id)
+        if stats is not None:
+            return stats
+
+        self._ensure_notification_table()
+        now = datetime.now().replace(microsecond=0)
+        today = date.today()
+        row = self.db_connection.fetch_one(_OVERVIEW_QUERY, (
+            now, now + DUE_SOON_WINDOW,
+            datetime.combine(today.replace(day=1), datetime.min.time()),
+            today,
+            user_id,
+        ))
+
+        stats = empty_overview_stats()
+        if row:
+            stats['student_id'] = row[0]
+            stats['gpa'] = float(row[1]) if row[1] is not None else None
+            stats.update(zip(_COUNTERS, (int(value or 0) for value in row[2:])))
+        cache_stats(user_id, stats)
+        return stats
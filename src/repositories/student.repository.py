@@ -1,4 +1,7 @@
 from core.db_singleton import DatabaseConnection
+from core.stats_cache import invalidate_overview_stats
+from core.user_profile import invalidate_user_profile
+from core.bulk_operations import fetch_by_ids
 from models.student import Student
 
 
@@ -47,6 +50,26 @@ class StudentRepository:
             cursor.close()
             conn.close()
 
+    def get_many_by_ids(self, student_ids):
+        """Get students for many IDs in one IN (...) query per chunk; returns {Student_ID: Student}"""
+        conn = self.db_connection.get_connection()
+        try:
+            cursor = conn.cursor()
+            rows = fetch_by_ids(cursor, "SELECT Student_ID, User_ID, Department, Year_Level, GPA FROM [Student] WHERE Student_ID IN ({ids})", student_ids)
+            return {
+                row[0]: Student(
+                    Student_ID=row[0],
+                    User_ID=row[1],
+                    Department=row[2],
+                    Year_Level=row[3],
+                    GPA=row[4]
+                )
+                for row in rows
+            }
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_by_user_id(self, user_id):
         """Get student by User_ID"""
         conn = self.db_connection.get_connection()
@@ -82,6 +105,8 @@ class StudentRepository:
             if row:
                 student.Student_ID = row[0]
             conn.commit()
+            invalidate_overview_stats(user_id=student.User_ID)
+            invalidate_user_profile(student.User_ID)
             return student
         finally:
             cursor.close()
@@ -97,6 +122,8 @@ class StudentRepository:
                 (student.Department, student.Year_Level, student.GPA, student.Student_ID)
             )
             conn.commit()
+            invalidate_overview_stats(user_id=student.User_ID)
+            invalidate_user_profile(student.User_ID)
             return student
         finally:
             cursor.close()
@@ -109,6 +136,8 @@ class StudentRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM [Student] WHERE Student_ID = ?", (student_id,))
             conn.commit()
+            invalidate_overview_stats()
+            invalidate_user_profile()
             return cursor.rowcount > 0
         finally:
             cursor.close()
@@ -4,6 +4,7 @@ Handles database operations for study plans
 """
 from models.study_plan import StudyPlan
 from core.db_singleton import DatabaseConnection
+from core.sql_dialect import dialect_for
 from datetime import datetime, date
 
 
@@ -16,10 +17,7 @@ class StudyPlanRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[StudyPlan]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE StudyPlan (
+            dialect_for(conn).create_table(cursor, "StudyPlan", """
                         Plan_ID INT IDENTITY(1,1) PRIMARY KEY,
                         Student_ID INT NOT NULL,
                         Course_ID INT,
@@ -31,8 +29,6 @@ class StudyPlanRepository:
                         Created_At DATETIME DEFAULT GETDATE(),
                         FOREIGN KEY (Student_ID) REFERENCES Student(Student_ID),
                         FOREIGN KEY (Course_ID) REFERENCES Course(Course_ID)
-                    )
-                END
             """)
             conn.commit()
         finally:
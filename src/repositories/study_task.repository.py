@@ -4,6 +4,7 @@ Handles database operations for study tasks
 """
 from models.study_task import StudyTask
 from core.db_singleton import DatabaseConnection
+from core.sql_dialect import dialect_for
 from datetime import datetime
 
 
@@ -16,10 +17,7 @@ class StudyTaskRepository:
         conn = self.db_connection.get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[StudyTask]') AND type in (N'U'))
-                BEGIN
-                    CREATE TABLE StudyTask (
+            dialect_for(conn).create_table(cursor, "StudyTask", """
                         Task_ID INT IDENTITY(1,1) PRIMARY KEY,
                         Plan_ID INT NOT NULL,
                         Parent_Task_ID INT,
@@ -34,8 +32,6 @@ class StudyTaskRepository:
                         Created_At DATETIME DEFAULT GETDATE(),
                         FOREIGN KEY (Plan_ID) REFERENCES StudyPlan(Plan_ID) ON DELETE CASCADE,
                         FOREIGN KEY (Parent_Task_ID) REFERENCES StudyTask(Task_ID)
-                    )
-                END
             """)
             conn.commit()
         finally:
@@ -74,6 +70,21 @@ class StudyTaskRepository:
             cursor.close()
             conn.close()
     
+    def create_many(self, tasks):
+        """Create many study tasks with one INSERT per chunk; assigns generated IDs back to each object"""
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        columns = ['Plan_ID', 'Parent_Task_ID', 'Task_Title', 'Description', 'Estimated_Hours',
+                   'Actual_Hours', 'Due_Date', 'Priority', 'Status', 'Suggested_Resources', 'Created_At']
+        rows = [(task.Plan_ID, task.Parent_Task_ID, task.Task_Title, task.Description, task.Estimated_Hours,
+                 task.Actual_Hours, task.Due_Date, task.Priority, task.Status, task.Suggested_Resources,
+                 task.Created_At) for task in tasks]
+        ids = self.db_connection.bulk_insert("StudyTask", columns, rows, id_column="Task_ID")
+        for task, new_id in zip(tasks, ids):
+            task.Task_ID = new_id
+        return tasks
+    
     def get_by_id(self, task_id):
         """Get study task by ID"""
         conn = self.db_connection.get_connection()
@@ -1,43 +1,41 @@
 from core.db_singleton import DatabaseConnection
+from core.stats_cache import invalidate_overview_stats
+from core.pagination import fetch_page, stream_query, STREAM_BATCH_SIZE
 from models.task import Task
-from datetime import datetime
+from core.row_decoder import row_decoder
+
+# Task_ID, Student_ID, Task_Title, Due_Date, Priority, Status
+_decode_task = row_decoder(None, None, None, 'datetime', None, None, factory=Task)
 
 
 class TaskRepository:
     def __init__(self):
         self.db_connection = DatabaseConnection()
 
+    SELECT_COLUMNS = "SELECT Task_ID, Student_ID, Task_Title, Due_Date, Priority, Status FROM [Task]"
+
+    def _row_to_task(self, row):
+        """Map a Task row, converting a string Due_Date to datetime"""
+        return _decode_task(row)
+
     def get_all(self):
         """Get all tasks"""
+        return list(self.iter_all())
+
+    def iter_all(self, batch_size=STREAM_BATCH_SIZE):
+        """Stream all tasks without loading the table into memory"""
+        return stream_query(self.db_connection, self.SELECT_COLUMNS + " ORDER BY Task_ID",
+                            self._row_to_task, batch_size=batch_size)
+
+    def get_page(self, cursor=None, limit=None, student_id=None):
+        """Get one keyset page of tasks ordered by Task_ID"""
         conn = self.db_connection.get_connection()
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT Task_ID, Student_ID, Task_Title, Due_Date, Priority, Status FROM [Task]")
-            rows = cursor.fetchall()
-            tasks = []
-            for row in rows:
-                # Handle Due_Date - convert to datetime if it's a string or keep as datetime
-                due_date = row[3]
-                if due_date and isinstance(due_date, str):
-                    try:
-                        due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                    except:
-                        try:
-                            due_date = datetime.strptime(due_date, '%Y-%m-%d %H:%M:%S')
-                        except:
-                            due_date = None
-                
-                tasks.append(Task(
-                    Task_ID=row[0],
-                    Student_ID=row[1],
-                    Task_Title=row[2],
-                    Due_Date=due_date,
-                    Priority=row[4],
-                    Status=row[5]
-                ))
-            return tasks
+            return fetch_page(conn, self.SELECT_COLUMNS, "Task_ID", self._row_to_task,
+                              cursor=cursor, limit=limit,
+                              where="Student_ID = ?" if student_id is not None else None,
+                              params=(student_id,) if student_id is not None else ())
         finally:
-            cursor.close()
             conn.close()
 
     def get_by_id(self, task_id):
@@ -48,25 +46,7 @@ class TaskRepository:
             cursor.execute("SELECT Task_ID, Student_ID, Task_Title, Due_Date, Priority, Status FROM [Task] WHERE Task_ID = ?", (task_id,))
             row = cursor.fetchone()
             if row:
-                # Handle Due_Date - convert to datetime if needed
-                due_date = row[3]
-                if due_date and isinstance(due_date, str):
-                    try:
-                        due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                    except:
-                        try:
-                            due_date = datetime.strptime(due_date, '%Y-%m-%d %H:%M:%S')
-                        except:
-                            due_date = None
-                
-                return Task(
-                    Task_ID=row[0],
-                    Student_ID=row[1],
-                    Task_Title=row[2],
-                    Due_Date=due_date,
-                    Priority=row[4],
-                    Status=row[5]
-                )
+                return self._row_to_task(row)
             return None
         finally:
             cursor.close()
@@ -81,25 +61,7 @@ class TaskRepository:
             rows = cursor.fetchall()
             tasks = []
             for row in rows:
-                # Handle Due_Date - convert to datetime if it's a string or keep as datetime
-                due_date = row[3]
-                if due_date and isinstance(due_date, str):
-                    try:
-                        due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                    except:
-                        try:
-                            due_date = datetime.strptime(due_date, '%Y-%m-%d %H:%M:%S')
-                        except:
-                            due_date = None
-                
-                tasks.append(Task(
-                    Task_ID=row[0],
-                    Student_ID=row[1],
-                    Task_Title=row[2],
-                    Due_Date=due_date,
-                    Priority=row[4],
-                    Status=row[5]
-                ))
+                tasks.append(self._row_to_task(row))
             return tasks
         finally:
             cursor.close()
@@ -119,26 +81,9 @@ class TaskRepository:
             rows = cursor.fetchall()
             tasks = []
             for row in rows:
-                # Handle Due_Date - convert to datetime if needed
-                due_date = row[3]
-                if due_date and isinstance(due_date, str):
-                    try:
-                        due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                    except:
-                        try:
-                            due_date = datetime.strptime(due_date, '%Y-%m-%d %H:%M:%S')
-                        except:
-                            due_date = None
-                
-                tasks.append(Task(
-                    Task_ID=row[0],
-                    Student_ID=row[1],
-                    Task_Title=row[2],
-                    Due_Date=due_date,
-                    Priority=row[4],
-                    Status=row[5],
-                    Completed=row[5] == 'Completed' if len(row) > 5 else False
-                ))
+                task = self._row_to_task(row)
+                task._set_extra({'Completed': row[5] == 'Completed'})
+                tasks.append(task)
             return tasks
         finally:
             cursor.close()
@@ -159,11 +104,26 @@ class TaskRepository:
             if row:
                 task.Task_ID = row[0]
             conn.commit()
+            invalidate_overview_stats(student_id=task.Student_ID)
             return task
         finally:
             cursor.close()
             conn.close()
 
+    def create_many(self, tasks):
+        """Create many tasks with one INSERT per chunk; assigns generated IDs back to each object"""
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        columns = ['Student_ID', 'Task_Title', 'Due_Date', 'Priority', 'Status']
+        rows = [(task.Student_ID, task.Task_Title, task.Due_Date, task.Priority, task.Status) for task in tasks]
+        ids = self.db_connection.bulk_insert("[Task]", columns, rows, id_column="Task_ID")
+        for task, new_id in zip(tasks, ids):
+            task.Task_ID = new_id
+        for student_id in {task.Student_ID for task in tasks}:
+            invalidate_overview_stats(student_id=student_id)
+        return tasks
+
     def update(self, task):
         """Update an existing task"""
         conn = self.db_connection.get_connection()
@@ -174,6 +134,7 @@ class TaskRepository:
                 (task.Task_Title, task.Due_Date, task.Priority, task.Status, task.Task_ID)
             )
             conn.commit()
+            invalidate_overview_stats(student_id=task.Student_ID)
             return task
         finally:
             cursor.close()
@@ -186,6 +147,7 @@ class TaskRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM [Task] WHERE Task_ID = ?", (task_id,))
             conn.commit()
+            invalidate_overview_stats()
             return cursor.rowcount > 0
         finally:
             cursor.close()
@@ -1,4 +1,5 @@
 from core.db_singleton import DatabaseConnection
+from core.user_profile import invalidate_user_profile
 from models.teaching_assistant import TeachingAssistant
 
 
@@ -95,6 +96,7 @@ class TeachingAssistantRepository:
             )
             ta_id = cursor.fetchone()[0]
             conn.commit()
+            invalidate_user_profile(ta.User_ID)
             ta.TA_ID = ta_id
             return ta
         finally:
@@ -110,6 +112,7 @@ class TeachingAssistantRepository:
                 (ta.Assigned_Course_ID, ta.Role, ta.Hours_Per_Week, ta.TA_ID)
             )
             conn.commit()
+            invalidate_user_profile(ta.User_ID)
             return ta
         finally:
             conn.close()
@@ -121,6 +124,7 @@ class TeachingAssistantRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM Teaching_Assistant WHERE TA_ID = ?", (ta_id,))
             conn.commit()
+            invalidate_user_profile()
             return cursor.rowcount > 0
         finally:
             conn.close()
@@ -1,4 +1,6 @@
 from core.db_singleton import DatabaseConnection
+from core.user_profile import invalidate_user_profile
+from core.bulk_operations import fetch_by_ids
 from models.user import User
 
 
@@ -47,6 +49,26 @@ class UserRepository:
             cursor.close()
             conn.close()
 
+    def get_many_by_ids(self, user_ids):
+        """Get users for many IDs in one IN (...) query per chunk; returns {User_ID: User}"""
+        conn = self.db_connection.get_connection()
+        try:
+            cursor = conn.cursor()
+            rows = fetch_by_ids(cursor, "SELECT User_ID, Username, Email, Password_Hash, Created_At FROM [User] WHERE User_ID IN ({ids})", user_ids)
+            return {
+                row[0]: User(
+                    User_ID=row[0],
+                    Username=row[1],
+                    Email=row[2],
+                    Password_Hash=row[3],
+                    Created_At=row[4]
+                )
+                for row in rows
+            }
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_by_email(self, email):
         """Get user by email"""
         conn = self.db_connection.get_connection()
@@ -82,6 +104,7 @@ class UserRepository:
             if row:
                 user.User_ID = row[0]
             conn.commit()
+            invalidate_user_profile(user.User_ID)
             return user
         finally:
             cursor.close()
@@ -97,6 +120,7 @@ class UserRepository:
                 (user.Username, user.Email, user.Password_Hash, user.User_ID)
             )
             conn.commit()
+            invalidate_user_profile(user.User_ID)
             return user
         finally:
             cursor.close()
@@ -109,6 +133,7 @@ class UserRepository:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM [User] WHERE User_ID = ?", (user_id,))
             conn.commit()
+            invalidate_user_profile(user_id)
             return cursor.rowcount > 0
         finally:
             cursor.close()
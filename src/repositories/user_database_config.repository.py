@@ -4,6 +4,7 @@ Manages database connection configurations for users
 """
 from models.user_database_config import UserDatabaseConfig
 from core.db_singleton import DatabaseConnection
+from core.config_cache import invalidate_tenant_config
 
 class UserDatabaseConfigRepository:
     def __init__(self):
@@ -12,23 +13,19 @@ class UserDatabaseConfigRepository:
     
     def create_table(self):
         """Create user database config table if it doesn't exist"""
-        query = """
-        CREATE TABLE IF NOT EXISTS User_Database_Config (
-            Config_ID INTEGER PRIMARY KEY AUTOINCREMENT,
-            User_ID INTEGER NOT NULL UNIQUE,
-            DB_Type TEXT NOT NULL DEFAULT 'sqlite',
-            DB_Host TEXT,
-            DB_Port INTEGER,
-            DB_Name TEXT,
-            DB_User TEXT,
-            DB_Password TEXT,
-            DB_Path TEXT,
-            Is_Active INTEGER DEFAULT 1,
-            Created_Date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (User_ID) REFERENCES Users(User_ID)
-        )
-        """
-        self.db.execute_update(query)
+        self.db.create_table("User_Database_Config", """
+            Config_ID INT IDENTITY(1,1) PRIMARY KEY,
+            User_ID INT NOT NULL UNIQUE,
+            DB_Type NVARCHAR(50) NOT NULL DEFAULT 'sqlite',
+            DB_Host NVARCHAR(255),
+            DB_Port INT,
+            DB_Name NVARCHAR(255),
+            DB_User NVARCHAR(255),
+            DB_Password NVARCHAR(255),
+            DB_Path NVARCHAR(500),
+            Is_Active INT DEFAULT 1,
+            Created_Date DATETIME DEFAULT GETDATE()
+        """)
     
     def add(self, config):
         """Add a new user database configuration"""
@@ -48,7 +45,9 @@ class UserDatabaseConfigRepository:
             config.DB_Path,
             1 if config.Is_Active else 0
         )
-        return self.db.execute_update(query, params)
+        result = self.db.execute_update(query, params)
+        invalidate_tenant_config(config.User_ID)
+        return result
     
     def get_by_user_id(self, user_id):
         """Get database configuration for a user"""
@@ -87,12 +86,18 @@ class UserDatabaseConfigRepository:
             1 if config.Is_Active else 0,
             config.Config_ID
         )
-        return self.db.execute_update(query, params)
+        result = self.db.execute_update(query, params)
+        # Connections for this user must pick up the new settings
+        invalidate_tenant_config(config.User_ID)
+        return result
     
     def delete(self, config_id):
         """Delete (deactivate) a database configuration"""
+        existing = self.get_by_id(config_id)
         query = "UPDATE User_Database_Config SET Is_Active = 0 WHERE Config_ID = ?"
-        return self.db.execute_update(query, (config_id,))
+        result = self.db.execute_update(query, (config_id,))
+        invalidate_tenant_config(existing.User_ID if existing else None)
+        return result
     
     def _map_to_object(self, row):
         """Map database row to UserDatabaseConfig object"""
@@ -132,10 +132,13 @@ def seed_cohort_data():
             if not grade_pattern:
                 grade_pattern = ['B', 'B+', 'B', 'B-', 'C+']
 
+            # Load this student's enrollments once instead of once per course
+            existing_by_course = {e.Course_ID: e for e in enrollment_repo.get_by_student(student.Student_ID)}
+            new_enrollments = []
+
             for course_idx, course in enumerate(courses_for_student):
                 # Check if enrollment already exists
-                existing_enrollments = enrollment_repo.get_by_student(student.Student_ID)
-                existing = next((e for e in existing_enrollments if e.Course_ID == course.Course_ID), None)
+                existing = existing_by_course.get(course.Course_ID)
 
                 if existing:
                     # Update existing enrollment with grade
@@ -158,9 +161,11 @@ def seed_cohort_data():
                     Grade=grade,
                     Semester=semester
                 )
-                enrollment_repo.create(enrollment)
+                new_enrollments.append(enrollment)
                 print(f"  [OK] Enrolled in {course.Course_Name} - Grade: {grade}, Semester: {semester}")
 
+            enrollment_repo.create_many(new_enrollments)
+
         print(f"\n[SUCCESS] Created cohort of {len(cohort_students)} students!")
         print(f"  Department: {department}")
         print(f"  Year Level: {year_level}")
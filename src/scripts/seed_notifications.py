@@ -96,11 +96,14 @@ def seed_notifications():
             
             print(f"\nProcessing user {user_id} ({username})...")
             
+            # Load existing titles once per user instead of once per sample
+            existing_titles = {n.Title for n in notification_repo.get_by_user(user_id, limit=100)}
+            
             # Create notifications for this user
+            new_notifications = []
             for i, sample in enumerate(sample_notifications):
                 # Check if notification already exists
-                existing = notification_repo.get_by_user(user_id, limit=100)
-                if any(n.Title == sample['title'] for n in existing):
+                if sample['title'] in existing_titles:
                     print(f"  ⏭ Skipped (already exists): {sample['title']}")
                     continue  # Skip if already exists
                 
@@ -115,9 +118,12 @@ def seed_notifications():
                     Created_At=datetime.now() - timedelta(hours=i*2)
                 )
                 
-                notification_repo.create(notification)
-                created_count += 1
-                print(f"  [OK] Created: {sample['title']}")
+                new_notifications.append(notification)
+            
+            notification_repo.create_many(new_notifications)
+            created_count += len(new_notifications)
+            for notification in new_notifications:
+                print(f"  [OK] Created: {notification.Title}")
         
         print(f"\n[OK] Seeding complete! Created {created_count} notifications")
         
@@ -31,18 +31,19 @@ class AcademicDashboardService:
             return {}
         
         enrollments = self.enrollment_repo.get_by_student(student_id)
+        courses = self._get_courses(enrollments)
         
         # Calculate GPA
-        gpa_data = self._calculate_gpa(enrollments)
+        gpa_data = self._calculate_gpa(enrollments, courses)
         
         # Get course grades
-        course_grades = self._get_course_grades(enrollments)
+        course_grades = self._get_course_grades(enrollments, courses)
         
         # Get cohort comparison
         cohort_data = self._get_cohort_comparison(student)
         
         # Calculate graduation timeline
-        graduation_timeline = self._calculate_graduation_timeline(student, enrollments)
+        graduation_timeline = self._calculate_graduation_timeline(student, enrollments, courses)
         
         return {
             'student': {
@@ -57,8 +58,16 @@ class AcademicDashboardService:
             'graduation_timeline': graduation_timeline
         }
     
-    def _calculate_gpa(self, enrollments: List) -> Dict:
+    def _get_courses(self, enrollments: List) -> Dict:
+        """Load every course referenced by the enrollments in one batch, keyed by Course_ID"""
+        if not self.course_repo:
+            return {}
+        return self.course_repo.get_many_by_ids([e.Course_ID for e in enrollments])
+    
+    def _calculate_gpa(self, enrollments: List, courses: Optional[Dict] = None) -> Dict:
         """Calculate cumulative and semester GPAs"""
+        if courses is None:
+            courses = self._get_courses(enrollments)
         total_credits = 0
         total_grade_points = 0
         semester_gpas = {}
@@ -67,7 +76,7 @@ class AcademicDashboardService:
             if enrollment.Status != 'completed' or not enrollment.Grade or not enrollment.Semester:
                 continue
             
-            course = self.course_repo.get_by_id(enrollment.Course_ID) if self.course_repo else None
+            course = courses.get(enrollment.Course_ID)
             if not course:
                 continue
             
@@ -114,15 +123,17 @@ class AcademicDashboardService:
             'semester_gpas': semester_gpas
         }
     
-    def _get_course_grades(self, enrollments: List) -> List[Dict]:
+    def _get_course_grades(self, enrollments: List, courses: Optional[Dict] = None) -> List[Dict]:
         """Get all course grades with details"""
+        if courses is None:
+            courses = self._get_courses(enrollments)
         course_grades = []
         
         for enrollment in enrollments:
             if enrollment.Status != 'completed' or not enrollment.Grade:
                 continue
             
-            course = self.course_repo.get_by_id(enrollment.Course_ID) if self.course_repo else None
+            course = courses.get(enrollment.Course_ID)
             if not course:
                 continue
             
@@ -188,11 +199,15 @@ class AcademicDashboardService:
                 'comparison': 'insufficient_data'
             }
         
-        # Calculate GPAs for all cohort students
+        # Calculate GPAs for all cohort students, loading their courses in one batch
+        cohort_enrollments = self.enrollment_repo.get_by_students(
+            [cohort_student.Student_ID for cohort_student in cohort_students] + [student.Student_ID])
+        courses = self._get_courses([e for enrollments in cohort_enrollments.values() for e in enrollments])
+        
         cohort_gpas = []
         for cohort_student in cohort_students:
-            enrollments = self.enrollment_repo.get_by_student(cohort_student.Student_ID)
-            gpa_data = self._calculate_gpa(enrollments)
+            enrollments = cohort_enrollments[cohort_student.Student_ID]
+            gpa_data = self._calculate_gpa(enrollments, courses)
             cohort_gpas.append({
                 'student_id': cohort_student.Student_ID,
                 'gpa': gpa_data['cumulative']
@@ -202,7 +217,7 @@ class AcademicDashboardService:
         cohort_gpas.sort(key=lambda x: x['gpa'], reverse=True)
         
         # Find student's rank
-        student_gpa_data = self._calculate_gpa(self.enrollment_repo.get_by_student(student.Student_ID))
+        student_gpa_data = self._calculate_gpa(cohort_enrollments[student.Student_ID], courses)
         student_gpa = student_gpa_data['cumulative']
         
         student_rank = 1
@@ -239,7 +254,7 @@ class AcademicDashboardService:
             'comparison': comparison
         }
     
-    def _calculate_graduation_timeline(self, student, enrollments: List) -> Dict:
+    def _calculate_graduation_timeline(self, student, enrollments: List, courses: Optional[Dict] = None) -> Dict:
         """Predict graduation timeline based on current progress"""
         if not student.Year_Level:
             return {
@@ -251,10 +266,12 @@ class AcademicDashboardService:
             }
         
         # Calculate completed credits
+        if courses is None:
+            courses = self._get_courses(enrollments)
         completed_credits = 0
         for enrollment in enrollments:
             if enrollment.Status == 'completed' and enrollment.Grade:
-                course = self.course_repo.get_by_id(enrollment.Course_ID) if self.course_repo else None
+                course = courses.get(enrollment.Course_ID)
                 if course:
                     # Get credits - try different attribute names
                     credits = 3  # Default
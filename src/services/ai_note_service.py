@@ -7,6 +7,8 @@ from docx import Document
 import PyPDF2
 from transformers import pipeline, AutoTokenizer
 
+from core.metrics import time_inference, track_summarization
+
 
 class AINoteService:
     """Service for AI-powered note summarization"""
@@ -132,12 +134,13 @@ class AINoteService:
                 chunk_min_length = max(1, chunk_min_length)
                 chunk_max_length = max(chunk_min_length + 1, chunk_max_length)
                 
-                summary = summarizer(
-                    chunk, 
-                    max_length=chunk_max_length, 
-                    min_length=chunk_min_length, 
-                    do_sample=False
-                )[0]['summary_text']
+                with time_inference(self.model_name):
+                    summary = summarizer(
+                        chunk, 
+                        max_length=chunk_max_length, 
+                        min_length=chunk_min_length, 
+                        do_sample=False
+                    )[0]['summary_text']
                 summaries.append(summary)
             except Exception as e:
                 # Catch any exceptions during summarization and print an error
@@ -166,7 +169,8 @@ class AINoteService:
             raise ValueError("No text could be extracted from the file")
         
         # Generate summary
-        summary = self.summarize_text(original_text)
+        with track_summarization():
+            summary = self.summarize_text(original_text)
         
         return {
             'original_text': original_text,
@@ -0,0 +1,263 @@
+"""
+Cohort Schedule Optimizer
+Batch schedule optimization for many students at once (registration week):
+requests are spread over a process pool that shares one read-only copy of the
+term's sections, and results are streamed back as they finish
+"""
+import csv
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from services.schedule_solver import SchedulePreferences, rank_section_map, solve_section_map, sort_slots
+
+
+class TermSections:
+    """A term's sections held in memory; used when no compiled conflict matrix is available"""
+
+    def __init__(self, sections):
+        self.sections = sections  # [(course_code, section, [slot dicts])]
+        self._by_course = {}
+        for course, section, slots in sections:
+            self._by_course.setdefault(str(course).strip().upper(), []).append((course, section, slots))
+
+    def section_map(self, course_codes):
+        section_map = {}
+        for code in course_codes:
+            for course, section, slots in self._by_course.get(str(code).strip().upper(), ()):
+                section_map.setdefault(course, {})[section] = [dict(slot) for slot in slots]
+        return section_map
+
+    def conflict_rows(self, section_map):
+        return None
+
+
+def open_term(source):
+    """('matrix', path) or ('sections', [...]) -> an object with section_map() and conflict_rows()"""
+    kind, value = source
+    if kind == 'matrix':
+        from core.conflict_matrix import ConflictMatrix
+        return ConflictMatrix(value)
+    return TermSections(value)
+
+
+def optimize_request(term, request: Dict, time_budget: Optional[float] = None,
+                     max_k: Optional[int] = None) -> Dict:
+    """
+    Optimize one student's course list against `term`; a ranked request's "k"
+    is capped at `max_k`.
+    Returns {"student_id", "status": "ok" | "no_solution" | "error", "schedule",
+    "message", "elapsed_ms"} plus "missing_courses" for codes not offered this term.
+    """
+    started = time.perf_counter()
+    student_id = request.get("student_id")
+    codes = [str(code).strip() for code in request.get("course_codes") or [] if str(code).strip()]
+    result = {"student_id": student_id, "status": "error", "schedule": None}
+    try:
+        if not codes:
+            result["message"] = "No course codes provided."
+            return result
+        section_map = term.section_map(codes)
+        offered = {str(course).strip().upper() for course in section_map}
+        missing = [code for code in codes if code.upper() not in offered]
+        if missing:
+            result["missing_courses"] = missing
+        if not section_map:
+            result["message"] = "No matching courses in schedule."
+            return result
+
+        conflict_rows = term.conflict_rows(section_map)
+        if request.get("preferences") is not None or request.get("k") is not None:
+            preferences = SchedulePreferences.from_dict(request.get("preferences"))
+            k = max(int(request.get("k") or 1), 1)
+            if max_k is not None:
+                k = min(k, max_k)
+            ranked, complete = rank_section_map(section_map, preferences, k, time_budget, conflict_rows)
+            solution = ranked[0].slots if ranked else None
+            result["complete"] = complete
+            if ranked:
+                result["score"] = round(ranked[0].score, 3)
+        else:
+            solution = solve_section_map(section_map, conflict_rows)
+
+        if solution is None:
+            result["status"] = "no_solution"
+            result["message"] = "No conflict-free combination of sections was found."
+        else:
+            result["status"] = "ok"
+            result["schedule"] = sort_slots(solution)
+            result["message"] = "Schedule optimized successfully"
+    except (TypeError, ValueError) as e:
+        result["message"] = f"Invalid request: {e}"
+    finally:
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+# The term each pool worker optimizes against (set once per process by _init_worker)
+_worker_term = None
+
+
+def _init_worker(source):
+    global _worker_term
+    _worker_term = open_term(source)
+
+
+def _run_chunk(requests, time_budget, max_k):
+    return [optimize_request(_worker_term, request, time_budget, max_k) for request in requests]
+
+
+class CohortReport:
+    """Counts, infeasible cases and throughput of one cohort run"""
+
+    def __init__(self, total=0):
+        self.total = total
+        self.completed = 0
+        self.scheduled = 0
+        self.infeasible = []  # no conflict-free schedule exists
+        self.errors = []      # nothing to optimize (no or unknown courses, bad input)
+        self.missing = []     # scheduled without some requested courses
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, result: Dict):
+        self.completed += 1
+        self.elapsed = time.perf_counter() - self.started
+        case = {"student_id": result.get("student_id"), "message": result.get("message")}
+        if result.get("missing_courses"):
+            case["missing_courses"] = result["missing_courses"]
+        if result["status"] == "ok":
+            self.scheduled += 1
+            if "missing_courses" in case:
+                self.missing.append(case)
+        elif result["status"] == "no_solution":
+            self.infeasible.append(case)
+        else:
+            self.errors.append(case)
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def schedules_per_second(self):
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "scheduled": self.scheduled,
+            "infeasible": self.infeasible,
+            "errors": self.errors,
+            "missing_courses": self.missing,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "schedules_per_second": round(self.schedules_per_second, 1),
+        }
+
+
+class CohortOptimizer:
+    """
+    Runs many (student, course_codes) requests through the schedule solver.
+
+    The term is loaded once: workers map the compiled conflict matrix file
+    (core.conflict_matrix, built if missing) so they share it through the page
+    cache; if it cannot be built, the sections are handed to each worker once
+    at startup instead. Requests are sent in chunks to keep IPC overhead low,
+    and results are yielded as soon as their chunk finishes.
+
+    Configuration (environment):
+        COHORT_OPTIMIZER_WORKERS       pool size (default: CPU count; 1 runs in-process)
+        COHORT_OPTIMIZER_CHUNK_SIZE    requests per pool task (default: automatic)
+        COHORT_OPTIMIZER_START_METHOD  multiprocessing start method (default spawn,
+                                       safe to use from a threaded web worker)
+        SCHEDULE_RANK_MAX_K            largest "k" a ranked request may ask for (default 10)
+    """
+
+    def __init__(self, academic_year: int = 2025, term: str = "SPRING", workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None, time_budget: Optional[float] = None, source=None,
+                 max_k: Optional[int] = None):
+        env = os.environ
+        self.academic_year = academic_year
+        self.term = term
+        self.workers = workers or int(env.get('COHORT_OPTIMIZER_WORKERS', '0')) or os.cpu_count() or 1
+        self.chunk_size = chunk_size or int(env.get('COHORT_OPTIMIZER_CHUNK_SIZE', '0')) or None
+        self.start_method = env.get('COHORT_OPTIMIZER_START_METHOD', 'spawn')
+        # Only used by requests asking for ranked schedules
+        self.time_budget = (time_budget if time_budget is not None
+                            else int(env.get('SCHEDULE_RANK_BUDGET_MS', '2000')) / 1000.0)
+        self.max_k = max_k or int(env.get('SCHEDULE_RANK_MAX_K', '10'))
+        self.source = source
+        self.report = None
+
+    def load_term(self):
+        """('matrix', path) for the compiled term, or ('sections', [...]) as a fallback"""
+        from core.conflict_matrix import get_conflict_matrix_store, load_term_sections
+
+        try:
+            return ('matrix', get_conflict_matrix_store().get(self.academic_year, self.term).path)
+        except Exception as e:
+            print(f"Warning: conflict matrix unavailable, sending sections to workers: {e}")
+            return ('sections', load_term_sections(self.academic_year, self.term))
+
+    def _chunks(self, requests):
+        size = self.chunk_size or max(1, min(64, math.ceil(len(requests) / (self.workers * 8))))
+        return [requests[start:start + size] for start in range(0, len(requests), size)]
+
+    def run(self, requests: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield one result per request, in completion order; `self.report` is updated as they arrive"""
+        requests = list(requests)
+        self.report = CohortReport(len(requests))
+        if not requests:
+            return
+        source = self.source or self.load_term()
+        chunks = self._chunks(requests)
+
+        if self.workers <= 1 or len(chunks) <= 1:
+            term = open_term(source)
+            for request in requests:
+                result = optimize_request(term, request, self.time_budget, self.max_k)
+                self.report.add(result)
+                yield result
+            self.report.finish()
+            return
+
+        pool = ProcessPoolExecutor(max_workers=min(self.workers, len(chunks)),
+                                   mp_context=multiprocessing.get_context(self.start_method),
+                                   initializer=_init_worker, initargs=(source,))
+        try:
+            futures = [pool.submit(_run_chunk, chunk, self.time_budget, self.max_k) for chunk in chunks]
+            for future in as_completed(futures):
+                for result in future.result():
+                    self.report.add(result)
+                    yield result
+        finally:
+            # Also reached when the consumer stops early (e.g. a client disconnects)
+            pool.shutdown(wait=True, cancel_futures=True)
+            self.report.finish()
+
+
+def read_cohort_requests(path: str) -> List[Dict]:
+    """
+    Requests from a file ('-' for stdin):
+      .csv    columns student_id and course_codes (codes separated by ';')
+      other   a JSON array, or one JSON object per line
+    """
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+    try:
+        if path.lower().endswith('.csv'):
+            return [{"student_id": row.get("student_id"),
+                     "course_codes": [code.strip() for code in (row.get("course_codes") or '').split(';')
+                                      if code.strip()]}
+                    for row in csv.DictReader(handle)]
+        text = handle.read()
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
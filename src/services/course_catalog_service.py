@@ -0,0 +1,118 @@
+"""
+Course Catalog Service
+Per-term course catalog for the registration search panel: built from one
+grouped query, cached as a snapshot with an in-memory search index and ETags
+"""
+import bisect
+import hashlib
+import json
+from typing import Dict, List
+
+from core.reference_cache import get_reference_cache
+from repositories.repository_factory import RepositoryFactory
+
+# Longest n-gram indexed for substring search; longer queries intersect their n-grams
+NGRAM = 3
+
+# Built from Course_Schedule_Slot, so slot writes invalidate it with the slots
+_cache = get_reference_cache('course_schedule_slot')
+
+
+def _is_lecture(slot_type, sub_type):
+    return (slot_type or '').lower() == 'lecture' or sub_type == 'LCTR'
+
+
+def _is_lab(slot_type, sub_type):
+    return (slot_type or '').lower() in ('lab', 'tutorial') or sub_type in ('LAB', 'TUTR')
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class TermCatalog:
+    """
+    Read-only snapshot of a term's courses with their lecture and lab section
+    slot counts, indexed for prefix and substring search on the course code.
+    """
+
+    def __init__(self, rows):
+        # rows: (Course_Code, Section, Slot_Type, Sub_Type, Slot_Count), ordered by course and section
+        sections = {}
+        for course_code, section, slot_type, sub_type, count in rows:
+            lectures, labs = sections.setdefault(course_code, ({}, {}))
+            if _is_lecture(slot_type, sub_type):
+                lectures[section] = lectures.get(section, 0) + count
+            if _is_lab(slot_type, sub_type):
+                labs[section] = labs.get(section, 0) + count
+
+        self.courses = [{
+            "id": course_code,
+            "code": course_code,
+            "name": course_code,  # Course_Schedule_Slot has no separate course name
+            "lecture_slots": [{"section": section, "count": count} for section, count in lectures.items()],
+            "lab_slots": [{"section": section, "count": count} for section, count in labs.items()],
+        } for course_code, (lectures, labs) in sections.items()]
+
+        self._keys = [str(course["code"]).upper() for course in self.courses]
+        self._sorted_keys = sorted((key, position) for position, key in enumerate(self._keys))
+        self._ngrams = {}  # every substring of up to NGRAM characters -> course positions
+        for position, key in enumerate(self._keys):
+            for size in range(1, NGRAM + 1):
+                for start in range(len(key) - size + 1):
+                    self._ngrams.setdefault(key[start:start + size], set()).add(position)
+        self.version = _digest(json.dumps(self.courses, sort_keys=True, default=str))[:16]
+
+    def _prefix_matches(self, q):
+        start = bisect.bisect_left(self._sorted_keys, (q,))
+        matches = []
+        for key, position in self._sorted_keys[start:]:
+            if not key.startswith(q):
+                break
+            matches.append(position)
+        return matches
+
+    def _substring_matches(self, q):
+        if len(q) <= NGRAM:
+            return self._ngrams.get(q, set())
+        candidates = None
+        for start in range(len(q) - NGRAM + 1):
+            positions = self._ngrams.get(q[start:start + NGRAM])
+            if not positions:
+                return set()
+            candidates = set(positions) if candidates is None else candidates & positions
+        return {position for position in candidates if q in self._keys[position]}
+
+    def search(self, q: str = "") -> List[Dict]:
+        """Courses whose code contains `q` (case-insensitive); codes starting with it come first"""
+        q = (q or "").strip().upper()
+        if not q:
+            return self.courses
+        prefix = self._prefix_matches(q)
+        seen = set(prefix)
+        rest = sorted(position for position in self._substring_matches(q) if position not in seen)
+        return [self.courses[position] for position in prefix + rest]
+
+    def etag(self, q: str = "") -> str:
+        """ETag of search(q): changes whenever the term's catalog does"""
+        return f"{self.version}-{_digest((q or '').strip().upper())[:8]}"
+
+
+class CourseCatalogService:
+    """Term catalogs for the course registration search panel"""
+
+    def get_term_catalog(self, academic_year: int = 2025, term: str = "SPRING") -> TermCatalog:
+        """The cached catalog of a term, built with a single grouped query on a miss"""
+        return _cache.get(('term_catalog', academic_year, term), lambda: TermCatalog(
+            RepositoryFactory.get_repository('course_schedule_slot').get_section_counts(academic_year, term)))
+
+
+# Singleton instance
+_catalog_service_instance = None
+
+def get_course_catalog_service():
+    """Get singleton instance of Course Catalog Service"""
+    global _catalog_service_instance
+    if _catalog_service_instance is None:
+        _catalog_service_instance = CourseCatalogService()
+    return _catalog_service_instance
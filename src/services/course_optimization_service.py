@@ -2,15 +2,21 @@
 Course Registration Optimization Service
 Handles conflict-free schedule optimization
 """
+import os
 from datetime import time
 from typing import List, Dict, Optional
+from core.conflict_matrix import get_conflict_matrix_store
 from repositories.repository_factory import RepositoryFactory
+from services.schedule_solver import SchedulePreferences, rank_section_map, solve_section_map, sort_slots
 
 
 class CourseOptimizationService:
     def __init__(self):
         from core.db_singleton import DatabaseConnection
         self.db_connection = DatabaseConnection()
+        # Ranked mode: search time per request and the largest K a client may ask for
+        self.rank_time_budget = int(os.environ.get('SCHEDULE_RANK_BUDGET_MS', '2000')) / 1000.0
+        self.max_rank_k = int(os.environ.get('SCHEDULE_RANK_MAX_K', '10'))
 
     def time_to_minutes(self, hhmm: str) -> int:
         """Convert 'HH:MM' string to minutes since midnight"""
@@ -103,48 +109,74 @@ class CourseOptimizationService:
                     return False
         return True
 
-    def backtracking_optimizer(self, section_map: Dict) -> Optional[List[Dict]]:
+    def backtracking_optimizer(self, section_map: Dict, conflict_rows: Optional[Dict] = None) -> Optional[List[Dict]]:
         """
-        Backtracking algorithm to find conflict-free schedule
+        Find a conflict-free schedule (one section per course).
+        Uses the bitmask solver in services.schedule_solver: sections are
+        pre-encoded as weekly occupancy bitsets (or precomputed conflict rows),
+        the most constrained course is branched on first and unsolvable states
+        are memoized.
         Returns: List of slots if solution found, None otherwise
         """
-        courses = list(section_map.keys())
-        courses.sort()  # deterministic order
-        n = len(courses)
-        solution_slots = []
-
-        def dfs(i, chosen_slots):
-            if i == n:
-                return chosen_slots
-            course_code = courses[i]
-            for section_num, sec_slots in section_map[course_code].items():
-                if self.is_compatible(chosen_slots, sec_slots):
-                    new_slots = chosen_slots + sec_slots
-                    result = dfs(i + 1, new_slots)
-                    if result is not None:
-                        return result
+        return solve_section_map(section_map, conflict_rows)
+
+    def get_conflict_matrix(self, academic_year: int = 2025, term: str = "SPRING"):
+        """The compiled term (core.conflict_matrix), or None when disabled or unavailable"""
+        store = get_conflict_matrix_store()
+        if not store.enabled:
+            return None
+        try:
+            return store.get(academic_year, term)
+        except Exception as e:
+            print(f"Warning: conflict matrix unavailable for {academic_year} {term}: {e}")
             return None
 
-        return dfs(0, [])
+    def rebuild_conflict_matrix(self, academic_year: int = 2025, term: str = "SPRING"):
+        """Compile a term's conflict matrix now (run after importing a schedule)"""
+        return get_conflict_matrix_store().build(academic_year, term)
 
-    def optimize_schedule(self, course_codes: List[str], academic_year: int = 2025, term: str = "SPRING") -> Dict:
+    def load_sections(self, course_codes: List[str], academic_year: int = 2025, term: str = "SPRING"):
         """
-        Main optimization function
+        (section map, conflict rows) for the requested courses; from the compiled
+        term when available, otherwise straight from the database (rows None)
+        """
+        matrix = self.get_conflict_matrix(academic_year, term)
+        if matrix is not None:
+            section_map = matrix.section_map(course_codes)
+            return section_map, matrix.conflict_rows(section_map)
+        return self.get_course_schedule_slots(course_codes, academic_year, term), None
+
+    def sort_slots(self, slots: List[Dict]) -> List[Dict]:
+        """Sort slots by day then start time"""
+        return sort_slots(slots)
+
+    def optimize_schedule(self, course_codes: List[str], academic_year: int = 2025, term: str = "SPRING",
+                          preferences: Optional[SchedulePreferences] = None, k: Optional[int] = None,
+                          time_budget: Optional[float] = None) -> Dict:
+        """
+        Main optimization function.
+        Passing `preferences` or `k` switches to ranked mode: the K best schedules
+        by weighted preference penalty, searched for at most `time_budget` seconds.
         Returns: {
             "status": "ok" | "no_solution" | "error",
             "schedule": List[Dict] or None,
             "message": str
         }
+        plus, in ranked mode, "schedules": [{"rank", "score", "penalties", "schedule"}]
+        and "complete" (False when the time budget ran out first)
         """
         if not course_codes:
             return {"status": "error", "message": "No course codes provided.", "schedule": None}
 
-        section_map = self.get_course_schedule_slots(course_codes, academic_year, term)
+        section_map, conflict_rows = self.load_sections(course_codes, academic_year, term)
         
         if not section_map:
             return {"status": "error", "message": "No matching courses in schedule.", "schedule": None}
 
-        solution = self.backtracking_optimizer(section_map)
+        if preferences is not None or k is not None:
+            return self.rank_schedules(section_map, preferences, k, time_budget, conflict_rows)
+
+        solution = self.backtracking_optimizer(section_map, conflict_rows)
         
         if solution is None:
             return {
@@ -153,19 +185,44 @@ class CourseOptimizationService:
                 "schedule": None
             }
 
-        # Sort solution by day then start time
-        day_order = {"SAT": 0, "SUN": 1, "MON": 2, "TUES": 3, "WED": 4, "THURS": 5}
-        solution_sorted = sorted(solution, key=lambda slot: (
-            day_order.get(str(slot["day"]).upper(), 99),
-            self.time_to_minutes(slot["start"]),
-        ))
-
         return {
             "status": "ok",
-            "schedule": solution_sorted,
+            "schedule": self.sort_slots(solution),
             "message": "Schedule optimized successfully"
         }
 
+    def rank_schedules(self, section_map: Dict, preferences: Optional[SchedulePreferences] = None,
+                       k: Optional[int] = None, time_budget: Optional[float] = None,
+                       conflict_rows: Optional[Dict] = None) -> Dict:
+        """Ranked mode of optimize_schedule for an already loaded section map"""
+        k = min(max(int(k or 5), 1), self.max_rank_k)
+        if time_budget is None:
+            time_budget = self.rank_time_budget
+        ranked, complete = rank_section_map(section_map, preferences, k, time_budget, conflict_rows)
+
+        if not ranked:
+            message = ("No conflict-free combination of sections was found." if complete
+                       else "No conflict-free combination of sections was found within the time limit.")
+            return {"status": "no_solution", "message": message, "schedule": None,
+                    "schedules": [], "complete": complete}
+
+        schedules = [{
+            "rank": rank,
+            "score": round(result.score, 3),
+            "penalties": {name: round(value, 3) for name, value in result.penalties.items()},
+            "schedule": self.sort_slots(result.slots),
+        } for rank, result in enumerate(ranked, 1)]
+        message = f"Found {len(schedules)} ranked schedule(s)"
+        if not complete:
+            message += " (time limit reached; best found so far)"
+        return {
+            "status": "ok",
+            "schedule": schedules[0]["schedule"],
+            "schedules": schedules,
+            "complete": complete,
+            "message": message
+        }
+
 
 # Singleton instance
 _optimization_service_instance = None
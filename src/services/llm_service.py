@@ -5,6 +5,10 @@ Supports Ollama (local), OpenAI, and other LLM providers
 import requests
 import json
 import os
+import time
+
+from core.metrics import record_llm_call
+from core.request_profiler import timed
 
 
 class LLMService:
@@ -88,14 +92,22 @@ class LLMService:
         Returns:
             Generated text response
         """
-        if self.provider == 'ollama':
-            return self._generate_ollama(prompt, context, system_prompt)
-        elif self.provider == 'openai':
-            return self._generate_openai(prompt, context, system_prompt)
-        elif self.provider == 'anthropic':
-            return self._generate_anthropic(prompt, context, system_prompt)
-        else:
-            raise ValueError(f"Unsupported provider: {self.provider}")
+        start = time.perf_counter()
+        failed = True
+        try:
+            with timed('llm'):
+                if self.provider == 'ollama':
+                    result = self._generate_ollama(prompt, context, system_prompt)
+                elif self.provider == 'openai':
+                    result = self._generate_openai(prompt, context, system_prompt)
+                elif self.provider == 'anthropic':
+                    result = self._generate_anthropic(prompt, context, system_prompt)
+                else:
+                    raise ValueError(f"Unsupported provider: {self.provider}")
+            failed = False
+            return result
+        finally:
+            record_llm_call(self.provider, time.perf_counter() - start, failed)
     
     def _generate_ollama(self, prompt, context=None, system_prompt=None):
         """Generate text using Ollama (local LLM)"""
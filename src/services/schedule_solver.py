@@ -0,0 +1,482 @@
+"""
+Schedule Solver
+Bitmask constraint solver for course section selection: every section is
+encoded once as a weekly occupancy bitset, so a conflict check is one AND.
+Also ranks conflict-free schedules by weighted preferences (branch-and-bound)
+"""
+import heapq
+import time as _time
+from datetime import time
+from math import gcd
+from typing import Dict, List, Optional, Tuple
+
+# Week order used for bit positions and for sorting results
+DAY_ORDER = {"SAT": 0, "SUN": 1, "MON": 2, "TUES": 3, "WED": 4, "THURS": 5, "FRI": 6}
+MINUTES_PER_DAY = 24 * 60
+BUCKET_MINUTES = 5
+
+
+def to_minutes(value) -> int:
+    """'HH:MM' (or datetime.time) to minutes since midnight"""
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    h, m = str(value).split(":")[:2]
+    return int(h) * 60 + int(m)
+
+
+def sort_slots(slots: List[Dict]) -> List[Dict]:
+    """Slots by day then start time"""
+    return sorted(slots, key=lambda slot: (DAY_ORDER.get(str(slot["day"]).upper(), 99), to_minutes(slot["start"])))
+
+
+class EncodedSection:
+    """
+    One course section: its slot dicts plus the week it occupies as a bitset.
+
+    The search tests `probe & occupied` and adds `block` to `occupied` when the
+    section is chosen. Both are the week bitset by default; with a precomputed
+    conflict matrix, probe is the section's own bit and block its conflict row.
+    """
+
+    __slots__ = ('course', 'section', 'slots', 'mask', 'intervals', 'probe', 'block')
+
+    def __init__(self, course, section, slots, mask, intervals, probe=None, block=None):
+        self.course = course
+        self.section = section
+        self.slots = slots
+        self.mask = mask
+        self.intervals = intervals  # [(day index, start minute, end minute)]
+        self.probe = mask if probe is None else probe
+        self.block = mask if block is None else block
+
+
+class EncodedCatalog:
+    """
+    A section map ({course: {section: [slot dicts]}}) encoded for the solver.
+
+    Times are bucketed in 5-minute steps; if any slot boundary is not on a
+    5-minute mark the bucket shrinks (down to 1 minute) so that two sections
+    conflict in the bitset exactly when their intervals overlap.
+
+    `conflict_rows` ({(course, section): (row index, conflict bitset)}, see
+    core.conflict_matrix) replaces the conflict test with precomputed rows
+    when it covers every section.
+    """
+
+    def __init__(self, section_map: Dict, conflict_rows: Optional[Dict] = None):
+        self.courses = sorted(section_map)
+        parsed = {}
+        bucket = BUCKET_MINUTES
+        day_index = dict(DAY_ORDER)
+        for course in self.courses:
+            for section, slots in section_map[course].items():
+                intervals = []
+                for slot in slots:
+                    day = str(slot["day"]).upper()
+                    if day not in day_index:
+                        day_index[day] = len(day_index)
+                    start, end = to_minutes(slot["start"]), to_minutes(slot["end"])
+                    bucket = gcd(gcd(bucket, start), end)
+                    intervals.append((day_index[day], start, end))
+                parsed[(course, section)] = intervals
+        self.bucket = bucket or 1
+        self.buckets_per_day = buckets_per_day = MINUTES_PER_DAY // self.bucket
+        self.day_count = len(day_index)
+
+        self.domains = []  # per course (in self.courses order): [EncodedSection]
+        for course in self.courses:
+            domain = []
+            for section, slots in section_map[course].items():
+                intervals = parsed[(course, section)]
+                mask = 0
+                for day, start, end in intervals:
+                    if end <= start:
+                        continue
+                    first = day * buckets_per_day + start // self.bucket
+                    last = day * buckets_per_day + (end - 1) // self.bucket
+                    mask |= ((1 << (last - first + 1)) - 1) << first
+                domain.append(EncodedSection(course, section, slots, mask, intervals))
+            self.domains.append(domain)
+        self.uses_conflict_rows = bool(conflict_rows) and all(
+            (encoded.course, encoded.section) in conflict_rows for domain in self.domains for encoded in domain)
+        if self.uses_conflict_rows:
+            for domain in self.domains:
+                for encoded in domain:
+                    position, row = conflict_rows[(encoded.course, encoded.section)]
+                    encoded.probe = 1 << position
+                    encoded.block = row
+        # Every bit a course's sections test; a dead-state key only needs those bits
+        self.course_union = [0] * len(self.courses)
+        for index, domain in enumerate(self.domains):
+            for encoded in domain:
+                self.course_union[index] |= encoded.probe
+        self._relevant = {}
+
+    def relevant_mask(self, remaining: int) -> int:
+        """Bits some section of the courses in `remaining` (a bitset of course indexes) could use"""
+        mask = self._relevant.get(remaining)
+        if mask is None:
+            mask = 0
+            index = 0
+            bits = remaining
+            while bits:
+                if bits & 1:
+                    mask |= self.course_union[index]
+                bits >>= 1
+                index += 1
+            self._relevant[remaining] = mask
+        return mask
+
+
+class BitmaskSolver:
+    """
+    Depth-first search over course sections with
+      - MRV: branch on the course with the fewest sections still compatible,
+      - forward checking: a branch is cut as soon as any remaining course has
+        no compatible section left,
+      - dead-state memo: (remaining courses, occupancy that matters to them)
+        pairs already proven unsolvable are not explored again.
+    """
+
+    def __init__(self, catalog: EncodedCatalog):
+        self.catalog = catalog
+        # Sections with the same bitset are interchangeable for feasibility;
+        # keep the first of each (lowest section number in catalog order)
+        self.domains = []
+        for domain in catalog.domains:
+            seen = {}
+            for encoded in domain:
+                seen.setdefault(encoded.mask, encoded)
+            self.domains.append(list(seen.values()))
+        self.nodes = 0
+        self._dead = set()
+
+    def solve(self) -> Optional[List[EncodedSection]]:
+        """One section per course with no overlaps, or None"""
+        count = len(self.catalog.courses)
+        if any(not domain for domain in self.domains):
+            return None
+        chosen = []
+        if self._search((1 << count) - 1, 0, chosen):
+            return sorted(chosen, key=lambda encoded: self.catalog.courses.index(encoded.course))
+        return None
+
+    def _search(self, remaining, occupied, chosen):
+        if not remaining:
+            return True
+        self.nodes += 1
+        key = (remaining, occupied & self.catalog.relevant_mask(remaining))
+        if key in self._dead:
+            return False
+
+        # Forward check every remaining course and pick the most constrained one
+        best_index, best_options = -1, None
+        index, bits = 0, remaining
+        while bits:
+            if bits & 1:
+                options = [encoded for encoded in self.domains[index] if not encoded.probe & occupied]
+                if not options:
+                    self._dead.add(key)
+                    return False
+                if best_options is None or len(options) < len(best_options):
+                    best_index, best_options = index, options
+            bits >>= 1
+            index += 1
+
+        rest = remaining & ~(1 << best_index)
+        for encoded in best_options:
+            chosen.append(encoded)
+            if self._search(rest, occupied | encoded.block, chosen):
+                return True
+            chosen.pop()
+        self._dead.add(key)
+        return False
+
+
+def solve_section_map(section_map: Dict, conflict_rows: Optional[Dict] = None) -> Optional[List[Dict]]:
+    """
+    Conflict-free selection of one section per course in `section_map`.
+    Returns the chosen sections' slot dicts (course by course), or None.
+    """
+    solution = BitmaskSolver(EncodedCatalog(section_map, conflict_rows)).solve()
+    if solution is None:
+        return None
+    return [slot for encoded in solution for slot in encoded.slots]
+
+
+# Penalty per unit; all weights must be >= 0 for the search bound to stay admissible
+DEFAULT_WEIGHTS = {
+    'early': 1.0,      # per class meeting starting before `no_classes_before`
+    'days': 1.0,       # per day on campus
+    'gaps': 1.0,       # per hour idle between classes on the same day
+    'preferred': 1.0,  # per course not placed in one of its preferred sections
+    'avoided': 2.0,    # per chosen section the student wants to avoid
+}
+
+
+def _section_sets(value) -> Dict[str, set]:
+    """{course: section or [sections]} -> {course: {section as str}}"""
+    if not value:
+        return {}
+    if not isinstance(value, dict):
+        raise ValueError("Section preferences must map course codes to sections")
+    sets = {}
+    for course, sections in value.items():
+        if not isinstance(sections, (list, tuple, set)):
+            sections = [sections]
+        sets[str(course).strip()] = {str(section) for section in sections}
+    return sets
+
+
+class SchedulePreferences:
+    """Weighted soft preferences; schedules are ranked by total penalty (lower is better)"""
+
+    FIELDS = ('no_classes_before', 'preferred_sections', 'avoided_sections', 'weights')
+
+    def __init__(self, no_classes_before=None, preferred_sections=None, avoided_sections=None, weights=None):
+        self.no_classes_before = to_minutes(no_classes_before) if no_classes_before else None
+        self.preferred_sections = _section_sets(preferred_sections)
+        self.avoided_sections = _section_sets(avoided_sections)
+        self.weights = dict(DEFAULT_WEIGHTS)
+        for name, value in (weights or {}).items():
+            if name not in DEFAULT_WEIGHTS:
+                raise ValueError(f"Unknown preference weight: {name}")
+            value = float(value)
+            if value < 0:
+                raise ValueError(f"Preference weight '{name}' must not be negative")
+            self.weights[name] = value
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'SchedulePreferences':
+        """Build from an API payload; raises ValueError on malformed input"""
+        if data is None:
+            return cls()
+        if not isinstance(data, dict):
+            raise ValueError("preferences must be an object")
+        unknown = set(data) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown preferences: {', '.join(sorted(unknown))}")
+        if data.get('weights') is not None and not isinstance(data['weights'], dict):
+            raise ValueError("preferences.weights must be an object")
+        try:
+            return cls(**{field: data.get(field) for field in cls.FIELDS})
+        except (TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid preferences: {e}")
+
+    def section_penalties(self, encoded: EncodedSection) -> Dict[str, float]:
+        """Penalties that depend on this section alone"""
+        weights = self.weights
+        penalties = {'early': 0.0, 'preferred': 0.0, 'avoided': 0.0}
+        if self.no_classes_before is not None:
+            early = sum(1 for _, start, _ in encoded.intervals if start < self.no_classes_before)
+            penalties['early'] = weights['early'] * early
+        section = str(encoded.section)
+        preferred = self.preferred_sections.get(encoded.course)
+        if preferred and section not in preferred:
+            penalties['preferred'] = weights['preferred']
+        if section in self.avoided_sections.get(encoded.course, ()):
+            penalties['avoided'] = weights['avoided']
+        return penalties
+
+
+class RankedSchedule:
+    """A conflict-free schedule with its total penalty and per-preference breakdown"""
+
+    __slots__ = ('score', 'penalties', 'sections')
+
+    def __init__(self, score, penalties, sections):
+        self.score = score
+        self.penalties = penalties
+        self.sections = sections
+
+    @property
+    def slots(self) -> List[Dict]:
+        return [slot for encoded in self.sections for slot in encoded.slots]
+
+
+def _day_gap_minutes(intervals) -> int:
+    """Idle minutes between the classes of one day"""
+    gaps = 0
+    latest_end = None
+    for start, end in sorted(intervals):
+        if latest_end is not None and start > latest_end:
+            gaps += start - latest_end
+        latest_end = end if latest_end is None else max(latest_end, end)
+    return gaps
+
+
+def _bit_count(value) -> int:
+    return bin(value).count('1')
+
+
+class ScheduleRanker:
+    """
+    Best-first-ordered branch-and-bound for the K lowest-penalty schedules.
+
+    At every node the bound adds to the penalty already fixed:
+      - the cheapest per-section penalty among each remaining course's
+        compatible sections,
+      - the days every compatible section of some remaining course meets on,
+      - the exact gaps of days no remaining section can touch any more.
+    Each term can only grow as courses are placed, so the bound is admissible
+    and a branch is cut once it cannot beat the K-th best schedule so far.
+    The search stops at `time_budget` seconds with the best schedules found.
+    """
+
+    def __init__(self, catalog: EncodedCatalog, preferences: SchedulePreferences = None,
+                 k: int = 5, time_budget: float = None):
+        self.catalog = catalog
+        self.preferences = preferences or SchedulePreferences()
+        self.k = max(int(k), 1)
+        self.time_budget = time_budget
+        self.weights = self.preferences.weights
+        # Cheapest sections first, so good schedules are found (and the bound tightens) early
+        self.domains = []
+        self.cost = {}
+        self.penalties = {}
+        self.days = {}
+        for domain in catalog.domains:
+            for encoded in domain:
+                penalties = self.preferences.section_penalties(encoded)
+                self.penalties[id(encoded)] = penalties
+                self.cost[id(encoded)] = sum(penalties.values())
+                self.days[id(encoded)] = sum(1 << day for day in {day for day, _, _ in encoded.intervals})
+            self.domains.append(sorted(domain, key=lambda encoded: self.cost[id(encoded)]))
+        per_day = (1 << catalog.buckets_per_day) - 1
+        self.day_masks = [per_day << (day * catalog.buckets_per_day) for day in range(catalog.day_count)]
+        self.nodes = 0
+        self.complete = True
+        self._dead = set()
+        self._best = []  # heap of (-score, -sequence, RankedSchedule)
+        self._sequence = 0
+        self._deadline = None
+
+    def rank(self) -> List[RankedSchedule]:
+        """Up to K schedules, best first; `complete` is False if the time budget ran out"""
+        self.nodes = 0
+        self.complete = True
+        self._best = []
+        if self.time_budget is not None:
+            self._deadline = _time.perf_counter() + self.time_budget
+        if all(self.domains):
+            self._search((1 << len(self.domains)) - 1, 0, [], 0.0, 0)
+        return [entry[2] for entry in sorted(self._best, key=lambda entry: (-entry[0], -entry[1]))]
+
+    def _worst_kept(self):
+        if len(self._best) < self.k:
+            return None
+        return -self._best[0][0]
+
+    def _gap_minutes(self, chosen, days):
+        per_day = {}
+        for encoded in chosen:
+            for day, start, end in encoded.intervals:
+                if days >> day & 1 and end > start:
+                    per_day.setdefault(day, []).append((start, end))
+        return sum(_day_gap_minutes(intervals) for intervals in per_day.values())
+
+    def _record(self, chosen, fixed_cost, days):
+        worst = self._worst_kept()
+        day_penalty = self.weights['days'] * _bit_count(days)
+        if worst is not None and fixed_cost + day_penalty >= worst:
+            return
+        gap_penalty = self.weights['gaps'] * self._gap_minutes(chosen, days) / 60.0 if self.weights['gaps'] else 0.0
+        score = fixed_cost + day_penalty + gap_penalty
+        if worst is not None and score >= worst:
+            return
+        penalties = {'early': 0.0, 'preferred': 0.0, 'avoided': 0.0}
+        for encoded in chosen:
+            for name, value in self.penalties[id(encoded)].items():
+                penalties[name] += value
+        penalties['days'] = day_penalty
+        penalties['gaps'] = gap_penalty
+        order = {course: index for index, course in enumerate(self.catalog.courses)}
+        ranked = RankedSchedule(score, penalties, sorted(chosen, key=lambda encoded: order[encoded.course]))
+        self._sequence += 1
+        entry = (-score, -self._sequence, ranked)
+        if worst is None:
+            heapq.heappush(self._best, entry)
+        else:
+            heapq.heapreplace(self._best, entry)
+
+    def _search(self, remaining, occupied, chosen, fixed_cost, days):
+        # False only when the subtree provably holds no conflict-free schedule
+        if not remaining:
+            self._record(chosen, fixed_cost, days)
+            return True
+        self.nodes += 1
+        if self._deadline is not None and not self.nodes & 255 and _time.perf_counter() > self._deadline:
+            self.complete = False
+        if not self.complete:
+            return True
+        key = (remaining, occupied & self.catalog.relevant_mask(remaining))
+        if key in self._dead:
+            return False
+
+        bound = fixed_cost
+        required_days = days
+        new_days = 0
+        reachable = 0
+        best_index, best_options = -1, None
+        index, bits = 0, remaining
+        while bits:
+            if bits & 1:
+                options = [encoded for encoded in self.domains[index] if not encoded.probe & occupied]
+                if not options:
+                    self._dead.add(key)
+                    return False
+                bound += self.cost[id(options[0])]
+                common = -1
+                fewest_new = None
+                for encoded in options:
+                    section_days = self.days[id(encoded)]
+                    common &= section_days
+                    reachable |= encoded.mask
+                    new = _bit_count(section_days & ~days)
+                    if fewest_new is None or new < fewest_new:
+                        fewest_new = new
+                required_days |= common
+                new_days = max(new_days, fewest_new)
+                if best_options is None or len(options) < len(best_options):
+                    best_index, best_options = index, options
+            bits >>= 1
+            index += 1
+
+        worst = self._worst_kept()
+        if worst is not None:
+            bound += self.weights['days'] * (_bit_count(days) + max(_bit_count(required_days & ~days), new_days))
+            if self.weights['gaps']:
+                closed = 0
+                for day in range(self.catalog.day_count):
+                    if days >> day & 1 and not reachable & self.day_masks[day]:
+                        closed |= 1 << day
+                if closed:
+                    bound += self.weights['gaps'] * self._gap_minutes(chosen, closed) / 60.0
+            if bound >= worst:
+                return True
+
+        rest = remaining & ~(1 << best_index)
+        feasible = False
+        for encoded in best_options:
+            chosen.append(encoded)
+            if self._search(rest, occupied | encoded.block, chosen,
+                            fixed_cost + self.cost[id(encoded)], days | self.days[id(encoded)]):
+                feasible = True
+            chosen.pop()
+            if not self.complete:
+                return True
+        if not feasible:
+            self._dead.add(key)
+        return feasible
+
+
+def rank_section_map(section_map: Dict, preferences: SchedulePreferences = None, k: int = 5,
+                     time_budget: float = None, conflict_rows: Optional[Dict] = None
+                     ) -> Tuple[List[RankedSchedule], bool]:
+    """
+    The K best conflict-free schedules for `section_map` under `preferences`.
+    Returns (schedules best first, whether the search finished within `time_budget`).
+    """
+    ranker = ScheduleRanker(EncodedCatalog(section_map, conflict_rows), preferences, k, time_budget)
+    schedules = ranker.rank()
+    return schedules, ranker.complete
@@ -1,10 +1,13 @@
 """
 Pytest configuration and fixtures
 Provides Flask test client fixture for all tests
+and SQLite database fixtures for repository tests
 """
 import pytest
+import sqlite3
 import sys
 import os
+from unittest.mock import MagicMock
 
 # Add src directory to path
 src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -12,6 +15,21 @@ sys.path.insert(0, src_path)
 
 # Import Flask app
 from app import create_app
+from core.db_singleton import DatabaseConnection
+from core.sql_dialect import DialectConnection, SQLITE, init_sqlite_schema
+
+
+class _KeepOpen:
+    """sqlite :memory: connection whose close() is a no-op so a repo can reuse it"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
 
 
 @pytest.fixture
@@ -36,3 +54,44 @@ def authenticated_client(client):
         sess['user_id'] = 1
         sess['username'] = 'testuser'
     return client
+
+
+@pytest.fixture
+def schema_conn():
+    """Create an in-memory SQLite connection with the application schema"""
+    conn = DialectConnection(sqlite3.connect(":memory:"), SQLITE)
+    init_sqlite_schema(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def memory_db(schema_conn):
+    """Create a database mock whose connections all share schema_conn"""
+    db = MagicMock()
+    db.get_connection.return_value = _KeepOpen(schema_conn)
+    return db
+
+
+@pytest.fixture
+def sqlite_main_db(tmp_path, monkeypatch):
+    """Point DatabaseConnection at a fresh SQLite file for the test"""
+    monkeypatch.setenv('DB_BACKEND', 'sqlite')
+    monkeypatch.setenv('DB_SQLITE_PATH', str(tmp_path / "main.db"))
+    DatabaseConnection._instance = None
+    yield DatabaseConnection()
+    DatabaseConnection._instance = None
+
+
+@pytest.fixture
+def insert_row(sqlite_main_db):
+    """Return insert_row(query, params) which runs an INSERT ... OUTPUT and returns the new id"""
+    def insert(query, params):
+        conn = sqlite_main_db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        new_id = cursor.fetchone()[0]
+        conn.commit()
+        conn.close()
+        return new_id
+    return insert
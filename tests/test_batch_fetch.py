@@ -0,0 +1,101 @@
+"""
+Unit tests for batch fetch APIs
+Covers chunked IN (...) lookups and get_many_by_ids on repositories
+"""
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.bulk_operations import fetch_by_ids, unique_ids
+from repositories.repository_factory import RepositoryFactory
+
+
+def _seed_courses(conn):
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO [User] (Username, Email, Password_Hash) VALUES ('prof', 'p@x', 'h')")
+    cursor.execute("INSERT INTO Instructor (User_ID, Department) VALUES (1, 'CS')")
+    cursor.executemany("INSERT INTO Course (Course_Name, Credits, Instructor_ID) VALUES (?, ?, 1)",
+                       [(f"Course {i}", 3) for i in range(1, 21)])
+    conn.commit()
+
+
+def test_unique_ids_drops_duplicates_and_none():
+    """Test that ids are de-duplicated in first-seen order"""
+    assert unique_ids([3, 1, None, 3, 2, 1]) == [3, 1, 2]
+
+
+def test_fetch_by_ids_chunks_the_in_list(schema_conn):
+    """Test that long id lists are split into several IN (...) statements"""
+    _seed_courses(schema_conn)
+    cursor = MagicMock(wraps=schema_conn.cursor())
+    rows = fetch_by_ids(cursor, "SELECT Course_ID FROM Course WHERE Course_ID IN ({ids})",
+                        range(1, 21), chunk_size=8)
+    assert sorted(row[0] for row in rows) == list(range(1, 21))
+    assert cursor.execute.call_count == 3
+
+
+def test_course_get_many_by_ids_returns_dict_keyed_by_id(schema_conn, memory_db):
+    """Test that get_many_by_ids returns {Course_ID: Course} and skips missing ids"""
+    _seed_courses(schema_conn)
+    repo = RepositoryFactory.create_repository("course")
+    repo.db_connection = memory_db
+
+    courses = repo.get_many_by_ids([2, 5, 5, 999])
+    assert set(courses) == {2, 5}
+    assert courses[5].Course_Name == "Course 5"
+    assert repo.get_many_by_ids([]) == {}
+
+
+def test_dashboard_loads_courses_in_one_batch():
+    """Test that the academic dashboard no longer looks courses up one at a time"""
+    from services.academic_dashboard_service import AcademicDashboardService
+
+    enrollment = MagicMock(Status='completed', Grade='A', Semester='Fall 2025', Course_ID=1)
+    course = MagicMock(Credits=4)
+    service = AcademicDashboardService.__new__(AcademicDashboardService)
+    service.course_repo = MagicMock()
+    service.course_repo.get_many_by_ids.return_value = {1: course}
+
+    gpa = service._calculate_gpa([enrollment, enrollment])
+    assert gpa['total_credits'] == 8
+    service.course_repo.get_many_by_ids.assert_called_once()
+    service.course_repo.get_by_id.assert_not_called()
+
+
+def test_enrollment_get_by_students_groups_by_student(schema_conn, memory_db):
+    """Test that get_by_students loads several students' enrollments in one query"""
+    _seed_courses(schema_conn)
+    cursor = schema_conn.cursor()
+    cursor.executemany("INSERT INTO Enrollment (Student_ID, Course_ID, Status) VALUES (?, ?, 'enrolled')",
+                       [(1, 1), (2, 3), (1, 2)])
+    schema_conn.commit()
+    repo = RepositoryFactory.create_repository("enrollment")
+    repo.db_connection = memory_db
+
+    enrollments = repo.get_by_students([1, 2, 3])
+    assert [e.Course_ID for e in enrollments[1]] == [1, 2]
+    assert [e.Course_ID for e in enrollments[2]] == [3]
+    assert enrollments[3] == []
+
+
+def test_cohort_comparison_loads_enrollments_in_one_batch():
+    """Test that cohort GPAs do not query enrollments once per student"""
+    from services.academic_dashboard_service import AcademicDashboardService
+
+    student = MagicMock(Student_ID=1, Year_Level=2, Department='CS')
+    peers = [student] + [MagicMock(Student_ID=i, Year_Level=2, Department='CS') for i in (2, 3)]
+    service = AcademicDashboardService.__new__(AcademicDashboardService)
+    service.student_repo = MagicMock()
+    service.student_repo.get_all.return_value = peers
+    service.enrollment_repo = MagicMock()
+    service.enrollment_repo.get_by_students.return_value = {1: [], 2: [], 3: []}
+    service.course_repo = MagicMock()
+    service.course_repo.get_many_by_ids.return_value = {}
+
+    comparison = service._get_cohort_comparison(student)
+    assert comparison['cohort_size'] == 3
+    service.enrollment_repo.get_by_students.assert_called_once()
+    service.enrollment_repo.get_by_student.assert_not_called()
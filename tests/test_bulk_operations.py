@@ -0,0 +1,135 @@
+"""
+Unit tests for the bulk write helpers
+Uses SQLite so no database server is required
+"""
+import sys
+import os
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core import bulk_operations
+from core.connection_pool import ConnectionPool
+
+
+def _make_db():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute("CREATE TABLE Task (Task_ID INTEGER PRIMARY KEY AUTOINCREMENT, Student_ID INT, Task_Title TEXT)")
+    conn.commit()
+    return conn
+
+
+def test_bulk_insert_returns_ids_in_row_order():
+    """Test that bulk_insert returns one generated id per row, in order"""
+    conn = _make_db()
+    rows = [(1, f"Task {i}") for i in range(10)]
+
+    ids = bulk_operations.bulk_insert(conn, "Task", ["Student_ID", "Task_Title"], rows, id_column="Task_ID")
+    conn.commit()
+
+    assert ids == list(range(1, 11))
+    titles = [r[0] for r in conn.execute("SELECT Task_Title FROM Task ORDER BY Task_ID")]
+    assert titles == [r[1] for r in rows]
+
+
+def test_bulk_insert_splits_into_parameter_limited_chunks():
+    """Test that large batches are split so no statement exceeds the parameter limit"""
+    conn = _make_db()
+    rows = [(1, f"Task {i}") for i in range(1200)]
+
+    ids = bulk_operations.bulk_insert(conn, "Task", ["Student_ID", "Task_Title"], rows, id_column="Task_ID")
+
+    assert len(ids) == 1200
+    assert ids == sorted(ids)
+    assert conn.execute("SELECT COUNT(*) FROM Task").fetchone()[0] == 1200
+
+
+def test_bulk_insert_without_id_column_uses_executemany():
+    """Test that bulk_insert without id_column inserts rows and returns no ids"""
+    conn = _make_db()
+    ids = bulk_operations.bulk_insert(conn, "Task", ["Student_ID", "Task_Title"], [(1, "a"), (2, "b")])
+    assert ids == []
+    assert conn.execute("SELECT COUNT(*) FROM Task").fetchone()[0] == 2
+
+
+def test_execute_many_enables_fast_executemany():
+    """Test that pyodbc cursors get fast_executemany turned on"""
+    cursor = MagicMock()
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+
+    count = bulk_operations.execute_many(conn, "UPDATE t SET x = ?", [(1,), (2,), (3,)], chunk_size=2)
+
+    assert count == 3
+    assert cursor.fast_executemany is True
+    assert cursor.executemany.call_count == 2
+
+
+def test_sqlite_detected_through_pool_proxy():
+    """Test that pooled connections are unwrapped to pick the SQLite dialect"""
+    pool = ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False), min_size=0, max_size=1)
+    conn = pool.acquire()
+    assert bulk_operations.is_sqlite_connection(conn)
+    conn.close()
+
+
+@patch("core.db_singleton.pyodbc")
+def test_database_connection_bulk_insert_commits_once(mock_pyodbc):
+    """Test that DatabaseConnection.bulk_insert commits the whole batch once"""
+    from core.db_singleton import DatabaseConnection
+
+    raw = _make_db()
+    conn = MagicMock(wraps=raw)
+    conn._raw = raw
+    db = DatabaseConnection()
+
+    with patch.object(db, "get_connection", return_value=conn):
+        ids = db.bulk_insert("Task", ["Student_ID", "Task_Title"], [(1, "a"), (1, "b")], id_column="Task_ID")
+
+    assert ids == [1, 2]
+    assert conn.commit.call_count == 1
+
+
+def test_bulk_insert_maps_sql_server_ids_by_row_ordinal():
+    """Test that ids are matched to rows by ordinal, not by OUTPUT order or id order"""
+    cursor = MagicMock()
+    # OUTPUT rows arrive shuffled and identities were not assigned in VALUES order
+    cursor.fetchall.return_value = [(2, 40), (0, 52), (1, 17)]
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+
+    ids = bulk_operations.bulk_insert(conn, "[Task]", ["Student_ID", "Task_Title"],
+                                      [(1, "c"), (1, "a"), (1, "b")], id_column="Task_ID")
+
+    assert ids == [52, 17, 40]
+    query, params = cursor.execute.call_args[0]
+    assert query.startswith("MERGE INTO [Task]")
+    assert "OUTPUT source.Row_Ordinal, INSERTED.Task_ID" in query
+    assert params == [1, "c", 1, "a", 1, "b"]
+
+
+def test_create_many_gives_each_task_its_own_id():
+    """Test that create_many assigns every task the id of the row inserted for it"""
+    from models.task import Task
+    from repositories.repository_factory import RepositoryFactory
+
+    raw = _make_db()
+    raw.execute("ALTER TABLE Task ADD COLUMN Due_Date TEXT")
+    raw.execute("ALTER TABLE Task ADD COLUMN Priority TEXT")
+    raw.execute("ALTER TABLE Task ADD COLUMN Status TEXT")
+    conn = MagicMock(wraps=raw)
+    conn._raw = raw
+    conn.close = MagicMock()  # keep the in-memory database for the assertions
+    repo = RepositoryFactory.get_repository('task')
+    tasks = [Task(Student_ID=sid, Task_Title=title, Due_Date=None, Priority='low', Status='pending')
+             for sid, title in [(3, "zeta"), (1, "alpha"), (2, "mid")]]
+
+    with patch.object(repo.db_connection, "get_connection", return_value=conn):
+        repo.create_many(tasks)
+
+    for task in tasks:
+        row = raw.execute("SELECT Student_ID, Task_Title FROM Task WHERE Task_ID = ?", (task.Task_ID,)).fetchone()
+        assert row == (task.Student_ID, task.Task_Title)
+    assert len({task.Task_ID for task in tasks}) == 3
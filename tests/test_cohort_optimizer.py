@@ -0,0 +1,154 @@
+"""
+Unit tests for batch cohort schedule optimization
+Tests per-student results, the process pool path, reporting and input parsing
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.conflict_matrix import write_conflict_matrix
+from services.cohort_optimizer import CohortOptimizer, read_cohort_requests
+
+
+def _section(course, section, day, start, end):
+    return (course, section, [{"course_code": course, "course_name": course, "type": "lecture",
+                               "sub_type": "LCTR", "section": section, "day": day, "start": start, "end": end}])
+
+
+SECTIONS = [
+    _section("CSE 101", 1, "MON", "09:00", "10:15"),
+    _section("CSE 101", 2, "MON", "11:00", "12:15"),
+    _section("MATH 201", 1, "MON", "09:30", "10:45"),
+    _section("PHYS 110", 1, "MON", "09:00", "10:00"),
+]
+
+COHORT = [
+    {"student_id": 1, "course_codes": ["CSE 101", "MATH 201"]},
+    {"student_id": 2, "course_codes": ["MATH 201", "PHYS 110"]},
+    {"student_id": 3, "course_codes": ["cse 101", "BIO 999"]},
+    {"student_id": 4, "course_codes": []},
+    {"student_id": 5, "course_codes": ["CSE 101"], "k": 2, "preferences": {"no_classes_before": "10:00"}},
+]
+
+
+def test_cohort_results_and_report_in_process():
+    """Test per-student statuses and the infeasible/missing summary"""
+    optimizer = CohortOptimizer(workers=1, source=('sections', SECTIONS))
+    results = {result["student_id"]: result for result in optimizer.run(COHORT)}
+
+    assert [slot["course_code"] for slot in results[1]["schedule"]] == ["MATH 201", "CSE 101"]
+    assert results[2]["status"] == "no_solution"
+    assert results[3]["status"] == "ok" and results[3]["missing_courses"] == ["BIO 999"]
+    assert results[4]["status"] == "error"
+    assert results[5]["schedule"][0]["section"] == 2 and results[5]["complete"]
+
+    report = optimizer.report.to_dict()
+    assert report["total"] == report["completed"] == 5
+    assert report["scheduled"] == 3
+    assert [case["student_id"] for case in report["infeasible"]] == [2]
+    assert [case["student_id"] for case in report["errors"]] == [4]
+    assert report["missing_courses"][0]["missing_courses"] == ["BIO 999"]
+    assert report["schedules_per_second"] > 0
+
+
+def test_ranked_requests_are_capped_at_max_k():
+    """Test that a request's "k" cannot exceed SCHEDULE_RANK_MAX_K"""
+    from unittest.mock import patch
+
+    request = {"student_id": 1, "course_codes": ["CSE 101"], "k": 10 ** 6}
+    with patch('services.cohort_optimizer.rank_section_map', return_value=([], True)) as rank, \
+            patch.dict(os.environ, {'SCHEDULE_RANK_MAX_K': '3'}):
+        list(CohortOptimizer(workers=1, source=('sections', SECTIONS)).run([request]))
+    assert rank.call_args[0][2] == 3
+
+
+def test_process_pool_shares_the_mapped_term(tmp_path):
+    """Test that pool workers map the compiled term and stream every result back"""
+    path = str(tmp_path / "2025-SPRING.ucm")
+    write_conflict_matrix(path, 2025, "SPRING", SECTIONS)
+    cohort = [dict(request, student_id=f"{request['student_id']}-{copy}") for copy in range(8) for request in COHORT]
+
+    sequential = {r["student_id"]: r for r in CohortOptimizer(workers=1, source=('matrix', path)).run(cohort)}
+    optimizer = CohortOptimizer(workers=2, chunk_size=5, source=('matrix', path))
+    pooled = {r["student_id"]: r for r in optimizer.run(cohort)}
+
+    assert pooled.keys() == sequential.keys()
+    assert all(pooled[key]["schedule"] == sequential[key]["schedule"] for key in pooled)
+    assert len(optimizer.report.infeasible) == 8
+
+
+def test_read_cohort_requests_formats(tmp_path):
+    """Test CSV, JSON array and JSON lines inputs"""
+    csv_path = tmp_path / "cohort.csv"
+    csv_path.write_text("student_id,course_codes\n7,CSE 101; MATH 201\n")
+    lines_path = tmp_path / "cohort.jsonl"
+    lines_path.write_text('{"student_id": 7, "course_codes": ["CSE 101"]}\n\n{"student_id": 8}\n')
+    array_path = tmp_path / "cohort.json"
+    array_path.write_text('[{"student_id": 9, "course_codes": ["PHYS 110"]}]')
+
+    assert read_cohort_requests(str(csv_path)) == [{"student_id": "7", "course_codes": ["CSE 101", "MATH 201"]}]
+    assert [r["student_id"] for r in read_cohort_requests(str(lines_path))] == [7, 8]
+    assert read_cohort_requests(str(array_path))[0]["course_codes"] == ["PHYS 110"]
+
+
+def test_cli_parses_optimize_cohort():
+    """Test the optimize-cohort subcommand options"""
+    from unify.__main__ import build_parser
+
+    args = build_parser().parse_args(['optimize-cohort', 'cohort.csv', '--workers', '4', '--term', 'FALL'])
+    assert (args.requests, args.workers, args.term, args.year) == ('cohort.csv', 4, 'FALL', 2025)
+
+
+def test_cli_resolves_paths_against_the_callers_directory(tmp_path, monkeypatch):
+    """Test that REQUESTS and --output are read/written relative to where the command runs"""
+    from unittest.mock import patch
+    from unify import __main__ as cli
+
+    (tmp_path / "req.json").write_text('[{"student_id": 1, "course_codes": ["CSE 101"]}]')
+    monkeypatch.chdir(tmp_path)
+
+    def optimizer(*args, **kwargs):
+        return CohortOptimizer(*args, **dict(kwargs, source=('sections', SECTIONS)))
+
+    with patch('services.cohort_optimizer.CohortOptimizer', side_effect=optimizer):
+        cli.main(['optimize-cohort', 'req.json', '--workers', '1', '--output', 'out.jsonl'])
+    assert os.getcwd() == cli.SRC_PATH
+    assert '"student_id": 1' in (tmp_path / "out.jsonl").read_text()
+
+
+def test_batch_endpoint_uses_a_small_pool_and_one_run_at_a_time(tmp_path):
+    """Test that the web endpoint caps its pool and answers 429 while a batch is running"""
+    from unittest.mock import patch
+    from flask import Flask
+    from controllers import course_registration_controller as controller
+
+    path = str(tmp_path / "2025-SPRING.ucm")
+    write_conflict_matrix(path, 2025, "SPRING", SECTIONS)
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(controller.course_reg_bp)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+
+    created = []
+
+    def optimizer(*args, **kwargs):
+        created.append(kwargs)
+        return CohortOptimizer(*args, **dict(kwargs, source=('matrix', path)))
+
+    with patch('core.role_auth.get_user_role', return_value='Instructor'), \
+            patch('services.cohort_optimizer.CohortOptimizer', side_effect=optimizer), \
+            patch.dict(os.environ, {'COHORT_OPTIMIZER_WEB_WORKERS': '1'}):
+        with controller._batch_lock:
+            busy = client.post('/course-registration/api/optimize/batch', json={"requests": COHORT})
+        response = client.post('/course-registration/api/optimize/batch', json={"requests": COHORT})
+        lines = response.get_data(as_text=True).splitlines()
+        response.close()
+
+    assert busy.status_code == 429
+    assert response.status_code == 200 and len(lines) == len(COHORT) + 1
+    assert created == [{"workers": 1}]
+    assert not controller._batch_lock.locked()
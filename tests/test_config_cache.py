@@ -0,0 +1,87 @@
+"""
+Unit tests for the tenant database config cache
+Covers LRU bounds, TTL expiry, invalidation hooks and hit/miss counters
+"""
+import sys
+import os
+import time
+from unittest.mock import patch, MagicMock
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.config_cache import TTLCache, create_tenant_config_cache, invalidate_tenant_config
+
+
+def test_cache_counts_hits_and_misses():
+    """Test that lookups update the hit and miss counters"""
+    cache = TTLCache(max_size=10, ttl=60)
+    assert cache.get(1) is None
+    cache.set(1, {'db_type': 'sqlite'})
+    assert cache.get(1) == {'db_type': 'sqlite'}
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == 0.5
+
+
+def test_cache_is_bounded_lru():
+    """Test that the least recently used entry is evicted at max_size"""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set(1, 'a')
+    cache.set(2, 'b')
+    cache.get(1)  # 1 is now most recently used
+    cache.set(3, 'c')
+
+    assert cache.get(2) is None
+    assert cache.get(1) == 'a'
+    assert len(cache) == 2
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_cache_entries_expire_after_ttl():
+    """Test that entries older than the TTL are treated as misses"""
+    cache = TTLCache(max_size=10, ttl=0.01)
+    cache.set(1, 'a')
+    time.sleep(0.02)
+    assert cache.get(1) is None
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_invalidate_reaches_every_registered_cache():
+    """Test that invalidate_tenant_config clears the user from all managers' caches"""
+    first = create_tenant_config_cache('first')
+    second = create_tenant_config_cache('second')
+    first.set(7, 'a')
+    second.set(7, 'b')
+    second.set(8, 'c')
+
+    invalidate_tenant_config(7)
+
+    assert first.get(7) is None
+    assert second.get(7) is None
+    assert second.get(8) == 'c'
+
+
+@patch("core.db_singleton.pyodbc")
+def test_config_repository_update_invalidates_cache(mock_pyodbc):
+    """Test that updating a config through the repository drops the cached copy"""
+    from core.db_singleton import DatabaseConnection
+    from models.user_database_config import UserDatabaseConfig
+    import importlib.util
+
+    repo_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'src', 'repositories', 'user_database_config.repository.py')
+    spec = importlib.util.spec_from_file_location("user_database_config_repository", repo_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    db = DatabaseConnection.get_instance()
+    db.user_db_configs.set(42, {'db_type': 'sqlite', 'db_path': 'old.db'})
+
+    repo = module.UserDatabaseConfigRepository()
+    with patch.object(db, "execute_update", MagicMock(return_value=1)):
+        repo.update(UserDatabaseConfig(config_id=1, user_id=42, db_type='sqlite', db_path='new.db'))
+
+    assert db.user_db_configs.get(42) is None
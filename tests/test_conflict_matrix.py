@@ -0,0 +1,130 @@
+"""
+Unit tests for the per-term section conflict matrix
+Tests conflict computation, the memory-mapped file format and store rebuilds
+"""
+import sys
+import os
+import itertools
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.conflict_matrix import ConflictMatrix, ConflictMatrixStore, compute_conflict_rows, write_conflict_matrix
+from services.course_optimization_service import CourseOptimizationService
+from services.schedule_solver import rank_section_map, solve_section_map
+
+
+def _slot(course, section, day, start, end):
+    return {"course_code": course, "course_name": course, "type": "lecture", "sub_type": "LCTR",
+            "section": section, "day": day, "start": start, "end": end}
+
+
+def _random_sections(seed, courses=6, sections=4):
+    rng = random.Random(seed)
+    result = []
+    for course in range(courses):
+        for section in range(1, sections + 1):
+            slots = []
+            for _ in range(rng.randint(1, 2)):
+                start = rng.choice(range(8 * 60, 16 * 60, 25))
+                end = start + rng.choice((50, 75, 110))
+                slots.append(_slot(f"C{course}", section, rng.choice(["SUN", "MON", "WED"]),
+                                   f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}"))
+            result.append((f"C{course}", section, slots))
+    return result
+
+
+def _overlap(first, second):
+    service = CourseOptimizationService.__new__(CourseOptimizationService)
+    return any(a["day"] == b["day"] and service.intervals_overlap(a["start"], a["end"], b["start"], b["end"])
+               for a in first for b in second)
+
+
+def test_conflict_rows_match_pairwise_overlaps():
+    """Test that the sweep finds exactly the overlapping pairs of different courses"""
+    sections = _random_sections(3)
+    rows = compute_conflict_rows(sections)
+    for i, j in itertools.combinations(range(len(sections)), 2):
+        expected = sections[i][0] != sections[j][0] and _overlap(sections[i][2], sections[j][2])
+        assert bool(rows[i] >> j & 1) == expected
+        assert bool(rows[j] >> i & 1) == expected
+
+
+def test_matrix_file_round_trip(tmp_path):
+    """Test that a written term maps back to the same sections and rows"""
+    sections = _random_sections(5, courses=10, sections=8)  # 80 sections: two words per row
+    path = str(tmp_path / "2025-SPRING.ucm")
+    write_conflict_matrix(path, 2025, "SPRING", sections)
+    matrix = ConflictMatrix(path)
+
+    rows = compute_conflict_rows(sections)
+    assert matrix.section_count == 80 and matrix.row_bytes == 16
+    assert [matrix.row(i) for i in range(80)] == rows
+    assert matrix.conflicts(0, 79) == bool(rows[0] >> 79 & 1)
+    section_map = matrix.section_map(["c1", "C9"])
+    assert sorted(section_map) == ["C1", "C9"]
+    assert section_map["C1"][2] == sections[9][2]
+    assert matrix.conflict_rows(section_map)[("C9", 8)] == (79, rows[79])
+    matrix.close()
+
+
+def test_solver_with_conflict_rows_matches_bitsets(tmp_path):
+    """Test that precomputed rows give the same answers as occupancy bitsets"""
+    path = str(tmp_path / "term.ucm")
+    for seed in range(20):
+        write_conflict_matrix(path, 2025, "SPRING", _random_sections(seed, courses=5, sections=3))
+        matrix = ConflictMatrix(path)
+        section_map = matrix.section_map([f"C{course}" for course in range(5)])
+        rows = matrix.conflict_rows(section_map)
+        assert solve_section_map(section_map, rows) == solve_section_map(section_map)
+        ranked_rows = rank_section_map(section_map, k=3, conflict_rows=rows)[0]
+        ranked_bits = rank_section_map(section_map, k=3)[0]
+        assert [r.score for r in ranked_rows] == [r.score for r in ranked_bits]
+
+
+def test_store_builds_once_and_follows_rebuilds(tmp_path):
+    """Test that workers reuse the mapped file, and see a rebuild or invalidation"""
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return _random_sections(len(calls))
+
+    worker_a = ConflictMatrixStore(directory=str(tmp_path), enabled=True, version=lambda: 0)
+    worker_b = ConflictMatrixStore(directory=str(tmp_path), enabled=True, version=lambda: 0)
+    first = worker_a.get(2025, "SPRING", loader)
+    assert worker_b.get(2025, "SPRING", loader).sections == first.sections
+    assert worker_a.get(2025, "SPRING", loader) is first
+    assert len(calls) == 1
+
+    rebuilt = worker_a.build(2025, "SPRING", loader)
+    assert worker_b.get(2025, "SPRING", loader).sections == rebuilt.sections != first.sections
+
+    worker_b.invalidate()
+    assert not list(tmp_path.glob("*.ucm"))
+    worker_a.get(2025, "SPRING", loader)
+    assert len(calls) == 3
+
+
+def test_store_rebuilds_a_matrix_built_before_a_slot_write(tmp_path):
+    """Test that a build which raced a slot write is not served once the version moves on"""
+    versions = [3]
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) == 1:
+            # The slot write commits (and deletes the files) while this build is loading
+            versions[0] = 4
+            worker_b.invalidate()
+        return _random_sections(len(calls))
+
+    worker_a = ConflictMatrixStore(directory=str(tmp_path), enabled=True, version=lambda: versions[0])
+    worker_b = ConflictMatrixStore(directory=str(tmp_path), enabled=True, version=lambda: versions[0])
+    stale = worker_a.get(2025, "SPRING", loader)
+    assert stale.version == 3
+
+    fresh = worker_b.get(2025, "SPRING", loader)
+    assert fresh.version == 4 and fresh.sections != stale.sections
+    assert worker_a.get(2025, "SPRING", loader).sections == fresh.sections
+    assert len(calls) == 2
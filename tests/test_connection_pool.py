@@ -0,0 +1,138 @@
+"""
+Unit tests for the database connection pool
+Uses in-memory SQLite connections so no database server is required
+"""
+import pytest
+import sys
+import os
+import sqlite3
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from src.core.connection_pool import ConnectionPool, PoolRegistry, PoolTimeoutError
+
+
+def _sqlite_connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_close_returns_connection_to_pool():
+    """Test that conn.close() hands the same raw connection back for reuse"""
+    pool = ConnectionPool(_sqlite_connect, min_size=0, max_size=2)
+
+    conn1 = pool.acquire()
+    raw1 = conn1.raw_connection
+    conn1.close()
+
+    conn2 = pool.acquire()
+    assert conn2.raw_connection is raw1
+
+    stats = pool.get_stats()
+    assert stats['created'] == 1
+    assert stats['checkouts'] == 2
+    conn2.close()
+
+
+def test_pooled_connection_behaves_like_driver_connection():
+    """Test that cursor/execute/commit work through the proxy"""
+    pool = ConnectionPool(_sqlite_connect, min_size=0, max_size=1)
+    conn = pool.acquire()
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1")
+    assert cursor.fetchone()[0] == 1
+    cursor.close()
+    conn.close()
+    # Closing twice must not double-release
+    conn.close()
+    assert pool.get_stats()['returns'] == 1
+
+
+def test_min_size_prefills_pool():
+    """Test that min_size connections are opened up front"""
+    pool = ConnectionPool(_sqlite_connect, min_size=2, max_size=4)
+    stats = pool.get_stats()
+    assert stats['idle'] == 2
+    assert stats['created'] == 2
+
+
+def test_max_size_times_out_when_exhausted():
+    """Test that acquire() raises PoolTimeoutError once max_size is reached"""
+    pool = ConnectionPool(_sqlite_connect, min_size=0, max_size=1, checkout_timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    conn.close()
+    assert pool.get_stats()['timeouts'] == 1
+
+
+def test_unhealthy_connection_is_replaced():
+    """Test that a connection failing the health check is discarded on checkout"""
+    pool = ConnectionPool(_sqlite_connect, min_size=0, max_size=2, health_check_interval=0)
+    conn = pool.acquire()
+    raw = conn.raw_connection
+    conn.close()
+    raw.close()  # Simulate a dropped server connection
+
+    conn2 = pool.acquire()
+    assert conn2.raw_connection is not raw
+    assert pool.get_stats()['health_check_failures'] == 1
+    conn2.close()
+
+
+def test_idle_connections_above_min_size_are_evicted():
+    """Test that idle connections beyond min_size are closed after idle_timeout"""
+    pool = ConnectionPool(_sqlite_connect, min_size=1, max_size=3, idle_timeout=0.01)
+    conns = [pool.acquire() for _ in range(3)]
+    for conn in conns:
+        conn.close()
+
+    time.sleep(0.02)
+    pool.evict_idle()
+
+    stats = pool.get_stats()
+    assert stats['idle'] == 1
+    assert stats['evicted_idle'] >= 2
+
+
+def test_release_rolls_back_uncommitted_work():
+    """Test that a returned connection does not leak an open transaction"""
+    pool = ConnectionPool(_sqlite_connect, min_size=0, max_size=1)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()
+
+    conn = pool.acquire()
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    conn.close()
+
+
+def test_registry_reuses_pool_per_tenant():
+    """Test that the registry hands out one pool per tenant key"""
+    registry = PoolRegistry(max_open_connections=10)
+    conn = registry.acquire(('sqlite', 'user_1.db'), _sqlite_connect)
+    raw = conn.raw_connection
+    conn.close()
+
+    conn = registry.acquire(('sqlite', 'user_1.db'), _sqlite_connect)
+    assert conn.raw_connection is raw
+    conn.close()
+
+    stats = registry.get_stats()
+    assert stats['pools'] == 1
+    assert stats['hits'] == 1
+
+
+def test_registry_caps_open_handles_lru():
+    """Test that least recently used tenant pools are closed above the handle cap"""
+    registry = PoolRegistry(max_open_connections=2)
+    for user_id in (1, 2, 3):
+        conn = registry.acquire(('sqlite', f'user_{user_id}.db'), _sqlite_connect)
+        conn.close()
+
+    stats = registry.get_stats()
+    assert stats['open_connections'] <= 2
+    assert stats['evicted_pools'] == 1
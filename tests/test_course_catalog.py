@@ -0,0 +1,89 @@
+"""
+Unit tests for the per-term course catalog
+Tests section counting, prefix/substring search and ETag revalidation
+"""
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from flask import Flask
+
+from services.course_catalog_service import CourseCatalogService, TermCatalog
+
+ROWS = [
+    ("AIE 501", 1, "lecture", "LCTR", 2),
+    ("AIE 501", 1, "lab", "LAB", 1),
+    ("AIE 501", 2, "lecture", "LCTR", 2),
+    ("BGEN 201", 1, "tutorial", "TUTR", 1),
+    ("BGEN 201", 1, None, "LCTR", 1),
+    ("CSE 101", 3, "lecture", "LCTR", 2),
+    ("MATH 101", 1, "lecture", "LCTR", 2),
+]
+
+
+def test_catalog_counts_lecture_and_lab_sections():
+    """Test that grouped rows become the per-course section summaries"""
+    courses = {course["code"]: course for course in TermCatalog(ROWS).search()}
+    assert courses["AIE 501"]["lecture_slots"] == [{"section": 1, "count": 2}, {"section": 2, "count": 2}]
+    assert courses["AIE 501"]["lab_slots"] == [{"section": 1, "count": 1}]
+    assert courses["BGEN 201"]["lecture_slots"] == [{"section": 1, "count": 1}]
+    assert courses["BGEN 201"]["lab_slots"] == [{"section": 1, "count": 1}]
+    assert list(courses) == ["AIE 501", "BGEN 201", "CSE 101", "MATH 101"]
+
+
+def test_search_puts_prefix_matches_first():
+    """Test case-insensitive prefix and substring search over course codes"""
+    catalog = TermCatalog(ROWS + [("XCSE 900", 1, "lecture", "LCTR", 1)])
+    assert [course["code"] for course in catalog.search("cse")] == ["CSE 101", "XCSE 900"]
+    assert [course["code"] for course in catalog.search(" 101")] == ["CSE 101", "MATH 101"]
+    assert [course["code"] for course in catalog.search("TH 10")] == ["MATH 101"]
+    assert catalog.search("ZZZZ") == []
+
+
+def test_etag_follows_query_and_content():
+    """Test that ETags differ per query and change when the catalog changes"""
+    catalog = TermCatalog(ROWS)
+    assert catalog.etag("cse") == TermCatalog(ROWS).etag(" CSE ")
+    assert catalog.etag("cse") != catalog.etag("math")
+    assert catalog.etag() != TermCatalog(ROWS[:-1]).etag()
+
+
+def test_catalog_is_built_with_one_grouped_query():
+    """Test that the term catalog comes from get_section_counts"""
+    repo = MagicMock()
+    repo.get_section_counts.return_value = ROWS
+    cache = MagicMock()
+    cache.get.side_effect = lambda key, loader: loader()
+    with patch('services.course_catalog_service.RepositoryFactory.get_repository', return_value=repo), \
+            patch('services.course_catalog_service._cache', cache):
+        catalog = CourseCatalogService().get_term_catalog(2025, "SPRING")
+    repo.get_section_counts.assert_called_once_with(2025, "SPRING")
+    assert cache.get.call_args[0][0] == ('term_catalog', 2025, "SPRING")
+    assert len(catalog.courses) == 4
+
+
+def test_api_courses_answers_304_for_a_matching_etag():
+    """Test that the search panel's repeated request is revalidated"""
+    from controllers import course_registration_controller as controller
+
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(controller.course_reg_bp)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+
+    service = MagicMock()
+    service.get_term_catalog.return_value = TermCatalog(ROWS)
+    with patch.object(controller, 'catalog_service', service):
+        first = client.get('/course-registration/api/courses?q=aie')
+        second = client.get('/course-registration/api/courses?q=aie',
+                            headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.status_code == 200
+    assert [course["code"] for course in first.get_json()] == ["AIE 501"]
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert second.status_code == 304
+    assert second.headers['ETag'] == first.headers['ETag']
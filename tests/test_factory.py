@@ -54,13 +54,45 @@ def test_factory_invalid_type():
     assert "Unknown repository type" in str(exc_info.value)
 
 
-def test_factory_returns_different_instances():
-    """Test that factory returns new instances (not singleton)"""
+def test_factory_caches_instances():
+    """Test that factory returns one cached instance per repository type"""
     repo1 = RepositoryFactory.get_repository("user")
-    repo2 = RepositoryFactory.get_repository("user")
+    repo2 = RepositoryFactory.get_repository("USER")
+    
+    # Should be the same instance
+    assert repo1 is repo2
+    assert RepositoryFactory.create_repository("user") is not repo1
+
+
+def test_factory_caches_per_tenant_in_multi_tenant_mode():
+    """Test that multi-tenant mode keeps a separate instance per tenant"""
+    from core.db_singleton import DatabaseConnection
+    from core.tenant_context import set_current_tenant, clear_current_tenant
+    
+    db = DatabaseConnection()
+    previous = db.multi_tenant_enabled
+    db.multi_tenant_enabled = True
+    try:
+        set_current_tenant(1)
+        repo1 = RepositoryFactory.get_repository("user")
+        assert RepositoryFactory.get_repository("user") is repo1
+        set_current_tenant(2)
+        repo2 = RepositoryFactory.get_repository("user")
+        assert repo2 is not repo1
+    finally:
+        clear_current_tenant()
+        db.multi_tenant_enabled = previous
+
+
+def test_factory_imports_modules_lazily():
+    """Test that repository modules are only loaded when first requested"""
+    from src.repositories import repository_factory
     
-    # Should be different instances
-    assert repo1 is not repo2
+    repository_factory._classes.pop("reminder", None)
+    RepositoryFactory.clear_cache()
+    assert "reminder" not in repository_factory._classes
+    RepositoryFactory.get_repository("reminder")
+    assert "reminder" in repository_factory._classes
 
 
 def test_factory_alternative_names():
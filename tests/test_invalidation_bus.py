@@ -0,0 +1,104 @@
+"""
+Unit tests for the cache invalidation bus
+Tests that topics published in one worker reach the caches of the others
+"""
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.invalidation_bus import (InvalidationBus, MemoryTransport, RedisTransport, SQLiteTransport,
+                                   decode_key, encode_key, get_invalidation_bus)
+
+
+class _StreamStandIn:
+    """Just enough of the redis-py stream API for RedisTransport"""
+
+    def __init__(self):
+        self.entries = []
+
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        entry_id = f"1700000000000-{len(self.entries)}".encode()
+        self.entries.append((entry_id, {k.encode(): v.encode() for k, v in fields.items()}))
+        return entry_id
+
+    def xrevrange(self, stream, count=None):
+        return list(reversed(self.entries))[:count]
+
+    def xrange(self, stream, min='-'):
+        after = tuple(int(part) for part in min.lstrip('(').split('-'))
+        return [entry for entry in self.entries
+                if tuple(int(part) for part in entry[0].split(b'-')) > after]
+
+
+def _workers(transport):
+    received = {'a': [], 'b': []}
+    buses = {}
+    for name in received:
+        bus = InvalidationBus(transport, enabled=True, poll_interval=0)
+        bus.subscribe('user', received[name].append)
+        bus.poll()  # start from the current end of the log
+        buses[name] = bus
+    return buses, received
+
+
+def _check_delivery(transport):
+    buses, received = _workers(transport)
+    buses['a'].publish('user:7', 'course:*')
+    assert received == {'a': ['7'], 'b': []}
+
+    assert buses['b'].poll() == 2
+    assert buses['a'].poll() == 0  # own topics are not applied twice
+    assert received == {'a': ['7'], 'b': ['7']}
+
+
+def test_memory_transport_delivers_between_workers():
+    """Test that a topic published by one bus is applied by another on poll"""
+    _check_delivery(MemoryTransport())
+
+
+def test_sqlite_transport_delivers_between_workers(tmp_path):
+    """Test that the SQLite change log carries topics and skips older history"""
+    path = str(tmp_path / "bus.db")
+    InvalidationBus(SQLiteTransport(path), enabled=True).publish('user:1')
+    _check_delivery(SQLiteTransport(path))
+
+
+def test_redis_transport_works_with_a_stand_in_client():
+    """Test that RedisTransport only needs the stream API of its client"""
+    _check_delivery(RedisTransport(client=_StreamStandIn()))
+
+
+def test_disabled_bus_still_runs_local_handlers():
+    """Test that publish() invalidates locally when cross-worker delivery is off"""
+    bus = InvalidationBus(None, enabled=False)
+    seen = []
+    bus.subscribe('kb', seen.append)
+    bus.publish('kb')
+    assert seen == [None]
+    assert bus.poll(force=True) == 0
+
+
+def test_tenant_scoped_keys_round_trip():
+    """Test that cache keys survive encoding into a topic"""
+    for key in (7, (3, 7), (None, 7)):
+        assert decode_key(encode_key(key)) == key
+
+
+def test_remote_invalidation_drops_cached_profile():
+    """Test that a 'user:<id>' topic from another worker evicts the profile cache"""
+    from core import user_profile
+
+    transport = MemoryTransport()
+    bus = get_invalidation_bus()
+    with patch.object(bus, 'transport', transport), patch.object(bus, 'enabled', True), \
+            patch.object(bus, '_pid', None), patch.object(bus, 'poll_interval', 0), \
+            patch('core.user_profile._cache_key', side_effect=lambda user_id: user_id):
+        bus.poll()
+        user_profile._profiles.set(42, user_profile.UserProfile(User_ID=42))
+
+        InvalidationBus(transport, enabled=True).publish('user:42')
+        assert user_profile._profiles.get(42) is not None
+        bus.poll()
+        assert user_profile._profiles.get(42) is None
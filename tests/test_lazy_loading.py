@@ -0,0 +1,79 @@
+"""
+Unit tests for deferred initialization and the startup import profiler
+Tests that singletons are created on first use and imports are timed
+"""
+import sys
+import os
+import importlib
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.import_profiler import ImportProfiler
+from core.lazy import lazy
+
+
+def test_lazy_object_creates_value_once_on_first_use():
+    """Test that the factory runs on first attribute access and only once"""
+    calls = []
+
+    class Service:
+        provider = 'ollama'
+
+    def factory():
+        calls.append(1)
+        return Service()
+
+    service = lazy(factory, 'service')
+    assert calls == [] and not service.loaded
+    assert service.provider == 'ollama'
+    assert service.provider == 'ollama'
+    assert calls == [1] and service.loaded
+
+
+def test_lazy_object_is_falsy_when_factory_returns_none():
+    """Test that `if service:` checks still work when nothing is available"""
+    service = lazy(lambda: None)
+    assert not service
+    service.reset()
+    assert not service.loaded
+
+
+def test_ai_assistant_controller_defers_llm_probe():
+    """Test that importing the AI assistant controller does not probe for an LLM"""
+    import controllers.ai_assistant_controller as controller
+
+    with patch('services.llm_service.get_llm_service') as get_llm_service, \
+            patch('services.ai_assistant_service.get_rag_engine') as get_rag_engine:
+        controller = importlib.reload(controller)
+        assert not get_llm_service.called and not get_rag_engine.called
+        assert not controller.llm_service.loaded
+
+        get_llm_service.return_value.provider = 'ollama'
+        assert controller.llm_service.provider == 'ollama'
+        get_llm_service.assert_called_once()
+
+
+def test_import_profiler_records_new_modules(tmp_path):
+    """Test that first-time imports are timed, including nested ones"""
+    (tmp_path / 'profiled_outer.py').write_text('import profiled_inner\n')
+    (tmp_path / 'profiled_inner.py').write_text('VALUE = 1\n')
+    sys.path.insert(0, str(tmp_path))
+    profiler = ImportProfiler()
+    try:
+        profiler.install()
+        import profiled_outer  # noqa: F401
+        import profiled_outer  # noqa: F401,F811  already loaded, not timed again
+    finally:
+        profiler.uninstall()
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop('profiled_outer', None)
+        sys.modules.pop('profiled_inner', None)
+
+    report = profiler.get_report()
+    modules = {row['module']: row for row in report['modules']}
+    assert set(modules) == {'profiled_outer', 'profiled_inner'}
+    outer, inner = modules['profiled_outer'], modules['profiled_inner']
+    assert outer['cumulative_ms'] >= inner['cumulative_ms']
+    assert outer['self_ms'] <= outer['cumulative_ms']
+    assert report['modules'][0]['module'] == 'profiled_outer'
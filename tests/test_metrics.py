@@ -0,0 +1,98 @@
+"""
+Unit tests for the Prometheus metrics endpoint
+Tests the text exposition format, worker merging and request instrumentation
+"""
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from flask import Blueprint, Flask
+
+from core import metrics
+from core.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histogram buckets are cumulative and end with +Inf"""
+    registry = MetricsRegistry(enabled=True)
+    latency = registry.histogram('test_seconds', 'Test latency', ('provider',), buckets=(0.1, 1))
+    latency.observe(0.05, 'ollama')
+    latency.observe(0.5, 'ollama')
+    latency.observe(5, 'ollama')
+
+    text = registry.render()
+    assert '# TYPE test_seconds histogram' in text
+    assert 'test_seconds_bucket{provider="ollama",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{provider="ollama",le="1"} 2' in text
+    assert 'test_seconds_bucket{provider="ollama",le="+Inf"} 3' in text
+    assert 'test_seconds_count{provider="ollama"} 3' in text
+
+
+def test_worker_snapshots_are_merged(tmp_path):
+    """Test that counters are summed across workers and gauges keep a pid label"""
+    other = MetricsRegistry(enabled=True, directory=str(tmp_path))
+    other.counter('test_total', 'Test counter', ('status',)).inc('200', amount=3)
+    other.gauge('test_depth', 'Test gauge').set(7)
+    with patch('os.getpid', return_value=os.getpid() + 100000):
+        other.flush(force=True)
+
+    registry = MetricsRegistry(enabled=True, directory=str(tmp_path))
+    registry.counter('test_total', 'Test counter', ('status',)).inc('200')
+    registry.gauge('test_depth', 'Test gauge').set(2)
+    with patch('core.metrics._pid_alive', return_value=True):
+        text = registry.render()
+
+    assert 'test_total{status="200"} 4' in text
+    assert f'test_depth{{pid="{os.getpid()}"}} 2' in text
+    assert f'test_depth{{pid="{os.getpid() + 100000}"}} 7' in text
+
+
+def test_exited_workers_are_folded_into_one_file(tmp_path):
+    """Test that snapshots of exited workers are summed into the retired file and removed"""
+    for offset, amount in ((100001, 2), (100002, 5)):
+        worker = MetricsRegistry(enabled=True, directory=str(tmp_path))
+        worker.counter('test_total', 'Test counter').inc(amount=amount)
+        worker.histogram('test_seconds', 'Test latency', buckets=(1,)).observe(0.5)
+        worker.gauge('test_depth', 'Test gauge').set(9)
+        with patch('os.getpid', return_value=os.getpid() + offset):
+            worker.flush(force=True)
+
+    registry = MetricsRegistry(enabled=True, directory=str(tmp_path))
+    registry.counter('test_total', 'Test counter').inc()
+    for _ in range(2):
+        text = registry.render()
+        assert 'test_total 8' in text
+        assert 'test_seconds_count 2' in text
+        assert 'test_depth{' not in text
+
+    names = sorted(name for name in os.listdir(tmp_path) if name.endswith('.json'))
+    assert names == [f"metrics-{os.getpid()}.json", metrics.RETIRED_FILE]
+
+
+def test_metrics_endpoint_labels_requests_by_blueprint():
+    """Test that /metrics reports request latency per blueprint and endpoint"""
+    app = Flask(__name__)
+    courses = Blueprint('course', __name__)
+
+    @courses.route('/courses')
+    def list_courses():
+        metrics.record_llm_call('ollama', 0.2, failed=True)
+        return 'ok'
+
+    app.register_blueprint(courses)
+    registry = metrics.get_metrics_registry()
+    with patch.object(registry, 'enabled', False), patch.object(registry, 'directory', None), \
+            patch.dict(os.environ, {'METRICS_TOKEN': 'scrape'}):
+        metrics.init_app(app)
+        client = app.test_client()
+        client.get('/courses')
+        client.get('/missing')
+        assert client.get('/metrics').status_code == 401
+        text = client.get('/metrics', headers={'Authorization': 'Bearer scrape'}).get_data(as_text=True)
+
+    assert 'unify_http_request_duration_seconds_count{blueprint="course",endpoint="course.list_courses"}' in text
+    assert 'unify_http_requests_total{blueprint="",endpoint="<unmatched>",status="404"}' in text
+    assert 'unify_llm_errors_total{provider="ollama"}' in text
+    assert '# TYPE unify_cache_hits_total counter' in text
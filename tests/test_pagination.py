@@ -0,0 +1,114 @@
+"""
+Unit tests for keyset pagination
+Covers opaque cursors, seek-method pages, fetchmany streaming and list endpoints
+"""
+import sys
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+from flask import Flask
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.pagination import (encode_cursor, decode_cursor, fetch_page, iter_rows,
+                             InvalidCursorError, Page, MAX_PAGE_SIZE, clamp_page_size)
+from repositories.repository_factory import RepositoryFactory
+
+
+def _seed_tasks(conn, tasks):
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO [User] (Username, Email, Password_Hash) VALUES ('s', 's@x', 'h')")
+    cursor.execute("INSERT INTO Student (User_ID) VALUES (1)")
+    cursor.executemany(
+        "INSERT INTO [Task] (Student_ID, Task_Title, Due_Date, Priority, Status) "
+        "VALUES (1, ?, '2025-01-01 09:00:00', 'low', 'pending')",
+        [(f"Task {i}",) for i in range(1, tasks + 1)])
+    conn.commit()
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    """Test that cursors decode to the encoded key and tampered cursors are rejected"""
+    token = encode_cursor(1234)
+    assert decode_cursor(token) == 1234
+    assert decode_cursor(None) is None
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor("1 OR 1=1"))
+
+
+def test_page_size_is_clamped():
+    """Test that page sizes are bounded"""
+    assert clamp_page_size(10 ** 6) == MAX_PAGE_SIZE
+    assert clamp_page_size(0) == 1
+
+
+def test_fetch_page_walks_every_row_once(schema_conn):
+    """Test that following next_cursor visits each row exactly once, in order"""
+    _seed_tasks(schema_conn, 25)
+    seen = []
+    cursor = None
+    while True:
+        page = fetch_page(schema_conn, "SELECT Task_ID, Task_Title FROM [Task]", "Task_ID",
+                          lambda row: row[0], cursor=cursor, limit=10)
+        seen.extend(page.items)
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+    assert seen == list(range(1, 26))
+
+
+def test_fetch_page_descending_with_filter(schema_conn):
+    """Test newest-first pages combined with a WHERE filter"""
+    _seed_tasks(schema_conn, 5)
+    page = fetch_page(schema_conn, "SELECT Task_ID FROM [Task]", "Task_ID", lambda row: row[0],
+                      limit=2, descending=True, where="Student_ID = ?", params=(1,))
+    assert page.items == [5, 4]
+    page = fetch_page(schema_conn, "SELECT Task_ID FROM [Task]", "Task_ID", lambda row: row[0],
+                      cursor=page.next_cursor, limit=2, descending=True,
+                      where="Student_ID = ?", params=(1,))
+    assert page.items == [3, 2]
+
+
+def test_iter_rows_uses_fetchmany(schema_conn):
+    """Test that streaming pulls rows in fetchmany() batches"""
+    _seed_tasks(schema_conn, 7)
+    cursor = MagicMock(wraps=schema_conn.cursor())
+    cursor.execute("SELECT Task_ID FROM [Task]")
+    assert [row[0] for row in iter_rows(cursor, batch_size=3)] == list(range(1, 8))
+    assert cursor.fetchmany.call_count == 4
+
+
+def test_task_repository_pages_and_streams(schema_conn, memory_db):
+    """Test TaskRepository.get_page and iter_all against SQLite"""
+    _seed_tasks(schema_conn, 12)
+    repo = RepositoryFactory.create_repository("task")
+    repo.db_connection = memory_db
+
+    page = repo.get_page(limit=5)
+    assert [t.Task_ID for t in page] == [1, 2, 3, 4, 5]
+    assert page.has_more
+    assert [t.Task_ID for t in repo.get_page(cursor=page.next_cursor, limit=5)] == [6, 7, 8, 9, 10]
+    assert [t.Task_ID for t in repo.iter_all(batch_size=4)] == list(range(1, 13))
+
+
+def test_list_endpoint_returns_page_envelope():
+    """Test that /calendar/api returns items plus next_cursor and rejects bad cursors"""
+    from controllers.calendar_controller import calendar_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(calendar_bp)
+    event = MagicMock()
+    event.to_dict.return_value = {'Event_ID': 1}
+    repo = MagicMock()
+    repo.get_page.return_value = Page([event], encode_cursor(1))
+
+    with patch("controllers.calendar_controller.RepositoryFactory") as factory:
+        factory.get_repository.return_value = repo
+        client = app.test_client()
+        response = client.get("/calendar/api?limit=1")
+        assert response.status_code == 200
+        assert response.get_json() == {'items': [{'Event_ID': 1}], 'next_cursor': encode_cursor(1), 'has_more': True}
+        repo.get_page.assert_called_once_with(cursor=None, limit=1)
+        assert client.get("/calendar/api?cursor=bogus").status_code == 400
@@ -0,0 +1,135 @@
+"""
+Unit tests for SQL query instrumentation
+Covers timing, per-request counters, the slow-query log and N+1 detection
+"""
+import sys
+import os
+import sqlite3
+from flask import Flask, g
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.query_instrumentation import QueryInstrumentation, get_request_query_stats, init_app
+
+
+def _make_instrumentation(tmp_path, **overrides):
+    instrumentation = QueryInstrumentation()
+    settings = {
+        'enabled': True,
+        'slow_query_threshold_ms': 10_000,
+        'slow_query_log': str(tmp_path / "slow.log"),
+        'n_plus_one_threshold': 3,
+    }
+    settings.update(overrides)
+    instrumentation.configure(**settings)
+    return instrumentation
+
+
+def _make_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE Course (Course_ID INTEGER PRIMARY KEY, Name TEXT)")
+    conn.executemany("INSERT INTO Course VALUES (?, ?)", [(i, f"C{i}") for i in range(5)])
+    return conn
+
+
+def test_disabled_instrumentation_returns_connection_unchanged(tmp_path):
+    """Test that wrap() is a no-op when instrumentation is off"""
+    instrumentation = _make_instrumentation(tmp_path, enabled=False)
+    conn = _make_conn()
+    assert instrumentation.wrap(conn) is conn
+
+
+def test_queries_are_counted_per_request(tmp_path):
+    """Test that every statement in a request increments the flask.g counter"""
+    app = Flask(__name__)
+    instrumentation = _make_instrumentation(tmp_path)
+    conn = instrumentation.wrap(_make_conn())
+
+    with app.test_request_context("/"):
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM Course")
+        assert len(cursor.fetchall()) == 5
+        cursor.execute("SELECT * FROM Course WHERE Course_ID = ?", (1,))
+        cursor.fetchone()
+        cursor.close()
+
+        stats = get_request_query_stats()
+        assert stats['count'] == 2
+        assert g.db_query_stats['count'] == 2
+
+    assert instrumentation.get_stats()['total_queries'] == 2
+
+
+def test_slow_queries_are_written_to_log(tmp_path):
+    """Test that statements over the threshold are appended to the slow-query log"""
+    instrumentation = _make_instrumentation(tmp_path, slow_query_threshold_ms=0)
+    conn = instrumentation.wrap(_make_conn())
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM Course")
+    cursor.fetchall()
+    cursor.close()
+
+    log = (tmp_path / "slow.log").read_text()
+    assert "SELECT * FROM Course" in log
+    assert "rows=5" in log
+    assert "test_slow_queries_are_written_to_log" in log
+    assert instrumentation.get_stats()['slow_queries'] == 1
+
+
+def test_repeated_statement_flagged_as_n_plus_one(tmp_path, capsys):
+    """Test that a statement repeated more than N times in a request is reported"""
+    app = Flask(__name__)
+    instrumentation = _make_instrumentation(tmp_path, n_plus_one_threshold=3)
+    conn = instrumentation.wrap(_make_conn())
+
+    with app.test_request_context("/"):
+        for course_id in range(5):
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM Course WHERE Course_ID = ?", (course_id,))
+            cursor.fetchone()
+            cursor.close()
+
+        stats = get_request_query_stats()
+        assert len(stats['n_plus_one']) == 1
+        assert "Course_ID = ?" in stats['n_plus_one'][0]['statement']
+
+    assert "possible N+1 query" in capsys.readouterr().out
+
+
+def test_cursor_attributes_reach_driver_cursor(tmp_path):
+    """Test that setting attributes such as fast_executemany passes through the proxy"""
+    instrumentation = _make_instrumentation(tmp_path)
+    conn = instrumentation.wrap(_make_conn())
+    cursor = conn.cursor()
+    cursor.arraysize = 7
+    assert cursor._cursor.arraysize == 7
+    cursor.close()
+
+
+def test_init_app_adds_query_count_header(tmp_path):
+    """Test that responses carry X-DB-Query-Count when instrumentation is enabled"""
+    from core import query_instrumentation
+
+    app = Flask(__name__)
+    instrumentation = _make_instrumentation(tmp_path)
+    conn = instrumentation.wrap(_make_conn())
+    init_app(app)
+
+    @app.route("/courses")
+    def courses():
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM Course")
+        cursor.fetchall()
+        cursor.close()
+        return "ok"
+
+    previous = query_instrumentation._instrumentation
+    query_instrumentation._instrumentation = instrumentation
+    try:
+        response = app.test_client().get("/courses")
+    finally:
+        query_instrumentation._instrumentation = previous
+
+    assert response.headers['X-DB-Query-Count'] == '1'
@@ -0,0 +1,146 @@
+"""
+Unit tests for the reference data cache
+Tests that course/instructor/slot reads are cached and versioned across processes
+"""
+import sys
+import os
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core import reference_cache
+from core.reference_cache import clear_reference_caches
+from repositories.repository_factory import RepositoryFactory
+
+
+@pytest.fixture
+def db(sqlite_main_db):
+    clear_reference_caches()
+    user_id = sqlite_main_db.execute_update(
+        "INSERT INTO [User] (Username, Email, Password_Hash) VALUES ('i', 'i@x', 'h')")
+    sqlite_main_db.execute_update("INSERT INTO Instructor (User_ID, Department) VALUES (?, 'CS')", (user_id,))
+    yield sqlite_main_db
+    clear_reference_caches()
+
+
+def _count_course_reads(db):
+    original = db.get_connection
+    reads = []
+
+    def counting():
+        reads.append(1)
+        return original()
+    return patch.object(db, 'get_connection', side_effect=counting), reads
+
+
+def test_course_reads_are_served_from_cache(db):
+    """Test that repeated get_by_id/get_all calls hit the database once each"""
+    repo = RepositoryFactory.create_repository("course")
+    from models.course import Course
+    created = repo.create(Course(Course_Name="Algorithms", Credits=3, Instructor_ID=1))
+
+    patcher, reads = _count_course_reads(db)
+    with patcher:
+        first = repo.get_by_id(created.Course_ID)
+        second = repo.get_by_id(created.Course_ID)
+        assert len(repo.get_all()) == 1
+        assert len(repo.get_all()) == 1
+        assert repo.get_by_id(999) is None
+        assert repo.get_by_id(999) is None
+    # version check + one load each for the id, the list and the missing id
+    assert len(reads) == 4
+    assert first is not second
+    assert second.Course_Name == "Algorithms"
+
+
+def test_writes_invalidate_cached_reads(db):
+    """Test that update() in this process drops the cached course at once"""
+    repo = RepositoryFactory.create_repository("course")
+    from models.course import Course
+    course = repo.create(Course(Course_Name="Old", Credits=3, Instructor_ID=1))
+    assert repo.get_by_id(course.Course_ID).Course_Name == "Old"
+
+    course.Course_Name = "New"
+    repo.update(course)
+    assert repo.get_by_id(course.Course_ID).Course_Name == "New"
+    assert [c.Course_Name for c in repo.get_many_by_ids([course.Course_ID]).values()] == ["New"]
+
+
+def test_version_bump_from_another_process_is_picked_up(db):
+    """Test that a Cache_Version bump made elsewhere clears the local region"""
+    slot_repo = RepositoryFactory.create_repository("course_schedule_slot")
+    assert slot_repo.get_by_course_code("CSAI 101") == []
+
+    # Another worker inserts a slot and bumps the counter
+    db.execute_update("INSERT INTO Course (Course_Name, Credits, Instructor_ID) VALUES ('X', 3, 1)")
+    db.execute_update(
+        "INSERT INTO Course_Schedule_Slot (Course_ID, Course_Code, Section, Day, Start_Time, End_Time, Slot_Type) "
+        "VALUES (1, 'CSAI 101', 1, 'MON', '09:00:00', '10:30:00', 'Lecture')")
+    db.execute_update("UPDATE Cache_Version SET Version = Version + 1 WHERE Region = 'course_schedule_slot'")
+
+    assert slot_repo.get_by_course_code("CSAI 101") == []  # still within the check interval
+    with patch.object(reference_cache._tracker, 'check_interval', 0):
+        slots = slot_repo.get_by_course_code("CSAI 101")
+    assert [slot['Day'] for slot in slots] == ['MON']
+
+
+def test_cache_is_bypassed_when_versions_are_unavailable():
+    """Test that reads fall through to the loader if the version table can't be read"""
+    cache = reference_cache.get_reference_cache('instructor')
+    clear_reference_caches()
+    with patch.object(reference_cache._tracker, 'sync', return_value=False):
+        calls = []
+        for _ in range(2):
+            cache.get('all', lambda: calls.append(1) or ['row'])
+    assert len(calls) == 2
+
+
+def test_invalidation_waits_for_the_unit_of_work_to_commit(db):
+    """Test that a write inside a unit of work clears the cache only once it commits"""
+    from core.unit_of_work import unit_of_work
+
+    repo = RepositoryFactory.create_repository("course")
+    from models.course import Course
+    course = repo.create(Course(Course_Name="Old", Credits=3, Instructor_ID=1))
+    assert repo.get_by_id(course.Course_ID).Course_Name == "Old"
+
+    with patch.object(reference_cache, 'publish') as published:
+        with unit_of_work():
+            course.Course_Name = "New"
+            repo.update(course)
+            published.assert_not_called()
+        published.assert_called_once_with("course:*", "course_schedule_slot:*")
+
+
+def test_unit_of_work_reads_its_own_writes(db):
+    """Test that a read after a write in the same unit of work skips the stale cache"""
+    from core.unit_of_work import unit_of_work
+    from models.course import Course
+
+    repo = RepositoryFactory.create_repository("course")
+    course = repo.create(Course(Course_Name="A", Credits=3, Instructor_ID=1))
+    assert repo.get_by_id(course.Course_ID).Course_Name == "A"
+
+    with unit_of_work():
+        course.Course_Name = "B"
+        repo.update(course)
+        assert repo.get_by_id(course.Course_ID).Course_Name == "B"
+        assert repo.get_many_by_ids([course.Course_ID])[course.Course_ID].Course_Name == "B"
+    assert repo.get_by_id(course.Course_ID).Course_Name == "B"
+
+
+def test_reads_in_a_unit_of_work_without_writes_are_cached(db):
+    """Test that a unit of work that only reads still fills the cache"""
+    from core.unit_of_work import unit_of_work
+    from models.course import Course
+
+    repo = RepositoryFactory.create_repository("course")
+    repo.create(Course(Course_Name="A", Credits=3, Instructor_ID=1))
+
+    patcher, reads = _count_course_reads(db)
+    with unit_of_work(), patcher:
+        for _ in range(3):
+            assert len(repo.get_all()) == 1
+    # version check + one load
+    assert len(reads) == 2
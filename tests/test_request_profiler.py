@@ -0,0 +1,82 @@
+"""
+Unit tests for the request profiling middleware
+Tests Server-Timing headers and on-demand profile captures
+"""
+import sys
+import os
+import pstats
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from flask import Flask
+
+from core import request_profiler
+from core.query_instrumentation import get_query_instrumentation
+from core.request_profiler import RequestProfiler, record_timing, server_timing
+
+
+def _client(profiler):
+    app = Flask(__name__)
+
+    @app.route('/api/slow')
+    def slow():
+        record_timing('llm', 12.5)
+        time.sleep(0.01)
+        return 'ok'
+
+    with patch.object(request_profiler, '_profiler', profiler):
+        request_profiler.init_app(app)
+    return app.test_client()
+
+
+def _profiler(tmp_path, **settings):
+    profiler = RequestProfiler()
+    profiler.configure(enabled=True, output_dir=str(tmp_path), **settings)
+    return profiler
+
+
+def test_server_timing_splits_wall_time():
+    """Test that app time is what remains after DB and subsystem time"""
+    header = server_timing(100.0, {'count': 3, 'time_ms': 40.0}, {'llm': [50.0, 1]})
+    assert header == ('total;dur=100.0, db;dur=40.0;desc="3 queries", '
+                      'llm;dur=50.0;desc="1 calls", app;dur=10.0')
+
+
+def test_every_response_gets_server_timing(tmp_path):
+    """Test that requests report timings without writing a capture"""
+    with patch.object(get_query_instrumentation(), 'enabled', False):
+        client = _client(_profiler(tmp_path, secret='s3cret'))
+        response = client.get('/api/slow', headers={'X-Unify-Profile': 'wrong'})
+
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('total;dur=')
+    assert 'db;dur=0.0;desc="0 queries"' in timing
+    assert 'llm;dur=12.5;desc="1 calls"' in timing
+    assert 'X-Unify-Profile-File' not in response.headers
+    assert os.listdir(tmp_path) == []
+
+
+def test_secret_header_writes_pstats_dump(tmp_path):
+    """Test that a request carrying the secret is captured with cProfile"""
+    with patch.object(get_query_instrumentation(), 'enabled', False):
+        client = _client(_profiler(tmp_path, secret='s3cret'))
+        response = client.get('/api/slow', headers={'X-Unify-Profile': 's3cret'})
+
+    name = response.headers['X-Unify-Profile-File']
+    assert name.endswith('-slow-%d.prof' % os.getpid())
+    stats = pstats.Stats(str(tmp_path / name))
+    assert any(func[2] == 'slow' for func in stats.stats)
+
+
+def test_sampling_rule_writes_collapsed_stacks(tmp_path):
+    """Test that a matching sampling rule captures folded stacks for flamegraphs"""
+    with patch.object(get_query_instrumentation(), 'enabled', False):
+        client = _client(_profiler(tmp_path, sample='/api/*=1', default_format='collapsed'))
+        response = client.get('/api/slow')
+
+    name = response.headers['X-Unify-Profile-File']
+    lines = (tmp_path / name).read_text().splitlines()
+    assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any('test_request_profiler.py:slow' in line for line in lines)
@@ -0,0 +1,65 @@
+"""
+Unit tests for slotted row models and the shared row decoder
+"""
+import sys
+import os
+import pickle
+from datetime import datetime
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.row_decoder import row_decoder, to_datetime
+from models.task import Task
+from models.message import Message
+from models.notification import Notification
+from repositories.repository_factory import RepositoryFactory
+
+
+def test_models_have_no_instance_dict():
+    """Test that high-volume models store fields in __slots__"""
+    task = Task(1, 2, "Read chapter", None, "low", "pending")
+    assert not hasattr(task, '__dict__')
+    assert task.to_dict()['Task_Title'] == "Read chapter"
+
+
+def test_extra_kwargs_remain_readable():
+    """Test that extra keyword fields are still available as attributes"""
+    task = Task(Task_ID=1, Completed=True)
+    assert task.Completed is True
+    assert getattr(task, 'Missing', None) is None
+    restored = pickle.loads(pickle.dumps(task))
+    assert restored.Completed is True and restored.Task_ID == 1
+
+
+def test_message_display_names_are_fields():
+    """Test that Sender_Name/Receiver_Name are real fields on Message"""
+    message = Message(1, 2, 3, "hi", datetime(2025, 1, 1), False, "ana", "omar")
+    result = message.to_dict()
+    assert result['Sender_Name'] == "ana"
+    assert result['Receiver_Name'] == "omar"
+
+
+def test_row_decoder_converts_once_per_column_layout():
+    """Test that decoders are cached per layout and convert strings and BIT values"""
+    decode = row_decoder(None, 'datetime', 'bool')
+    assert row_decoder(None, 'datetime', 'bool') is decode
+    assert decode((1, "2025-03-01 10:30:00", 1)) == (1, datetime(2025, 3, 1, 10, 30), True)
+    assert decode((1, "not a date", None)) == (1, None, False)
+    assert row_decoder(None, None) is tuple
+    # Columns past the layout are ignored, as with an explicit column list
+    assert row_decoder(None, 'bool', factory=lambda *values: values)((7, 0, "extra")) == (7, False)
+    assert to_datetime("2025-03-01T10:30:00Z").tzinfo is not None
+
+
+def test_repository_mappers_use_decoder():
+    """Test that repository row mappers build models from decoded rows"""
+    task = RepositoryFactory.create_repository("task")._row_to_task(
+        (5, 1, "Essay", "2025-05-01 09:00:00", "high", "pending"))
+    assert task.Due_Date == datetime(2025, 5, 1, 9, 0)
+
+    notification = RepositoryFactory.create_repository("notification")._row_to_notification(
+        (1, 2, "T", "M", "system", "low", 0, None, "2025-05-01 09:00:00", None))
+    assert isinstance(notification, Notification)
+    assert notification.Is_Read is False
+    assert notification.to_dict()['created_at'] == "2025-05-01T09:00:00"
@@ -0,0 +1,165 @@
+"""
+Unit tests for the bitmask schedule solver
+Tests conflict-free section selection, preference ranking and the optimizer result format
+"""
+import sys
+import os
+import itertools
+import random
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from services.course_optimization_service import CourseOptimizationService
+from services.schedule_solver import EncodedCatalog, SchedulePreferences, rank_section_map, solve_section_map
+
+
+def _slot(course, section, day, start, end):
+    return {"course_code": course, "course_name": course, "type": "LEC", "sub_type": None,
+            "section": section, "day": day, "start": start, "end": end}
+
+
+def _section_map(spec):
+    """{course: {section: [(day, start, end)]}} -> section map of slot dicts"""
+    return {course: {section: [_slot(course, section, *slot) for slot in slots]
+                     for section, slots in sections.items()}
+            for course, sections in spec.items()}
+
+
+def _conflict_free(slots):
+    service = CourseOptimizationService.__new__(CourseOptimizationService)
+    return not any(
+        a["course_code"] != b["course_code"] and a["day"] == b["day"]
+        and service.intervals_overlap(a["start"], a["end"], b["start"], b["end"])
+        for a, b in itertools.combinations(slots, 2))
+
+
+def test_solver_picks_one_compatible_section_per_course():
+    """Test that the only feasible combination is found"""
+    section_map = _section_map({
+        "CSE 101": {1: [("MON", "09:00", "10:15")], 2: [("MON", "11:00", "12:15")]},
+        "MATH 201": {1: [("MON", "09:30", "10:45"), ("WED", "09:30", "10:45")]},
+        "PHYS 110": {1: [("MON", "10:45", "11:00")], 2: [("WED", "10:00", "11:00")]},
+    })
+    slots = solve_section_map(section_map)
+    chosen = {(slot["course_code"], slot["section"]) for slot in slots}
+    assert chosen == {("CSE 101", 2), ("MATH 201", 1), ("PHYS 110", 1)}
+    assert _conflict_free(slots)
+
+
+def test_off_grid_times_do_not_create_false_conflicts():
+    """Test that back-to-back slots off the 5-minute grid still fit"""
+    section_map = _section_map({
+        "A": {1: [("SUN", "10:00", "10:52")]},
+        "B": {1: [("SUN", "10:52", "11:40")]},
+    })
+    assert EncodedCatalog(section_map).bucket == 1
+    assert solve_section_map(section_map) is not None
+
+
+def test_pigeonhole_catalog_is_rejected_quickly():
+    """Test that 9 courses competing for 8 time slots fail fast instead of exploding"""
+    hours = [("MON", h) for h in range(8, 12)] + [("WED", h) for h in range(8, 12)]
+    spec = {f"C{c}": {s: [(hours[(c + s) % 8][0], f"{hours[(c + s) % 8][1]:02d}:00",
+                            f"{hours[(c + s) % 8][1]:02d}:50")] for s in range(1, 31)}
+            for c in range(9)}
+    started = time.perf_counter()
+    assert solve_section_map(_section_map(spec)) is None
+    assert time.perf_counter() - started < 1.0
+
+
+def test_backtracking_optimizer_keeps_slot_list_format():
+    """Test that the service still returns a flat list of slot dicts"""
+    section_map = _section_map({"CSE 101": {1: [("MON", "09:00", "10:15"), ("WED", "09:00", "10:15")]}})
+    service = CourseOptimizationService.__new__(CourseOptimizationService)
+    assert service.backtracking_optimizer(section_map) == section_map["CSE 101"][1]
+    assert service.backtracking_optimizer({"X": {}}) is None
+
+
+def test_ranking_orders_schedules_by_preference_penalty():
+    """Test that schedules come back best first under weighted preferences"""
+    section_map = _section_map({
+        "CSE 101": {1: [("MON", "08:00", "09:15")], 2: [("MON", "11:00", "12:15")],
+                    3: [("WED", "11:00", "12:15")]},
+        "MATH 201": {1: [("MON", "09:30", "10:45")], 2: [("WED", "09:30", "10:45")]},
+    })
+    preferences = SchedulePreferences(no_classes_before="09:00", avoided_sections={"MATH 201": [2]},
+                                      weights={"days": 2, "gaps": 1})
+    ranked, complete = rank_section_map(section_map, preferences, k=3)
+
+    assert complete
+    scores = [result.score for result in ranked]
+    assert scores == sorted(scores)
+    best = {(encoded.course, encoded.section) for encoded in ranked[0].sections}
+    # One campus day and a 15 minute gap beats an 8:00 start or the avoided section
+    assert best == {("CSE 101", 2), ("MATH 201", 1)}
+    assert ranked[0].penalties["days"] == 2
+    assert ranked[0].penalties["gaps"] == 0.25
+    assert all(_conflict_free(result.slots) for result in ranked)
+
+
+def test_ranking_matches_exhaustive_enumeration():
+    """Test that branch-and-bound returns the same top-K scores as brute force"""
+    rng = random.Random(7)
+    days = ["SUN", "MON", "TUES", "WED", "THURS"]
+    for _ in range(40):
+        spec = {}
+        for course in range(rng.randint(2, 4)):
+            spec[f"C{course}"] = {}
+            for section in range(1, rng.randint(2, 5)):
+                start = rng.choice(range(8 * 60, 16 * 60, 30))
+                spec[f"C{course}"][section] = [(rng.choice(days), f"{start // 60:02d}:{start % 60:02d}",
+                                                f"{(start + 75) // 60:02d}:{(start + 75) % 60:02d}")]
+        section_map = _section_map(spec)
+        preferences = SchedulePreferences(no_classes_before="10:00", preferred_sections={"C0": [1]},
+                                          weights={"gaps": rng.choice([0, 1, 3])})
+        k = rng.randint(1, 4)
+
+        expected = []
+        for combo in itertools.product(*(section_map[course].values() for course in sorted(section_map))):
+            slots = [slot for section in combo for slot in section]
+            if _conflict_free(slots):
+                single = rank_section_map({slot_list[0]["course_code"]: {slot_list[0]["section"]: slot_list}
+                                           for slot_list in combo}, preferences, k=1)[0]
+                expected.append(round(single[0].score, 6))
+        ranked, complete = rank_section_map(section_map, preferences, k=k)
+        assert complete
+        assert [round(result.score, 6) for result in ranked] == sorted(expected)[:k]
+
+
+def test_ranking_stops_at_time_budget_with_best_so_far():
+    """Test that an exhausted time budget still returns the schedules found"""
+    spec = {f"C{c}": {s: [(["SUN", "MON", "TUES", "WED", "THURS"][(c * s) % 5],
+                           f"{8 + (c + s) % 9:02d}:00", f"{8 + (c + s) % 9:02d}:50")]
+                      for s in range(1, 16)} for c in range(9)}
+    started = time.perf_counter()
+    ranked, complete = rank_section_map(_section_map(spec), SchedulePreferences(), k=5, time_budget=0.05)
+    assert time.perf_counter() - started < 1.0
+    assert not complete
+    assert ranked and all(_conflict_free(result.slots) for result in ranked)
+
+
+def test_preferences_reject_invalid_payloads():
+    """Test that unknown fields and negative weights are refused"""
+    for payload in ({"earliest": "09:00"}, {"weights": {"days": -1}}, {"weights": {"lunch": 1}}, [1]):
+        try:
+            SchedulePreferences.from_dict(payload)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {payload!r}")
+
+
+def test_optimize_schedule_ranked_mode_response():
+    """Test that optimize_schedule returns ranked schedules when K is given"""
+    section_map = _section_map({"CSE 101": {1: [("MON", "08:00", "09:15")], 2: [("MON", "11:00", "12:15")]}})
+    service = CourseOptimizationService.__new__(CourseOptimizationService)
+    service.rank_time_budget = 1.0
+    service.max_rank_k = 10
+    with patch.object(service, 'get_course_schedule_slots', return_value=section_map):
+        result = service.optimize_schedule(["CSE 101"], preferences=SchedulePreferences(no_classes_before="09:00"), k=50)
+
+    assert result["status"] == "ok" and result["complete"]
+    assert [entry["rank"] for entry in result["schedules"]] == [1, 2]
+    assert result["schedule"] == section_map["CSE 101"][2]
+    assert result["schedules"][1]["penalties"]["early"] == 1
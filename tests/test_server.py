@@ -0,0 +1,91 @@
+"""
+Unit tests for the production server entry point
+Tests server settings, the CLI and per-process state reset after fork()
+"""
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.server import ServerConfig
+from core.sqlite_tuning import SQLiteMaintenance
+
+
+def test_server_config_reads_environment():
+    """Test that UNIFY_* variables configure workers, threads and recycling"""
+    env = {'UNIFY_WORKERS': '4', 'UNIFY_THREADS': '1', 'UNIFY_MAX_REQUESTS': '500'}
+    with patch.dict(os.environ, env):
+        options = ServerConfig().gunicorn_options()
+    assert options['workers'] == 4
+    assert options['worker_class'] == 'sync'
+    assert options['max_requests'] == 500
+    assert options['preload_app'] is False
+
+
+def test_preloading_the_model_preloads_the_app():
+    """Test that model sharing implies loading the app before the fork"""
+    config = ServerConfig(preload=False, preload_model=True, threads=4)
+    assert config.preload is True
+    assert config.gunicorn_options()['worker_class'] == 'gthread'
+
+
+def test_cli_overrides_environment():
+    """Test that `python -m unify serve` options take precedence over UNIFY_*"""
+    from unify.__main__ import build_parser
+
+    args = build_parser().parse_args(['serve', '--workers', '3', '--preload'])
+    with patch.dict(os.environ, {'UNIFY_WORKERS': '8'}):
+        config = ServerConfig(workers=args.workers, preload=args.preload, preload_model=args.preload_model)
+    assert config.workers == 3
+    assert config.preload is True and config.preload_model is False
+
+
+def test_maintenance_thread_restarts_after_fork():
+    """Test that a forked worker gets its own running maintenance thread"""
+    maintenance = SQLiteMaintenance(interval=3600)
+    maintenance.start()
+    inherited, inherited_stop = maintenance._thread, maintenance._stop
+    try:
+        maintenance._reset_after_fork()
+        assert maintenance._thread is not inherited and maintenance._thread.is_alive()
+    finally:
+        maintenance.stop()
+        inherited_stop.set()  # not a real fork, so the old thread is still running
+        inherited.join(timeout=5)
+
+    idle = SQLiteMaintenance(interval=3600)
+    idle._reset_after_fork()
+    assert idle._thread is None
+
+
+def test_forked_worker_does_not_reuse_or_close_parent_pools():
+    """Test that inherited pools are dropped without closing the parent's connections"""
+    from core.db_singleton import DatabaseConnection
+
+    DatabaseConnection._instance = None
+    try:
+        db = DatabaseConnection()
+        pool = MagicMock()
+        db._pools = {'main': pool}
+        db._reset_after_fork()
+        assert db._pools == {}
+        pool.close_all.assert_not_called()
+    finally:
+        DatabaseConnection._instance = None
+
+
+def test_serve_enables_invalidation_bus_for_multiple_workers():
+    """Test that multi-worker servers turn on cross-worker cache invalidation"""
+    from core.server import _enable_invalidation_bus
+
+    with patch.dict(os.environ, {'INVALIDATION_BUS_ENABLED': 'false'}):
+        os.environ.pop('INVALIDATION_BUS_TRANSPORT', None)
+        _enable_invalidation_bus(4)
+        assert os.environ['INVALIDATION_BUS_ENABLED'] == 'true'
+        assert os.environ['INVALIDATION_BUS_TRANSPORT'] == 'sqlite'
+
+    with patch.dict(os.environ, {'INVALIDATION_BUS_ENABLED': 'false'}):
+        _enable_invalidation_bus(1)
+        assert os.environ['INVALIDATION_BUS_ENABLED'] == 'false'
@@ -0,0 +1,112 @@
+"""
+Unit tests for the portable SQL dialect layer
+Covers T-SQL translation for SQLite, dialect helpers and the SQLite backend
+"""
+import sys
+import os
+import sqlite3
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.sql_dialect import (SQLITE, SQLSERVER, DialectConnection, dialect_for,
+                              init_sqlite_schema, SQLITE_DETECT_TYPES)
+
+
+def _make_conn():
+    conn = DialectConnection(sqlite3.connect(":memory:", detect_types=SQLITE_DETECT_TYPES), SQLITE)
+    init_sqlite_schema(conn)
+    return conn
+
+
+def test_top_and_output_inserted_are_translated():
+    """Test that TOP, OUTPUT INSERTED and GETDATE() become SQLite syntax"""
+    query, _ = SQLITE.translate("SELECT TOP 5 * FROM [dbo].[Task] WHERE Due_Date > GETDATE()")
+    assert query.startswith("SELECT * FROM [Task]")
+    assert query.rstrip().endswith("LIMIT 5")
+    assert "datetime('now', 'localtime')" in query
+
+    query, _ = SQLITE.translate("INSERT INTO Task (Task_Title) OUTPUT INSERTED.Task_ID VALUES (?)")
+    assert "OUTPUT" not in query
+    assert query.rstrip().endswith("RETURNING Task_ID")
+
+
+def test_parameterised_top_moves_its_parameter():
+    """Test that TOP (?) becomes LIMIT ? with the parameter reordered to match"""
+    query, params = SQLITE.translate(
+        "SELECT TOP (?) * FROM Message WHERE Receiver_ID = ? ORDER BY Timestamp DESC", (10, 7))
+    assert "LIMIT ?" in query
+    assert list(params) == [7, 10]
+
+
+def test_dialect_for_follows_wrapped_connections():
+    """Test that dialect_for() sees through connection proxies"""
+    conn = _make_conn()
+    assert dialect_for(conn) is SQLITE
+    assert dialect_for(conn._raw) is SQLITE
+
+    class FakeOdbcConnection:
+        pass
+
+    assert dialect_for(FakeOdbcConnection()) is SQLSERVER
+
+
+def test_create_table_and_add_column_are_idempotent():
+    """Test that repository-style DDL in SQL Server syntax works on SQLite"""
+    conn = _make_conn()
+    cursor = conn.cursor()
+    columns = """
+        Plan_ID INT IDENTITY(1,1) PRIMARY KEY,
+        Title NVARCHAR(MAX) NOT NULL,
+        Created_At DATETIME DEFAULT GETDATE()
+    """
+    SQLITE.create_table(cursor, "StudyPlan", columns)
+    SQLITE.create_table(cursor, "StudyPlan", columns)
+    SQLITE.add_column(cursor, "StudyPlan", "Status", "NVARCHAR(20) DEFAULT 'active'")
+    SQLITE.add_column(cursor, "StudyPlan", "Status", "NVARCHAR(20) DEFAULT 'active'")
+
+    cursor.execute("PRAGMA table_info(StudyPlan)")
+    assert [row[1] for row in cursor.fetchall()] == ["Plan_ID", "Title", "Created_At", "Status"]
+
+    cursor.execute("INSERT INTO StudyPlan (Title) OUTPUT INSERTED.Plan_ID VALUES (?)", ("Week 1",))
+    assert cursor.fetchone()[0] == 1
+    cursor.execute("SELECT Created_At, Status FROM StudyPlan")
+    created_at, status = cursor.fetchone()
+    assert status == 'active'
+    assert created_at.year >= 2024
+
+
+def test_limit_on_sqlite():
+    """Test the row limit helper against a real SQLite database"""
+    conn = _make_conn()
+    cursor = conn.cursor()
+    cursor.executemany("INSERT INTO [User] (Username, Email, Password_Hash) VALUES (?, ?, 'h')",
+                       [(f"u{i}", f"u{i}@x") for i in range(5)])
+    cursor.execute(SQLITE.limit("SELECT Username FROM [User] ORDER BY User_ID;", 2))
+    assert [row[0] for row in cursor.fetchall()] == ['u0', 'u1']
+
+
+def test_database_connection_uses_sqlite_backend(tmp_path):
+    """Test that DB_BACKEND=sqlite gives DatabaseConnection a working T-SQL connection"""
+    from core.db_singleton import DatabaseConnection
+
+    env = {'DB_BACKEND': 'sqlite', 'DB_SQLITE_PATH': str(tmp_path / "main.db")}
+    with patch.dict(os.environ, env):
+        DatabaseConnection._instance = None
+        try:
+            db = DatabaseConnection()
+            conn = db.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO [User] (Username, Email, Password_Hash) "
+                "OUTPUT INSERTED.User_ID VALUES (?, ?, ?)", ("ana", "ana@x", "h"))
+            user_id = cursor.fetchone()[0]
+            conn.commit()
+            conn.close()
+
+            db.create_table("Knowledge_Base", "Entry_ID INT IDENTITY(1,1) PRIMARY KEY, Body NVARCHAR(MAX)")
+            row = db.fetch_one("SELECT TOP 1 Username FROM [User] WHERE User_ID = ?", (user_id,))
+            assert row[0] == "ana"
+        finally:
+            DatabaseConnection._instance = None
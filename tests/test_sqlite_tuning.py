@@ -0,0 +1,92 @@
+"""
+Unit tests for the SQLite performance profile
+Tests that tuned connections get WAL/synchronous settings and maintenance runs
+"""
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core import sqlite_tuning
+
+
+def test_connect_applies_profile(tmp_path):
+    """Test that connect() switches the file to WAL with synchronous=NORMAL"""
+    db_path = str(tmp_path / "user_1.db")
+    conn = sqlite_tuning.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        # 1 = NORMAL
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        # 2 = MEMORY
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == sqlite_tuning.get_profile()['busy_timeout']
+    finally:
+        conn.close()
+
+
+def test_readers_not_blocked_by_open_write_transaction(tmp_path):
+    """Test that a reader can query while another connection holds a write transaction"""
+    db_path = str(tmp_path / "user_2.db")
+    writer = sqlite_tuning.connect(db_path)
+    writer.execute("CREATE TABLE t (x INTEGER)")
+    writer.commit()
+    writer.execute("INSERT INTO t VALUES (1)")  # transaction left open
+
+    reader = sqlite_tuning.connect(db_path)
+    try:
+        assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    finally:
+        reader.close()
+        writer.rollback()
+        writer.close()
+
+
+def test_maintenance_run_once(tmp_path):
+    """Test that the maintenance task checkpoints registered files"""
+    db_path = str(tmp_path / "user_3.db")
+    conn = sqlite_tuning.connect(db_path)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.close()
+
+    maintenance = sqlite_tuning.SQLiteMaintenance(interval=0)
+    maintenance.register(db_path)
+    maintenance.run_once()
+    assert maintenance.runs == 1
+
+
+def test_maintenance_keeps_only_recently_opened_paths():
+    """Test that registered paths are bounded, dropping the least recently opened first"""
+    maintenance = sqlite_tuning.SQLiteMaintenance(interval=0, max_paths=2)
+    maintenance.register("a.db")
+    maintenance.register("b.db")
+    maintenance.register("a.db")
+    maintenance.register("c.db")
+    assert list(maintenance._paths) == ["a.db", "c.db"]
+
+
+def test_pooled_connection_optimizes_on_release_and_close(tmp_path):
+    """Test that PRAGMA optimize runs from the pooled connection itself, when due and on close"""
+    from core.connection_pool import ConnectionPool
+
+    db_path = str(tmp_path / "user_4.db")
+    statements = []
+    pool = ConnectionPool(lambda: sqlite_tuning.connect(db_path, check_same_thread=False), min_size=0, max_size=1)
+    conn = pool.acquire()
+    conn.raw_connection.set_trace_callback(statements.append)
+
+    conn.close()
+    assert "PRAGMA optimize" not in statements  # not due yet
+
+    interval = sqlite_tuning.get_profile()['optimize_interval']
+    sqlite_tuning.set_profile(optimize_interval=0.000001)
+    try:
+        pool.acquire().close()
+        assert statements.count("PRAGMA optimize") == 1
+    finally:
+        sqlite_tuning.set_profile(optimize_interval=interval)
+
+    pool.close_all()
+    assert statements.count("PRAGMA optimize") == 2
@@ -0,0 +1,101 @@
+"""
+Unit tests for the overview stats repository
+Tests that dashboard counters come from one query and the optional cache
+"""
+import sys
+import os
+from datetime import date, datetime, timedelta
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.db_singleton import DatabaseConnection
+from core.stats_cache import invalidate_overview_stats
+from repositories.repository_factory import RepositoryFactory
+
+
+@pytest.fixture
+def db(sqlite_main_db, monkeypatch):
+    monkeypatch.setenv('OVERVIEW_STATS_CACHE_ENABLED', 'false')
+    invalidate_overview_stats()
+    yield sqlite_main_db
+    invalidate_overview_stats()
+
+
+def _seed_student(insert_row):
+    user_id = insert_row("INSERT INTO [User] (Username, Email, Password_Hash) "
+                         "OUTPUT INSERTED.User_ID VALUES (?, ?, ?)", ("sam", "sam@x", "h"))
+    student_id = insert_row("INSERT INTO Student (User_ID, Department, GPA) "
+                            "OUTPUT INSERTED.Student_ID VALUES (?, ?, ?)", (user_id, "CS", 3.5))
+    return user_id, student_id
+
+
+def _add_task(insert_row, student_id, due, status='pending'):
+    insert_row("INSERT INTO Task (Student_ID, Task_Title, Due_Date, Priority, Status) "
+               "OUTPUT INSERTED.Task_ID VALUES (?, ?, ?, ?, ?)", (student_id, "t", due, 'low', status))
+
+
+def test_overview_stats_in_one_query(db, insert_row):
+    """Test that every counter is computed by a single aggregate statement"""
+    user_id, student_id = _seed_student(insert_row)
+    instructor_id = insert_row("INSERT INTO Instructor (User_ID) OUTPUT INSERTED.Instructor_ID VALUES (?)",
+                               (user_id,))
+    for name, status in (("A", 'enrolled'), ("B", 'enrolled'), ("C", 'dropped')):
+        course_id = insert_row("INSERT INTO Course (Course_Name, Credits, Instructor_ID) "
+                               "OUTPUT INSERTED.Course_ID VALUES (?, ?, ?)", (name, 3, instructor_id))
+        insert_row("INSERT INTO Enrollment (Student_ID, Course_ID, Status) "
+                   "OUTPUT INSERTED.Enrollment_ID VALUES (?, ?, ?)", (student_id, course_id, status))
+    now = datetime.now()
+    _add_task(insert_row, student_id, now + timedelta(hours=2))
+    _add_task(insert_row, student_id, now + timedelta(days=5))
+    _add_task(insert_row, student_id, now - timedelta(days=40), status='completed')
+    for offset in (-1, 0, 3):
+        insert_row("INSERT INTO Calendar (Student_ID, Title, Date, Time) "
+                   "OUTPUT INSERTED.Event_ID VALUES (?, ?, ?, ?)",
+                   (student_id, "e", date.today() + timedelta(days=offset), "09:00:00"))
+
+    repo = RepositoryFactory.create_repository("stats")
+    repo._ensure_notification_table()
+    insert_row("INSERT INTO Notification (User_ID, Title, Message, Is_Read) "
+               "OUTPUT INSERTED.Notification_ID VALUES (?, ?, ?, ?)", (user_id, "n", "m", 0))
+
+    with patch.object(DatabaseConnection, 'fetch_one', wraps=db.fetch_one) as fetch_one:
+        stats = repo.get_overview_stats(user_id)
+    assert fetch_one.call_count == 1
+
+    assert stats['student_id'] == student_id
+    assert stats['gpa'] == 3.5
+    assert stats['total_courses'] == 2
+    assert stats['active_tasks'] == 2
+    assert stats['due_soon_tasks'] == 1
+    assert stats['completed_tasks'] == 1
+    assert stats['upcoming_events'] == 2
+    assert stats['unread_notifications'] == 1
+
+
+def test_non_student_gets_empty_counters(db):
+    """Test that users without a student record get zeroed counters"""
+    stats = RepositoryFactory.create_repository("stats").get_overview_stats(12345)
+    assert stats['student_id'] is None
+    assert stats['active_tasks'] == 0
+
+
+def test_cached_stats_are_invalidated_by_task_writes(db, insert_row, monkeypatch):
+    """Test that the optional cache serves repeats and drops entries on writes"""
+    from models.task import Task
+
+    monkeypatch.setenv('OVERVIEW_STATS_CACHE_ENABLED', 'true')
+    user_id, student_id = _seed_student(insert_row)
+    repo = RepositoryFactory.create_repository("stats")
+
+    with patch.object(DatabaseConnection, 'fetch_one', wraps=db.fetch_one) as fetch_one:
+        assert repo.get_overview_stats(user_id)['active_tasks'] == 0
+        repo.get_overview_stats(user_id)['active_tasks'] = 99
+        assert repo.get_overview_stats(user_id)['active_tasks'] == 0
+    assert fetch_one.call_count == 1
+
+    RepositoryFactory.create_repository("task").create(
+        Task(Student_ID=student_id, Task_Title="new", Due_Date=datetime.now() + timedelta(days=1),
+             Priority='low', Status='pending'))
+    assert repo.get_overview_stats(user_id)['active_tasks'] == 1
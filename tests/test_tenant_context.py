@@ -0,0 +1,48 @@
+"""
+Unit tests for thread-safe tenant routing
+Tests that the tenant context is isolated between concurrent requests
+"""
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.tenant_context import tenant_context, get_current_tenant
+
+
+def test_tenant_context_restores_previous_value():
+    """Test that tenant_context() restores the previous tenant on exit"""
+    assert get_current_tenant() is None
+    with tenant_context(5):
+        assert get_current_tenant() == 5
+        with tenant_context(7):
+            assert get_current_tenant() == 7
+        assert get_current_tenant() == 5
+    assert get_current_tenant() is None
+
+
+@patch("core.db_singleton.pyodbc")
+def test_user_context_is_isolated_per_thread(mock_pyodbc):
+    """Test that set_user_context() in one thread does not leak into another"""
+    from core.db_singleton import DatabaseConnection
+
+    db = DatabaseConnection()
+    barrier = threading.Barrier(2)
+    seen = {}
+
+    def worker(user_id):
+        db.set_user_context(user_id)
+        barrier.wait()
+        seen[user_id] = db.current_user_id
+
+    threads = [threading.Thread(target=worker, args=(uid,)) for uid in (1, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert seen == {1: 1, 2: 2}
+    assert db.current_user_id is None
@@ -0,0 +1,120 @@
+"""
+Unit tests for the request-scoped Unit of Work
+Tests that repositories share one connection and commit exactly once
+"""
+import pytest
+import sys
+import os
+import sqlite3
+from unittest.mock import patch
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.unit_of_work import unit_of_work, get_current_unit_of_work, on_commit
+
+
+def _make_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.close()
+
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_connection_shared_within_unit_of_work(tmp_path):
+    """Test that every get_connection() call in a unit of work shares one connection"""
+    db_path = str(tmp_path / "uow.db")
+    _make_db(db_path)
+    opened = []
+
+    def opener():
+        opened.append(1)
+        return sqlite3.connect(db_path)
+
+    with unit_of_work() as uow:
+        conn1 = uow.get_connection(('main',), opener)
+        conn2 = uow.get_connection(('main',), opener)
+        assert conn1 is conn2
+        assert get_current_unit_of_work() is uow
+
+    assert len(opened) == 1
+    assert get_current_unit_of_work() is None
+
+
+def test_commit_deferred_until_end(tmp_path):
+    """Test that repository commit()/close() calls are deferred to the unit of work"""
+    db_path = str(tmp_path / "uow.db")
+    _make_db(db_path)
+
+    with unit_of_work() as uow:
+        conn = uow.get_connection(('main',), lambda: sqlite3.connect(db_path))
+        conn.cursor().execute("INSERT INTO t VALUES (1)")
+        conn.commit()
+        conn.close()
+        # Nothing is visible to other connections yet
+        assert _count(db_path) == 0
+
+    assert _count(db_path) == 1
+
+
+def test_exception_rolls_back_everything(tmp_path):
+    """Test that an exception inside the unit of work rolls back all writes"""
+    db_path = str(tmp_path / "uow.db")
+    _make_db(db_path)
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work() as uow:
+            conn = uow.get_connection(('main',), lambda: sqlite3.connect(db_path))
+            conn.cursor().execute("INSERT INTO t VALUES (1)")
+            conn.commit()
+            raise RuntimeError("second write failed")
+
+    assert _count(db_path) == 0
+
+
+def test_nested_unit_of_work_joins_outer(tmp_path):
+    """Test that a nested unit_of_work() joins the active one"""
+    with unit_of_work() as outer:
+        with unit_of_work() as inner:
+            assert inner is outer
+
+
+@patch("core.db_singleton.pyodbc")
+def test_database_connection_uses_active_unit_of_work(mock_pyodbc, tmp_path):
+    """Test that DatabaseConnection.get_connection() joins the active unit of work"""
+    from core.db_singleton import DatabaseConnection
+
+    db_path = str(tmp_path / "uow.db")
+    _make_db(db_path)
+    db = DatabaseConnection()
+
+    with patch.object(db, "_get_main_connection", side_effect=lambda: sqlite3.connect(db_path)) as opener:
+        with unit_of_work():
+            assert db.get_connection() is db.get_connection()
+        assert opener.call_count == 1
+
+
+def test_on_commit_runs_after_commit_and_is_dropped_on_rollback():
+    """Test that after-commit callbacks wait for the commit and never run on rollback"""
+    calls = []
+    on_commit(lambda: calls.append("no uow"))
+    assert calls == ["no uow"]
+
+    with unit_of_work():
+        on_commit(lambda: calls.append("committed"))
+        assert calls == ["no uow"]
+    assert calls == ["no uow", "committed"]
+
+    with pytest.raises(ValueError):
+        with unit_of_work():
+            on_commit(lambda: calls.append("rolled back"))
+            raise ValueError("boom")
+    assert calls == ["no uow", "committed"]
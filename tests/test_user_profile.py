@@ -0,0 +1,113 @@
+"""
+Unit tests for user profile resolution
+Tests that roles and template data come from one cached, invalidated query
+"""
+import sys
+import os
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from core.db_singleton import DatabaseConnection
+from core.user_profile import get_user_profile, invalidate_user_profile
+
+
+@pytest.fixture
+def db(sqlite_main_db):
+    invalidate_user_profile()
+    yield sqlite_main_db
+    invalidate_user_profile()
+
+
+def _add_user(insert_row, name):
+    return insert_row("INSERT INTO [User] (Username, Email, Password_Hash) "
+                      "OUTPUT INSERTED.User_ID VALUES (?, ?, ?)", (name, f"{name}@x", "h"))
+
+
+def test_profile_resolves_roles_in_one_query(db, insert_row):
+    """Test that a TA who is also a student is resolved with a single query"""
+    instructor_user = _add_user(insert_row, "ins")
+    instructor_id = insert_row("INSERT INTO Instructor (User_ID, Department) "
+                               "OUTPUT INSERTED.Instructor_ID VALUES (?, ?)", (instructor_user, "CS"))
+    course_id = insert_row("INSERT INTO Course (Course_Name, Credits, Instructor_ID) "
+                           "OUTPUT INSERTED.Course_ID VALUES (?, ?, ?)", ("Algorithms", 3, instructor_id))
+    user_id = _add_user(insert_row, "sam")
+    insert_row("INSERT INTO Student (User_ID, Department) OUTPUT INSERTED.Student_ID VALUES (?, ?)",
+               (user_id, "Physics"))
+    for _ in range(2):
+        insert_row("INSERT INTO Teaching_Assistant (User_ID, Assigned_Course_ID, Hours_Per_Week) "
+                   "OUTPUT INSERTED.TA_ID VALUES (?, ?, ?)", (user_id, course_id, 5))
+
+    with patch.object(DatabaseConnection, 'fetch_one', wraps=db.fetch_one) as fetch_one:
+        profile = get_user_profile(user_id)
+        assert get_user_profile(user_id) is profile
+    assert fetch_one.call_count == 1
+
+    assert profile.Username == "sam"
+    assert profile.is_student and profile.is_ta and not profile.is_instructor
+    assert profile.Student_Department == "Physics"
+    assert profile.role == 'TA'
+    assert get_user_profile(instructor_user).role == 'Instructor'
+
+
+def test_missing_user_is_cached_as_empty_profile(db):
+    """Test that unknown users resolve to an empty profile without re-querying"""
+    assert get_user_profile(None) is None
+    with patch.object(DatabaseConnection, 'fetch_one', wraps=db.fetch_one) as fetch_one:
+        assert not get_user_profile(999).exists
+        assert get_user_profile(999).role is None
+    assert fetch_one.call_count == 1
+
+
+def test_role_changes_invalidate_the_cached_profile(db, insert_row):
+    """Test that creating a role row through its repository refreshes the profile"""
+    from models.student import Student
+    from repositories.repository_factory import RepositoryFactory
+
+    user_id = _add_user(insert_row, "lee")
+    assert get_user_profile(user_id).role is None
+
+    RepositoryFactory.create_repository("student").create(Student(User_ID=user_id, Department="Math"))
+    assert get_user_profile(user_id).role == 'Student'
+
+
+def test_get_user_data_and_role_share_the_profile():
+    """Test that get_user_data and get_user_role read the same cached profile"""
+    from core.role_auth import get_user_role
+    from core.user_helper import get_user_data
+    from core.user_profile import UserProfile
+
+    profile = UserProfile(User_ID=7, Username="kim", Email="kim@x", Instructor_ID=3,
+                          Instructor_Department="EE")
+    with patch('core.user_profile._load_profile', return_value=profile) as load, \
+            patch('core.user_profile._cache_key', side_effect=lambda user_id: ('test', user_id)):
+        try:
+            data = get_user_data(7)
+            assert get_user_role(7) == 'Instructor'
+        finally:
+            invalidate_user_profile(7)
+    assert load.call_count == 1
+    assert data['role'] == 'Instructor'
+    assert data['department'] == 'EE'
+    assert data['is_instructor_or_ta'] is True
+
+
+def test_role_change_in_unit_of_work_is_shared_only_after_commit(db, insert_row):
+    """Test that an uncommitted role row is seen by its own request but not cached for others"""
+    from flask import Flask
+    from core import user_profile
+    from core.unit_of_work import unit_of_work
+    from models.student import Student
+    from repositories.repository_factory import RepositoryFactory
+
+    user_id = _add_user(insert_row, "kim")
+    assert get_user_profile(user_id).role is None
+
+    with Flask(__name__).test_request_context():
+        with unit_of_work():
+            RepositoryFactory.create_repository("student").create(Student(User_ID=user_id, Department="Math"))
+            assert get_user_profile(user_id).role == 'Student'
+            # Other requests keep the committed profile until the commit
+            assert user_profile._profiles.get(user_id).role is None
+    assert get_user_profile(user_id).role == 'Student'
@@ -0,0 +1,13 @@
+"""
+UNIFY command line
+`python -m unify <command>` from the project root; see `python -m unify --help`
+"""
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(REPO_ROOT, 'src')
+
+# Application modules import each other as top-level packages (core, services, ...)
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
@@ -0,0 +1,109 @@
+"""
+UNIFY command line entry point
+
+    python -m unify serve [--workers N] [--threads N] [--preload] [--preload-model] ...
+    python -m unify optimize-cohort REQUESTS [--year 2025] [--term SPRING] [--workers N] [--output FILE]
+"""
+import argparse
+import json
+import os
+import sys
+
+from unify import SRC_PATH
+
+
+def _serve(args):
+    from core.server import ServerConfig, serve
+
+    serve(ServerConfig(
+        bind=args.bind,
+        workers=args.workers,
+        threads=args.threads,
+        preload=args.preload,
+        preload_model=args.preload_model,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        timeout=args.timeout,
+        graceful_timeout=args.graceful_timeout,
+    ))
+
+
+def _optimize_cohort(args):
+    from services.cohort_optimizer import CohortOptimizer, read_cohort_requests
+
+    requests = read_cohort_requests(args.requests)
+    optimizer = CohortOptimizer(args.year, args.term, workers=args.workers, chunk_size=args.chunk_size)
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for result in optimizer.run(requests):
+            output.write(json.dumps(result, default=str) + '\n')
+            report = optimizer.report
+            if report.completed % args.progress_every == 0:
+                print(f"[COHORT] {report.completed}/{report.total} "
+                      f"({report.schedules_per_second:.1f} schedules/s)", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    summary = optimizer.report.to_dict()
+    print(f"[COHORT] {summary['scheduled']}/{summary['total']} scheduled in {summary['elapsed_seconds']}s "
+          f"({summary['schedules_per_second']} schedules/s, {optimizer.workers} workers)", file=sys.stderr)
+    for label, cases in (('infeasible', summary['infeasible']), ('error', summary['errors']),
+                         ('missing courses', summary['missing_courses'])):
+        for case in cases:
+            detail = ', '.join(case.get('missing_courses', [])) or case.get('message')
+            print(f"[COHORT] {label}: student {case['student_id']}: {detail}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m unify', description='UNIFY command line')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='run the multi-worker production server',
+                                description='Unset options fall back to UNIFY_* environment variables.')
+    serve.add_argument('--bind', help='host:port (UNIFY_BIND, default 0.0.0.0:5000)')
+    serve.add_argument('--workers', type=int, help='worker processes (UNIFY_WORKERS, default 2)')
+    serve.add_argument('--threads', type=int, help='threads per worker (UNIFY_THREADS, default 4)')
+    serve.add_argument('--preload', action='store_true', default=None,
+                       help='load the app before forking workers (UNIFY_PRELOAD)')
+    serve.add_argument('--preload-model', action='store_true', default=None,
+                       help='also load the summarization model before forking (UNIFY_PRELOAD_MODEL)')
+    serve.add_argument('--max-requests', type=int,
+                       help='recycle a worker after N requests, 0 = never (UNIFY_MAX_REQUESTS, default 1000)')
+    serve.add_argument('--max-requests-jitter', type=int,
+                       help='random extra requests before recycling (UNIFY_MAX_REQUESTS_JITTER, default 100)')
+    serve.add_argument('--timeout', type=int, help='worker timeout in seconds (UNIFY_TIMEOUT, default 120)')
+    serve.add_argument('--graceful-timeout', type=int,
+                       help='seconds to finish requests on reload/shutdown (UNIFY_GRACEFUL_TIMEOUT, default 30)')
+    serve.set_defaults(handler=_serve)
+
+    cohort = commands.add_parser('optimize-cohort', help='pre-compute schedules for many students',
+                                 description='Results are written as JSON lines; progress and the '
+                                             'throughput summary go to stderr.')
+    cohort.add_argument('requests', help='JSON array, JSON lines or CSV (student_id, course_codes '
+                                         'separated by ";") file; - for stdin')
+    cohort.add_argument('--year', type=int, default=2025, help='academic year (default 2025)')
+    cohort.add_argument('--term', default='SPRING', help='term (default SPRING)')
+    cohort.add_argument('--workers', type=int, help='worker processes (COHORT_OPTIMIZER_WORKERS, default CPU count)')
+    cohort.add_argument('--chunk-size', type=int, help='requests per worker task (default automatic)')
+    cohort.add_argument('--output', help='results file (default stdout)')
+    cohort.add_argument('--progress-every', type=int, default=100, help='progress line every N results')
+    cohort.set_defaults(handler=_optimize_cohort)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # File arguments are relative to the caller's directory, not src/
+    if args.command == 'optimize-cohort':
+        if args.requests != '-':
+            args.requests = os.path.abspath(args.requests)
+        if args.output:
+            args.output = os.path.abspath(args.output)
+    # Same working directory as `python app.py`, for paths relative to src/
+    os.chdir(SRC_PATH)
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()